@@ -10,6 +10,7 @@ from __future__ import annotations
 import hashlib
 import random
 from datetime import date, timedelta
+from pathlib import Path
 
 # Deterministic topics for title/body generation
 _TOPICS = [
@@ -116,3 +117,57 @@ def find_relevant(entries: list[dict], query: dict) -> set[str]:
     """Return entry IDs relevant to a query (title contains the topic)."""
     topic = query["topic"].lower()
     return {e["id"] for e in entries if topic in e["title"].lower()}
+
+
+def _unit(values: list[float]) -> list[float]:
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return [v / norm for v in values]
+
+
+def generate_vectors(
+    n: int, dim: int = 384, clusters: int = 10, noise: float = 1.5, seed: int = 7
+) -> list[list[float]]:
+    """Generate n unit vectors scattered around ``clusters`` random centroids.
+
+    Clustered data gives nearest-neighbour sets with realistic near-ties,
+    which is what quantization errors disturb.
+    """
+    rng = random.Random(seed)
+    centroids = [_unit([rng.gauss(0, 1) for _ in range(dim)]) for _ in range(clusters)]
+    return [
+        _unit([c + rng.gauss(0, noise / dim**0.5) for c in centroids[i % clusters]])
+        for i in range(n)
+    ]
+
+
+def generate_query_vectors(
+    vectors: list[list[float]], n: int = 50, noise: float = 0.3, seed: int = 11
+) -> list[list[float]]:
+    """Perturbed copies of corpus vectors, used as KNN queries."""
+    rng = random.Random(seed)
+    dim = len(vectors[0])
+    return [
+        _unit([v + rng.gauss(0, noise / dim**0.5) for v in rng.choice(vectors)]) for _ in range(n)
+    ]
+
+
+def write_kb_files(entries: list[dict], root: Path) -> list[Path]:
+    """Write entries as markdown files under ``root``, one per ``source_path``."""
+    import yaml
+
+    paths = []
+    for entry in entries:
+        frontmatter = {
+            "id": entry["id"],
+            "title": entry["title"],
+            "type": entry["entry_type"],
+            "date": entry["date"],
+            "importance": entry["importance"],
+            "summary": entry["summary"],
+            "tags": entry["tags"],
+        }
+        path = root / entry["source_path"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"---\n{yaml.safe_dump(frontmatter, sort_keys=False)}---\n\n{entry['body']}\n")
+        paths.append(path)
+    return paths
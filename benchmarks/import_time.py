@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the CLI and MCP entry points.
+
+Every agent call to ``pyrite-read search`` starts a fresh interpreter, so
+import latency and database open time are paid on each invocation. Each
+measurement runs in a new subprocess.
+
+Measures:
+- Import time of each entry-point module (median/min over repeats)
+- PyriteDB open time on a fresh and on an already-initialized database
+- ``pyrite-read --help`` wall time
+
+Usage:
+    python benchmarks/import_time.py [--repeats 10] [--output benchmarks/import_time.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ENTRY_POINTS = {
+    "pyrite": "pyrite.cli",
+    "pyrite-read": "pyrite.read_cli",
+    "pyrite-admin": "pyrite.admin_cli",
+    "pyrite mcp": "pyrite.server.mcp_server",
+}
+
+_IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+_DB_OPEN_SNIPPET = """
+import time
+from pyrite.storage.database import PyriteDB
+start = time.perf_counter()
+db = PyriteDB({path!r})
+elapsed = time.perf_counter() - start
+db.close()
+print(elapsed)
+"""
+
+
+def _run(snippet: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _summary(label: str, times: list[float]) -> dict:
+    return {
+        "target": label,
+        "runs": len(times),
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "min_ms": round(min(times) * 1000, 1),
+    }
+
+
+def bench_imports(repeats: int) -> list[dict]:
+    results = []
+    for label, module in ENTRY_POINTS.items():
+        times = [_run(_IMPORT_SNIPPET.format(module=module)) for _ in range(repeats)]
+        results.append({**_summary(label, times), "module": module})
+    return results
+
+
+def bench_db_open(repeats: int) -> list[dict]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        times_fresh = []
+        for i in range(repeats):
+            path = str(Path(tmpdir) / f"fresh-{i}.db")
+            times_fresh.append(_run(_DB_OPEN_SNIPPET.format(path=path)))
+        path = str(Path(tmpdir) / "existing.db")
+        _run(_DB_OPEN_SNIPPET.format(path=path))
+        times_existing = [_run(_DB_OPEN_SNIPPET.format(path=path)) for _ in range(repeats)]
+    return [
+        _summary("PyriteDB (new file)", times_fresh),
+        _summary("PyriteDB (existing)", times_existing),
+    ]
+
+
+def bench_help(repeats: int) -> dict:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", "from pyrite.read_cli import main; main()", "--help"],
+            capture_output=True,
+            check=False,
+        )
+        times.append(time.perf_counter() - start)
+    return _summary("pyrite-read --help", times)
+
+
+def run_benchmarks(repeats: int) -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "imports": bench_imports(repeats),
+        "db_open": bench_db_open(repeats),
+        "commands": [bench_help(repeats)],
+    }
+
+
+def format_markdown(results: dict) -> str:
+    lines = ["# Cold-Start Benchmark Results\n"]
+    lines.append("## Entry-Point Imports\n")
+    lines.append("| Entry point | Module | Median (ms) | Min (ms) |")
+    lines.append("|-------------|--------|-------------|----------|")
+    for r in results["imports"]:
+        lines.append(f"| {r['target']} | {r['module']} | {r['median_ms']} | {r['min_ms']} |")
+
+    lines.append("\n## Database Open and Commands\n")
+    lines.append("| Target | Median (ms) | Min (ms) |")
+    lines.append("|--------|-------------|----------|")
+    for r in results["db_open"] + results["commands"]:
+        lines.append(f"| {r['target']} | {r['median_ms']} | {r['min_ms']} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run cold-start benchmarks")
+    parser.add_argument("--repeats", type=int, default=10, help="Subprocess runs per target")
+    parser.add_argument("--output", default=None, help="Output JSON path")
+    args = parser.parse_args()
+
+    print("Cold-Start Benchmark")
+    print("=" * 40)
+    results = run_benchmarks(args.repeats)
+    print("\n" + format_markdown(results))
+
+    out_path = args.output or "benchmarks/import_time.json"
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nJSON results saved to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
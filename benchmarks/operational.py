@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Operational benchmarks for the MCP, REST and sync paths.
+
+``run_all.py`` measures the search backends in isolation; this suite
+measures the paths that serve agents and users, on a synthetic KB written
+to disk from ``benchmarks/corpus.py``.
+
+Measures:
+- MCP tool-call throughput (``kb_search``/``kb_get``) with N concurrent
+  clients sharing one server and event loop, as the SSE transport does
+- REST ``/api/entries`` and ``/api/search`` under N concurrent users,
+  against a live uvicorn server
+- ``sync_incremental`` after a git checkout touching 1% of files,
+  next to a no-op sync
+- Peak RSS of ``index_kb`` and of embedding, each in a fresh subprocess
+
+Rate limits (MCP token buckets, the REST per-IP limiter) are lifted so the
+numbers reflect server work.  All results are written as JSON for
+regression comparison.
+
+Usage:
+    python benchmarks/operational.py [--size 2000] [--concurrency 1,4,16] [--calls 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.corpus import generate_entries, generate_queries, write_kb_files
+
+_UNLIMITED = "1000000/second"
+
+
+def _config(tmpdir: Path, kb_path: Path):
+    from pyrite.config import KBConfig, PyriteConfig, Settings
+
+    return PyriteConfig(
+        knowledge_bases=[KBConfig(name="bench", path=kb_path, kb_type="generic")],
+        settings=Settings(index_path=tmpdir / "index.db", rate_limit_read=_UNLIMITED),
+    )
+
+
+def _build_kb(tmpdir: Path, entries: list[dict]):
+    """Write and fully index the synthetic KB; returns its config."""
+    from pyrite.storage.database import PyriteDB
+    from pyrite.storage.index import IndexManager
+
+    kb_path = tmpdir / "kb"
+    write_kb_files(entries, kb_path)
+    config = _config(tmpdir, kb_path)
+    db = PyriteDB(config.settings.index_path)
+    IndexManager(db, config).index_kb("bench")
+    db.close()
+    return config
+
+
+def _latency(times: list[float]) -> dict:
+    ordered = sorted(times)
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 2),
+    }
+
+
+def _tool_calls(entries: list[dict], n: int) -> list[tuple[str, dict]]:
+    """Alternating search and get calls over the corpus."""
+    queries = generate_queries(n)
+    calls = []
+    for i in range(n):
+        if i % 2:
+            calls.append(("kb_get", {"entry_id": entries[(i * 37) % len(entries)]["id"]}))
+        else:
+            calls.append(("kb_search", {"query": queries[i]["query"], "kb_name": "bench"}))
+    return calls
+
+
+# --------------- MCP ---------------
+
+
+def bench_mcp(entries: list[dict], concurrency: list[int], calls: int) -> dict:
+    """Tool calls/sec and latency with concurrent clients on one server.
+
+    Each client is a task on a shared event loop running the same body as
+    the SDK's ``_call_tool`` handler: dispatch, then compact JSON encoding.
+    """
+    from pyrite.server.mcp_server import PyriteMCPServer
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = _build_kb(Path(tmpdir), entries)
+        server = PyriteMCPServer(config=config, tier="read")
+        workload = _tool_calls(entries, calls)
+
+        async def call_tool(name: str, arguments: dict, client_id: str) -> str:
+            result = server._dispatch_tool(name, arguments, client_id=client_id)
+            return json.dumps(result, separators=(",", ":"), default=str)
+
+        async def client(client_id: str, times: list[float], errors: list[str]):
+            for name, arguments in workload:
+                start = time.perf_counter()
+                payload = await call_tool(name, arguments, client_id)
+                times.append(time.perf_counter() - start)
+                if payload.startswith('{"error"'):
+                    errors.append(payload)
+                await asyncio.sleep(0)
+
+        async def run(clients: int) -> tuple[float, list[float], list[str]]:
+            times: list[float] = []
+            errors: list[str] = []
+            start = time.perf_counter()
+            await asyncio.gather(*(client(f"bench-{i}", times, errors) for i in range(clients)))
+            return time.perf_counter() - start, times, errors
+
+        try:
+            for clients in concurrency:
+                elapsed, times, errors = asyncio.run(run(clients))
+                rows.append(
+                    {
+                        "clients": clients,
+                        "calls": len(times),
+                        "errors": len(errors),
+                        "calls_per_sec": round(len(times) / elapsed, 1),
+                        **_latency(times),
+                    }
+                )
+        finally:
+            server.close()
+    return {"entries": len(entries), "tools": ["kb_search", "kb_get"], "levels": rows}
+
+
+# --------------- REST ---------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def bench_rest(entries: list[dict], concurrency: list[int], requests_per_user: int) -> dict:
+    """Requests/sec and latency of ``/api/entries`` and ``/api/search`` per user count."""
+    import httpx
+    import uvicorn
+
+    from pyrite.server import api
+
+    queries = generate_queries(requests_per_user)
+    endpoints = {
+        "/api/entries": [
+            {"kb": "bench", "limit": 50, "offset": (i * 50) % len(entries)}
+            for i in range(requests_per_user)
+        ],
+        "/api/search": [{"q": q["query"], "kb": "bench"} for q in queries],
+    }
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = _build_kb(Path(tmpdir), entries)
+        application = api.create_app(config=config)
+        api.limiter.enabled = False
+        port = _free_port()
+        server = uvicorn.Server(
+            uvicorn.Config(application, host="127.0.0.1", port=port, log_level="warning")
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        async def user(http, path: str, params: list[dict], times, errors):
+            for p in params:
+                start = time.perf_counter()
+                response = await http.get(path, params=p)
+                times.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+        async def run(path: str, users: int):
+            times: list[float] = []
+            errors: list[int] = []
+            limits = httpx.Limits(max_connections=users)
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+            ) as http:
+                await http.get(path, params=endpoints[path][0])  # warm up
+                start = time.perf_counter()
+                await asyncio.gather(
+                    *(user(http, path, endpoints[path], times, errors) for _ in range(users))
+                )
+            return time.perf_counter() - start, times, errors
+
+        try:
+            for path in endpoints:
+                for users in concurrency:
+                    elapsed, times, errors = asyncio.run(run(path, users))
+                    rows.append(
+                        {
+                            "endpoint": path,
+                            "users": users,
+                            "requests": len(times),
+                            "errors": len(errors),
+                            "requests_per_sec": round(len(times) / elapsed, 1),
+                            **_latency(times),
+                        }
+                    )
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+            api.limiter.enabled = True
+    return {"entries": len(entries), "levels": rows}
+
+
+# --------------- Incremental sync ---------------
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def bench_sync(entries: list[dict], fraction: float = 0.01) -> dict:
+    """``sync_incremental`` after checking out a branch that edits ``fraction`` of files."""
+    from pyrite.storage.database import PyriteDB
+    from pyrite.storage.index import IndexManager
+
+    if shutil.which("git") is None:
+        return {"entries": len(entries), "skipped": "git not found"}
+
+    touched = max(1, math.ceil(len(entries) * fraction))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        kb_path = Path(tmpdir) / "kb"
+        paths = write_kb_files(entries, kb_path)
+        _git(kb_path, "init", "-q", "-b", "main")
+        _git(kb_path, "add", ".")
+        _git(kb_path, "commit", "-q", "-m", "corpus")
+        _git(kb_path, "checkout", "-q", "-b", "touched")
+        step = len(paths) // touched
+        for path in paths[::step][:touched]:
+            path.write_text(path.read_text() + "\nRevised after review.\n")
+        _git(kb_path, "commit", "-q", "-am", "touch")
+        _git(kb_path, "checkout", "-q", "main")
+
+        config = _config(Path(tmpdir), kb_path)
+        db = PyriteDB(config.settings.index_path)
+        index_mgr = IndexManager(db, config)
+        # indexed_at has one-second resolution; keep file mtimes clear of it
+        time.sleep(1.1)
+        start = time.perf_counter()
+        index_mgr.index_kb("bench")
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        noop = index_mgr.sync_incremental("bench")
+        noop_s = time.perf_counter() - start
+
+        time.sleep(1.1)
+        _git(kb_path, "checkout", "-q", "touched")
+        start = time.perf_counter()
+        changed = index_mgr.sync_incremental("bench")
+        changed_s = time.perf_counter() - start
+        db.close()
+
+    return {
+        "entries": len(entries),
+        "touched_files": touched,
+        "full_index_s": round(full_s, 3),
+        "noop_sync_s": round(noop_s, 3),
+        "noop_updated": noop["updated"],
+        "checkout_sync_s": round(changed_s, 3),
+        "checkout_updated": changed["updated"],
+    }
+
+
+# --------------- Peak RSS ---------------
+
+_RSS_SNIPPET = """
+import json, resource, sys
+from pathlib import Path
+from benchmarks.operational import _config
+from pyrite.storage.database import PyriteDB
+from pyrite.storage.index import IndexManager
+
+def rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+config = _config(Path({tmpdir!r}), Path({tmpdir!r}) / "kb")
+db = PyriteDB(config.settings.index_path)
+baseline = rss_mb()
+if {phase!r} == "index_kb":
+    count = IndexManager(db, config).index_kb("bench")
+else:
+    from pyrite.services.embedding_service import EmbeddingService
+    count = EmbeddingService(db).embed_all("bench")["embedded"]
+print(json.dumps({{"count": count, "baseline_mb": baseline, "peak_mb": rss_mb()}}))
+"""
+
+
+def bench_memory(entries: list[dict]) -> list[dict]:
+    """Peak RSS of indexing then embedding the KB, each in its own interpreter."""
+    from pyrite.services.embedding_service import is_available
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_kb_files(entries, Path(tmpdir) / "kb")
+        for phase in ("index_kb", "embed_all"):
+            if phase == "embed_all" and not is_available():
+                rows.append({"phase": phase, "skipped": "sentence-transformers not installed"})
+                continue
+            out = subprocess.run(
+                [sys.executable, "-c", _RSS_SNIPPET.format(tmpdir=tmpdir, phase=phase)],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).resolve().parents[1],
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            rows.append(
+                {
+                    "phase": phase,
+                    "entries": result["count"],
+                    "baseline_rss_mb": round(result["baseline_mb"], 1),
+                    "peak_rss_mb": round(result["peak_mb"], 1),
+                    "delta_mb": round(result["peak_mb"] - result["baseline_mb"], 1),
+                }
+            )
+    return rows
+
+
+# --------------- Main ---------------
+
+
+def run_benchmarks(size: int, concurrency: list[int], calls: int) -> dict:
+    entries = generate_entries(size)
+    results = {
+        "python": sys.version.split()[0],
+        "entries": size,
+        "concurrency": concurrency,
+    }
+    print(f"MCP tool calls ({size} entries)...")
+    results["mcp"] = bench_mcp(entries, concurrency, calls)
+    print("REST endpoints...")
+    results["rest"] = bench_rest(entries, concurrency, calls)
+    print("Incremental sync after checkout...")
+    results["sync"] = bench_sync(entries)
+    print("Peak RSS...")
+    results["memory"] = bench_memory(entries)
+    return results
+
+
+def format_markdown(results: dict) -> str:
+    lines = ["# Operational Benchmark Results\n"]
+    lines.append(f"## MCP Tool Calls ({results['mcp']['entries']} entries)\n")
+    lines.append("| Clients | Calls | Errors | Calls/sec | p50 (ms) | p95 (ms) |")
+    lines.append("|---------|-------|--------|-----------|----------|----------|")
+    for r in results["mcp"]["levels"]:
+        lines.append(
+            f"| {r['clients']} | {r['calls']} | {r['errors']} | {r['calls_per_sec']} "
+            f"| {r['p50_ms']} | {r['p95_ms']} |"
+        )
+
+    lines.append("\n## REST Endpoints\n")
+    lines.append("| Endpoint | Users | Requests | Errors | Req/sec | p50 (ms) | p95 (ms) |")
+    lines.append("|----------|-------|----------|--------|---------|----------|----------|")
+    for r in results["rest"]["levels"]:
+        lines.append(
+            f"| {r['endpoint']} | {r['users']} | {r['requests']} | {r['errors']} "
+            f"| {r['requests_per_sec']} | {r['p50_ms']} | {r['p95_ms']} |"
+        )
+
+    lines.append("\n## Incremental Sync After Checkout\n")
+    sync = results["sync"]
+    if "skipped" in sync:
+        lines.append(f"Skipped: {sync['skipped']}")
+    else:
+        lines.append(
+            "| Entries | Touched | Full index (s) | No-op sync (s) | Checkout sync (s) | Updated |"
+        )
+        lines.append(
+            "|---------|---------|----------------|----------------|-------------------|---------|"
+        )
+        lines.append(
+            f"| {sync['entries']} | {sync['touched_files']} | {sync['full_index_s']} "
+            f"| {sync['noop_sync_s']} | {sync['checkout_sync_s']} | {sync['checkout_updated']} |"
+        )
+
+    lines.append("\n## Peak RSS\n")
+    lines.append("| Phase | Entries | Baseline (MB) | Peak (MB) | Delta (MB) |")
+    lines.append("|-------|---------|---------------|-----------|------------|")
+    for r in results["memory"]:
+        if "skipped" in r:
+            lines.append(f"| {r['phase']} | - | - | - | skipped: {r['skipped']} |")
+        else:
+            lines.append(
+                f"| {r['phase']} | {r['entries']} | {r['baseline_rss_mb']} "
+                f"| {r['peak_rss_mb']} | {r['delta_mb']} |"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run operational benchmarks")
+    parser.add_argument("--size", type=int, default=2000, help="Synthetic KB size")
+    parser.add_argument(
+        "--concurrency", default="1,4,16", help="Comma-separated client/user counts"
+    )
+    parser.add_argument("--calls", type=int, default=50, help="Calls per client/user")
+    parser.add_argument("--output", default=None, help="Output JSON path")
+    args = parser.parse_args()
+
+    concurrency = [int(c) for c in args.concurrency.split(",")]
+
+    print("Operational Benchmark Suite")
+    print("=" * 40)
+    results = run_benchmarks(args.size, concurrency, args.calls)
+    print("\n" + format_markdown(results))
+
+    out_path = args.output or "benchmarks/operational.json"
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nJSON results saved to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ Measures:
 - Query latency (p50/p95 for keyword, semantic, hybrid)
 - Search quality (Recall@10, MRR, nDCG@10) using synthetic queries
 - Disk footprint
+- Frontmatter parse speed (round-trip vs fast read-only loader)
+- Claim/status-update throughput (restricted vs unconditional FTS trigger)
+- Quantized (int8/bit) vector KNN with exact rerank: disk vs. Recall@10
 
 Usage:
     python benchmarks/run_all.py [--sizes 500,1000] [--queries 50] [--repeats 20]
@@ -263,6 +266,254 @@ def bench_disk(backend_factory, entries: list[dict], label: str) -> dict:
     }
 
 
+def bench_frontmatter_parse(entries: list[dict], repeats: int) -> dict:
+    """Compare round-trip ``load_yaml`` with the read-only ``load_yaml_fast``."""
+    from pyrite.utils.yaml import dump_yaml, load_yaml, load_yaml_fast
+
+    texts = [
+        dump_yaml(
+            {
+                "id": e["id"],
+                "type": e["entry_type"],
+                "title": e["title"],
+                "date": e["date"],
+                "importance": e["importance"],
+                "tags": e["tags"],
+                "summary": e["summary"],
+            }
+        )
+        for e in entries
+    ]
+
+    def timed(loader) -> float:
+        best = float("inf")
+        for _ in range(max(1, repeats // 5)):
+            start = time.perf_counter()
+            for text in texts:
+                loader(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    round_trip = timed(load_yaml)
+    fast = timed(load_yaml_fast)
+    return {
+        "entries": len(entries),
+        "round_trip_ms": round(round_trip * 1000, 2),
+        "fast_ms": round(fast * 1000, 2),
+        "speedup": round(round_trip / fast, 1) if fast else 0,
+    }
+
+
+def bench_fts_ranking(entries: list[dict], queries: list[dict], repeats: int) -> dict:
+    """Relevance and prefix-query latency under uniform vs. weighted FTS5 configs.
+
+    Guards the default bm25 column weights against relevance regressions and
+    measures what the prefix indexes buy for ``term*`` queries.
+    """
+    from pyrite.storage.virtual_tables import FtsConfig
+
+    configs = {
+        "uniform": FtsConfig(title_weight=1.0, summary_weight=1.0, prefix=()),
+        "weighted": FtsConfig(),
+    }
+    prefixes = sorted({q["query"][:3] + "*" for q in queries})
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend, db = _make_sqlite_backend(Path(tmpdir))
+        for entry in entries:
+            backend.upsert_entry(entry)
+        for label, config in configs.items():
+            backend.configure_fts(config)
+            mrrs, ndcgs = [], []
+            for q in queries:
+                relevant = find_relevant(entries, q)
+                if not relevant:
+                    continue
+                results = backend.search(q["query"], kb_name="bench", limit=10)
+                retrieved_ids = [r["id"] for r in results]
+                mrrs.append(mrr(retrieved_ids, relevant))
+                ndcgs.append(ndcg_at_k(retrieved_ids, relevant))
+            times = []
+            for _ in range(repeats):
+                for prefix in prefixes:
+                    start = time.perf_counter()
+                    backend.search(prefix, kb_name="bench", limit=10)
+                    times.append((time.perf_counter() - start) * 1000)
+            rows.append(
+                {
+                    "config": label,
+                    "entries": len(entries),
+                    "mrr": round(statistics.mean(mrrs), 3) if mrrs else 0,
+                    "ndcg_at_10": round(statistics.mean(ndcgs), 3) if ndcgs else 0,
+                    "prefix_p50_ms": round(statistics.median(times), 3),
+                }
+            )
+        db.close()
+    return {"entries": len(entries), "configs": rows}
+
+
+def bench_status_updates(entries: list[dict], repeats: int) -> dict:
+    """Claim/status-update throughput with restricted vs. unconditional FTS triggers.
+
+    Claims and status changes only touch non-text columns; the restricted
+    ``entry_au`` trigger skips re-tokenizing the (large) body for them.
+    """
+    body = " ".join(e["body"] for e in entries[:20])
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend, db = _make_sqlite_backend(Path(tmpdir))
+        for entry in entries:
+            backend.upsert_entry({**entry, "body": body})
+        conn = db._raw_conn
+        legacy = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'entry_au'"
+        ).fetchone()[0]
+        legacy = legacy.split("BEGIN", 1)[1]
+        ids = [e["id"] for e in entries]
+        for label in ("restricted", "unconditional"):
+            if label == "unconditional":
+                conn.execute("DROP TRIGGER entry_au")
+                conn.execute(f"CREATE TRIGGER entry_au AFTER UPDATE ON entry BEGIN{legacy}")
+            start = time.perf_counter()
+            for i in range(repeats):
+                for entry_id in ids:
+                    conn.execute(
+                        "UPDATE entry SET status = ?, assignee = ? WHERE id = ? AND kb_name = ?",
+                        (f"s{i}", f"agent-{i}", entry_id, "bench"),
+                    )
+                conn.commit()
+            elapsed = time.perf_counter() - start
+            rows.append(
+                {
+                    "trigger": label,
+                    "entries": len(entries),
+                    "body_kb": round(len(body) / 1024, 1),
+                    "updates_per_sec": round(len(ids) * repeats / elapsed, 1),
+                }
+            )
+        db.close()
+    return {"entries": len(entries), "triggers": rows}
+
+
+def _simulate_quantized_knn(
+    vectors: list[list[float]], queries: list[list[float]], mode: str, k: int, candidates: int
+) -> list[list[int]]:
+    """First-pass KNN for ``candidates`` on quantized vectors, exact rerank to ``k``."""
+    import heapq
+
+    def dot(a, b):
+        return sum(x * y for x, y in zip(a, b, strict=True))
+
+    if mode == "bit":
+
+        def bits(v):
+            return sum(1 << i for i, x in enumerate(v) if x > 0)
+
+        codes = [bits(v) for v in vectors]
+
+        def coarse(q):
+            qb = bits(q)
+            return heapq.nsmallest(
+                candidates, range(len(codes)), key=lambda i: (codes[i] ^ qb).bit_count()
+            )
+    elif mode == "int8":
+        codes = [[round(x * 127) for x in v] for v in vectors]
+
+        def coarse(q):
+            qi = [round(x * 127) for x in q]
+            return heapq.nlargest(candidates, range(len(codes)), key=lambda i: dot(codes[i], qi))
+    else:
+
+        def coarse(q):
+            return range(len(vectors))
+
+    return [heapq.nlargest(k, coarse(q), key=lambda i, q=q: dot(vectors[i], q)) for q in queries]
+
+
+def bench_quantization(size: int, n_queries: int, dim: int = 384, rerank: int = 8) -> dict:
+    """Disk and Recall@10 of int8/bit first-pass KNN with exact rerank vs. float32.
+
+    Recall is measured against exact top-10 neighbours, both for the first
+    pass alone (rerank factor 1) and with ``rerank`` times as many
+    candidates reranked.  With sqlite-vec installed each mode runs through
+    SQLiteBackend in its own database and ``disk_mb`` is that file's size;
+    without it the first pass and rerank are simulated in Python and
+    ``disk_mb`` is the stored vector bytes (full precision plus quantized
+    copy).  ``scan_mb`` is what the first-pass KNN reads.
+    """
+    from benchmarks.corpus import generate_query_vectors, generate_vectors
+
+    k = 10
+    vectors = generate_vectors(size, dim)
+    queries = generate_query_vectors(vectors, n_queries)
+    exact = _simulate_quantized_knn(vectors, queries, "none", k, size)
+    ids = [f"v{i}" for i in range(size)]
+    scan_bytes = {"none": 4 * dim, "int8": dim, "bit": dim // 8}
+    stored_bytes = {"none": 4 * dim, "int8": 5 * dim, "bit": 4 * dim + dim // 8}
+
+    def recall(found: list[list[int]]) -> float:
+        return round(
+            statistics.mean(
+                recall_at_k([ids[i] for i in got], {ids[i] for i in truth}, k)
+                for got, truth in zip(found, exact, strict=True)
+            ),
+            3,
+        )
+
+    rows = []
+    for mode in ("none", "int8", "bit"):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            backend, db = _make_sqlite_backend(Path(tmpdir))
+            measured = backend.vec_available
+            times: list[float] = []
+            found: dict[int, list[list[int]]] = {}
+            if measured:
+                for entry_id, vector in zip(ids, vectors, strict=True):
+                    backend.upsert_entry(
+                        {
+                            "id": entry_id,
+                            "kb_name": "bench",
+                            "entry_type": "note",
+                            "title": entry_id,
+                        }
+                    )
+                    backend.upsert_embedding(entry_id, "bench", vector)
+                backend.set_embedding_quantization(1, mode)
+                for factor in (1, rerank):
+                    backend.quantized_rerank_factor = factor
+                    found[factor] = []
+                    for q in queries:
+                        start = time.perf_counter()
+                        results = backend.search_semantic(q, limit=k, max_distance=2.0)
+                        if factor == rerank:
+                            times.append((time.perf_counter() - start) * 1000)
+                        found[factor].append([int(r["id"][1:]) for r in results])
+                db._raw_conn.execute("VACUUM")
+                db.close()
+                disk = (Path(tmpdir) / "bench.db").stat().st_size
+            else:
+                db.close()
+                # Unfiltered searches fetch 2 * limit candidates per rerank factor
+                for factor in (1, rerank):
+                    found[factor] = _simulate_quantized_knn(
+                        vectors, queries, mode, k, 2 * k * factor
+                    )
+                disk = stored_bytes[mode] * size
+        rows.append(
+            {
+                "mode": mode,
+                "vectors": size,
+                "measured": measured,
+                "disk_mb": round(disk / (1024 * 1024), 2),
+                "scan_mb": round(scan_bytes[mode] * size / (1024 * 1024), 2),
+                "first_pass_recall_at_10": recall(found[1]),
+                "recall_at_10": recall(found[rerank]),
+                "p50_ms": round(statistics.median(times), 3) if times else None,
+            }
+        )
+    return {"vectors": size, "dimensions": dim, "rerank_factor": rerank, "modes": rows}
+
+
 # --------------- Main ---------------
 
 def run_benchmarks(sizes: list[int], n_queries: int, repeats: int, backend_filter: list[str] | None = None) -> dict:
@@ -280,10 +531,23 @@ def run_benchmarks(sizes: list[int], n_queries: int, repeats: int, backend_filte
         "latency": [],
         "quality": [],
         "disk": [],
+        "parse": [],
+        "fts": [],
+        "updates": [],
+        "quantization": [],
     }
 
     for size in sizes:
         entries = generate_entries(size)
+        print(f"  {size} entries: frontmatter parse...")
+        results["parse"].append(bench_frontmatter_parse(entries, repeats))
+        if "sqlite" in backends:
+            print(f"  [sqlite] {size} entries: FTS ranking configs...")
+            results["fts"].append(bench_fts_ranking(entries, queries, repeats))
+            print(f"  [sqlite] {size} entries: status-update throughput...")
+            results["updates"].append(bench_status_updates(entries, repeats))
+            print(f"  [sqlite] {size} vectors: quantized KNN vs. float32...")
+            results["quantization"].append(bench_quantization(size, n_queries))
         for label, factory in backends.items():
             print(f"  [{label}] {size} entries: indexing...")
             results["index"].append(bench_index(factory, entries, label))
@@ -331,6 +595,35 @@ def format_markdown(results: dict) -> str:
     for r in results["disk"]:
         lines.append(f"| {r['backend']} | {r['entries']} | {r['disk_mb']} |")
 
+    lines.append("\n## Frontmatter Parse\n")
+    lines.append("| Entries | Round-trip (ms) | Fast (ms) | Speedup |")
+    lines.append("|---------|-----------------|-----------|---------|")
+    for r in results.get("parse", []):
+        lines.append(f"| {r['entries']} | {r['round_trip_ms']} | {r['fast_ms']} | {r['speedup']}x |")
+
+    lines.append("\n## FTS Ranking (SQLite)\n")
+    lines.append("| Config | Entries | MRR | nDCG@10 | Prefix query p50 (ms) |")
+    lines.append("|--------|---------|-----|---------|-----------------------|")
+    for r in results.get("fts", []):
+        for c in r["configs"]:
+            lines.append(f"| {c['config']} | {c['entries']} | {c['mrr']} | {c['ndcg_at_10']} | {c['prefix_p50_ms']} |")
+
+    lines.append("\n## Claim/Status Updates (SQLite)\n")
+    lines.append("| FTS update trigger | Entries | Body (KB) | Updates/sec |")
+    lines.append("|--------------------|---------|-----------|-------------|")
+    for r in results.get("updates", []):
+        for t in r["triggers"]:
+            lines.append(f"| {t['trigger']} | {t['entries']} | {t['body_kb']} | {t['updates_per_sec']} |")
+
+    lines.append("\n## Vector Quantization (SQLite, exact rerank)\n")
+    lines.append("| Mode | Vectors | Disk (MB) | First-pass scan (MB) | Recall@10 (first pass) | Recall@10 (reranked) | p50 (ms) | Measured |")
+    lines.append("|------|---------|-----------|----------------------|------------------------|----------------------|----------|----------|")
+    for r in results.get("quantization", []):
+        for m in r["modes"]:
+            p50 = m["p50_ms"] if m["p50_ms"] is not None else "-"
+            measured = "yes" if m["measured"] else "simulated"
+            lines.append(f"| {m['mode']} | {m['vectors']} | {m['disk_mb']} | {m['scan_mb']} | {m['first_pass_recall_at_10']} | {m['recall_at_10']} | {p50} | {measured} |")
+
     return "\n".join(lines)
 
 
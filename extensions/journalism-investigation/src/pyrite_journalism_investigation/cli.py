@@ -586,6 +586,7 @@ def money_flow(
     hops: int = typer.Option(3, "--hops", help="Max transaction hops to follow"),
     from_date: str = typer.Option("", "--from", help="Start date (YYYY-MM-DD)"),
     to_date: str = typer.Option("", "--to", help="End date (YYYY-MM-DD)"),
+    min_amount: float | None = typer.Option(None, "--min-amount", help="Skip smaller transactions"),
     output_json: bool = typer.Option(False, "--json", help="Output as JSON"),
 ):
     """Trace money flows for an entity through transaction chains."""
@@ -600,6 +601,7 @@ def money_flow(
             max_hops=hops,
             from_date=from_date,
             to_date=to_date,
+            min_amount=min_amount,
         )
 
         if output_json:
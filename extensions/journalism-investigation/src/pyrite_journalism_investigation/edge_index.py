@@ -0,0 +1,372 @@
+"""Indexed transaction, ownership and membership edges.
+
+``investigation_edge`` holds one row per transaction, ownership or
+membership entry, keyed by the two entities it connects (sender/receiver,
+owner/asset, person/organization).  Triggers on ``entry`` keep it current
+on every upsert and delete — including index sync, which bypasses plugin
+hooks — and traversals walk it with a bounded recursive CTE that applies
+the date and amount filters in SQL, instead of loading every transaction
+or ownership entry and matching metadata in Python.
+
+The table and triggers are installed (and backfilled from existing
+entries) with the database schema through the plugin's
+``get_db_derived_tables`` definition, and dropped if the plugin is
+removed.  Databases without a plain SQLite backend (worktree overlays,
+Postgres) fall back to scanning entries through the DB API.
+"""
+
+import sqlite3
+from typing import Any
+
+from pyrite.storage.backends.sqlite_backend import SQLiteBackend
+
+from .utils import parse_amount, parse_meta, strip_wikilink
+
+EDGE_TYPES = ("transaction", "ownership", "membership")
+
+# (source field, target field) in each edge type's metadata
+EDGE_FIELDS = {
+    "transaction": ("sender", "receiver"),
+    "ownership": ("owner", "asset"),
+    "membership": ("person", "organization"),
+}
+
+# Fallback scan size when the index is unavailable
+SCAN_LIMIT = 5000
+
+_COLUMNS = (
+    "entry_id, kb_name, edge_type, source_id, target_id, title, date, amount, "
+    "amount_value, currency, kind, percentage, beneficial"
+)
+_TYPE_LIST = ", ".join(f"'{t}'" for t in EDGE_TYPES)
+
+
+def _meta_path(row: str, side: int) -> str:
+    cases = " ".join(f"WHEN '{t}' THEN '$.{f[side]}'" for t, f in EDGE_FIELDS.items())
+    return f"json_extract({row}.metadata, CASE {row}.entry_type {cases} END)"
+
+
+def _wikilink(expr: str) -> str:
+    """SQL twin of ``utils.strip_wikilink``."""
+    return f"replace(replace(trim(trim(COALESCE({expr}, '')), '[]'), '[[', ''), ']]', '')"
+
+
+def _amount(expr: str) -> str:
+    """SQL twin of ``utils.parse_amount``."""
+    text = f"trim(replace({expr}, ',', ''), ' ')"
+    digits = f"(CASE WHEN substr({text}, 1, 1) = '-' THEN substr({text}, 2) ELSE {text} END)"
+    return f"""(CASE
+        WHEN typeof({expr}) IN ('integer', 'real') THEN {expr}
+        WHEN {digits} GLOB '*[0-9]*' AND {digits} NOT GLOB '*[^0-9.]*'
+             AND {digits} NOT GLOB '*.*.*' THEN CAST({text} AS REAL)
+        ELSE 0 END)"""
+
+
+def _edge_select(row: str) -> str:
+    """SELECT list deriving an edge row from entry row ``row``."""
+
+    def meta(name: str) -> str:
+        return f"json_extract({row}.metadata, '$.{name}')"
+
+    return f"""SELECT {row}.id AS entry_id, {row}.kb_name AS kb_name,
+        {row}.entry_type AS edge_type,
+        {_wikilink(_meta_path(row, 0))} AS source_id,
+        {_wikilink(_meta_path(row, 1))} AS target_id,
+        {row}.title, COALESCE({row}.date, ''),
+        COALESCE({meta("amount")}, ''), {_amount(meta("amount"))},
+        COALESCE({meta("currency")}, ''), COALESCE({meta("transaction_type")}, ''),
+        CAST(rtrim(COALESCE({meta("percentage")}, '0'), '%') AS REAL),
+        COALESCE({meta("beneficial")}, 0)"""
+
+
+# Transactions without both parties are not flows; ownership rows with no
+# owner are kept because chain tracing reports them as terminal nodes.
+_EDGE_FILTER = "edge_type != 'transaction' OR (source_id != '' AND target_id != '')"
+
+
+def _insert_new() -> str:
+    return f"""INSERT OR REPLACE INTO investigation_edge ({_COLUMNS})
+        SELECT * FROM ({_edge_select("new")}) WHERE {_EDGE_FILTER};"""
+
+
+EDGE_SCHEMA_SQL = f"""
+DROP TRIGGER IF EXISTS investigation_edge_ai;
+DROP TRIGGER IF EXISTS investigation_edge_au;
+DROP TRIGGER IF EXISTS investigation_edge_ad;
+DROP TABLE IF EXISTS investigation_edge;
+
+CREATE TABLE investigation_edge (
+    entry_id TEXT NOT NULL,
+    kb_name TEXT NOT NULL,
+    edge_type TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    title TEXT,
+    date TEXT NOT NULL DEFAULT '',
+    amount TEXT NOT NULL DEFAULT '',
+    amount_value REAL NOT NULL DEFAULT 0,
+    currency TEXT NOT NULL DEFAULT '',
+    kind TEXT NOT NULL DEFAULT '',
+    percentage REAL NOT NULL DEFAULT 0,
+    beneficial INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (entry_id, kb_name)
+);
+CREATE INDEX idx_investigation_edge_source
+    ON investigation_edge(kb_name, edge_type, source_id, date);
+CREATE INDEX idx_investigation_edge_target
+    ON investigation_edge(kb_name, edge_type, target_id, date);
+
+CREATE TRIGGER investigation_edge_ai AFTER INSERT ON entry
+WHEN new.entry_type IN ({_TYPE_LIST}) AND json_valid(new.metadata)
+BEGIN
+    {_insert_new()}
+END;
+
+CREATE TRIGGER investigation_edge_au
+AFTER UPDATE OF id, kb_name, entry_type, title, date, metadata ON entry
+WHEN old.entry_type IN ({_TYPE_LIST}) OR new.entry_type IN ({_TYPE_LIST})
+BEGIN
+    DELETE FROM investigation_edge WHERE entry_id = old.id AND kb_name = old.kb_name;
+    INSERT OR REPLACE INTO investigation_edge ({_COLUMNS})
+        SELECT * FROM ({_edge_select("new")})
+        WHERE new.entry_type IN ({_TYPE_LIST}) AND json_valid(new.metadata)
+          AND ({_EDGE_FILTER});
+END;
+
+CREATE TRIGGER investigation_edge_ad AFTER DELETE ON entry
+WHEN old.entry_type IN ({_TYPE_LIST})
+BEGIN
+    DELETE FROM investigation_edge WHERE entry_id = old.id AND kb_name = old.kb_name;
+END;
+"""
+
+
+def edge_index(db: Any) -> sqlite3.Connection | None:
+    """Connection holding the edge index, or None to use the scanning fallback.
+
+    The index exists on every SQLite database set up with this plugin
+    installed; other backends have none.
+    """
+    if not isinstance(getattr(db, "backend", None), SQLiteBackend):
+        return None
+    return db._raw_conn
+
+
+def rebuild_edge_index(conn: sqlite3.Connection, kb_name: str | None = None) -> int:
+    """Recompute edges from entries for one KB (or all); returns rows written."""
+    where = f"e.entry_type IN ({_TYPE_LIST}) AND json_valid(e.metadata)"
+    params: tuple = ()
+    if kb_name:
+        conn.execute("DELETE FROM investigation_edge WHERE kb_name = ?", (kb_name,))
+        where += " AND e.kb_name = ?"
+        params = (kb_name,)
+    else:
+        conn.execute("DELETE FROM investigation_edge")
+    cur = conn.execute(
+        f"""INSERT OR REPLACE INTO investigation_edge ({_COLUMNS})
+            SELECT * FROM ({_edge_select("e")} FROM entry e WHERE {where})
+            WHERE {_EDGE_FILTER}""",
+        params,
+    )
+    conn.commit()
+    return cur.rowcount
+
+
+# Installed with the database schema (see ``JournalismInvestigationPlugin.get_db_derived_tables``).
+DERIVED_TABLE = {
+    "name": "investigation_edge",
+    "version": 2,
+    "schema": EDGE_SCHEMA_SQL,
+    "backfill": rebuild_edge_index,
+}
+
+
+def _filters(
+    from_date: str, to_date: str, min_amount: float | None, max_amount: float | None
+) -> tuple[str, list[Any]]:
+    clauses, params = [], []
+    if from_date:
+        clauses.append("e.date >= ?")
+        params.append(from_date)
+    if to_date:
+        clauses.append("e.date <= ?")
+        params.append(to_date)
+    if min_amount is not None:
+        clauses.append("e.amount_value >= ?")
+        params.append(min_amount)
+    if max_amount is not None:
+        clauses.append("e.amount_value <= ?")
+        params.append(max_amount)
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def reachable_edges(
+    db: Any,
+    kb_name: str,
+    edge_type: str,
+    start: str,
+    *,
+    reverse: bool = False,
+    max_hops: int = 3,
+    from_date: str = "",
+    to_date: str = "",
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+) -> list[dict[str, Any]]:
+    """Edges of ``edge_type`` within ``max_hops`` of ``start``.
+
+    Follows source → target, or target → source when ``reverse``; only
+    edges passing the date and amount filters are followed or returned.
+    The result is the bounded neighbourhood a path walk needs, ordered by
+    date, so enumerating paths never touches the rest of the KB.
+    """
+    if max_hops <= 0:
+        return []
+    conn = edge_index(db)
+    if conn is None:
+        edges = [
+            e
+            for e in _scan_edges(db, kb_name, edge_type)
+            if _matches(e, from_date, to_date, min_amount, max_amount)
+        ]
+        return sorted(edges, key=lambda e: (e["date"], e["entry_id"]))
+
+    near, far = ("target_id", "source_id") if reverse else ("source_id", "target_id")
+    filters, filter_params = _filters(from_date, to_date, min_amount, max_amount)
+    rows = conn.execute(
+        f"""
+        WITH RECURSIVE reach(node, depth) AS (
+            SELECT ?, 0
+            UNION
+            SELECT e.{far}, r.depth + 1 FROM reach r
+            JOIN investigation_edge e
+              ON e.kb_name = ? AND e.edge_type = ? AND e.{near} = r.node{filters}
+            WHERE r.depth + 1 < ?
+        )
+        SELECT e.* FROM investigation_edge e
+        WHERE e.kb_name = ? AND e.edge_type = ?{filters}
+          AND e.{near} IN (SELECT node FROM reach)
+        ORDER BY e.date, e.entry_id
+        """,
+        [start, kb_name, edge_type, *filter_params, max_hops, kb_name, edge_type, *filter_params],
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def edges_touching(
+    db: Any,
+    kb_name: str,
+    edge_type: str,
+    entity_ids: list[str],
+    *,
+    from_date: str = "",
+    to_date: str = "",
+) -> list[dict[str, Any]]:
+    """Edges of ``edge_type`` whose source or target is in ``entity_ids``."""
+    if not entity_ids:
+        return []
+    conn = edge_index(db)
+    if conn is None:
+        wanted = set(entity_ids)
+        return [
+            e
+            for e in _scan_edges(db, kb_name, edge_type)
+            if (e["source_id"] in wanted or e["target_id"] in wanted)
+            and _matches(e, from_date, to_date, None, None)
+        ]
+
+    filters, filter_params = _filters(from_date, to_date, None, None)
+    marks = ", ".join("?" * len(entity_ids))
+    rows = conn.execute(
+        f"""
+        SELECT e.* FROM investigation_edge e
+        WHERE e.kb_name = ? AND e.edge_type = ? AND e.source_id IN ({marks}){filters}
+        UNION
+        SELECT e.* FROM investigation_edge e
+        WHERE e.kb_name = ? AND e.edge_type = ? AND e.target_id IN ({marks}){filters}
+        ORDER BY date, entry_id
+        """,
+        [
+            kb_name,
+            edge_type,
+            *entity_ids,
+            *filter_params,
+            kb_name,
+            edge_type,
+            *entity_ids,
+            *filter_params,
+        ],
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def entity_titles(db: Any, kb_name: str, entity_ids: list[str]) -> dict[str, str]:
+    """Titles for the given entry IDs (missing entries are left out)."""
+    ids = [i for i in dict.fromkeys(entity_ids) if i]
+    if not ids:
+        return {}
+    if not isinstance(getattr(db, "backend", None), SQLiteBackend):
+        titles = {}
+        for eid in ids:
+            entry = db.get_entry(eid, kb_name)
+            if entry:
+                titles[eid] = entry.get("title", eid)
+        return titles
+    marks = ", ".join("?" * len(ids))
+    rows = db._raw_conn.execute(
+        f"SELECT id, title FROM entry WHERE kb_name = ? AND id IN ({marks})",
+        [kb_name, *ids],
+    ).fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+def _scan_edges(db: Any, kb_name: str, edge_type: str) -> list[dict[str, Any]]:
+    """Build edge rows from listed entries (fallback without the index)."""
+    source_field, target_field = EDGE_FIELDS[edge_type]
+    edges = []
+    for r in db.list_entries(kb_name=kb_name, entry_type=edge_type, limit=SCAN_LIMIT):
+        meta = parse_meta(r)
+        source = strip_wikilink(str(meta.get(source_field) or ""))
+        target = strip_wikilink(str(meta.get(target_field) or ""))
+        if edge_type == "transaction" and not (source and target):
+            continue
+        try:
+            percentage = float(str(meta.get("percentage") or "0").rstrip("%"))
+        except (ValueError, TypeError):
+            percentage = 0.0
+        edges.append(
+            {
+                "entry_id": r.get("id", ""),
+                "kb_name": kb_name,
+                "edge_type": edge_type,
+                "source_id": source,
+                "target_id": target,
+                "title": r.get("title", ""),
+                "date": str(r.get("date") or ""),
+                "amount": meta.get("amount", ""),
+                "amount_value": parse_amount(meta.get("amount")),
+                "currency": meta.get("currency", ""),
+                "kind": meta.get("transaction_type", ""),
+                "percentage": percentage,
+                "beneficial": meta.get("beneficial", False),
+            }
+        )
+    return edges
+
+
+def _matches(
+    edge: dict[str, Any],
+    from_date: str,
+    to_date: str,
+    min_amount: float | None,
+    max_amount: float | None,
+) -> bool:
+    if from_date and edge["date"] < from_date:
+        return False
+    if to_date and edge["date"] > to_date:
+        return False
+    if min_amount is not None and edge["amount_value"] < min_amount:
+        return False
+    if max_amount is not None and edge["amount_value"] > max_amount:
+        return False
+    return True
@@ -1,52 +1,35 @@
 """Money flow tracing and aggregation for journalism investigations.
 
 Functions for traversing transaction chains, aggregating money flows,
-and detecting circular flows between entities.
+and detecting circular flows between entities.  Transactions are read
+from the indexed edge table (see ``edge_index``), so a trace touches only
+the entity's bounded neighbourhood rather than every transaction in the KB.
 """
 
 from collections import defaultdict
 from typing import Any
 
-from .utils import parse_meta, strip_wikilink
-
-
-def _get_all_transactions(
-    db: Any, kb_name: str, *, from_date: str = "", to_date: str = ""
-) -> list[dict[str, Any]]:
-    """Load all transaction entries, optionally filtered by date range."""
-    results = db.list_entries(kb_name=kb_name, entry_type="transaction", limit=5000)
-    txns = []
-    for r in results:
-        date = str(r.get("date", ""))
-        if from_date and date < from_date:
-            continue
-        if to_date and date > to_date:
-            continue
-        meta = parse_meta(r)
-        sender_raw = meta.get("sender", "")
-        receiver_raw = meta.get("receiver", "")
-        if not sender_raw or not receiver_raw:
-            continue
-        txns.append({
-            "id": r.get("id", ""),
-            "title": r.get("title", ""),
-            "date": date,
-            "sender": strip_wikilink(sender_raw),
-            "receiver": strip_wikilink(receiver_raw),
-            "amount": meta.get("amount", ""),
-            "currency": meta.get("currency", ""),
-            "transaction_type": meta.get("transaction_type", ""),
-        })
-    return txns
+from .edge_index import edges_touching, entity_titles, reachable_edges
+
+
+def _edge_to_txn(edge: dict[str, Any]) -> dict[str, Any]:
+    """Shape an ``investigation_edge`` row as a transaction dict."""
+    return {
+        "id": edge["entry_id"],
+        "title": edge["title"],
+        "date": edge["date"],
+        "sender": edge["source_id"],
+        "receiver": edge["target_id"],
+        "amount": edge["amount"],
+        "currency": edge["currency"],
+        "transaction_type": edge["kind"],
+    }
 
 
 def _get_entity_info(db: Any, kb_name: str, entity_id: str) -> dict[str, str]:
     """Get basic info for an entity. Returns id and title."""
-    entries = db.list_entries(kb_name=kb_name, limit=5000)
-    for e in entries:
-        if e.get("id") == entity_id:
-            return {"id": entity_id, "title": e.get("title", entity_id)}
-    return {"id": entity_id, "title": entity_id}
+    titles = entity_titles(db, kb_name, [entity_id])
+    return {"id": entity_id, "title": titles.get(entity_id, entity_id)}
 
 
 def _build_txn_step(txn: dict[str, Any]) -> dict[str, Any]:
@@ -91,9 +74,14 @@ def trace_money_flow(
     max_hops: int = 3,
     from_date: str = "",
     to_date: str = "",
+    min_amount: float | None = None,
+    max_amount: float | None = None,
 ) -> dict[str, Any]:
     """Trace money flows starting from an entity.
 
+    Only the transactions within ``max_hops`` of the entity that pass the
+    date and amount filters are read, via the indexed edge table.
+
     Args:
         db: Database instance.
         kb_name: Knowledge base name.
@@ -102,17 +90,34 @@ def trace_money_flow(
         max_hops: Maximum number of hops to follow.
         from_date: Start date filter (YYYY-MM-DD).
         to_date: End date filter (YYYY-MM-DD).
+        min_amount: Skip transactions below this amount.
+        max_amount: Skip transactions above this amount.
 
     Returns:
         Dict with entity info, flows, circular_flows, and summary.
     """
     entity_info = _get_entity_info(db, kb_name, entity_id)
-    txns = _get_all_transactions(db, kb_name, from_date=from_date, to_date=to_date)
+    filters = {
+        "max_hops": max_hops,
+        "from_date": from_date,
+        "to_date": to_date,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+    }
+    txns: dict[str, dict[str, Any]] = {}
+    if direction in ("outbound", "both"):
+        for edge in reachable_edges(db, kb_name, "transaction", entity_id, **filters):
+            txns[edge["entry_id"]] = _edge_to_txn(edge)
+    if direction in ("inbound", "both"):
+        for edge in reachable_edges(
+            db, kb_name, "transaction", entity_id, reverse=True, **filters
+        ):
+            txns[edge["entry_id"]] = _edge_to_txn(edge)
 
     # Index transactions by sender and receiver
     by_sender: dict[str, list[dict]] = defaultdict(list)
     by_receiver: dict[str, list[dict]] = defaultdict(list)
-    for t in txns:
+    for t in txns.values():
         by_sender[t["sender"]].append(t)
         by_receiver[t["receiver"]].append(t)
 
@@ -128,7 +133,7 @@ def trace_money_flow(
                 "total_amount": _compute_total(path),
             }
             # Check if circular: does the last receiver == origin entity?
-            last_txn = txns_by_id.get(path[-1]["id"])
+            last_txn = txns.get(path[-1]["id"])
             if last_txn and last_txn["receiver"] == entity_id:
                 circular_flows.append(flow)
             else:
@@ -152,7 +157,7 @@ def trace_money_flow(
                 "path": list(path),
                 "total_amount": _compute_total(path),
             }
-            last_txn = txns_by_id.get(path[-1]["id"])
+            last_txn = txns.get(path[-1]["id"])
             if last_txn and last_txn["sender"] == entity_id:
                 circular_flows.append(flow)
             else:
@@ -169,9 +174,6 @@ def trace_money_flow(
             new_visited = visited_txns | {t["id"]}
             _trace_inbound(t["sender"], new_path, new_visited)
 
-    # Build ID lookup
-    txns_by_id = {t["id"]: t for t in txns}
-
     if direction in ("outbound", "both"):
         _trace_outbound(entity_id, [], set())
 
@@ -214,7 +216,12 @@ def aggregate_flows(
         Dict with entity info, inflows, outflows, net_flow, and period.
     """
     entity_info = _get_entity_info(db, kb_name, entity_id)
-    txns = _get_all_transactions(db, kb_name, from_date=from_date, to_date=to_date)
+    txns = [
+        _edge_to_txn(edge)
+        for edge in edges_touching(
+            db, kb_name, "transaction", [entity_id], from_date=from_date, to_date=to_date
+        )
+    ]
 
     # Aggregate outflows (entity is sender)
     outflow_totals: dict[str, float] = defaultdict(float)
@@ -240,12 +247,13 @@ def aggregate_flows(
             inflow_counts[counterparty] += 1
             inflow_totals[counterparty] += amt
 
+    titles = entity_titles(db, kb_name, [*outflow_totals, *inflow_totals])
+
     def _build_flow_list(totals, counts):
         items = []
         for cp_id in sorted(totals.keys()):
-            cp_info = _get_entity_info(db, kb_name, cp_id)
             items.append({
-                "counterparty": cp_info,
+                "counterparty": {"id": cp_id, "title": titles.get(cp_id, cp_id)},
                 "total": str(totals[cp_id]),
                 "count": counts[cp_id],
             })
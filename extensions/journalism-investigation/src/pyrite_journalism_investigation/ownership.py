@@ -2,68 +2,50 @@
 
 Traces ownership chains through intermediaries to find beneficial owners,
 computing effective ownership percentages and detecting shell companies.
+Ownership and membership edges come from the indexed edge table (see
+``edge_index``), bounded to ``max_depth`` hops from the traced entity.
 """
 
+from collections import defaultdict
 from typing import Any
 
-from .utils import parse_meta, strip_wikilink
-
-
-def _find_owners(all_ownership: list[dict[str, Any]], asset_id: str) -> list[dict[str, Any]]:
-    """Find all ownership entries where the given entity is the asset."""
-    results = []
-    for entry in all_ownership:
-        meta = parse_meta(entry)
-        asset_ref = meta.get("asset", "")
-        if strip_wikilink(asset_ref) == asset_id:
-            pct_str = meta.get("percentage", "0")
-            # Handle "51%" or "51" formats
-            pct_str = pct_str.rstrip("%")
-            try:
-                pct = float(pct_str)
-            except (ValueError, TypeError):
-                pct = 0.0
-            results.append({
-                "owner_id": strip_wikilink(meta.get("owner", "")),
-                "percentage": pct,
-                "beneficial": bool(meta.get("beneficial", False)),
-                "entry": entry,
-            })
-    return results
-
-
-def _is_shell_company(
-    entity_id: str,
-    all_ownership: list[dict[str, Any]],
-    all_membership: list[dict[str, Any]],
-) -> bool:
+from .edge_index import edges_touching, entity_titles, reachable_edges
+
+
+def _find_owners(owners_by_asset: dict[str, list[dict]], asset_id: str) -> list[dict[str, Any]]:
+    """Find all ownership edges where the given entity is the asset."""
+    return [
+        {
+            "owner_id": edge["source_id"],
+            "percentage": edge["percentage"],
+            "beneficial": bool(edge["beneficial"]),
+            "entry": edge,
+        }
+        for edge in owners_by_asset.get(asset_id, [])
+    ]
+
+
+def _shell_companies(db: Any, kb_name: str, entity_ids: set[str]) -> set[str]:
     """Heuristic: entity is owner AND asset in ownership entries, but has no membership entries."""
-    is_owner = False
-    is_asset = False
-    for entry in all_ownership:
-        meta = parse_meta(entry)
-        if strip_wikilink(meta.get("owner", "")) == entity_id:
-            is_owner = True
-        if strip_wikilink(meta.get("asset", "")) == entity_id:
-            is_asset = True
-        if is_owner and is_asset:
-            break
-
-    if not (is_owner and is_asset):
-        return False
-
-    # Check if any membership entry references this entity as the organization
-    for entry in all_membership:
-        meta = parse_meta(entry)
-        org_ref = meta.get("organization", "")
-        if strip_wikilink(org_ref) == entity_id:
-            return False
-
-    return True
+    owners: set[str] = set()
+    assets: set[str] = set()
+    for edge in edges_touching(db, kb_name, "ownership", sorted(entity_ids)):
+        owners.add(edge["source_id"])
+        assets.add(edge["target_id"])
+    candidates = entity_ids & owners & assets
+    if not candidates:
+        return set()
+
+    # Any membership entry naming the entity as the organization clears it
+    staffed = {
+        edge["target_id"]
+        for edge in edges_touching(db, kb_name, "membership", sorted(candidates))
+    }
+    return candidates - staffed
 
 
 def _trace_chains(
-    all_ownership: list[dict[str, Any]],
+    owners_by_asset: dict[str, list[dict]],
     entity_id: str,
     max_depth: int,
     visited: set[str] | None = None,
@@ -80,7 +62,7 @@ def _trace_chains(
     if visited is None:
         visited = set()
 
-    owners = _find_owners(all_ownership, entity_id)
+    owners = _find_owners(owners_by_asset, entity_id)
     if not owners:
         return []
 
@@ -107,7 +89,7 @@ def _trace_chains(
         # Try to go further up the chain
         new_visited = visited | {entity_id}
         sub_chains = _trace_chains(
-            all_ownership, owner_id, max_depth, new_visited, current_depth + 1
+            owners_by_asset, owner_id, max_depth, new_visited, current_depth + 1
         )
 
         if sub_chains:
@@ -129,11 +111,7 @@ def _enrich_titles(db, kb_name: str, chains: list[list[dict[str, Any]]]) -> None
             all_ids.add(node["id"])
 
     # Fetch titles
-    title_map: dict[str, str] = {}
-    for eid in all_ids:
-        entry = db.get_entry(eid, kb_name)
-        if entry:
-            title_map[eid] = entry.get("title", eid)
+    title_map = entity_titles(db, kb_name, sorted(all_ids))
 
     # Update nodes
     for chain in chains:
@@ -163,11 +141,14 @@ def trace_ownership_chain(
         "title": entity_entry.get("title", entity_id) if entity_entry else entity_id,
     }
 
-    # Load all ownership entries for this KB
-    all_ownership = db.list_entries(kb_name=kb_name, entry_type="ownership", limit=5000)
+    # Load the ownership edges within max_depth of the entity, keyed by asset
+    owners_by_asset: dict[str, list[dict]] = defaultdict(list)
+    for edge in reachable_edges(db, kb_name, "ownership", entity_id, reverse=True,
+                                max_hops=max_depth):
+        owners_by_asset[edge["target_id"]].append(edge)
 
     # Trace chains
-    raw_chains = _trace_chains(all_ownership, entity_id, max_depth)
+    raw_chains = _trace_chains(owners_by_asset, entity_id, max_depth)
 
     # Enrich titles
     _enrich_titles(db, kb_name, raw_chains)
@@ -197,8 +178,6 @@ def trace_ownership_chain(
     beneficial_owners = list(beneficial_owners_map.values())
 
     # Shell company detection
-    all_membership = db.list_entries(kb_name=kb_name, entry_type="membership", limit=5000)
-
     shell_indicators = []
     # Check intermediaries (all non-terminal nodes in any chain)
     intermediary_ids: set[str] = set()
@@ -206,13 +185,13 @@ def trace_ownership_chain(
         for node in chain["path"][:-1]:  # All except terminal
             intermediary_ids.add(node["id"])
 
-    for mid in intermediary_ids:
-        if _is_shell_company(mid, all_ownership, all_membership):
-            entry = db.get_entry(mid, kb_name)
-            shell_indicators.append({
-                "id": mid,
-                "title": entry.get("title", mid) if entry else mid,
-            })
+    shells = _shell_companies(db, kb_name, intermediary_ids)
+    titles = entity_titles(db, kb_name, sorted(shells))
+    for mid in sorted(shells):
+        shell_indicators.append({
+            "id": mid,
+            "title": titles.get(mid, mid),
+        })
 
     return {
         "entity": entity_info,
@@ -163,6 +163,11 @@ class JournalismInvestigationPlugin:
             },
         }
 
+    def get_db_derived_tables(self) -> list[dict]:
+        from .edge_index import DERIVED_TABLE
+
+        return [DERIVED_TABLE]
+
     def get_validators(self) -> list:
         return [validate_investigation_entry]
 
@@ -269,6 +274,7 @@ class JournalismInvestigationPlugin:
                         "max_hops": {"type": "integer", "description": "Max transaction hops to follow (default 3)"},
                         "from_date": {"type": "string", "description": "Start date filter (YYYY-MM-DD)"},
                         "to_date": {"type": "string", "description": "End date filter (YYYY-MM-DD)"},
+                        "min_amount": {"type": "number", "description": "Skip transactions below this amount"},
                         "kb_name": {"type": "string", "description": "KB name (auto-detected if omitted)"},
                     },
                     "required": ["entry_id"],
@@ -659,6 +665,7 @@ class JournalismInvestigationPlugin:
                 max_hops=args.get("max_hops", 3),
                 from_date=args.get("from_date", ""),
                 to_date=args.get("to_date", ""),
+                min_amount=args.get("min_amount"),
             )
         finally:
             if should_close:
@@ -1,8 +1,11 @@
 """Shared utilities for journalism-investigation plugin."""
 
 import json
+import re
 from typing import Any
 
+_AMOUNT_RE = re.compile(r"-?(\d+\.?\d*|\.\d+)")
+
 
 def parse_meta(entry_dict: dict[str, Any]) -> dict[str, Any]:
     """Parse metadata from a DB entry dict, handling JSON strings."""
@@ -18,3 +21,15 @@ def parse_meta(entry_dict: dict[str, Any]) -> dict[str, Any]:
 def strip_wikilink(ref: str) -> str:
     """Extract entry ID from a wikilink reference like [[some-id]]."""
     return ref.strip().strip("[]").replace("[[", "").replace("]]", "")
+
+
+def parse_amount(value: Any) -> float:
+    """Numeric value of a metadata amount such as ``1,250.50``; 0 when not a number.
+
+    Thousands separators are dropped; anything else non-numeric (currency
+    symbols, units, ranges) makes the amount 0.
+    """
+    if isinstance(value, int | float):
+        return float(value)
+    text = str(value or "").replace(",", "").strip(" ")
+    return float(text) if _AMOUNT_RE.fullmatch(text) else 0.0
@@ -0,0 +1,170 @@
+"""Tests for the indexed transaction/ownership edge table."""
+
+import pytest
+from pyrite_journalism_investigation.edge_index import (
+    edge_index,
+    edges_touching,
+    reachable_edges,
+    rebuild_edge_index,
+)
+from pyrite_journalism_investigation.money_flow import trace_money_flow
+from pyrite_journalism_investigation.ownership import trace_ownership_chain
+
+from pyrite.storage.database import PyriteDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = PyriteDB(tmp_path / "index.db")
+    db.register_kb("test", "journalism-investigation", str(tmp_path / "kb"))
+    yield db
+    db.close()
+
+
+def _txn(db, txn_id, sender, receiver, amount="1000", date="2024-01-15"):
+    db.upsert_entry(
+        {
+            "id": txn_id,
+            "kb_name": "test",
+            "title": f"{sender} to {receiver}",
+            "entry_type": "transaction",
+            "date": date,
+            "metadata": {
+                "sender": f"[[{sender}]]",
+                "receiver": f"[[{receiver}]]",
+                "amount": amount,
+            },
+        }
+    )
+
+
+def _own(db, own_id, owner, asset, pct="100"):
+    db.upsert_entry(
+        {
+            "id": own_id,
+            "kb_name": "test",
+            "title": f"{owner} owns {asset}",
+            "entry_type": "ownership",
+            "metadata": {"owner": f"[[{owner}]]", "asset": f"[[{asset}]]", "percentage": pct},
+        }
+    )
+
+
+def _ids(edges):
+    return [e["entry_id"] for e in edges]
+
+
+class _ScanOnlyDB:
+    """DB without a SQLite backend: forces the scanning fallback."""
+
+    backend = None
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+class TestEdgeMaintenance:
+    def test_installed_with_schema_and_removed_with_plugin(self, db):
+        def edge_objects():
+            rows = db._raw_conn.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'investigation_edge%'"
+            )
+            return {r[0] for r in rows}
+
+        assert {"investigation_edge", "investigation_edge_au"} <= edge_objects()
+        db._sync_derived_tables([])
+        assert edge_objects() == set()
+
+    def test_triggers_then_rebuild(self, db):
+        _txn(db, "t1", "a", "b")
+        assert edge_index(db) is not None
+        assert _ids(reachable_edges(db, "test", "transaction", "a")) == ["t1"]
+
+        _txn(db, "t2", "b", "c", date="2024-02-01")
+        _txn(db, "t1", "a", "z")
+        edges = reachable_edges(db, "test", "transaction", "a")
+        assert [(e["entry_id"], e["target_id"]) for e in edges] == [("t1", "z")]
+
+        db.delete_entry("t2", "test")
+        assert edges_touching(db, "test", "transaction", ["b", "c"]) == []
+
+        db._raw_conn.execute("DELETE FROM investigation_edge")
+        assert rebuild_edge_index(db._raw_conn, "test") == 1
+
+    def test_invalid_metadata_and_missing_party_skipped(self, db):
+        _txn(db, "t1", "a", "")
+        db._raw_conn.execute("UPDATE entry SET metadata = 'not json' WHERE id = 't1'")
+        db._raw_conn.commit()
+        assert edges_touching(db, "test", "transaction", ["a"]) == []
+
+    def test_amounts_parse_alike_in_sql_and_fallback(self, db):
+        amounts = {
+            "1,000": 1000.0,
+            "1,250.50": 1250.5,
+            " -5 ": -5.0,
+            ".5": 0.5,
+            "$500": 0.0,
+            "12abc": 0.0,
+            "1.2.3": 0.0,
+            "": 0.0,
+            250: 250.0,
+        }
+        for i, amount in enumerate(amounts):
+            _txn(db, f"t{i}", "a", f"r{i}", amount=amount)
+
+        def values(source):
+            edges = edges_touching(source, "test", "transaction", ["a"])
+            return {e["entry_id"]: e["amount_value"] for e in edges}
+
+        expected = {f"t{i}": value for i, value in enumerate(amounts.values())}
+        assert values(db) == expected
+        assert values(_ScanOnlyDB(db)) == expected
+
+
+class TestBoundedTraversal:
+    def test_hops_and_filters_applied_in_sql(self, db):
+        _txn(db, "t1", "a", "b", amount="500", date="2024-01-01")
+        _txn(db, "t2", "b", "c", amount="50", date="2024-02-01")
+        _txn(db, "t3", "c", "d", amount="500", date="2024-03-01")
+        _txn(db, "t4", "x", "y", amount="500", date="2024-01-01")
+
+        assert _ids(reachable_edges(db, "test", "transaction", "a", max_hops=2)) == ["t1", "t2"]
+        assert _ids(reachable_edges(db, "test", "transaction", "a", max_hops=5)) == [
+            "t1",
+            "t2",
+            "t3",
+        ]
+        # Filtered edges are neither returned nor followed
+        assert _ids(
+            reachable_edges(db, "test", "transaction", "a", max_hops=5, min_amount=100)
+        ) == ["t1"]
+        assert _ids(
+            reachable_edges(
+                db, "test", "transaction", "d", reverse=True, max_hops=5, from_date="2024-01-15"
+            )
+        ) == ["t2", "t3"]
+
+    def test_trace_min_amount(self, db):
+        _txn(db, "t1", "a", "b", amount="500")
+        _txn(db, "t2", "a", "c", amount="5")
+        result = trace_money_flow(db, "test", "a", direction="outbound", min_amount=100)
+        assert [f["path"][0]["id"] for f in result["flows"]] == ["t1"]
+
+    def test_fallback_matches_index(self, db):
+        _txn(db, "t1", "a", "b", date="2024-01-01")
+        _txn(db, "t2", "b", "a", date="2024-02-01")
+        _own(db, "o1", "holdco", "target", "60%")
+        _own(db, "o2", "person", "holdco", "50")
+        indexed = trace_money_flow(db, "test", "a", max_hops=2)
+        scanned = trace_money_flow(_ScanOnlyDB(db), "test", "a", max_hops=2)
+        assert indexed["flows"] == scanned["flows"]
+        assert indexed["circular_flows"] == scanned["circular_flows"]
+
+        indexed = trace_ownership_chain(db, "test", "target")
+        scanned = trace_ownership_chain(_ScanOnlyDB(db), "test", "target")
+        assert indexed == scanned
+        assert indexed["chains"][0]["effective_percentage"] == pytest.approx(30.0)
+        assert [s["id"] for s in indexed["shell_indicators"]] == ["holdco"]
@@ -598,6 +598,11 @@ class SoftwareKBPlugin:
     def get_db_tables(self) -> list[dict]:
         return []
 
+    def get_db_derived_tables(self) -> list[dict]:
+        from .queue import DERIVED_TABLE
+
+        return [DERIVED_TABLE]
+
     def get_workflows(self) -> dict[str, dict]:
         return {
             "adr_lifecycle": ADR_LIFECYCLE,
@@ -987,49 +992,29 @@ class SoftwareKBPlugin:
 
     def _mcp_epics(self, args: dict[str, Any]) -> dict[str, Any]:
         """List epics with subtask progress rollup."""
-        import json
+        from .queue import query_queue
 
         db, should_close = self._get_db()
         kb_name = args.get("kb_name")
         status_filter = args.get("status")
 
         try:
-            query = "SELECT * FROM entry WHERE entry_type = 'backlog_item'"
-            params: list = []
-            if kb_name:
-                query += " AND kb_name = ?"
-                params.append(kb_name)
-            query += " ORDER BY created_at DESC"
-
-            rows = db._raw_conn.execute(query, params).fetchall()
+            rows = query_queue(
+                db, kb_name, status=status_filter, kind="epic", order_by="created_at DESC"
+            )
             epics = []
             for row in rows:
-                meta = {}
-                if row["metadata"]:
-                    try:
-                        meta = json.loads(row["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                kind = meta.get("kind", "")
-                if kind != "epic":
-                    continue
-                status = row["status"] or meta.get("status", "proposed")
-                if status_filter and status != status_filter:
-                    continue
-
-                progress = self._get_epic_progress(
-                    db, row["id"], row["kb_name"]
-                )
+                total, done = row["subtask_total"], row["subtask_done"]
                 epics.append(
                     {
-                        "id": row["id"],
+                        "id": row["entry_id"],
                         "title": row["title"],
-                        "status": status,
-                        "priority": row["priority"] or meta.get("priority", "medium"),
-                        "total": progress["total"],
-                        "done": progress["done"],
-                        "in_progress": progress["in_progress"],
-                        "completion_pct": progress["completion_pct"],
+                        "status": row["status"],
+                        "priority": row["priority"],
+                        "total": total,
+                        "done": done,
+                        "in_progress": row["subtask_in_progress"],
+                        "completion_pct": round(done / total * 100) if total > 0 else 0,
                         "kb_name": row["kb_name"],
                     }
                 )
@@ -1233,10 +1218,9 @@ class SoftwareKBPlugin:
             board_config = {"lanes": [], "wip_policy": "warn"}
             try:
                 if self.ctx is not None:
-                    from pyrite.config import load_config
+                    from pyrite.config import config_snapshot
 
-                    config = load_config()
-                    kb_conf = config.get_kb(kb_name)
+                    kb_conf = config_snapshot().get_kb(kb_name)
                     if kb_conf:
                         board_config = load_board_config(kb_conf.path)
                     else:
@@ -1387,10 +1371,10 @@ class SoftwareKBPlugin:
 
     def _mcp_board(self, args: dict[str, Any]) -> dict[str, Any]:
         """View kanban board."""
-        import json
         from pathlib import Path
 
         from .board import load_board_config
+        from .queue import query_queue
 
         db, should_close = self._get_db()
         kb_name = args.get("kb_name")
@@ -1398,25 +1382,15 @@ class SoftwareKBPlugin:
         try:
             # Load board config
             if self.ctx is not None and kb_name:
-                from pyrite.config import load_config
+                from pyrite.config import config_snapshot
 
-                config = load_config()
-                kb_conf = config.get_kb(kb_name)
+                kb_conf = config_snapshot().get_kb(kb_name)
                 board_config = (
                     load_board_config(kb_conf.path) if kb_conf else load_board_config(Path("."))
                 )
             else:
                 board_config = load_board_config(Path("."))
 
-            # Query all backlog items
-            query = "SELECT * FROM entry WHERE entry_type = 'backlog_item'"
-            params: list = []
-            if kb_name:
-                query += " AND kb_name = ?"
-                params.append(kb_name)
-
-            rows = db._raw_conn.execute(query, params).fetchall()
-
             # Build status→lane mapping
             status_to_lane: dict[str, int] = {}
             for i, lane in enumerate(board_config["lanes"]):
@@ -1425,23 +1399,16 @@ class SoftwareKBPlugin:
 
             # Group items into lanes
             lane_items: dict[int, list] = {i: [] for i in range(len(board_config["lanes"]))}
-            for row in rows:
-                meta = {}
-                if row["metadata"]:
-                    try:
-                        meta = json.loads(row["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                status = row["status"] or meta.get("status", "proposed")
-                lane_idx = status_to_lane.get(status)
+            for row in query_queue(db, kb_name):
+                lane_idx = status_to_lane.get(row["status"])
                 if lane_idx is not None:
                     lane_items[lane_idx].append(
                         {
-                            "id": row["id"],
+                            "id": row["entry_id"],
                             "title": row["title"],
-                            "status": status,
-                            "priority": row["priority"] or meta.get("priority", "medium"),
-                            "kind": meta.get("kind", ""),
+                            "status": row["status"],
+                            "priority": row["priority"],
+                            "kind": row["kind"],
                         }
                     )
 
@@ -1526,65 +1493,44 @@ class SoftwareKBPlugin:
 
     def _mcp_review_queue(self, args: dict[str, Any]) -> dict[str, Any]:
         """View items in review status, sorted by wait time."""
-        import json
         from pathlib import Path
 
         from .board import load_board_config
+        from .queue import query_queue
 
         db, should_close = self._get_db()
         kb_name = args.get("kb_name")
 
         try:
-            query = "SELECT * FROM entry WHERE entry_type = 'backlog_item'"
-            params: list = []
-            if kb_name:
-                query += " AND kb_name = ?"
-                params.append(kb_name)
-            query += " ORDER BY updated_at ASC"
-
-            rows = db._raw_conn.execute(query, params).fetchall()
-            items = []
-            for row in rows:
-                meta = {}
-                if row["metadata"]:
-                    try:
-                        meta = json.loads(row["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                status = row["status"] or meta.get("status", "proposed")
-                if status != "review":
-                    continue
-
-                # Count prior changes_requested reviews for rework count
-                rework_count = 0
-                try:
-                    prior_reviews = db.get_reviews(row["id"], kb_name or row["kb_name"])
-                    rework_count = sum(
-                        1 for r in prior_reviews if r["result"] == "changes_requested"
-                    )
-                except Exception:
-                    pass
-
-                items.append(
-                    {
-                        "id": row["id"],
-                        "title": row["title"],
-                        "kind": meta.get("kind", ""),
-                        "priority": row["priority"] or meta.get("priority", "medium"),
-                        "assignee": row["assignee"] or meta.get("assignee", ""),
-                        "updated_at": row["updated_at"] or "",
-                        "rework_count": rework_count,
-                    }
-                )
+            # Count prior changes_requested reviews for rework count
+            rework = """(
+                SELECT COUNT(*) FROM review r
+                WHERE r.entry_id = q.entry_id AND r.kb_name = q.kb_name
+                  AND r.result = 'changes_requested'
+            ) AS rework_count"""
+            rows = query_queue(
+                db, kb_name, status="review", order_by="updated_at", extra_columns=rework
+            )
+            items = [
+                {
+                    "id": row["entry_id"],
+                    "title": row["title"],
+                    "kind": row["kind"],
+                    "priority": row["priority"],
+                    "assignee": row["assignee"],
+                    "updated_at": row["updated_at"] or "",
+                    "rework_count": row["rework_count"],
+                }
+                for row in rows
+            ]
 
             # Load board config for review lane WIP limit
             wip_limit = None
             try:
                 if self.ctx is not None and kb_name:
-                    from pyrite.config import load_config
+                    from pyrite.config import config_snapshot
 
-                    config = load_config()
-                    kb_conf = config.get_kb(kb_name)
+                    kb_conf = config_snapshot().get_kb(kb_name)
                     board_config = (
                         load_board_config(kb_conf.path) if kb_conf else load_board_config(Path("."))
                     )
@@ -1618,66 +1564,21 @@ class SoftwareKBPlugin:
 
         Returns dict with blocked_by, blocks, and is_blocked.
         """
-        import json
+        from .queue import dependency_rows
 
         blocked_by: list[dict[str, Any]] = []
         blocks: list[dict[str, Any]] = []
 
-        # Outlinks with relation "blocked_by" → this item is blocked by those targets
-        for link in db.get_outlinks(item_id, kb_name):
-            if link.get("relation") != "blocked_by":
-                continue
-            dep_entry = db.get_entry(link["id"], link.get("kb_name", kb_name))
-            if dep_entry:
-                meta = {}
-                if dep_entry.get("metadata"):
-                    try:
-                        meta = (
-                            json.loads(dep_entry["metadata"])
-                            if isinstance(dep_entry["metadata"], str)
-                            else dep_entry["metadata"]
-                        )
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                dep_status = dep_entry.get("status") or meta.get("status", "proposed")
-            else:
-                dep_status = "unknown"
-            blocked_by.append(
-                {
-                    "id": link["id"],
-                    "title": link.get("title", ""),
-                    "status": dep_status,
-                    "resolved": dep_status in self._RESOLVED_STATUSES,
-                }
-            )
-
+        # Outlinks with relation "blocked_by" → this item is blocked by those targets.
         # Backlinks with relation "blocked_by" → the source item is blocked by *this* item,
         # meaning this item blocks that source.
-        for link in db.get_backlinks(item_id, kb_name):
-            if link.get("relation") != "blocked_by":
-                continue
-            dep_entry = db.get_entry(link["id"], link.get("kb_name", kb_name))
-            if dep_entry:
-                meta = {}
-                if dep_entry.get("metadata"):
-                    try:
-                        meta = (
-                            json.loads(dep_entry["metadata"])
-                            if isinstance(dep_entry["metadata"], str)
-                            else dep_entry["metadata"]
-                        )
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                dep_status = dep_entry.get("status") or meta.get("status", "proposed")
+        for row in dependency_rows(db, item_id, kb_name):
+            dep = {"id": row["id"], "title": row["title"], "status": row["status"]}
+            if row["direction"] == "blocked_by":
+                dep["resolved"] = row["status"] in self._RESOLVED_STATUSES
+                blocked_by.append(dep)
             else:
-                dep_status = "unknown"
-            blocks.append(
-                {
-                    "id": link["id"],
-                    "title": link.get("title", ""),
-                    "status": dep_status,
-                }
-            )
+                blocks.append(dep)
 
         return {
             "blocked_by": blocked_by,
@@ -1691,80 +1592,17 @@ class SoftwareKBPlugin:
         Returns dict with subtasks list, total, done, in_progress, completion_pct,
         and by_status grouping.
         """
-        import json
+        from .queue import subtask_rows
 
+        # Subtasks come from has_subtask outlinks and from items that link to
+        # this epic via subtask_of; an item found both ways is listed once.
         subtasks: list[dict[str, Any]] = []
-
-        for link in db.get_outlinks(epic_id, kb_name):
-            if link.get("relation") != "has_subtask":
-                continue
-            target_id = link.get("id", "")
-            target_kb = link.get("kb_name", kb_name)
-            dep_entry = db.get_entry(target_id, target_kb)
-            if not dep_entry:
+        seen: set[str] = set()
+        for row in subtask_rows(db, epic_id, kb_name):
+            if row["id"] in seen:
                 continue
-            if dep_entry.get("entry_type") != "backlog_item":
-                continue
-            meta = {}
-            if dep_entry.get("metadata"):
-                try:
-                    meta = (
-                        json.loads(dep_entry["metadata"])
-                        if isinstance(dep_entry["metadata"], str)
-                        else dep_entry["metadata"]
-                    )
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            status = dep_entry.get("status") or meta.get("status", "proposed")
-            subtasks.append(
-                {
-                    "id": target_id,
-                    "title": dep_entry.get("title", ""),
-                    "status": status,
-                    "priority": meta.get("priority", "medium"),
-                    "kind": meta.get("kind", ""),
-                    "effort": meta.get("effort", ""),
-                    "rank": meta.get("rank", 0),
-                }
-            )
-
-        # Also check backlinks: items that link to this epic via subtask_of
-        # get_backlinks returns the inverse_relation, so we look for "has_subtask"
-        for link in db.get_backlinks(epic_id, kb_name):
-            if link.get("relation") != "has_subtask":
-                continue
-            target_id = link.get("id", "")
-            # Skip if already found via outlinks
-            if any(s["id"] == target_id for s in subtasks):
-                continue
-            target_kb = link.get("kb_name", kb_name)
-            dep_entry = db.get_entry(target_id, target_kb)
-            if not dep_entry:
-                continue
-            if dep_entry.get("entry_type") != "backlog_item":
-                continue
-            meta = {}
-            if dep_entry.get("metadata"):
-                try:
-                    meta = (
-                        json.loads(dep_entry["metadata"])
-                        if isinstance(dep_entry["metadata"], str)
-                        else dep_entry["metadata"]
-                    )
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            status = dep_entry.get("status") or meta.get("status", "proposed")
-            subtasks.append(
-                {
-                    "id": target_id,
-                    "title": dep_entry.get("title", ""),
-                    "status": status,
-                    "priority": meta.get("priority", "medium"),
-                    "kind": meta.get("kind", ""),
-                    "effort": meta.get("effort", ""),
-                    "rank": meta.get("rank", 0),
-                }
-            )
+            seen.add(row["id"])
+            subtasks.append(row)
 
         total = len(subtasks)
         done = sum(1 for s in subtasks if s["status"] in self._RESOLVED_STATUSES)
@@ -1902,10 +1740,9 @@ class SoftwareKBPlugin:
         from .board import load_board_config
 
         try:
-            from pyrite.config import load_config as _load_config
+            from pyrite.config import config_snapshot
 
-            cfg = _load_config()
-            kb_conf = cfg.get_kb(kb_name) if kb_name else None
+            kb_conf = config_snapshot().get_kb(kb_name) if kb_name else None
             if kb_conf:
                 return load_board_config(kb_conf.path)
             return load_board_config(Path("."))
@@ -2141,10 +1978,10 @@ class SoftwareKBPlugin:
 
     def _mcp_pull_next(self, args: dict[str, Any]) -> dict[str, Any]:
         """Recommend next work item based on priority and WIP limits."""
-        import json
         from pathlib import Path
 
         from .board import load_board_config
+        from .queue import count_queue, query_queue, split_ids, unresolved_blockers_sql
 
         db, should_close = self._get_db()
         kb_name = args.get("kb_name")
@@ -2153,10 +1990,9 @@ class SoftwareKBPlugin:
             # Load board config for WIP limits
             try:
                 if self.ctx is not None and kb_name:
-                    from pyrite.config import load_config
+                    from pyrite.config import config_snapshot
 
-                    config = load_config()
-                    kb_conf = config.get_kb(kb_name)
+                    kb_conf = config_snapshot().get_kb(kb_name)
                     board_config = (
                         load_board_config(kb_conf.path) if kb_conf else load_board_config(Path("."))
                     )
@@ -2166,13 +2002,7 @@ class SoftwareKBPlugin:
                 board_config = {"lanes": [], "wip_policy": "warn"}
 
             # Count in_progress items and find WIP limit
-            ip_query = "SELECT COUNT(*) as cnt FROM entry WHERE entry_type = 'backlog_item'"
-            ip_params: list = []
-            if kb_name:
-                ip_query += " AND kb_name = ?"
-                ip_params.append(kb_name)
-            ip_query += " AND status = 'in_progress'"
-            ip_count = db._raw_conn.execute(ip_query, ip_params).fetchone()["cnt"]
+            ip_count = count_queue(db, kb_name, status="in_progress")
 
             wip_limit = None
             wip_policy = board_config.get("wip_policy", "warn")
@@ -2195,51 +2025,11 @@ class SoftwareKBPlugin:
                     "wip_status": wip_status,
                 }
 
-            # Query accepted items, rank by priority then created_at
-            query = "SELECT * FROM entry WHERE entry_type = 'backlog_item'"
-            params: list = []
-            if kb_name:
-                query += " AND kb_name = ?"
-                params.append(kb_name)
-            query += " ORDER BY created_at ASC"
-
-            rows = db._raw_conn.execute(query, params).fetchall()
-
-            priority_rank = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-            candidates = []
-            for row in rows:
-                meta = {}
-                if row["metadata"]:
-                    try:
-                        meta = json.loads(row["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                status = row["status"] or meta.get("status", "proposed")
-                if status != "accepted":
-                    continue
-                priority = row["priority"] or meta.get("priority", "medium")
-                item_rank = int(meta.get("rank", 0))
-                candidates.append(
-                    {
-                        "id": row["id"],
-                        "title": row["title"],
-                        "kind": meta.get("kind", ""),
-                        "priority": priority,
-                        "effort": meta.get("effort", ""),
-                        "rank": item_rank,
-                        "_rank": priority_rank.get(priority, 2),
-                        "_created": row["created_at"] or "",
-                    }
-                )
-
-            # Sort by priority band, then ranked before unranked, then rank, then created_at
-            candidates.sort(
-                key=lambda c: (
-                    c["_rank"],
-                    0 if c["rank"] else 1,
-                    c["rank"],
-                    c["_created"],
-                )
+            # Accepted items by priority band, then ranked before unranked, then
+            # rank, then created_at; blocker IDs are only looked up for items
+            # whose precomputed open_blockers count is non-zero.
+            candidates = query_queue(
+                db, kb_name, status="accepted", extra_columns=unresolved_blockers_sql()
             )
 
             if not candidates:
@@ -2253,13 +2043,12 @@ class SoftwareKBPlugin:
             blocked_items = []
             top = None
             for candidate in candidates:
-                dep = self._get_dependency_status(db, candidate["id"], kb_name or "")
-                if dep["is_blocked"]:
+                if candidate["open_blockers"]:
                     blocked_items.append(
                         {
-                            "id": candidate["id"],
+                            "id": candidate["entry_id"],
                             "title": candidate["title"],
-                            "blocked_by": [d["id"] for d in dep["blocked_by"] if not d["resolved"]],
+                            "blocked_by": split_ids(candidate["blocker_ids"]),
                         }
                     )
                 elif top is None:
@@ -2274,7 +2063,7 @@ class SoftwareKBPlugin:
                 }
 
             # Get context preview counts
-            outlinks = db.get_outlinks(top["id"], kb_name or "")
+            outlinks = db.get_outlinks(top["entry_id"], kb_name or "")
             adr_count = sum(1 for l in outlinks if l.get("entry_type") == "adr")
             component_count = sum(1 for l in outlinks if l.get("entry_type") == "component")
             validation_count = sum(
@@ -2283,7 +2072,7 @@ class SoftwareKBPlugin:
 
             result = {
                 "recommendation": {
-                    "id": top["id"],
+                    "id": top["entry_id"],
                     "title": top["title"],
                     "kind": top["kind"],
                     "priority": top["priority"],
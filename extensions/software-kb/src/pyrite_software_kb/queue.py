@@ -0,0 +1,340 @@
+"""Backlog work-queue index for the flow tools.
+
+``sw_backlog_queue`` holds one row per backlog item with the fields the flow
+tools filter and sort on (status, priority rank, rank, created_at) decoded
+from the entry's columns and metadata, plus precomputed counts of unresolved
+``blocked_by`` dependencies and of the item's subtasks by status.
+
+SQLite triggers on ``entry`` and ``link`` keep the table current on every
+write path (index sync, KBService, direct SQL), so ``pull_next``, ``board``,
+``epics`` and ``review_queue`` are each answered with one indexed query
+instead of decoding every backlog row's metadata in Python.  Entry updates
+only fire the trigger when a backlog item's queue columns change.
+
+The table and triggers are installed (and backfilled) with the database
+schema through the plugin's ``get_db_derived_tables`` definition, and
+dropped again if the plugin is removed; bumping ``_VERSION`` rebuilds them.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+_VERSION = 2
+_TABLE = "sw_backlog_queue"
+
+RESOLVED_STATUSES = ("done", "retired", "wont_do")
+PRIORITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Unranked items sort after ranked ones within a priority band.
+_UNRANKED = 2**31 - 1
+
+
+def _meta(alias: str, key: str) -> str:
+    return (
+        f"CASE WHEN json_valid({alias}.metadata) THEN json_extract({alias}.metadata, '$.{key}') END"
+    )
+
+
+def _status(alias: str) -> str:
+    return f"COALESCE(NULLIF({alias}.status, ''), {_meta(alias, 'status')}, 'proposed')"
+
+
+def _priority(alias: str) -> str:
+    return f"COALESCE(NULLIF({alias}.priority, ''), {_meta(alias, 'priority')}, 'medium')"
+
+
+_RESOLVED_SQL = ", ".join(f"'{s}'" for s in RESOLVED_STATUSES)
+_PRIORITY_RANK_SQL = (
+    "CASE "
+    + " ".join(f"WHEN {_priority('e')} = '{p}' THEN {r}" for p, r in PRIORITY_RANK.items())
+    + " ELSE 2 END"
+)
+_RANK_SQL = f"COALESCE(CAST({_meta('e', 'rank')} AS INTEGER), 0)"
+
+_CREATE_TABLE = f"""
+DROP TABLE IF EXISTS {_TABLE};
+CREATE TABLE {_TABLE} (
+    entry_id TEXT NOT NULL,
+    kb_name TEXT NOT NULL,
+    title TEXT,
+    kind TEXT,
+    status TEXT,
+    priority TEXT,
+    priority_rank INTEGER,
+    rank INTEGER,
+    rank_key INTEGER,
+    effort TEXT,
+    assignee TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    open_blockers INTEGER NOT NULL DEFAULT 0,
+    subtask_total INTEGER NOT NULL DEFAULT 0,
+    subtask_done INTEGER NOT NULL DEFAULT 0,
+    subtask_in_progress INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (entry_id, kb_name)
+);
+CREATE INDEX idx_{_TABLE}_order
+    ON {_TABLE} (kb_name, status, priority_rank, rank_key, created_at);
+CREATE INDEX idx_{_TABLE}_kind ON {_TABLE} (kb_name, kind);
+"""
+
+# Copy decoded fields for the backlog items selected by ``{where}`` (alias e).
+_FILL = f"""
+INSERT OR REPLACE INTO {_TABLE} (
+    entry_id, kb_name, title, kind, status, priority, priority_rank, rank, rank_key,
+    effort, assignee, created_at, updated_at
+)
+SELECT e.id, e.kb_name, e.title,
+       COALESCE({_meta("e", "kind")}, ''),
+       {_status("e")},
+       {_priority("e")},
+       {_PRIORITY_RANK_SQL},
+       {_RANK_SQL},
+       CASE WHEN {_RANK_SQL} = 0 THEN {_UNRANKED} ELSE {_RANK_SQL} END,
+       COALESCE({_meta("e", "effort")}, ''),
+       COALESCE(NULLIF(e.assignee, ''), {_meta("e", "assignee")}, ''),
+       e.created_at, e.updated_at
+FROM entry e
+WHERE e.entry_type = 'backlog_item' AND {{where}};
+"""
+
+_SUBTASKS = f"""
+    SELECT target_id, target_kb FROM link
+    WHERE source_id = {_TABLE}.entry_id AND source_kb = {_TABLE}.kb_name
+      AND relation = 'has_subtask'
+    UNION
+    SELECT source_id, source_kb FROM link
+    WHERE target_id = {_TABLE}.entry_id AND target_kb = {_TABLE}.kb_name
+      AND inverse_relation = 'has_subtask'
+"""
+
+
+def _subtask_count(condition: str) -> str:
+    return f"""(
+        SELECT COUNT(*) FROM entry s
+        WHERE s.entry_type = 'backlog_item' AND (s.id, s.kb_name) IN ({_SUBTASKS})
+          AND {condition}
+    )"""
+
+
+# Recompute the dependency counts of the queue rows selected by ``{where}``.
+_REFRESH = f"""
+UPDATE {_TABLE} SET
+    open_blockers = (
+        SELECT COUNT(*) FROM link l
+        LEFT JOIN entry d ON d.id = l.target_id AND d.kb_name = l.target_kb
+        WHERE l.source_id = {_TABLE}.entry_id AND l.source_kb = {_TABLE}.kb_name
+          AND l.relation = 'blocked_by'
+          AND (d.id IS NULL OR {_status("d")} NOT IN ({_RESOLVED_SQL}))
+    ),
+    subtask_total = {_subtask_count("1")},
+    subtask_done = {_subtask_count(f"{_status('s')} IN ({_RESOLVED_SQL})")},
+    subtask_in_progress = {_subtask_count(f"{_status('s')} = 'in_progress'")}
+WHERE {{where}};
+"""
+
+
+def _key_in(row: str) -> str:
+    return f"(entry_id = {row}.id AND kb_name = {row}.kb_name)"
+
+
+def _dependents_of(row: str) -> str:
+    """Queue rows whose counts depend on entry ``row``: blocked items and parent epics."""
+    return f"""(entry_id, kb_name) IN (
+        SELECT source_id, source_kb FROM link
+        WHERE target_id = {row}.id AND target_kb = {row}.kb_name
+          AND relation IN ('blocked_by', 'has_subtask')
+        UNION
+        SELECT target_id, target_kb FROM link
+        WHERE source_id = {row}.id AND source_kb = {row}.kb_name
+          AND inverse_relation = 'has_subtask'
+    )"""
+
+
+def _link_ends(row: str) -> str:
+    return (
+        f"((entry_id = {row}.source_id AND kb_name = {row}.source_kb) "
+        f"OR (entry_id = {row}.target_id AND kb_name = {row}.target_kb))"
+    )
+
+
+_LINK_WHEN = (
+    "{row}.relation IN ('blocked_by', 'has_subtask') OR {row}.inverse_relation = 'has_subtask'"
+)
+
+_UPDATED_ROWS = f"{_key_in('new')} OR {_dependents_of('new')} OR {_dependents_of('old')}"
+
+# Entry columns the queue is derived from
+_QUEUE_COLUMNS = (
+    "id, kb_name, entry_type, title, status, priority, assignee, metadata, created_at, updated_at"
+)
+
+_TRIGGERS = {
+    "entry_ai": f"""
+        AFTER INSERT ON entry BEGIN
+            {_FILL.format(where="e.id = new.id AND e.kb_name = new.kb_name")}
+            {_REFRESH.format(where=f"{_key_in('new')} OR {_dependents_of('new')}")}
+        END""",
+    "entry_au": f"""
+        AFTER UPDATE OF {_QUEUE_COLUMNS} ON entry
+        WHEN new.entry_type = 'backlog_item' OR old.entry_type = 'backlog_item' BEGIN
+            DELETE FROM {_TABLE} WHERE {_key_in("old")};
+            {_FILL.format(where="e.id = new.id AND e.kb_name = new.kb_name")}
+            {_REFRESH.format(where=_UPDATED_ROWS)}
+        END""",
+    "entry_ad": f"""
+        AFTER DELETE ON entry BEGIN
+            DELETE FROM {_TABLE} WHERE {_key_in("old")};
+            {_REFRESH.format(where=_dependents_of("old"))}
+        END""",
+    "link_ai": f"""
+        AFTER INSERT ON link WHEN {_LINK_WHEN.format(row="new")} BEGIN
+            {_REFRESH.format(where=_link_ends("new"))}
+        END""",
+    "link_ad": f"""
+        AFTER DELETE ON link WHEN {_LINK_WHEN.format(row="old")} BEGIN
+            {_REFRESH.format(where=_link_ends("old"))}
+        END""",
+}
+
+
+def _rebuild(conn: sqlite3.Connection, kb_name: str | None = None) -> int:
+    if kb_name:
+        conn.execute(f"DELETE FROM {_TABLE} WHERE kb_name = ?", (kb_name,))
+        conn.execute(_FILL.format(where="e.kb_name = :kb"), {"kb": kb_name})
+        conn.execute(_REFRESH.format(where="kb_name = :kb"), {"kb": kb_name})
+        count = conn.execute(f"SELECT COUNT(*) FROM {_TABLE} WHERE kb_name = ?", (kb_name,))
+    else:
+        conn.execute(f"DELETE FROM {_TABLE}")
+        conn.execute(_FILL.format(where="1"))
+        conn.execute(_REFRESH.format(where="1"))
+        count = conn.execute(f"SELECT COUNT(*) FROM {_TABLE}")
+    return count.fetchone()[0]
+
+
+# Version 1 created the table and triggers lazily, outside the install records.
+_LEGACY_DROPS = "".join(f"DROP TRIGGER IF EXISTS sw_queue_v1_{suffix};\n" for suffix in _TRIGGERS)
+
+# Installed with the database schema (see ``SoftwareKBPlugin.get_db_derived_tables``).
+DERIVED_TABLE = {
+    "name": _TABLE,
+    "version": _VERSION,
+    "schema": _LEGACY_DROPS
+    + _CREATE_TABLE
+    + "".join(
+        f"CREATE TRIGGER sw_queue_v{_VERSION}_{suffix} {body};\n"
+        for suffix, body in _TRIGGERS.items()
+    ),
+    "backfill": _rebuild,
+}
+
+
+def rebuild_queue(db, kb_name: str | None = None) -> int:
+    """Repopulate the queue from ``entry`` and ``link``; returns the row count."""
+    conn = db._raw_conn
+    count = _rebuild(conn, kb_name)
+    conn.commit()
+    return count
+
+
+def query_queue(
+    db,
+    kb_name: str | None = None,
+    *,
+    status: str | None = None,
+    kind: str | None = None,
+    order_by: str = "priority_rank, rank_key, created_at",
+    extra_columns: str = "",
+) -> list[dict[str, Any]]:
+    """Select queue rows, optionally filtered by KB, status and kind."""
+    clauses, params = [], []
+    if kb_name:
+        clauses.append("q.kb_name = ?")
+        params.append(kb_name)
+    if status:
+        clauses.append("q.status = ?")
+        params.append(status)
+    if kind is not None:
+        clauses.append("q.kind = ?")
+        params.append(kind)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    columns = f"q.*{', ' + extra_columns if extra_columns else ''}"
+    rows = db._raw_conn.execute(
+        f"SELECT {columns} FROM {_TABLE} q {where} ORDER BY {order_by}", params
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def count_queue(db, kb_name: str | None = None, *, status: str | None = None) -> int:
+    """Count queue rows, optionally filtered by KB and status."""
+    sql = f"SELECT COUNT(*) FROM {_TABLE} WHERE (:kb IS NULL OR kb_name = :kb)"
+    if status:
+        sql += " AND status = :status"
+    row = db._raw_conn.execute(sql, {"kb": kb_name or None, "status": status}).fetchone()
+    return row[0]
+
+
+def unresolved_blockers_sql() -> str:
+    """Correlated subquery listing a queue row's unresolved blocker IDs (alias q)."""
+    return f"""CASE WHEN q.open_blockers > 0 THEN (
+        SELECT group_concat(l.target_id, char(31)) FROM link l
+        LEFT JOIN entry d ON d.id = l.target_id AND d.kb_name = l.target_kb
+        WHERE l.source_id = q.entry_id AND l.source_kb = q.kb_name
+          AND l.relation = 'blocked_by'
+          AND (d.id IS NULL OR {_status("d")} NOT IN ({_RESOLVED_SQL}))
+    ) END AS blocker_ids"""
+
+
+def split_ids(value: str | None) -> list[str]:
+    return value.split("\x1f") if value else []
+
+
+def dependency_rows(db, item_id: str, kb_name: str) -> list[dict[str, Any]]:
+    """``blocked_by`` links of an item in both directions with each end's status.
+
+    ``direction`` is ``"blocked_by"`` for the item's own blockers (status
+    ``"unknown"`` when the blocker entry is missing) and ``"blocks"`` for
+    items that name it as a blocker.
+    """
+    rows = db._raw_conn.execute(
+        f"""
+        SELECT 'blocked_by' AS direction, l.target_id AS id, d.title,
+               CASE WHEN d.id IS NULL THEN 'unknown' ELSE {_status("d")} END AS status
+        FROM link l
+        LEFT JOIN entry d ON d.id = l.target_id AND d.kb_name = l.target_kb
+        WHERE l.source_id = :id AND l.source_kb = :kb AND l.relation = 'blocked_by'
+        UNION ALL
+        SELECT 'blocks', d.id, d.title, {_status("d")}
+        FROM link l
+        JOIN entry d ON d.id = l.source_id AND d.kb_name = l.source_kb
+        WHERE l.target_id = :id AND l.target_kb = :kb AND l.inverse_relation = 'blocked_by'
+        """,
+        {"id": item_id, "kb": kb_name},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def subtask_rows(db, epic_id: str, kb_name: str) -> list[dict[str, Any]]:
+    """Backlog items linked to an epic by ``has_subtask`` in either direction."""
+    rows = db._raw_conn.execute(
+        f"""
+        SELECT s.id, s.title, {_status("s")} AS status,
+               COALESCE({_meta("s", "priority")}, 'medium') AS priority,
+               COALESCE({_meta("s", "kind")}, '') AS kind,
+               COALESCE({_meta("s", "effort")}, '') AS effort,
+               COALESCE({_meta("s", "rank")}, 0) AS rank
+        FROM (
+            SELECT target_id AS id, target_kb AS kb FROM link
+            WHERE source_id = :id AND source_kb = :kb AND relation = 'has_subtask'
+            UNION ALL
+            SELECT source_id, source_kb FROM link
+            WHERE target_id = :id AND target_kb = :kb AND inverse_relation = 'has_subtask'
+        ) sub
+        JOIN entry s ON s.id = sub.id AND s.kb_name = sub.kb
+        WHERE s.entry_type = 'backlog_item'
+        """,
+        {"id": epic_id, "kb": kb_name},
+    ).fetchall()
+    return [dict(row) for row in rows]
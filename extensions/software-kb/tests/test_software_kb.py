@@ -4042,3 +4042,149 @@ class TestOrphanBacklogItemChecker:
         }
         result = check_orphan_backlog_item(entry, None)
         assert result is None
+
+
+# =========================================================================
+# TestBacklogQueue
+# =========================================================================
+
+
+class TestBacklogQueue:
+    """The sw_backlog_queue index stays current as entries and links change."""
+
+    def _queue(self, db):
+        from pyrite_software_kb.queue import query_queue
+
+        return {row["entry_id"]: row for row in query_queue(db, "test")}
+
+    def test_backfill_decodes_metadata(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = _make_test_db(
+                tmpdir,
+                entries=[
+                    {"id": "a", "meta": {"kind": "bug", "status": "accepted", "rank": 3}},
+                    {"id": "b", "status": "review", "priority": "low"},
+                    {"id": "note", "entry_type": "note", "status": "accepted"},
+                ],
+            )
+            try:
+                queue = self._queue(db)
+                assert set(queue) == {"a", "b"}
+                assert (queue["a"]["status"], queue["a"]["kind"], queue["a"]["rank"]) == (
+                    "accepted",
+                    "bug",
+                    3,
+                )
+                assert (queue["b"]["priority"], queue["b"]["priority_rank"]) == ("low", 3)
+            finally:
+                db.close()
+
+    def test_triggers_track_entry_and_link_writes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = _make_test_db(
+                tmpdir,
+                entries=[
+                    {"id": "epic", "status": "accepted", "meta": {"kind": "epic"}},
+                    {"id": "a", "status": "accepted"},
+                ],
+            )
+            try:
+                conn = db._raw_conn
+                conn.execute(
+                    "INSERT INTO entry (id, kb_name, entry_type, title, status) "
+                    "VALUES ('b', 'test', 'backlog_item', 'B', 'in_progress')"
+                )
+                conn.executemany(
+                    "INSERT INTO link (source_id, source_kb, target_id, target_kb, relation, "
+                    "inverse_relation) VALUES (?, 'test', ?, 'test', ?, ?)",
+                    [
+                        ("a", "b", "blocked_by", "blocks"),
+                        ("epic", "a", "has_subtask", "subtask_of"),
+                        ("b", "epic", "subtask_of", "has_subtask"),
+                    ],
+                )
+                queue = self._queue(db)
+                assert queue["a"]["open_blockers"] == 1
+                assert (queue["epic"]["subtask_total"], queue["epic"]["subtask_in_progress"]) == (
+                    2,
+                    1,
+                )
+
+                conn.execute("UPDATE entry SET status = 'done' WHERE id = 'b'")
+                queue = self._queue(db)
+                assert queue["a"]["open_blockers"] == 0
+                assert queue["epic"]["subtask_done"] == 1
+
+                conn.execute("DELETE FROM entry WHERE id = 'b'")
+                queue = self._queue(db)
+                assert "b" not in queue
+                # A missing blocker counts as unresolved
+                assert queue["a"]["open_blockers"] == 1
+                assert queue["epic"]["subtask_total"] == 1
+            finally:
+                db.close()
+
+    def test_installed_with_schema_and_removed_with_plugin(self):
+        def queue_objects(db):
+            rows = db._raw_conn.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'sw_queue_%' "
+                "OR name = 'sw_backlog_queue'"
+            )
+            return {r[0] for r in rows}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = _make_test_db(tmpdir)
+            try:
+                assert "sw_backlog_queue" in queue_objects(db)
+                update_sql = db._raw_conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE name = 'sw_queue_v2_entry_au'"
+                ).fetchone()[0]
+                assert "AFTER UPDATE OF" in update_sql
+                assert "old.entry_type = 'backlog_item'" in update_sql
+
+                db._sync_derived_tables([])
+                assert queue_objects(db) == set()
+            finally:
+                db.close()
+
+    def test_rebuild_matches_incremental(self):
+        from pyrite_software_kb.queue import rebuild_queue
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = _make_test_db(
+                tmpdir,
+                entries=[
+                    {"id": "a", "status": "accepted", "meta": {"rank": 2}},
+                    {"id": "b", "status": "proposed"},
+                ],
+                links=[{"source": "a", "target": "b", "relation": "blocked_by"}],
+            )
+            try:
+                before = self._queue(db)
+                assert rebuild_queue(db, "test") == 2
+                assert self._queue(db) == before
+            finally:
+                db.close()
+
+    def test_pull_next_lists_unresolved_blockers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = _make_test_db(
+                tmpdir,
+                entries=[
+                    {"id": "a", "status": "accepted", "priority": "critical"},
+                    {"id": "b", "status": "in_progress"},
+                    {"id": "c", "status": "done"},
+                    {"id": "d", "status": "accepted", "priority": "low"},
+                ],
+                links=[
+                    {"source": "a", "target": "b", "relation": "blocked_by"},
+                    {"source": "a", "target": "c", "relation": "blocked_by"},
+                ],
+            )
+            try:
+                result = _make_plugin_with_db(db)._mcp_pull_next({"kb_name": "test"})
+                assert result["recommendation"]["id"] == "d"
+                assert result["blocked_items"] == [{"id": "a", "title": "a", "blocked_by": ["b"]}]
+                assert result["wip_status"]["current"] == 1
+            finally:
+                db.close()
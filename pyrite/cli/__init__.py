@@ -27,32 +27,92 @@ from ..config import (
     save_config,
 )
 from ..exceptions import PyriteError
-from ..services.kb_service import KBService
-from ..storage.database import PyriteDB
-from .browse_commands import register_browse_commands
-from .collection_commands import collections_app
-from .context import cli_context
-from .db_commands import db_app
-from .entry_commands import register_entry_commands
-from .export_commands import export_app
-from .extension_commands import extension_app
-from .index_commands import index_app
 from .init_command import init_kb
-from .kb_commands import kb_app
-from .link_commands import links_app
-from .protocol_commands import protocol_app
-from .qa_commands import qa_app
-from .repo_commands import repo_collab_app
-from .schema_commands import schema_app
-from .search_commands import register_search_command
-from .task_commands import task_app
+from .lazy import lazy_group, registered_commands, typer_app
 
 logger = logging.getLogger(__name__)
 
+
+def _load_repo_app() -> dict:
+    """Collaboration repo commands plus the legacy local add/remove commands."""
+    from .repo_commands import repo_collab_app
+
+    if not any(c.name == "add" for c in repo_collab_app.registered_commands):
+        repo_collab_app.command("add")(repo_add)
+        repo_collab_app.command("remove")(repo_remove)
+    group = typer.main.get_group(repo_collab_app)
+    group.name = "repo"
+    return {"repo": group}
+
+
+def _load_plugin_commands() -> dict:
+    """CLI commands contributed by plugins."""
+    host = typer.Typer()
+    try:
+        from ..plugins import get_registry
+
+        for name, command in get_registry().get_all_cli_commands():
+            if hasattr(command, "registered_commands"):
+                # It's a Typer app — register as sub-app
+                host.add_typer(command, name=name)
+            else:
+                # It's a single command callback
+                host.command(name)(command)
+    except Exception:
+        logger.warning("Plugin CLI loading failed", exc_info=True)
+    if not host.registered_commands and not host.registered_groups:
+        return {}
+    return dict(typer.main.get_group(host).commands)
+
+
+_search = registered_commands(f"{__name__}.search_commands:register_search_command")
+_entry = registered_commands(f"{__name__}.entry_commands:register_entry_commands")
+_browse = registered_commands(f"{__name__}.browse_commands:register_browse_commands")
+
+# Sub-apps and command modules are imported only when one of their commands
+# is invoked, so a `pyrite search` does not pay for every other command.
+_LAZY_COMMANDS = {
+    "kb": typer_app(f"{__name__}.kb_commands:kb_app", "kb"),
+    "index": typer_app(f"{__name__}.index_commands:index_app", "index"),
+    "collections": typer_app(f"{__name__}.collection_commands:collections_app", "collections"),
+    "qa": typer_app(f"{__name__}.qa_commands:qa_app", "qa"),
+    "db": typer_app(f"{__name__}.db_commands:db_app", "db"),
+    "links": typer_app(f"{__name__}.link_commands:links_app", "links"),
+    "export": typer_app(f"{__name__}.export_commands:export_app", "export"),
+    # Repository management — collaboration app with subscribe/fork/sync/unsubscribe/status/list
+    # Plus legacy add/remove commands added below
+    "repo": _load_repo_app,
+    # Extension management
+    "extension": typer_app(f"{__name__}.extension_commands:extension_app", "extension"),
+    "schema": typer_app(f"{__name__}.schema_commands:schema_app", "schema"),
+    "protocol": typer_app(f"{__name__}.protocol_commands:protocol_app", "protocol"),
+    # Task management (core, not plugin)
+    "task": typer_app(f"{__name__}.task_commands:task_app", "task"),
+    # Search command
+    "search": _search,
+    # Entry CRUD commands (get, create, add, update, delete, link)
+    **dict.fromkeys(["get", "create", "add", "update", "delete", "link"], _entry),
+    # Browse/discovery commands (list-entries, batch-read, orient, recent, timeline, tags, backlinks)
+    **dict.fromkeys(
+        [
+            "list-entries",
+            "batch-read",
+            "orient",
+            "recent",
+            "timeline",
+            "tags",
+            "backlinks",
+        ],
+        _browse,
+    ),
+}
+
 app = typer.Typer(
     name="pyrite",
     help="Multi-KB research infrastructure for citizen journalists and AI agents",
     no_args_is_help=True,
+    # Plugin CLI commands are registered on first lookup as well
+    cls=lazy_group(_LAZY_COMMANDS, extra=_load_plugin_commands),
 )
 console = Console()
 
@@ -62,64 +122,22 @@ def _get_svc():
 
     Deprecated: use cli_context() directly in new code.
     """
+    from ..services.kb_service import KBService
+    from ..storage.database import PyriteDB
+
     config = load_config()
     db = PyriteDB(config.settings.index_path)
     return KBService(config, db), db
 
 
-# Register sub-apps
-app.add_typer(kb_app, name="kb")
-app.add_typer(index_app, name="index")
-app.add_typer(collections_app, name="collections")
-app.add_typer(qa_app, name="qa")
-app.add_typer(db_app, name="db")
-app.add_typer(links_app, name="links")
-app.add_typer(export_app, name="export")
-
-# Repository management — collaboration app with subscribe/fork/sync/unsubscribe/status/list
-# Plus legacy add/remove commands added below
-app.add_typer(repo_collab_app, name="repo")
-
-# Extension management
-app.add_typer(extension_app, name="extension")
-app.add_typer(schema_app, name="schema")
-app.add_typer(protocol_app, name="protocol")
-
 # Init command (headless KB init)
 app.command("init")(init_kb)
 
+
 # Authentication commands
 auth_app = typer.Typer(help="Authentication (GitHub OAuth)")
 app.add_typer(auth_app, name="auth")
 
-# Register search command
-register_search_command(app)
-
-# Entry CRUD commands (get, create, add, update, delete, link)
-register_entry_commands(app)
-
-# Browse/discovery commands (list-entries, batch-read, orient, recent, timeline, tags, backlinks)
-register_browse_commands(app)
-
-# Task management (core, not plugin)
-app.add_typer(task_app, name="task")
-
-# Register plugin CLI commands
-try:
-    from ..plugins import get_registry
-
-    for name, command in get_registry().get_all_cli_commands():
-        if hasattr(command, "registered_commands"):
-            # It's a Typer app — register as sub-app
-            app.add_typer(command, name=name)
-        else:
-            # It's a single command callback
-            app.command(name)(command)
-except Exception:
-    import logging
-
-    logging.getLogger(__name__).warning("Plugin CLI loading failed", exc_info=True)
-
 
 def _format_output(data: dict, fmt: str) -> str | None:
     from .output import format_output
@@ -171,6 +189,8 @@ def ci_command(
             typer.echo("pyrite ci — no KBs configured, nothing to validate.")
         raise typer.Exit(0)
 
+    from ..storage.database import PyriteDB
+
     db = PyriteDB(config.settings.index_path)
     try:
         # Set up LLM service for tier >= 2
@@ -311,6 +331,8 @@ def list_kbs(
     ),
 ):
     """List all knowledge bases."""
+    from .context import cli_context
+
     with cli_context() as (config, db, svc):
         kbs = svc.list_kbs()
 
@@ -418,7 +440,6 @@ def serve(
 # =============================================================================
 
 
-@repo_collab_app.command("add")
 def repo_add(
     path: Path = typer.Argument(..., help="Path to the repository"),
     name: str | None = typer.Option(None, "--name", "-n", help="Name for the repo"),
@@ -462,7 +483,6 @@ def repo_add(
     console.print(f"[green]Added repository:[/green] {repo_name}")
 
 
-@repo_collab_app.command("remove")
 def repo_remove(
     name: str = typer.Argument(..., help="Name of the repository"),
     force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation"),
@@ -529,6 +549,8 @@ def auth_whoami(
     ),
 ):
     """Show current user identity."""
+    from .context import cli_context
+
     with cli_context() as (config, db, svc):
         from ..services.user_service import UserService
 
@@ -757,6 +779,8 @@ def import_entries(
         console.print("\n[dim]No entries were created (--dry-run).[/dim]")
         return
 
+    from .context import cli_context
+
     with cli_context() as (config, db, svc):
         try:
             results = svc.bulk_create_entries(kb_name, parsed)
@@ -792,6 +816,8 @@ def generate_readme_cmd(
     write: bool = typer.Option(False, "--write", "-w", help="Write to KB's README.md"),
 ):
     """Generate a README.md for a knowledge base."""
+    from .context import cli_context
+
     with cli_context() as (config, db, svc):
         try:
             readme = svc.generate_readme(kb_name)
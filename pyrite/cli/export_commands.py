@@ -128,7 +128,7 @@ def export_collection(
                     folder = kb_config.path / collection.folder_path
                     if folder.exists():
                         from ..models.core_types import entry_from_frontmatter
-                        from ..utils.yaml import load_yaml
+                        from ..utils.yaml import load_yaml_fast
 
                         for md_file in sorted(folder.rglob("*.md")):
                             if md_file.name.startswith("__"):
@@ -139,7 +139,7 @@ def export_collection(
                                 text = md_file.read_text(encoding="utf-8")
                                 parts = re.split(r"^---\s*$", text, flags=re.MULTILINE, maxsplit=2)
                                 if len(parts) >= 3:
-                                    meta = load_yaml(parts[1])
+                                    meta = load_yaml_fast(parts[1])
                                     body = parts[2].strip()
                                     entry = entry_from_frontmatter(meta, body)
                                     entry.file_path = md_file
@@ -271,7 +271,7 @@ def export_site(
 def _load_entry_from_result(result: dict, svc, kb: str | None):
     """Load an Entry from a DB query result, using file_path when available."""
     from ..models.core_types import entry_from_frontmatter
-    from ..utils.yaml import load_yaml
+    from ..utils.yaml import load_yaml_fast
 
     # Try file_path from DB first (handles ID/filename mismatches)
     file_path = result.get("file_path", "")
@@ -285,7 +285,7 @@ def _load_entry_from_result(result: dict, svc, kb: str | None):
                 text = path.read_text(encoding="utf-8")
                 parts = re.split(r"^---\s*$", text, flags=re.MULTILINE, maxsplit=2)
                 if len(parts) >= 3:
-                    meta = load_yaml(parts[1])
+                    meta = load_yaml_fast(parts[1])
                     body = parts[2].strip()
                     entry = entry_from_frontmatter(meta, body)
                     entry.file_path = path
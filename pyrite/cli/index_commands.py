@@ -1,7 +1,7 @@
 """
 Index management commands for pyrite CLI.
 
-Commands: build, sync, stats, embed, health
+Commands: build, sync, stats, check-stats, embed, health
 """
 
 import logging
@@ -119,7 +119,11 @@ def index_build(
 
             if is_available() and db.vec_available:
                 console.print("[dim]Generating embeddings...[/dim]")
-                svc = EmbeddingService(db, model_name=config.settings.embedding_model)
+                svc = EmbeddingService(
+                    db,
+                    model_name=config.settings.embedding_model,
+                    dimensions=config.settings.embedding_dimensions,
+                )
                 stats = svc.embed_all(kb_name=kb_name, force=force)
                 if stats["embedded"] > 0:
                     console.print(
@@ -166,7 +170,11 @@ def index_sync(
             from ..services.embedding_service import EmbeddingService, is_available
 
             if is_available() and db.vec_available:
-                svc = EmbeddingService(db, model_name=config.settings.embedding_model)
+                svc = EmbeddingService(
+                    db,
+                    model_name=config.settings.embedding_model,
+                    dimensions=config.settings.embedding_dimensions,
+                )
                 stats = svc.embed_all(kb_name=kb_name)
                 if stats["embedded"] > 0:
                     console.print(f"  Embedded: {stats['embedded']}")
@@ -216,13 +224,62 @@ def index_stats(
         console.print(table)
 
 
+@index_app.command("check-stats")
+def index_check_stats(
+    kb_name: str | None = typer.Option(None, "--kb", "-k", help="KB to check (all if omitted)"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Recompute counters that disagree"),
+):
+    """Compare the materialized KB statistics with the index and optionally rebuild them."""
+    config, db = get_config_and_db()
+
+    mismatches = db.check_kb_stats(kb_name)
+    if not mismatches:
+        console.print("[green]KB statistics are consistent.[/green]")
+        return
+
+    table = Table(title="Stale KB statistics")
+    table.add_column("KB", style="cyan")
+    table.add_column("Kind")
+    table.add_column("Key")
+    table.add_column("Stored", justify="right")
+    table.add_column("Actual", justify="right")
+    for m in mismatches[:50]:
+        table.add_row(m["kb_name"], m["kind"], m["key"], str(m["stored"]), str(m["actual"]))
+    console.print(table)
+    console.print(f"\nTotal: {len(mismatches)} counter(s) out of date")
+
+    if not rebuild:
+        console.print("\n[yellow]Use --rebuild to recompute them.[/yellow]")
+        raise typer.Exit(1)
+
+    rows = db.rebuild_kb_stats(kb_name)
+    console.print(f"[green]Rebuilt KB statistics ({rows} counters).[/green]")
+
+
 @index_app.command("embed")
 def index_embed(
     kb_name: str | None = typer.Option(None, "--kb", "-k", help="KB to embed (all if omitted)"),
     force: bool = typer.Option(False, "--force", "-f", help="Re-embed all entries"),
+    reembed: bool = typer.Option(
+        False,
+        "--reembed",
+        help="Rebuild vectors with the configured embedding model; old vectors serve "
+        "searches until the new ones are complete",
+    ),
+    background: bool = typer.Option(
+        False,
+        "--background",
+        help="With --reembed, only start the rebuild and let the embedding worker finish it",
+    ),
+    quantize: str | None = typer.Option(
+        None,
+        "--quantize",
+        help="Quantized KNN copy: none, int8 or bit (default: settings.embedding_quantization)",
+    ),
 ):
     """Generate vector embeddings for semantic search."""
     from ..services.embedding_service import EmbeddingService, is_available
+    from ..storage.embedding_versions import QUANTIZATIONS
 
     if not is_available():
         console.print("[red]Error:[/red] sentence-transformers is not installed.")
@@ -236,6 +293,11 @@ def index_embed(
         console.print("Install with: pip install pyrite[semantic]")
         raise typer.Exit(1)
 
+    quantization = quantize or config.settings.embedding_quantization
+    if quantization not in QUANTIZATIONS:
+        console.print(f"[red]Error:[/red] --quantize must be one of {', '.join(QUANTIZATIONS)}")
+        raise typer.Exit(1)
+
     # Check index has entries
     row = db._raw_conn.execute("SELECT COUNT(*) FROM entry").fetchone()
     if row[0] == 0:
@@ -244,7 +306,17 @@ def index_embed(
 
     from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
-    svc = EmbeddingService(db, model_name=config.settings.embedding_model)
+    svc = EmbeddingService(
+        db,
+        model_name=config.settings.embedding_model,
+        dimensions=config.settings.embedding_dimensions,
+    )
+
+    if reembed:
+        kb_names = [kb_name] if kb_name else [kb.name for kb in config.knowledge_bases]
+        _reembed(svc, kb_names, background)
+        svc.set_quantization(quantization)
+        return
 
     with Progress(
         SpinnerColumn(),
@@ -270,6 +342,50 @@ def index_embed(
     if stats["errors"]:
         console.print(f"  [red]Errors: {stats['errors']}[/red]")
 
+    quantized = svc.set_quantization(quantization)
+    for version, count in quantized.items():
+        console.print(f"  Quantized: {count} vectors (version {version})")
+
+
+def _reembed(svc, kb_names: list[str], background: bool) -> None:
+    """Start (and unless ``background``, run) re-embeds of ``kb_names``."""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
+    started = [kb for kb in kb_names if svc.start_reembed(kb)]
+    for kb in kb_names:
+        if kb not in started:
+            console.print(f"  {kb}: already on {svc.model_name}")
+    if not started:
+        return
+    if background:
+        console.print(
+            f"[green]Re-embed started[/green] for {', '.join(started)}; "
+            "searches use the current vectors until the embedding worker finishes."
+        )
+        return
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed}/{task.total}"),
+        console=console,
+    ) as progress:
+        for kb in started:
+            task = progress.add_task(f"Re-embedding {kb}...", total=None)
+
+            def update_progress(current: int, total: int, task=task):
+                progress.update(task, completed=current, total=total)
+
+            result = svc.reembed(kb, progress_callback=update_progress)
+            if result["done"]:
+                console.print(f"  [green]{kb}[/green]: switched to {svc.model_name}")
+            else:
+                console.print(
+                    f"  [yellow]{kb}[/yellow]: {result['remaining']} entries left "
+                    f"({result['errors']} errors); still serving the previous model"
+                )
+
 
 @index_app.command("health")
 def index_health(
@@ -0,0 +1,90 @@
+"""Lazy command registration for the pyrite CLIs.
+
+Each command module pulls in the storage layer (SQLAlchemy), services and,
+for plugin commands, every installed extension.  Importing all of them up
+front made every ``pyrite``/``pyrite-read`` invocation pay for commands it
+never runs.  ``lazy_group`` builds a Typer group class that resolves
+subcommands by name and imports only the module that provides them; listing
+commands (``--help``) still loads everything.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+
+import click
+import typer
+from typer.core import TyperGroup
+
+CommandLoader = Callable[[], dict[str, click.Command]]
+
+
+def typer_app(spec: str, name: str) -> CommandLoader:
+    """Loader for a Typer sub-app given as ``"module:attribute"``."""
+
+    def load() -> dict[str, click.Command]:
+        module, attr = spec.split(":")
+        group = typer.main.get_group(getattr(importlib.import_module(module), attr))
+        group.name = name
+        return {name: group}
+
+    return load
+
+
+def registered_commands(spec: str) -> CommandLoader:
+    """Loader for a ``register_*(app)`` function given as ``"module:function"``."""
+
+    def load() -> dict[str, click.Command]:
+        module, attr = spec.split(":")
+        host = typer.Typer()
+        getattr(importlib.import_module(module), attr)(host)
+        return dict(typer.main.get_group(host).commands)
+
+    return load
+
+
+def lazy_group(
+    commands: dict[str, CommandLoader],
+    extra: CommandLoader | None = None,
+) -> type[TyperGroup]:
+    """Build a ``TyperGroup`` subclass that loads ``commands`` on first use.
+
+    ``commands`` maps each command name to the loader that provides it; one
+    loader may provide several names.  ``extra`` provides commands whose names
+    are not known in advance (plugin commands) and is only called for names
+    missing from ``commands`` or when the full command list is needed.
+    """
+    cache: dict[CommandLoader, dict[str, click.Command]] = {}
+
+    def _load(loader: CommandLoader) -> dict[str, click.Command]:
+        if loader not in cache:
+            cache[loader] = loader()
+        return cache[loader]
+
+    class LazyTyperGroup(TyperGroup):
+        def _resolve(self, name: str) -> click.Command | None:
+            loader = commands.get(name)
+            if loader is not None:
+                return _load(loader).get(name)
+            if extra is not None:
+                return _load(extra).get(name)
+            return None
+
+        def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+            cmd = super().get_command(ctx, cmd_name)
+            if cmd is None:
+                cmd = self._resolve(cmd_name)
+                if cmd is not None:
+                    self.commands[cmd_name] = cmd
+            return cmd
+
+        def list_commands(self, ctx: click.Context) -> list[str]:
+            names = list(self.commands)
+            lazy = list(commands)
+            if extra is not None:
+                lazy.extend(_load(extra))
+            names.extend(n for n in lazy if n not in self.commands)
+            return names
+
+    return LazyTyperGroup
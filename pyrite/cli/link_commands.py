@@ -6,7 +6,9 @@ Commands: check, bulk-create, suggest, discover, batch-suggest
 
 from __future__ import annotations
 
+import json
 import sys
+from collections.abc import Iterator
 
 import typer
 from rich.console import Console
@@ -539,6 +541,53 @@ def _batch_suggest(
             db.close()
 
 
+def _iter_batch_suggest(
+    source_kb: str,
+    target_kb: str,
+    limit_per_entry: int = 3,
+    mode: str = "keyword",
+    exclude_linked: bool = True,
+    config=None,
+    db=None,
+) -> Iterator[dict]:
+    """Yield cross-KB link pairs as they are found.
+
+    Semantic mode streams LinkDiscoveryService.iter_batch_suggestions (stored
+    embeddings, source order); other modes, and KBs without stored
+    embeddings, yield batch_suggest's sorted pairs.
+    """
+    from ..services.link_discovery_service import LinkDiscoveryService
+
+    close_db = False
+    if config is None or db is None:
+        config, db = get_config_and_db()
+        close_db = True
+
+    try:
+        svc = LinkDiscoveryService(config, db)
+        streamed = False
+        if mode == "semantic":
+            for pair in svc.iter_batch_suggestions(
+                source_kb=source_kb,
+                target_kb=target_kb,
+                limit_per_entry=limit_per_entry,
+                exclude_linked=exclude_linked,
+            ):
+                streamed = True
+                yield pair
+        if not streamed:
+            yield from svc.batch_suggest(
+                source_kb=source_kb,
+                target_kb=target_kb,
+                limit_per_entry=limit_per_entry,
+                mode=mode,
+                exclude_linked=exclude_linked,
+            )
+    finally:
+        if close_db:
+            db.close()
+
+
 @links_app.command("batch-suggest")
 def links_batch_suggest(
     source_kb: str = typer.Option(..., "--source-kb", help="KB to find connections FROM"),
@@ -552,18 +601,37 @@ def links_batch_suggest(
     output_format: str = typer.Option(
         "rich", "--format", help="Output format: json, rich, markdown, csv, yaml"
     ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="Print pairs as JSON lines while they are found (unsorted in semantic mode)",
+    ),
 ):
     """Batch-compare all entries between two KBs to find potential links.
 
     For each entry in source-kb, finds the most similar entries in target-kb.
-    Deduplicates bidirectional matches and sorts by similarity score.
+    Deduplicates bidirectional matches and sorts by similarity score. Semantic
+    mode compares the KBs' stored embeddings in one pass when both have them;
+    with --stream it prints each pair as one JSON line as soon as its block
+    is scored, so large KBs start producing output immediately.
 
     \\b
     Examples:
         pyrite links batch-suggest --source-kb ramm --target-kb senge
         pyrite links batch-suggest --source-kb ramm --target-kb senge --mode semantic
         pyrite links batch-suggest --source-kb ramm --target-kb senge --limit-per-entry 5 --format json
+        pyrite links batch-suggest --source-kb ramm --target-kb senge --mode semantic --stream
     """
+    if stream:
+        for pair in _iter_batch_suggest(
+            source_kb=source_kb,
+            target_kb=target_kb,
+            limit_per_entry=limit_per_entry,
+            mode=mode,
+            exclude_linked=exclude_linked,
+        ):
+            typer.echo(json.dumps(pair))
+        return
+
     pairs = _batch_suggest(
         source_kb=source_kb,
         target_kb=target_kb,
@@ -731,12 +731,21 @@ def qa_check_urls(
     kb_name: str = typer.Argument(..., help="KB to check source URLs"),
     sample: int = typer.Option(0, "--sample", "-s", help="Check a random sample of N URLs (0=all)"),
     cache_file: str = typer.Option("", "--cache", help="Path to URL check cache file"),
+    concurrency: int = typer.Option(16, "--concurrency", "-c", help="Parallel requests in total"),
+    per_host: int = typer.Option(2, "--per-host", help="Parallel requests per host"),
+    host_delay: float = typer.Option(
+        0.5, "--host-delay", help="Seconds between request starts to one host"
+    ),
+    max_age: float = typer.Option(
+        24.0, "--max-age", help="Hours before a cached result is revalidated"
+    ),
     output_format: str = typer.Option("rich", "--format", help="Output format: json, rich"),
 ):
     """Check source URLs for liveness (HTTP status).
 
     Validates that source URLs in KB entries are reachable. Results are cached
-    to avoid rechecking on subsequent runs.
+    to avoid rechecking on subsequent runs; stale cache entries are
+    revalidated with conditional requests (ETag/Last-Modified).
     """
     from pathlib import Path
 
@@ -744,7 +753,14 @@ def qa_check_urls(
 
     ctx = cli_context()
     cache_path = Path(cache_file) if cache_file else None
-    checker = URLChecker(ctx.db, cache_path=cache_path)
+    checker = URLChecker(
+        ctx.db,
+        cache_path=cache_path,
+        max_concurrent=concurrency,
+        per_host=per_host,
+        host_delay=host_delay,
+        cache_max_age=max_age * 3600,
+    )
 
     console.print(f"Collecting URLs from '{kb_name}'...")
     url_entries = checker.collect_urls(kb_name)
@@ -84,9 +84,9 @@ def _parse_frontmatter(file_path: Path) -> tuple[dict[str, Any], str, list[dict[
     body = text[end + 3 :].strip()
 
     try:
-        from ..utils.yaml import load_yaml
+        from ..utils.yaml import load_yaml_fast
 
-        fm = load_yaml(yaml_text)
+        fm = load_yaml_fast(yaml_text)
         if not isinstance(fm, dict):
             errors.append(
                 {
@@ -33,7 +33,7 @@ def register_search_command(app: typer.Typer):
         state_filter: str | None = typer.Option(None, "--state", help="Filter by US state (e.g. FL, TX)"),
         limit: int = typer.Option(20, "--limit", "-n", help="Max results"),
         mode: str = typer.Option(
-            None, "--mode", "-m", help="Search mode: keyword, semantic, hybrid"
+            None, "--mode", "-m", help="Search mode: keyword, semantic, hybrid, substring"
         ),
         use_files: bool = typer.Option(False, "--files", help="Search files directly (skip index)"),
         expand: bool = typer.Option(False, "--expand", "-x", help="Use AI query expansion"),
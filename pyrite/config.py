@@ -6,10 +6,19 @@ Configuration is loaded from:
 1. ~/.pyrite/config.yaml (global)
 2. Environment variables (overrides)
 3. Individual kb.yaml files in each KB root
+
+Parsed YAML is cached per process and re-read only when a file's stat
+changes; ``config_snapshot()`` hands out a private copy of a cached config
+that is rebuilt when config.yaml, a kb.yaml or a PYRITE_* environment
+variable changes.  The rebuild itself announces the change to
+``subscribe_config_changes`` listeners.
 """
 
+import copy
 import logging
 import os
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import StrEnum
 from pathlib import Path
@@ -78,11 +87,8 @@ class KBConfig:
         if self._schema_cache is None:
             from .schema import KBSchema
 
-            schema_path = self.path / "kb.yaml"
-            if schema_path.exists():
-                self._schema_cache = KBSchema.from_yaml(schema_path)
-            else:
-                self._schema_cache = KBSchema()
+            data = _yaml_files.load(self.kb_yaml_path)
+            self._schema_cache = KBSchema.from_dict(data) if data is not None else KBSchema()
         return self._schema_cache
 
     def invalidate_schema_cache(self) -> None:
@@ -98,8 +104,8 @@ class KBConfig:
 
     def load_kb_yaml(self) -> bool:
         """Load kb.yaml if it exists. Returns True if loaded."""
-        if self.kb_yaml_path.exists():
-            data = load_yaml_file(self.kb_yaml_path)
+        data = _yaml_files.load(self.kb_yaml_path)
+        if data is not None:
             self.schema = data.get("schema")
             self.types = data.get("types")
             self.policies = data.get("policies")
@@ -310,6 +316,7 @@ class Settings:
     ai_model: str = "claude-sonnet-4-20250514"
     ai_api_key: str = ""
     ai_api_base: str = ""
+    ai_chat_context_tokens: int = 2000  # RAG chat context budget (~4 chars per token)
     summary_length: int = 280
     enable_mcp: bool = True
     index_path: Path = field(default_factory=lambda: Path.home() / ".pyrite" / "index.db")
@@ -332,12 +339,33 @@ class Settings:
     mcp_rate_limit_exempt_local: bool = True
     embedding_model: str = "all-MiniLM-L6-v2"
     embedding_dimensions: int = 384
+    # Compact vector copy for first-pass KNN, reranked exactly: "none", "int8" or "bit"
+    embedding_quantization: str = "none"
     search_mode: str = "keyword"
+    # Related-entries index scoring (shared actors/tags, optional embedding blend)
+    related_actor_weight: float = 2.0
+    related_tag_weight: float = 1.0
+    related_embedding_weight: float = 0.0
+    related_limit: int = 10  # related entries stored per entry
+    related_max_term_entries: int = 500  # ignore tags/actors shared by more entries (0 = no cap)
+    # FTS5 ranking and index options (prefix/trigram changes rebuild entry_fts on next sync)
+    fts_title_weight: float = 10.0
+    fts_summary_weight: float = 5.0
+    fts_body_weight: float = 1.0
+    fts_location_weight: float = 1.0
+    fts_prefix_lengths: list[int] = field(default_factory=lambda: [2, 3])
+    fts_trigram: bool = False  # substring index for search_substring()
     search_backend: str = "sqlite"  # "sqlite" or "postgres"
     database_url: str = ""  # PostgreSQL connection string (for postgres backend)
     workspace_path: Path = field(default_factory=lambda: Path.home() / ".pyrite" / "repos")
     strict_plugins: bool = False  # Raise on plugin load failures (dev/CI mode)
     prewarm_embeddings: bool = False  # Pre-load embedding model on server startup
+    metrics_enabled: bool = True  # Serve Prometheus text at /metrics (admin tier)
+    trace_path: str = ""  # Append JSON-lines spans here; empty = tracing off
+    site_render_workers: int = 0  # Site cache render processes (0 = one per CPU, 1 = in-process)
+    # Per-user worktree diff DBs kept open by the server (LRU, closed when idle)
+    worktree_diff_db_pool_size: int = 64
+    worktree_diff_db_idle_seconds: float = 600.0
     # White-label branding folder. None = use built-in Pyrite defaults.
     # Env override: PYRITE_BRANDING_DIR
     branding_dir: Path | None = field(
@@ -564,6 +592,7 @@ class PyriteConfig:
             "default_editor": self.settings.default_editor,
             "ai_provider": self.settings.ai_provider,
             "ai_model": self.settings.ai_model,
+            "ai_chat_context_tokens": self.settings.ai_chat_context_tokens,
             "summary_length": self.settings.summary_length,
             "enable_mcp": self.settings.enable_mcp,
             "index_path": str(self.settings.index_path),
@@ -605,7 +634,24 @@ class PyriteConfig:
             "mcp_rate_limit_exempt_local": self.settings.mcp_rate_limit_exempt_local,
             "embedding_model": self.settings.embedding_model,
             "embedding_dimensions": self.settings.embedding_dimensions,
+            "embedding_quantization": self.settings.embedding_quantization,
             "search_mode": self.settings.search_mode,
+            "related_actor_weight": self.settings.related_actor_weight,
+            "related_tag_weight": self.settings.related_tag_weight,
+            "related_embedding_weight": self.settings.related_embedding_weight,
+            "related_limit": self.settings.related_limit,
+            "related_max_term_entries": self.settings.related_max_term_entries,
+            "fts_title_weight": self.settings.fts_title_weight,
+            "fts_summary_weight": self.settings.fts_summary_weight,
+            "fts_body_weight": self.settings.fts_body_weight,
+            "fts_location_weight": self.settings.fts_location_weight,
+            "fts_prefix_lengths": self.settings.fts_prefix_lengths,
+            "fts_trigram": self.settings.fts_trigram,
+            "site_render_workers": self.settings.site_render_workers,
+            "worktree_diff_db_pool_size": self.settings.worktree_diff_db_pool_size,
+            "worktree_diff_db_idle_seconds": self.settings.worktree_diff_db_idle_seconds,
+            "metrics_enabled": self.settings.metrics_enabled,
+            "trace_path": self.settings.trace_path,
         }
 
         return result
@@ -703,6 +749,7 @@ class PyriteConfig:
             default_editor=settings_data.get("default_editor", os.environ.get("EDITOR", "vim")),
             ai_provider=settings_data.get("ai_provider", "stub"),
             ai_model=settings_data.get("ai_model", "claude-sonnet-4-20250514"),
+            ai_chat_context_tokens=settings_data.get("ai_chat_context_tokens", 2000),
             summary_length=settings_data.get("summary_length", 280),
             enable_mcp=settings_data.get("enable_mcp", True),
             index_path=Path(settings_data.get("index_path", "~/.pyrite/index.db")),
@@ -736,7 +783,24 @@ class PyriteConfig:
             mcp_rate_limit_exempt_local=settings_data.get("mcp_rate_limit_exempt_local", True),
             embedding_model=settings_data.get("embedding_model", "all-MiniLM-L6-v2"),
             embedding_dimensions=settings_data.get("embedding_dimensions", 384),
+            embedding_quantization=settings_data.get("embedding_quantization", "none"),
             search_mode=settings_data.get("search_mode", "keyword"),
+            related_actor_weight=settings_data.get("related_actor_weight", 2.0),
+            related_tag_weight=settings_data.get("related_tag_weight", 1.0),
+            related_embedding_weight=settings_data.get("related_embedding_weight", 0.0),
+            related_limit=settings_data.get("related_limit", 10),
+            related_max_term_entries=settings_data.get("related_max_term_entries", 500),
+            fts_title_weight=settings_data.get("fts_title_weight", 10.0),
+            fts_summary_weight=settings_data.get("fts_summary_weight", 5.0),
+            fts_body_weight=settings_data.get("fts_body_weight", 1.0),
+            fts_location_weight=settings_data.get("fts_location_weight", 1.0),
+            fts_prefix_lengths=settings_data.get("fts_prefix_lengths", [2, 3]),
+            fts_trigram=settings_data.get("fts_trigram", False),
+            site_render_workers=settings_data.get("site_render_workers", 0),
+            worktree_diff_db_pool_size=settings_data.get("worktree_diff_db_pool_size", 64),
+            worktree_diff_db_idle_seconds=settings_data.get("worktree_diff_db_idle_seconds", 600.0),
+            metrics_enabled=settings_data.get("metrics_enabled", True),
+            trace_path=settings_data.get("trace_path", ""),
         )
 
         return cls(
@@ -797,6 +861,10 @@ def _apply_env_overrides(config: PyriteConfig) -> None:
         config.settings.strict_plugins = val.lower() in ("true", "1", "yes")
     if val := env("PYRITE_PREWARM_EMBEDDINGS"):
         config.settings.prewarm_embeddings = val.lower() in ("true", "1", "yes")
+    if val := env("PYRITE_METRICS_ENABLED"):
+        config.settings.metrics_enabled = val.lower() in ("true", "1", "yes")
+    if val := env("PYRITE_TRACE_PATH"):
+        config.settings.trace_path = val
 
     # When PYRITE_DATA_DIR is set, derive index_path and workspace_path from it
     data_dir = env("PYRITE_DATA_DIR")
@@ -810,12 +878,14 @@ def load_config() -> PyriteConfig:
     """
     Load configuration from config.yaml.
 
-    Creates default config if it doesn't exist.
+    Creates default config if it doesn't exist.  Returns a new, mutable
+    config on every call; the YAML files are only re-parsed when they change.
+    Read-only callers on hot paths should prefer ``config_snapshot()``.
     """
     ensure_config_dir()
 
-    if CONFIG_FILE.exists():
-        data = load_yaml_file(CONFIG_FILE)
+    data = _yaml_files.load(CONFIG_FILE)
+    if data is not None:
         config = PyriteConfig.from_dict(data)
     else:
         # Create default config
@@ -836,6 +906,196 @@ def save_config(config: PyriteConfig) -> None:
     ensure_config_dir()
 
     dump_yaml_file(config.to_dict(), CONFIG_FILE)
+    _yaml_files.forget(CONFIG_FILE)
+    _snapshots.invalidate()
+    _snapshots.reload()
+
+
+# =========================================================================
+# Config snapshot cache
+# =========================================================================
+
+
+def _plain(value: Any) -> Any:
+    """Convert ruamel round-trip containers to plain dicts and lists."""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _file_stamp(path: Path) -> tuple[int, int, int] | None:
+    """(mtime_ns, size, inode) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class _YamlFileCache:
+    """Parsed YAML files, re-read only when their stat stamp changes.
+
+    ``load`` returns a deep copy so callers can mutate the result freely.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files: dict[Path, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+
+    def load(self, path: Path) -> dict[str, Any] | None:
+        """Parsed contents of ``path``, or None if it does not exist."""
+        stamp = _file_stamp(path)
+        if stamp is None:
+            with self._lock:
+                self._files.pop(path, None)
+            return None
+        with self._lock:
+            cached = self._files.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, _plain(load_yaml_file(path)))
+            with self._lock:
+                self._files[path] = cached
+        return copy.deepcopy(cached[1])
+
+    def forget(self, path: Path) -> None:
+        with self._lock:
+            self._files.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+
+
+_yaml_files = _YamlFileCache()
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """Event sent to ``subscribe_config_changes`` listeners when a snapshot is rebuilt."""
+
+    config: PyriteConfig  # a copy of the new snapshot
+    config_changed: bool  # config.yaml or PYRITE_* environment changed
+    changed_kbs: frozenset[str]  # KBs whose kb.yaml changed (or KBs added/removed)
+
+
+class ConfigSnapshotCache:
+    """Process-level, stat-validated config snapshot.
+
+    ``reload()`` stats config.yaml and every KB's kb.yaml and rebuilds the
+    cached config only when a stamp (or the PYRITE_* environment) changed,
+    notifying listeners of each rebuild before it returns.  ``get()``
+    reloads and hands out a deep copy, so callers never share (or can
+    corrupt) the cached config; changes made to a copy are not saved — use
+    ``load_config()`` and ``save_config()`` for that.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._config: PyriteConfig | None = None
+        self._stamps: dict[Path, tuple[int, int, int] | None] = {}
+        self._env: tuple[tuple[str, str], ...] = ()
+        self._listeners: list[Callable[[ConfigChange], None]] = []
+
+    def get(self) -> PyriteConfig:
+        with self._lock:
+            self.reload()
+            return copy.deepcopy(self._config)
+
+    def reload(self) -> bool:
+        """Rebuild the snapshot if any stamp changed. Returns True if it was rebuilt.
+
+        Listeners are called from here, in rebuild order, once per rebuild.
+        """
+        with self._lock:
+            change = self._refresh()
+            if change is not None:
+                self._emit(change)
+        return change is not None
+
+    def subscribe(self, listener: Callable[[ConfigChange], None]) -> Callable[[], None]:
+        """Register a change listener. Returns a function that unsubscribes it."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def invalidate(self) -> None:
+        """Treat config.yaml as changed on the next reload, whatever its stamp."""
+        with self._lock:
+            self._stamps.pop(CONFIG_FILE, None)
+
+    @staticmethod
+    def _env_signature() -> tuple[tuple[str, str], ...]:
+        return tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("PYRITE_")))
+
+    def _kb_stamps(self, config: PyriteConfig) -> dict[Path, tuple[int, int, int] | None]:
+        return {kb.kb_yaml_path: _file_stamp(kb.kb_yaml_path) for kb in config.knowledge_bases}
+
+    def _refresh(self) -> ConfigChange | None:
+        env = self._env_signature()
+        config_stamp = _file_stamp(CONFIG_FILE)
+        old = self._config
+        config_changed = (
+            old is None
+            or env != self._env
+            or CONFIG_FILE not in self._stamps
+            or self._stamps[CONFIG_FILE] != config_stamp
+        )
+        if not config_changed:
+            stale = {
+                path
+                for path, stamp in self._kb_stamps(old).items()
+                if self._stamps.get(path) != stamp
+            }
+            if not stale:
+                return None
+            changed_kbs = {kb.name for kb in old.knowledge_bases if kb.kb_yaml_path in stale}
+        new = load_config()
+        if config_changed:
+            old_kbs = {kb.name: kb for kb in old.knowledge_bases} if old else {}
+            new_kbs = {kb.name: kb for kb in new.knowledge_bases}
+            changed_kbs = {
+                name
+                for name in old_kbs.keys() | new_kbs.keys()
+                if name not in old_kbs
+                or name not in new_kbs
+                or old_kbs[name].path != new_kbs[name].path
+                or self._stamps.get(new_kbs[name].kb_yaml_path)
+                != _file_stamp(new_kbs[name].kb_yaml_path)
+            }
+        self._config = new
+        self._env = env
+        self._stamps = {CONFIG_FILE: config_stamp, **self._kb_stamps(new)}
+        if old is None:
+            return None  # first load: nothing to announce
+        return ConfigChange(copy.deepcopy(new), config_changed, frozenset(changed_kbs))
+
+    def _emit(self, change: ConfigChange) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(change)
+            except Exception:
+                logger.warning("Config change listener %r failed", listener, exc_info=True)
+
+
+_snapshots = ConfigSnapshotCache()
+
+
+def config_snapshot() -> PyriteConfig:
+    """Copy of the current config, re-parsed only when config files change."""
+    return _snapshots.get()
+
+
+def subscribe_config_changes(listener: Callable[[ConfigChange], None]) -> Callable[[], None]:
+    """Call ``listener`` with a ``ConfigChange`` whenever the snapshot is rebuilt."""
+    return _snapshots.subscribe(listener)
 
 
 def auto_discover_kbs(search_paths: list[Path] | None = None) -> list[KBConfig]:
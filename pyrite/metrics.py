@@ -0,0 +1,403 @@
+"""
+Metrics and Tracing for pyrite
+
+An in-process metrics registry (counters, gauges and histograms with
+labels) rendered in the Prometheus text exposition format, and optional
+span tracing to a local JSON-lines file.  No client library is needed: the
+REST API serves ``/metrics`` and the ``kb_metrics`` MCP admin tool returns
+the same registry as JSON.
+
+Usage:
+    from pyrite.metrics import SEARCH_STAGE_SECONDS, timed
+
+    with timed("search.fts", SEARCH_STAGE_SECONDS, stage="fts"):
+        results = db.search(...)
+
+Tracing is off until ``configure_tracing(path)`` is called (the
+``trace_path`` setting).  Each finished span is appended as one JSON line
+with its trace id, parent span, start time, duration and attributes;
+nested spans on the same thread or task share a trace.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TextIO
+
+# Latency buckets in seconds, from sub-millisecond lookups to slow syncs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {tuple(labels)}")
+        try:
+            return tuple(str(labels[name]) for name in self.labels)
+        except KeyError:
+            raise ValueError(
+                f"{self.name} takes labels {self.labels}, got {tuple(labels)}"
+            ) from None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _items(self) -> list[tuple[tuple[str, ...], Any]]:
+        with self._lock:
+            return [(k, list(v) if isinstance(v, list) else v) for k, v in self._values.items()]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [
+            {"labels": dict(zip(self.labels, key, strict=True)), "value": value}
+            for key, value in sorted(self._items())
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Point-in-time value, such as a queue depth refreshed before each scrape."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[slot] += 1
+            state[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        names = (*self.labels, "le")
+        for key, state in sorted(self._items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), state[:-1], strict=True):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def _quantile(self, counts: list[int], q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (None past the last bound)."""
+        target = q * sum(counts)
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts, strict=False):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        rows = []
+        for key, state in sorted(self._items()):
+            counts, total = state[:-1], state[-1]
+            count = sum(counts)
+            rows.append(
+                {
+                    "labels": dict(zip(self.labels, key, strict=True)),
+                    "count": count,
+                    "sum": round(total, 6),
+                    "mean": round(total / count, 6) if count else 0.0,
+                    "p50_le": self._quantile(counts, 0.5),
+                    "p95_le": self._quantile(counts, 0.95),
+                }
+            )
+        return rows
+
+
+class MetricsRegistry:
+    """Named metrics, rendered for Prometheus or snapshotted as JSON."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labels != metric.labels:
+            raise ValueError(f"Metric {metric.name} already registered with another shape")
+        return existing
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def _sorted(self) -> list[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._sorted():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self, prefix: str | None = None) -> dict[str, Any]:
+        """Metrics as JSON-friendly dicts, optionally only names starting with ``prefix``."""
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "series": metric.snapshot()}
+            for metric in self._sorted()
+            if prefix is None or metric.name.startswith(prefix)
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "pyrite_http_request_duration_seconds",
+    "REST request latency by route template.",
+    ("method", "route", "status"),
+)
+MCP_TOOL_SECONDS = REGISTRY.histogram(
+    "pyrite_mcp_tool_duration_seconds",
+    "MCP tool call latency.",
+    ("tool", "outcome"),
+)
+SEARCH_STAGE_SECONDS = REGISTRY.histogram(
+    "pyrite_search_stage_duration_seconds",
+    "Search latency per stage (fts, vector, fusion, hybrid, embed).",
+    ("stage",),
+)
+EMBED_BATCH_SECONDS = REGISTRY.histogram(
+    "pyrite_embed_batch_duration_seconds",
+    "EmbeddingWorker batch processing time.",
+)
+INDEX_JOB_SECONDS = REGISTRY.histogram(
+    "pyrite_index_job_duration_seconds",
+    "Background index job duration.",
+    ("operation", "outcome"),
+    buckets=JOB_BUCKETS,
+)
+EMBED_QUEUE_DEPTH = REGISTRY.gauge(
+    "pyrite_embed_queue_depth",
+    "Entries in embed_queue by status.",
+    ("status",),
+)
+INDEX_JOBS = REGISTRY.gauge(
+    "pyrite_index_jobs",
+    "Rows in index_job by status.",
+    ("status",),
+)
+SQLITE_LOCK_WAIT_SECONDS = REGISTRY.histogram(
+    "pyrite_sqlite_lock_wait_seconds",
+    "Time spent acquiring the SQLite write lock.",
+    ("source",),
+)
+SQLITE_BUSY_TOTAL = REGISTRY.counter(
+    "pyrite_sqlite_busy_total",
+    "Write-lock acquisitions that gave up with 'database is locked'.",
+    ("source",),
+)
+
+
+def collect_queue_depths(connection: sqlite3.Connection) -> None:
+    """Refresh the embed_queue and index_job gauges; call before rendering."""
+    for gauge, table in ((EMBED_QUEUE_DEPTH, "embed_queue"), (INDEX_JOBS, "index_job")):
+        try:
+            rows = connection.execute(
+                f"SELECT status, COUNT(*) FROM {table} GROUP BY status"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            continue  # table not created until its worker first runs
+        gauge.clear()
+        for status, count in rows:
+            gauge.set(count, status=status)
+
+
+def acquire_write_lock(connection: sqlite3.Connection, source: str) -> None:
+    """Open a write transaction with ``BEGIN IMMEDIATE``, timing the lock wait.
+
+    Use right before a write that would take the lock anyway; a no-op
+    inside an already open transaction.
+    """
+    if connection.in_transaction:
+        return
+    start = time.perf_counter()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+    except sqlite3.OperationalError as e:
+        if "locked" in str(e) or "busy" in str(e):
+            SQLITE_BUSY_TOTAL.inc(source=source)
+        raise
+    finally:
+        SQLITE_LOCK_WAIT_SECONDS.observe(time.perf_counter() - start, source=source)
+
+
+# =============================================================================
+# Tracing
+# =============================================================================
+
+_trace_file: TextIO | None = None
+_trace_path: Path | None = None
+_trace_lock = threading.Lock()
+_current_span: ContextVar[tuple[str, str] | None] = ContextVar("pyrite_span", default=None)
+
+
+def configure_tracing(path: str | Path | None) -> None:
+    """Append finished spans to ``path`` as JSON lines; None or "" turns tracing off."""
+    global _trace_file, _trace_path
+    target = Path(path).expanduser().resolve() if path else None
+    with _trace_lock:
+        if target == _trace_path:
+            return
+        if _trace_file is not None:
+            _trace_file.close()
+        _trace_file = None
+        _trace_path = target
+        if target is not None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _trace_file = open(target, "a", encoding="utf-8", buffering=1)  # noqa: SIM115
+
+
+def tracing_enabled() -> bool:
+    return _trace_file is not None
+
+
+def _write_span(record: dict[str, Any]) -> None:
+    line = json.dumps(record, separators=(",", ":"), default=str)
+    with _trace_lock:
+        if _trace_file is not None:
+            _trace_file.write(line + "\n")
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[None]:
+    """Trace the enclosed block when tracing is on; free when it is off."""
+    if _trace_file is None:
+        yield
+        return
+    parent = _current_span.get()
+    trace_id = parent[0] if parent else uuid.uuid4().hex
+    span_id = uuid.uuid4().hex[:16]
+    token = _current_span.set((trace_id, span_id))
+    started = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        record = {
+            "name": name,
+            "trace_id": trace_id,
+            "span_id": span_id,
+            "parent_id": parent[1] if parent else None,
+            "start": round(started, 6),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            "attrs": attrs,
+        }
+        if error:
+            record["error"] = error
+        _write_span(record)
+
+
+@contextmanager
+def timed(name: str, histogram: Histogram | None = None, **labels: Any) -> Iterator[None]:
+    """Span ``name`` plus an observation of ``histogram`` with ``labels``."""
+    start = time.perf_counter()
+    try:
+        with span(name, **labels):
+            yield
+    finally:
+        if histogram is not None:
+            histogram.observe(time.perf_counter() - start, **labels)
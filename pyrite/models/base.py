@@ -13,7 +13,7 @@ from pathlib import Path
 from typing import Any
 
 from ..schema import Link, Provenance, Source
-from ..utils.yaml import dump_yaml, load_yaml
+from ..utils.yaml import dump_yaml, load_yaml_fast
 
 logger = logging.getLogger(__name__)
 
@@ -165,7 +165,7 @@ class Entry(ABC):
         if len(parts) < 3:
             raise ValueError("Invalid entry format: missing YAML frontmatter")
 
-        meta = load_yaml(parts[1])
+        meta = load_yaml_fast(parts[1])
         body = parts[2].strip()
 
         entry = cls.from_frontmatter(meta, body)
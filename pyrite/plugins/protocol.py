@@ -146,6 +146,32 @@ class PyritePlugin(Protocol):
         """
         ...
 
+    def get_db_derived_tables(self) -> list[dict]:
+        """
+        Return tables kept in sync with core tables by SQLite triggers.
+
+        Each definition is installed when the database schema is set up
+        (and the plugin set changes), never from read paths: its ``schema``
+        script runs, then ``backfill`` populates the table from existing
+        rows.  Bumping ``version`` drops and reinstalls it, and everything
+        the script created is dropped once the plugin is no longer installed.
+
+        Returns:
+            List of definitions. Each dict has:
+                name: str - unique name, usually the derived table's
+                version: int - schema version of the definition
+                schema: str - SQL script creating the table, indexes and triggers
+                backfill: Callable[[sqlite3.Connection], Any] - optional initial fill
+
+            Example:
+                [{"name": "vote_total",
+                  "version": 1,
+                  "schema": "CREATE TABLE vote_total (...); CREATE TRIGGER ...;",
+                  "backfill": rebuild_vote_totals,
+                }]
+        """
+        ...
+
     def get_hooks(self) -> dict[str, list[Callable]]:
         """
         Return lifecycle hooks.
@@ -58,6 +58,8 @@ class PluginRegistry:
     def __init__(self):
         self._plugins: dict[str, PyritePlugin] = {}
         self._discovered = False
+        self._context: PluginContext | None = None
+        self._config_subscription: Callable[[], None] | None = None
 
     def discover(self, strict: bool = False) -> None:
         """Discover plugins via entry points.
@@ -108,6 +110,28 @@ class PluginRegistry:
 
         self._discovered = True
 
+    @property
+    def loaded(self) -> bool:
+        """True once plugins have been discovered or registered in this process."""
+        return self._discovered or bool(self._plugins)
+
+    def entry_point_signature(self) -> str:
+        """Describe the installed plugin entry points without importing them.
+
+        Changes whenever a plugin is installed, removed or upgraded, so it can
+        stand in for the plugins' table definitions when deciding whether
+        stored schema is current.
+        """
+        try:
+            from importlib.metadata import entry_points
+
+            eps = entry_points(group=self.ENTRY_POINT_GROUP)
+        except Exception:
+            return ""
+        return ";".join(
+            sorted(f"{ep.name}={ep.value}@{ep.dist.version if ep.dist else ''}" for ep in eps)
+        )
+
     def register(self, plugin: PyritePlugin) -> None:
         """Manually register a plugin (for testing or programmatic use)."""
         self._plugins[plugin.name] = plugin
@@ -115,6 +139,11 @@ class PluginRegistry:
     def set_context(self, ctx: PluginContext) -> None:
         """Inject shared context into all discovered plugins."""
         self.discover()
+        self._context = ctx
+        if self._config_subscription is None:
+            from ..config import subscribe_config_changes
+
+            self._config_subscription = subscribe_config_changes(self._on_config_change)
         for plugin in self._plugins.values():
             if hasattr(plugin, "set_context"):
                 try:
@@ -122,6 +151,19 @@ class PluginRegistry:
                 except Exception as e:
                     logger.warning("Plugin %s set_context failed: %s", plugin.name, e)
 
+    def _on_config_change(self, change: Any) -> None:
+        """Reload changed kb.yaml files into the shared context's config."""
+        ctx = self._context
+        if ctx is None or ctx.config is None:
+            return
+        for name in change.changed_kbs:
+            kb = ctx.config.get_kb(name)
+            if kb is not None:
+                kb.load_kb_yaml()
+                kb.invalidate_schema_cache()
+        if ctx.kb_name in change.changed_kbs:
+            ctx.kb_schema = None
+
     def get_plugin(self, name: str) -> PyritePlugin | None:
         """Get a plugin by name."""
         self.discover()
@@ -266,6 +308,10 @@ class PluginRegistry:
         """Get all custom DB table definitions from all plugins."""
         return self._aggregate_list("get_db_tables")
 
+    def get_all_db_derived_tables(self) -> list[dict]:
+        """Get all trigger-maintained table definitions from all plugins."""
+        return self._aggregate_list("get_db_derived_tables")
+
     def get_all_hooks(self) -> dict[str, list[Callable]]:
         """Get all lifecycle hooks from all plugins, merged by hook name."""
         return self._aggregate_dict_of_lists("get_hooks")
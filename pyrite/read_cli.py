@@ -14,8 +14,6 @@ from rich.table import Table
 
 from .cli.search_commands import register_search_command
 from .config import CONFIG_FILE, load_config
-from .services.kb_service import KBService
-from .storage.database import PyriteDB
 
 app = typer.Typer(
     name="pyrite-read",
@@ -27,6 +25,9 @@ console = Console()
 
 def _get_svc():
     """Create a KBService instance for CLI commands."""
+    from .services.kb_service import KBService
+    from .storage.database import PyriteDB
+
     config = load_config()
     db = PyriteDB(config.settings.index_path)
     return KBService(config, db), db
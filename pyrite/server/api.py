@@ -12,6 +12,7 @@ import hashlib
 import logging
 import os
 import secrets
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -24,6 +25,7 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
 from ..config import PyriteConfig, Settings, load_config
+from ..metrics import configure_tracing
 from ..services.ephemeral_service import EphemeralKBService
 from ..services.export_service import ExportService
 from ..services.graph_service import GraphService
@@ -37,6 +39,7 @@ from ..services.starred_service import StarredService
 from ..services.version_service import VersionService
 from ..storage.database import PyriteDB
 from ..storage.index import IndexManager
+from .diff_db_pool import DiffDBPool
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +72,15 @@ def _init_app_state(application: FastAPI, config: PyriteConfig) -> None:
     application.state.pyrite_kb_service = None
     application.state.pyrite_kb_registry = None
     application.state.pyrite_llm_service = None
-    application.state.pyrite_diff_db_cache = {}  # (user_id, kb_name) → PyriteDB
+    application.state.pyrite_diff_db_pool = _diff_db_pool(config)
+
+
+def _diff_db_pool(config: PyriteConfig) -> DiffDBPool:
+    """A diff-DB pool sized from the worktree settings."""
+    return DiffDBPool(
+        max_size=config.settings.worktree_diff_db_pool_size,
+        idle_seconds=config.settings.worktree_diff_db_idle_seconds,
+    )
 
 
 def get_config() -> PyriteConfig:
@@ -126,12 +137,21 @@ def get_worktree_resolver(
     config: PyriteConfig = Depends(get_config),
     db: PyriteDB = Depends(get_db),
 ):
-    """Get a WorktreeResolver for per-user read/write routing."""
+    """Get a WorktreeResolver for per-user read/write routing.
+
+    Diff DBs the resolver leases are released after the response.
+    """
     from .worktree_resolver import WorktreeResolver
 
-    # Cache diff DBs on app state to avoid heavyweight re-init per request
-    cache = getattr(request.app.state, "pyrite_diff_db_cache", {})
-    return WorktreeResolver(config, db, cache)
+    # Diff DBs are pooled on app state to avoid heavyweight re-init per request
+    pool = getattr(request.app.state, "pyrite_diff_db_pool", None)
+    if pool is None:
+        pool = request.app.state.pyrite_diff_db_pool = _diff_db_pool(config)
+    resolver = WorktreeResolver(config, db, pool)
+    try:
+        yield resolver
+    finally:
+        resolver.release()
 
 
 def get_llm_service(
@@ -541,6 +561,15 @@ limiter = Limiter(key_func=_anonymized_key_func)
 # =============================================================================
 
 
+@asynccontextmanager
+async def _lifespan(application: FastAPI):
+    yield
+    # Shutdown: close pooled worktree diff DBs
+    pool = getattr(application.state, "pyrite_diff_db_pool", None)
+    if pool is not None:
+        pool.close_all()
+
+
 def create_app(config: PyriteConfig | None = None) -> FastAPI:
     """Create and configure the FastAPI application.
 
@@ -557,6 +586,7 @@ def create_app(config: PyriteConfig | None = None) -> FastAPI:
         version="0.12.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=_lifespan,
     )
 
     # Resolve config for CORS setup
@@ -640,7 +670,9 @@ def create_app(config: PyriteConfig | None = None) -> FastAPI:
         from ..services.embedding_service import EmbeddingService
 
         application.state.pyrite_embedding_svc = EmbeddingService(
-            _app_get_db(), model_name=config.settings.embedding_model
+            _app_get_db(),
+            model_name=config.settings.embedding_model,
+            dimensions=config.settings.embedding_dimensions,
         )
 
     # CORS — use configured origins; disable credentials with wildcard (spec compliance)
@@ -653,6 +685,14 @@ def create_app(config: PyriteConfig | None = None) -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Per-route request timing and /metrics; spans go to trace_path when set
+    configure_tracing(config.settings.trace_path)
+    if config.settings.metrics_enabled:
+        from .metrics_endpoints import RequestMetricsMiddleware, metrics_router
+
+        application.add_middleware(RequestMetricsMiddleware)
+        application.include_router(metrics_router)
+
     # Rate limiting
     application.state.limiter = limiter
     application.add_exception_handler(
@@ -716,8 +756,8 @@ def create_app(config: PyriteConfig | None = None) -> FastAPI:
         await manager.connect(ws)
         try:
             while True:
-                # Keep connection alive; clients can send pings
-                await ws.receive_text()
+                # Clients send pings and subscribe/unsubscribe messages
+                manager.handle_message(ws, await ws.receive_text())
         except WebSocketDisconnect:
             manager.disconnect(ws)
 
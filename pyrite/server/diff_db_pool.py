@@ -0,0 +1,234 @@
+"""Bounded pool of per-user worktree diff databases.
+
+Every collaborator with an active worktree has a small diff index
+(``.pyrite/diff-index.db``) that the overlay reads merge with the main
+index.  Opening one is not free — a SQLAlchemy engine, two connections and
+the sqlite-vec load — so handles are kept open between requests, but only
+for the ``max_size`` most recently used (user, KB) pairs and only while they
+are in use at least every ``idle_seconds``.
+
+Requests take a lease (``acquire``/``release``, or the ``lease`` context
+manager).  A handle that is evicted, discarded or replaced while leased is
+retired instead of closed, and closed when its last lease is released, so
+eviction never pulls a session out from under a running request.
+
+Opening skips schema setup for files whose ``PRAGMA user_version`` stamp
+matches the running code (see ``storage.connection``); diff DBs are created
+by ``WorktreeService.ensure_worktree`` so they are stamped from the start.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pyrite.storage.database import PyriteDB
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[int, str]  # (user_id, kb_name)
+
+
+@dataclass
+class _Slot:
+    db: PyriteDB
+    path: Path
+    inode: int
+    last_used: float
+
+
+class DiffDBPool:
+    """LRU-bounded cache of open diff ``PyriteDB`` handles with idle eviction.
+
+    Thread-safe: FastAPI runs sync endpoints in a thread pool.  Handles are
+    reference counted by lease; dropping one from the pool only closes it
+    once no request holds it.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 64,
+        idle_seconds: float = 600.0,
+        opener: Callable[[Path], PyriteDB] = PyriteDB,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max(1, max_size)
+        self.idle_seconds = idle_seconds
+        self._opener = opener
+        self._clock = clock
+        self._slots: OrderedDict[PoolKey, _Slot] = OrderedDict()
+        self._leases: dict[int, int] = {}  # id(db) -> open leases
+        self._retired: dict[int, PyriteDB] = {}  # dropped from the pool, still leased
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.open_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def acquire(self, key: PoolKey, path: Path) -> PyriteDB | None:
+        """Lease an open handle for ``key``'s diff DB at ``path``.
+
+        Reuses the pooled handle while it still points at the same file;
+        a deleted or replaced file (merge/reset unlink it) is reopened.
+        Returns None if the file does not exist.  Every handle returned
+        must be given back with ``release``.
+        """
+        path = Path(path)
+        try:
+            inode = path.stat().st_ino
+        except OSError:
+            self.discard(key)
+            return None
+
+        with self._lock:
+            now = self._clock()
+            stale = self._retire(self._evict_idle(now))
+            slot = self._slots.get(key)
+            if slot is not None and slot.path == path and slot.inode == inode:
+                self.hits += 1
+                slot.last_used = now
+                self._slots.move_to_end(key)
+                db = self._lease(slot.db)
+            else:
+                if slot is not None:
+                    stale += self._retire([self._slots.pop(key).db])
+                self.misses += 1
+                db = None
+        self._close(stale)
+        if db is not None:
+            return db
+
+        # Open outside the lock so a slow open doesn't stall other users' hits.
+        start = time.perf_counter()
+        db = self._opener(path)
+        elapsed = time.perf_counter() - start
+        stale = []
+        with self._lock:
+            self.open_seconds += elapsed
+            slot = self._slots.get(key)
+            if slot is not None and slot.inode == inode:
+                # Another request opened the same file meanwhile; keep theirs.
+                stale.append(db)
+                db = slot.db
+            else:
+                if slot is not None:
+                    stale += self._retire([slot.db])
+                self._slots[key] = _Slot(db, path, inode, self._clock())
+                self._slots.move_to_end(key)
+                while len(self._slots) > self.max_size:
+                    _, evicted = self._slots.popitem(last=False)
+                    self.evictions += 1
+                    stale += self._retire([evicted.db])
+            self._lease(db)
+        self._close(stale)
+        return db
+
+    def release(self, db: PyriteDB) -> None:
+        """Return a lease taken by ``acquire``; closes the handle if it was retired."""
+        with self._lock:
+            remaining = self._leases.get(id(db), 0) - 1
+            if remaining > 0:
+                self._leases[id(db)] = remaining
+                return
+            self._leases.pop(id(db), None)
+            retired = self._retired.pop(id(db), None)
+        if retired is not None:
+            self._close([retired])
+
+    @contextmanager
+    def lease(self, key: PoolKey, path: Path) -> Iterator[PyriteDB | None]:
+        """``acquire`` for the duration of a ``with`` block."""
+        db = self.acquire(key, path)
+        try:
+            yield db
+        finally:
+            if db is not None:
+                self.release(db)
+
+    def discard(self, key: PoolKey) -> None:
+        """Drop ``key``'s handle (after merge/reset/delete), closing it once unleased."""
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            stale = self._retire([slot.db]) if slot is not None else []
+        self._close(stale)
+
+    def evict_idle(self) -> int:
+        """Drop handles unused for ``idle_seconds``; returns how many."""
+        with self._lock:
+            evicted = self._evict_idle(self._clock())
+            stale = self._retire(evicted)
+        self._close(stale)
+        return len(evicted)
+
+    def close_all(self) -> None:
+        """Drop every pooled handle (app shutdown); leased ones close on release."""
+        with self._lock:
+            stale = self._retire([slot.db for slot in self._slots.values()])
+            self._slots.clear()
+        self._close(stale)
+
+    def stats(self) -> dict[str, Any]:
+        """Pool size, hit rate and open-time counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "open_handles": len(self._slots),
+            "leased_handles": len(self._leases),
+            "retired_handles": len(self._retired),
+            "max_size": self.max_size,
+            "idle_seconds": self.idle_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "avg_open_ms": round(self.open_seconds * 1000 / self.misses, 2) if self.misses else 0.0,
+        }
+
+    def _lease(self, db: PyriteDB) -> PyriteDB:
+        """Count a lease on ``db``; caller holds the lock."""
+        self._leases[id(db)] = self._leases.get(id(db), 0) + 1
+        return db
+
+    def _retire(self, dbs: list[PyriteDB]) -> list[PyriteDB]:
+        """Park leased handles until release; return the rest to close.  Caller holds the lock."""
+        unleased = []
+        for db in dbs:
+            if self._leases.get(id(db)):
+                self._retired[id(db)] = db
+            else:
+                unleased.append(db)
+        return unleased
+
+    def _evict_idle(self, now: float) -> list[PyriteDB]:
+        """Pop idle slots (oldest first); caller holds the lock."""
+        if self.idle_seconds <= 0:
+            return []
+        stale = []
+        while self._slots:
+            key, slot = next(iter(self._slots.items()))
+            if now - slot.last_used < self.idle_seconds:
+                break
+            del self._slots[key]
+            self.evictions += 1
+            stale.append(slot.db)
+        return stale
+
+    @staticmethod
+    def _close(dbs: list[PyriteDB]) -> None:
+        for db in dbs:
+            try:
+                db.close()
+            except Exception:
+                logger.debug("Failed to close pooled diff DB", exc_info=True)
@@ -2,14 +2,30 @@
 
 import json
 import logging
+import time
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from ...config import PyriteConfig
+from ...services.chat_retrieval import (
+    build_context,
+    chat_retriever,
+    conversation_key,
+    estimate_tokens,
+)
 from ...services.kb_service import KBService
 from ...services.llm_service import LLMService
 from ...services.search_service import SearchService
-from ..api import get_kb_service, get_llm_service, get_search_service, get_user_llm_context, limiter, requires_tier
+from ..api import (
+    get_config,
+    get_kb_service,
+    get_llm_service,
+    get_search_service,
+    get_user_llm_context,
+    limiter,
+    requires_tier,
+)
 from ..schemas import (
     AIAutoTagResponse,
     AIChatRequest,
@@ -232,12 +248,18 @@ Candidate entries to link:
 async def ai_chat(
     request: Request,
     req: AIChatRequest,
+    config: PyriteConfig = Depends(get_config),
     llm: LLMService = Depends(get_llm_service),
     svc: KBService = Depends(get_kb_service),
     search_svc: SearchService = Depends(get_search_service),
     user_ctx: dict | None = Depends(get_user_llm_context),
 ):
-    """Chat with your knowledge base using RAG. Returns SSE stream."""
+    """Chat with your knowledge base using RAG. Returns SSE stream.
+
+    Retrieval runs inside the stream: a ``retrieval`` event (timings, cache
+    hit) and the ``sources`` event are sent before context assembly and the
+    first token, followed by a ``context`` event once the prompt is built.
+    """
     llm = _resolve_llm(llm, user_ctx)
     _require_configured(llm)
 
@@ -247,81 +269,82 @@ async def ai_chat(
         )
 
     last_msg = req.messages[-1].content
+    conversation = req.conversation_id or conversation_key(req.messages[0].content, req.kb)
+    budget = config.settings.ai_chat_context_tokens
 
-    # RAG: search KB for context
-    sources = []
-    context_text = ""
-    try:
-        try:
-            results = search_svc.search(
-                query=last_msg,
-                kb_name=req.kb,
-                limit=5,
-                mode="hybrid",
-            )
-        except Exception:
-            results = search_svc.search(
-                query=last_msg,
-                kb_name=req.kb,
-                limit=5,
-                mode="keyword",
-            )
+    # Build full prompt from message history
+    history = ""
+    for msg in req.messages[:-1]:
+        role_label = "User" if msg.role == "user" else "Assistant"
+        history += f"{role_label}: {msg.content}\n\n"
+    prompt = f"{history}User: {last_msg}" if history else last_msg
+
+    def _event(payload: dict) -> str:
+        return f"data: {json.dumps(payload)}\n\n"
 
-        for r in results:
-            sources.append(
+    async def event_stream():
+        try:
+            # RAG: search KB for context (cached per conversation)
+            passages = []
+            try:
+                retrieval = chat_retriever().retrieve(
+                    conversation, last_msg, req.kb, search_svc, svc
+                )
+                passages = retrieval.passages
+                yield _event(
+                    {
+                        "type": "retrieval",
+                        "cached": retrieval.cached,
+                        "mode": retrieval.mode,
+                        "search_ms": round(retrieval.search_ms, 1),
+                        "fetch_ms": round(retrieval.fetch_ms, 1),
+                        "results": len(passages),
+                    }
+                )
+                if passages:
+                    yield _event({"type": "sources", "entries": [p.source() for p in passages]})
+            except Exception:
+                logger.exception("RAG search failed, proceeding without context")
+
+            start = time.perf_counter()
+            context_text = ""
+            remaining = budget
+            # If chatting about a specific entry, include it first
+            if req.entry_id and req.kb:
+                entry = svc.get_entry(req.entry_id, kb_name=req.kb)
+                if entry:
+                    entry_body = (entry.get("body") or "")[:1500]
+                    context_text = (
+                        f"\n---\nCurrent entry [[{req.entry_id}]] "
+                        f"{entry.get('title', '')}\n{entry_body}\n"
+                    )
+                    remaining -= estimate_tokens(context_text)
+            used = 0
+            for block in build_context(passages, remaining):
+                context_text += block
+                used += 1
+            yield _event(
                 {
-                    "id": r.get("id", ""),
-                    "kb_name": r.get("kb_name", ""),
-                    "title": r.get("title", ""),
-                    "snippet": (r.get("snippet") or "")[:200],
+                    "type": "context",
+                    "passages": used,
+                    "tokens": estimate_tokens(context_text),
+                    "context_ms": round((time.perf_counter() - start) * 1000, 1),
                 }
             )
-            # Fetch full entry for richer context
-            full = svc.get_entry(r["id"], kb_name=r.get("kb_name"))
-            if full:
-                body_preview = (full.get("body") or "")[:500]
-                context_text += f"\n---\n[[{r['id']}]] {r.get('title', '')}\n{body_preview}\n"
-    except Exception:
-        logger.exception("RAG search failed, proceeding without context")
-
-    # If chatting about a specific entry, include it
-    if req.entry_id and req.kb:
-        entry = svc.get_entry(req.entry_id, kb_name=req.kb)
-        if entry:
-            entry_body = (entry.get("body") or "")[:1500]
-            context_text = (
-                f"\n---\nCurrent entry [[{req.entry_id}]] {entry.get('title', '')}\n{entry_body}\n"
-                + context_text
-            )
 
-    system = f"""You are a research assistant for a knowledge base. Answer the user's question using the provided context from the KB.
+            system = f"""You are a research assistant for a knowledge base. Answer the user's question using the provided context from the KB.
 Cite entries using [[entry-id]] notation. Be concise and helpful.
 If the context doesn't contain enough information to fully answer, say so.
 
 KB Context:
 {context_text}"""
 
-    # Build full prompt from message history
-    history = ""
-    for msg in req.messages[:-1]:
-        role_label = "User" if msg.role == "user" else "Assistant"
-        history += f"{role_label}: {msg.content}\n\n"
-    prompt = f"{history}User: {last_msg}" if history else last_msg
-
-    async def event_stream():
-        try:
             async for token in llm.stream(prompt, system=system):
-                data = json.dumps({"type": "token", "content": token})
-                yield f"data: {data}\n\n"
-
-            if sources:
-                data = json.dumps({"type": "sources", "entries": sources})
-                yield f"data: {data}\n\n"
+                yield _event({"type": "token", "content": token})
 
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            yield _event({"type": "done"})
         except Exception as e:
             logger.exception("AI chat stream error")
-            data = json.dumps({"type": "error", "message": str(e)})
-            yield f"data: {data}\n\n"
+            yield _event({"type": "error", "message": str(e)})
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
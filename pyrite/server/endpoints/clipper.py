@@ -73,7 +73,7 @@ async def clip_url(
     # Broadcast WebSocket event
     from ..websocket import broadcast_event
 
-    broadcast_event("entry_created", entry_id=entry.id, kb_name=req.kb)
+    broadcast_event("entry_created", entry_id=entry.id, kb_name=req.kb, entry_type=entry.entry_type)
 
     return ClipResponse(
         created=True,
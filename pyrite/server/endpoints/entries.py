@@ -670,7 +670,7 @@ def create_entry(
     # Broadcast WebSocket event
     from ..websocket import broadcast_event
 
-    broadcast_event("entry_created", entry_id=entry.id, kb_name=req.kb)
+    broadcast_event("entry_created", entry_id=entry.id, kb_name=req.kb, entry_type=entry.entry_type)
 
     return CreateResponse(created=True, id=entry.id, kb_name=req.kb, file_path="")
 
@@ -708,7 +708,7 @@ def update_entry(
         updates["tags"] = req.tags
 
     try:
-        svc.update_entry(entry_id, req.kb, **updates)
+        entry = svc.update_entry(entry_id, req.kb, **updates)
     except (KBNotFoundError, EntryNotFoundError) as e:
         raise HTTPException(status_code=404, detail={"code": "NOT_FOUND", "message": str(e)})
     except KBReadOnlyError as e:
@@ -719,7 +719,7 @@ def update_entry(
     # Broadcast WebSocket event
     from ..websocket import broadcast_event
 
-    broadcast_event("entry_updated", entry_id=entry_id, kb_name=req.kb)
+    broadcast_event("entry_updated", entry_id=entry_id, kb_name=req.kb, entry_type=entry.entry_type)
 
     return UpdateResponse(updated=True, id=entry_id)
 
@@ -1,13 +1,21 @@
-"""Graph visualization endpoint."""
+"""Graph visualization and analytics endpoints."""
 
 from collections import deque
 from typing import Any
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from ...services.graph_service import GraphService
 from ..api import get_graph_service, limiter
-from ..schemas import GraphEdge, GraphNode, GraphResponse
+from ..schemas import (
+    CommunitiesResponse,
+    GraphEdge,
+    GraphNode,
+    GraphPathsResponse,
+    GraphResponse,
+    PageRankResponse,
+    RelatedEntriesResponse,
+)
 
 router = APIRouter(tags=["Graph"])
 
@@ -113,3 +121,78 @@ def get_graph(
     nodes = [GraphNode(**n) for n in data["nodes"]]
     edges = [GraphEdge(**e) for e in data["edges"]]
     return GraphResponse(nodes=nodes, edges=edges)
+
+
+@router.get("/graph/pagerank", response_model=PageRankResponse)
+@limiter.limit("60/minute")
+def get_graph_pagerank(
+    request: Request,
+    kb: str | None = Query(None, description="Filter to KB"),
+    limit: int = Query(20, ge=1, le=500, description="Max entries"),
+    graph_svc: GraphService = Depends(get_graph_service),
+):
+    """Get the most central entries by PageRank over links, refs and edge entities."""
+    return PageRankResponse(entries=graph_svc.get_pagerank(kb_name=kb, limit=limit))
+
+
+@router.get("/graph/communities", response_model=CommunitiesResponse)
+@limiter.limit("60/minute")
+def get_graph_communities(
+    request: Request,
+    kb: str | None = Query(None, description="Filter to KB"),
+    method: str = Query("louvain", description="louvain or connected"),
+    min_size: int = Query(2, ge=1, description="Minimum community size"),
+    limit: int = Query(20, ge=1, le=200, description="Max communities"),
+    member_limit: int = Query(50, ge=1, le=1000, description="Max members per community"),
+    graph_svc: GraphService = Depends(get_graph_service),
+):
+    """Get clusters of densely connected entries."""
+    try:
+        communities = graph_svc.get_communities(
+            kb_name=kb,
+            method=method,
+            min_size=min_size,
+            limit=limit,
+            member_limit=member_limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"code": "INVALID_METHOD", "message": str(e)})
+    return CommunitiesResponse(method=method, communities=communities)
+
+
+@router.get("/graph/paths", response_model=GraphPathsResponse)
+@limiter.limit("60/minute")
+def get_graph_paths(
+    request: Request,
+    source: str = Query(..., description="Source entry ID"),
+    source_kb: str = Query(..., description="KB of source entry"),
+    target: str = Query(..., description="Target entry ID"),
+    target_kb: str | None = Query(None, description="KB of target entry (default: source_kb)"),
+    k: int = Query(3, ge=1, le=10, description="Number of paths"),
+    max_length: int = Query(6, ge=1, le=10, description="Max hops per path"),
+    graph_svc: GraphService = Depends(get_graph_service),
+):
+    """Get the k shortest paths between two entries."""
+    paths = graph_svc.get_shortest_paths(
+        source,
+        source_kb,
+        target,
+        target_kb or source_kb,
+        k=k,
+        max_length=max_length,
+    )
+    return GraphPathsResponse(paths=paths)
+
+
+@router.get("/graph/related", response_model=RelatedEntriesResponse)
+@limiter.limit("60/minute")
+def get_graph_related(
+    request: Request,
+    entry_id: str = Query(..., description="Entry ID"),
+    kb: str = Query(..., description="KB of the entry"),
+    limit: int = Query(5, ge=1, le=50, description="Max related entries"),
+    graph_svc: GraphService = Depends(get_graph_service),
+):
+    """Get entries sharing actors/tags with an entry, from the precomputed index."""
+    related = graph_svc.get_related_entries(entry_id, kb, limit=limit)
+    return RelatedEntriesResponse(entry_id=entry_id, kb_name=kb, related=related)
@@ -23,7 +23,7 @@ def search(
     date_from: str | None = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
     date_to: str | None = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
     limit: int = Query(20, ge=1, le=100),
-    mode: str = Query("keyword", description="Search mode: keyword, semantic, hybrid"),
+    mode: str = Query("keyword", description="Search mode: keyword, semantic, hybrid, substring"),
     expand: bool = Query(False, description="Use AI query expansion for additional search terms"),
     include_body: bool = Query(
         False, description="Include full body text in results (default: snippet only)"
@@ -367,3 +367,17 @@ def merge_queue_reject(
 
     result = wt_svc.reject(req.kb, wt.user_id, req.feedback)
     return {"rejected": True, "status": result.status, "feedback": result.feedback}
+
+
+@router.get(
+    "/admin/worktree-pool",
+    dependencies=[Depends(requires_tier("admin"))],
+)
+@limiter.limit("30/minute")
+def worktree_pool_stats(request: Request):
+    """Diff-DB pool size, hit rate and eviction counters."""
+    pool = getattr(request.app.state, "pyrite_diff_db_pool", None)
+    if pool is None:
+        return {"open_handles": 0}
+    pool.evict_idle()
+    return pool.stats()
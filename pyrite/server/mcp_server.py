@@ -12,12 +12,14 @@ Tiers:
 
 import json
 import logging
+import time
 from typing import Any
 
 from pydantic import AnyUrl
 
 from ..config import PyriteConfig, load_config
 from ..exceptions import ConfigError, KBNotFoundError, KBProtectedError, PyriteError
+from ..metrics import MCP_TOOL_SECONDS, configure_tracing, span
 from ..schema import generate_entry_id
 from ..services.export_service import ExportService
 from ..services.graph_service import GraphService
@@ -142,6 +144,7 @@ class PyriteMCPServer:
 
         self.config = config or load_config()
         self.tier = tier
+        configure_tracing(self.config.settings.trace_path)
         self.db = PyriteDB(self.config.settings.index_path)
         # Merge DB-registered KBs into config
         try:
@@ -403,6 +406,57 @@ class PyriteMCPServer:
             "backlinks": backlinks,
         }
 
+    def _kb_related(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Get precomputed related entries."""
+        entry_id = args.get("entry_id")
+        kb_name = args.get("kb_name")
+        related = self.graph_svc.get_related_entries(entry_id, kb_name, limit=args.get("limit", 5))
+        return {"entry_id": entry_id, "count": len(related), "related": related}
+
+    def _kb_graph_analytics(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Run PageRank, community detection, or k-shortest paths."""
+        analysis = args.get("analysis")
+        kb_name = args.get("kb_name")
+        if analysis == "pagerank":
+            entries = self.graph_svc.get_pagerank(kb_name=kb_name, limit=args.get("limit", 20))
+            return {"analysis": analysis, "count": len(entries), "entries": entries}
+        if analysis == "communities":
+            method = args.get("method", "louvain")
+            try:
+                communities = self.graph_svc.get_communities(
+                    kb_name=kb_name,
+                    method=method,
+                    min_size=args.get("min_size", 2),
+                    limit=args.get("limit", 20),
+                )
+            except ValueError as e:
+                return _error("VALIDATION_FAILED", str(e))
+            return {
+                "analysis": analysis,
+                "method": method,
+                "count": len(communities),
+                "communities": communities,
+            }
+        if analysis == "paths":
+            source_id = args.get("source_id")
+            source_kb = args.get("source_kb")
+            target_id = args.get("target_id")
+            if not (source_id and source_kb and target_id):
+                return _error(
+                    "VALIDATION_FAILED", "source_id, source_kb and target_id are required"
+                )
+            paths = self.graph_svc.get_shortest_paths(
+                source_id,
+                source_kb,
+                target_id,
+                args.get("target_kb") or source_kb,
+                k=args.get("k", 3),
+                max_length=args.get("max_length", 6),
+                kb_name=kb_name,
+            )
+            return {"analysis": analysis, "count": len(paths), "paths": paths}
+        return _error("VALIDATION_FAILED", "analysis must be one of: pagerank, communities, paths")
+
     def _kb_tags(self, args: dict[str, Any]) -> dict[str, Any]:
         """Get all tags with counts."""
         kb_name = args.get("kb_name")
@@ -1306,6 +1360,18 @@ class PyriteMCPServer:
         except KBNotFoundError as e:
             return _error("NOT_FOUND", str(e))
 
+    def _kb_metrics(self, args: dict[str, Any]) -> dict[str, Any]:
+        """Process metrics: latency histograms, queue depths, lock waits."""
+        from ..metrics import REGISTRY, collect_queue_depths, tracing_enabled
+
+        collect_queue_depths(self.db._raw_conn)
+        if args.get("format") == "prometheus":
+            return {"format": "prometheus", "text": REGISTRY.render()}
+        return {
+            "metrics": REGISTRY.snapshot(prefix=args.get("prefix")),
+            "tracing": tracing_enabled(),
+        }
+
     # =========================================================================
     # Prompts
     # =========================================================================
@@ -1615,12 +1681,19 @@ class PyriteMCPServer:
                     retryable=True,
                 )
 
+        outcome = "exception"
+        start = time.perf_counter()
         try:
             handler = self.tools[name]["handler"]
-            return handler(arguments)
+            with span("mcp.tool", tool=name, client_id=client_id):
+                result = handler(arguments)
+            outcome = "error" if isinstance(result, dict) and "error" in result else "ok"
+            return result
         except Exception as e:
             logger.exception("Tool %s failed with args %s", name, arguments)
             return _error("INTERNAL", str(e), retryable=True)
+        finally:
+            MCP_TOOL_SECONDS.observe(time.perf_counter() - start, tool=name, outcome=outcome)
 
     def build_sdk_server(self, *, client_id: str = "stdio"):
         """Build an mcp.server.Server wired to this instance's business logic.
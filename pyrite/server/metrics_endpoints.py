@@ -0,0 +1,85 @@
+"""Prometheus metrics endpoint and per-route request timing.
+
+``GET /metrics`` renders the process-wide registry from ``pyrite.metrics``
+in the Prometheus text format.  It is mounted outside /api (scrapers expect
+the conventional path) but requires the admin tier, so a scrape config
+passes an admin API key as ``X-API-Key`` or ``?api_key=``.
+
+``RequestMetricsMiddleware`` times every HTTP request and labels it with the
+matched route's template (``/api/entries/{entry_id}``) under its router
+prefix, never the raw path; requests matching no route share one label, so
+cardinality stays bounded.
+"""
+
+from __future__ import annotations
+
+import time
+
+from fastapi import APIRouter, Depends, Response
+from starlette.routing import replace_params
+
+from ..metrics import HTTP_REQUEST_SECONDS, REGISTRY, collect_queue_depths, span
+from ..storage.database import PyriteDB
+from .api import get_db, requires_tier, verify_api_key
+
+metrics_router = APIRouter(
+    tags=["Admin"], dependencies=[Depends(verify_api_key), Depends(requires_tier("admin"))]
+)
+
+
+@metrics_router.get("/metrics")
+def prometheus_metrics(db: PyriteDB = Depends(get_db)) -> Response:
+    """Return all metrics in the Prometheus text exposition format."""
+    collect_queue_depths(db._raw_conn)
+    return Response(
+        content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "<unmatched>"
+    # ``route.path`` is relative to the router or mount that declares it, so
+    # the /api prefix (or a mount's root_path) is whatever precedes the
+    # concrete form of the route in the request path.
+    path = scope["path"]
+    concrete, _ = replace_params(
+        route.path_format, route.param_convertors, dict(scope.get("path_params") or {})
+    )
+    if path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return scope.get("root_path", "") + template
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware observing ``pyrite_http_request_duration_seconds``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with span("http.request", method=scope["method"], path=scope["path"]):
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start,
+                    method=scope["method"],
+                    route=_route_template(scope),
+                    status=status,
+                )
@@ -229,6 +229,80 @@ class GraphResponse(BaseModel):
     edges: list[GraphEdge]
 
 
+class GraphEntryRef(BaseModel):
+    """Entry reference in graph analytics results."""
+
+    id: str
+    kb_name: str
+    title: str
+    entry_type: str
+
+
+class RelatedEntryRef(GraphEntryRef):
+    """Entry related by shared actors/tags."""
+
+    date: str | None = None
+    score: float
+
+
+class RelatedEntriesResponse(BaseModel):
+    """Response for related entry queries."""
+
+    entry_id: str
+    kb_name: str
+    related: list[RelatedEntryRef]
+
+
+class PageRankEntry(GraphEntryRef):
+    """Entry ranked by PageRank."""
+
+    score: float
+    in_degree: int = 0
+    out_degree: int = 0
+
+
+class PageRankResponse(BaseModel):
+    """Response for PageRank queries."""
+
+    entries: list[PageRankEntry]
+
+
+class GraphCommunity(BaseModel):
+    """Cluster of densely connected entries."""
+
+    community: int
+    size: int
+    members: list[GraphEntryRef]
+
+
+class CommunitiesResponse(BaseModel):
+    """Response for community detection queries."""
+
+    method: str
+    communities: list[GraphCommunity]
+
+
+class GraphPathHop(BaseModel):
+    """One step along a graph path."""
+
+    relation: str | None = None
+    direction: str
+
+
+class GraphPath(BaseModel):
+    """Path between two entries."""
+
+    length: int
+    nodes: list[GraphEntryRef]
+    hops: list[GraphPathHop]
+
+
+class GraphPathsResponse(BaseModel):
+    """Response for shortest path queries."""
+
+    paths: list[GraphPath]
+
+
 # =============================================================================
 # Admin
 # =============================================================================
@@ -297,6 +371,7 @@ class AIChatRequest(BaseModel):
     messages: list[ChatMessageSchema]
     kb: str | None = None
     entry_id: str | None = None
+    conversation_id: str | None = None  # retrieval cache scope; defaults to the first message
 
 
 class StatsResponse(BaseModel):
@@ -2,7 +2,9 @@
 Static file serving for the Pyrite web application.
 
 Serves the built SvelteKit app from web/dist/ with SPA fallback:
-- /site/* → pre-rendered static HTML from site-cache/ (SEO-friendly)
+- /site/* → pre-rendered static HTML from site-cache/ (SEO-friendly), with
+  ETag/Last-Modified revalidation and precompressed variants from the
+  site-cache manifest
 - /site/sitemap.xml → dynamic sitemap from index
 - /site/robots.txt → crawler directives
 - /assets/* → static files (JS, CSS, images)
@@ -10,8 +12,11 @@ Serves the built SvelteKit app from web/dist/ with SPA fallback:
 - Everything else → index.html (SPA client-side routing)
 """
 
+import json
 import os
+from collections.abc import Mapping
 from datetime import UTC, datetime
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -21,9 +26,12 @@ from fastapi.staticfiles import StaticFiles
 
 def mount_site_routes(app: FastAPI) -> None:
     """Mount /site and /viewer routes. These work independent of the SPA dist."""
+    from ..services.site_cache import MANIFEST_FILE
+
     data_dir = Path(os.environ.get("PYRITE_DATA_DIR", "."))
     site_cache_dir = data_dir / "site-cache"
     viewer_dir = data_dir / "viewer"
+    manifest = SiteManifest(site_cache_dir / MANIFEST_FILE)
 
     # Sitemap
     @app.get("/site/sitemap.xml", include_in_schema=False)
@@ -60,11 +68,23 @@ def mount_site_routes(app: FastAPI) -> None:
     # Serve /site/* from pre-rendered cache
     @app.get("/site/{path:path}", include_in_schema=False)
     async def site_page(request: Request, path: str):
-        return _serve_site_cached(site_cache_dir, path, "<html><body>Page not yet rendered. Run site cache render.</body></html>")
+        return _serve_site_cached(
+            site_cache_dir,
+            path,
+            "<html><body>Page not yet rendered. Run site cache render.</body></html>",
+            manifest=manifest,
+            headers=request.headers,
+        )
 
     @app.get("/site", include_in_schema=False)
     async def site_index(request: Request):
-        return _serve_site_cached(site_cache_dir, "", "<html><body>Site not yet rendered. Run site cache render.</body></html>")
+        return _serve_site_cached(
+            site_cache_dir,
+            "",
+            "<html><body>Site not yet rendered. Run site cache render.</body></html>",
+            manifest=manifest,
+            headers=request.headers,
+        )
 
 
 def mount_static(app: FastAPI, dist_dir: Path) -> None:
@@ -201,22 +221,118 @@ def _serve_search_page(cache_dir: Path) -> HTMLResponse:
     )
 
 
-def _serve_site_cached(cache_dir: Path, path: str, fallback_html: str) -> HTMLResponse:
+class SiteManifest:
+    """Page metadata written by the site cache renderer (``_manifest.json``).
+
+    Maps cache-relative page paths to their ETag, modification time and
+    precompressed encodings.  The file is re-read only when its mtime
+    changes, so answering a conditional request costs one ``stat`` of the
+    manifest and never touches the page itself.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._mtime: int | None = None
+        self._pages: dict[str, dict] = {}
+
+    def get(self, rel: str) -> dict | None:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self._mtime, self._pages = None, {}
+            return None
+        if mtime != self._mtime:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._pages = data.get("pages") or {}
+            except (OSError, ValueError, AttributeError):
+                self._pages = {}
+            self._mtime = mtime
+        return self._pages.get(rel)
+
+
+# Sibling suffix → Content-Encoding token
+_CONTENT_ENCODINGS = {"br": "br", "gz": "gzip"}
+
+
+def _pick_encoding(accept_encoding: str, available: list[str]) -> str | None:
+    """Choose a precompressed sibling suffix acceptable to the client, or None."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token.strip().lower()] = q
+    best, best_q = None, 0.0
+    for suffix in available:
+        coding = _CONTENT_ENCODINGS.get(suffix)
+        q = accepted.get(coding, accepted.get("*", 0.0)) if coding else 0.0
+        if q > best_q:  # ties keep the earlier (smaller) encoding
+            best, best_q = suffix, q
+    return best
+
+
+def _not_modified(headers: Mapping[str, str], etag: str, modified: int) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against a manifest record."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag == "*" or tag.split("-", 1)[0] == etag:
+                return True
+        return False
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(modified) <= since.timestamp()
+    return False
+
+
+def _serve_site_cached(
+    cache_dir: Path,
+    path: str,
+    fallback_html: str,
+    *,
+    manifest: SiteManifest | None = None,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
     """Serve a /site page from the cache directory.
 
     Cache layout:
         /site           → cache_dir/index.html
         /site/boyd      → cache_dir/boyd/index.html
         /site/boyd/ooda → cache_dir/boyd/ooda.html
+
+    Pages listed in the manifest get an ETag and Last-Modified; matching
+    conditional requests are answered 304 from the manifest alone, and the
+    body is served from a ``.br``/``.gz`` sibling when ``Accept-Encoding``
+    allows it.
     """
     if not path:
-        cache_path = cache_dir / "index.html"
+        rel = "index.html"
     else:
         parts = path.rstrip("/").split("/")
         if len(parts) == 1:
-            cache_path = cache_dir / parts[0] / "index.html"
+            rel = f"{parts[0]}/index.html"
         else:
-            cache_path = cache_dir / parts[0] / ("/".join(parts[1:]) + ".html")
+            rel = f"{parts[0]}/{'/'.join(parts[1:])}.html"
+    cache_path = cache_dir / rel
+
+    # Manifest keys are paths the renderer wrote, so a hit is already safe
+    record = manifest.get(rel) if manifest is not None else None
+    if record is not None:
+        response = _serve_manifest_page(cache_path, record, headers or {})
+        if response is not None:
+            return response
 
     # Security: ensure resolved path is within cache_dir
     try:
@@ -230,7 +346,7 @@ def _serve_site_cached(cache_dir: Path, path: str, fallback_html: str) -> HTMLRe
         return HTMLResponse(
             content=cache_path.read_text(encoding="utf-8"),
             headers={
-                "Cache-Control": "public, max-age=3600, s-maxage=86400",
+                "Cache-Control": _SITE_CACHE_CONTROL,
                 "X-Pyrite-Cache": "HIT",
             },
         )
@@ -240,3 +356,39 @@ def _serve_site_cached(cache_dir: Path, path: str, fallback_html: str) -> HTMLRe
         content=fallback_html,
         headers={"X-Pyrite-Cache": "MISS"},
     )
+
+
+_SITE_CACHE_CONTROL = "public, max-age=3600, s-maxage=86400"
+
+
+def _serve_manifest_page(
+    cache_path: Path, record: dict, headers: Mapping[str, str]
+) -> Response | None:
+    """Serve a page described by a manifest record; None if its file has gone."""
+    etag = record.get("etag") or ""
+    modified = record.get("modified") or 0
+    available = [e for e in record.get("encodings") or [] if e in _CONTENT_ENCODINGS]
+    encoding = _pick_encoding(headers.get("accept-encoding", ""), available)
+    response_headers = {
+        "Cache-Control": _SITE_CACHE_CONTROL,
+        "ETag": f'"{etag}-{encoding}"' if encoding else f'"{etag}"',
+        "Vary": "Accept-Encoding",
+        "X-Pyrite-Cache": "HIT",
+    }
+    if modified:
+        response_headers["Last-Modified"] = formatdate(modified, usegmt=True)
+
+    if _not_modified(headers, etag, modified):
+        return Response(status_code=304, headers=response_headers)
+
+    body_path = cache_path.with_name(f"{cache_path.name}.{encoding}") if encoding else cache_path
+    try:
+        body = body_path.read_bytes()
+    except OSError:
+        if not encoding:
+            return None
+        # Sibling missing (e.g. mid-render): fall back to the plain page
+        return _serve_manifest_page(cache_path, {**record, "encodings": []}, headers)
+    if encoding:
+        response_headers["Content-Encoding"] = _CONTENT_ENCODINGS[encoding]
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=response_headers)
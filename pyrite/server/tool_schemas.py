@@ -50,8 +50,8 @@ READ_TOOLS = {
                 },
                 "mode": {
                     "type": "string",
-                    "enum": ["keyword", "semantic", "hybrid"],
-                    "description": "Search mode: keyword (FTS5), semantic (vector), or hybrid. Default: hybrid",
+                    "enum": ["keyword", "semantic", "hybrid", "substring"],
+                    "description": "Search mode: keyword (FTS5), semantic (vector), hybrid, or substring (text anywhere in a word). Default: hybrid",
                 },
                 "expand": {
                     "type": "boolean",
@@ -156,6 +156,67 @@ READ_TOOLS = {
             "required": ["entry_id", "kb_name"],
         },
     },
+    "kb_related": {
+        "description": "Get entries related to a given entry by shared actors and tags "
+        "(excluding entries it already links to or from), highest score first.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "entry_id": {"type": "string", "description": "Entry ID"},
+                "kb_name": {"type": "string", "description": "KB name"},
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum results (default 5)",
+                },
+            },
+            "required": ["entry_id", "kb_name"],
+        },
+    },
+    "kb_graph_analytics": {
+        "description": "Analyze the knowledge graph (links, object refs, and edge entities). "
+        "'pagerank' ranks the most central entries, 'communities' finds clusters of densely "
+        "connected entries, 'paths' finds the k shortest paths between two entries.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "analysis": {
+                    "type": "string",
+                    "enum": ["pagerank", "communities", "paths"],
+                    "description": "Analysis to run",
+                },
+                "kb_name": {
+                    "type": "string",
+                    "description": "Restrict to a KB (optional)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max entries or communities (default 20)",
+                },
+                "method": {
+                    "type": "string",
+                    "enum": ["louvain", "connected"],
+                    "description": "Community method (default louvain)",
+                },
+                "min_size": {
+                    "type": "integer",
+                    "description": "Minimum community size (default 2)",
+                },
+                "source_id": {"type": "string", "description": "Path start entry ID"},
+                "source_kb": {"type": "string", "description": "Path start KB"},
+                "target_id": {"type": "string", "description": "Path end entry ID"},
+                "target_kb": {
+                    "type": "string",
+                    "description": "Path end KB (default: source_kb)",
+                },
+                "k": {"type": "integer", "description": "Number of paths (default 3)"},
+                "max_length": {
+                    "type": "integer",
+                    "description": "Max hops per path (default 6)",
+                },
+            },
+            "required": ["analysis"],
+        },
+    },
     "kb_tags": {
         "description": "Get all tags with their usage counts, optionally filtered by KB. Supports hierarchical /-separated tags.",
         "inputSchema": {
@@ -1130,4 +1191,21 @@ ADMIN_TOOLS = {
             "required": ["name"],
         },
     },
+    "kb_metrics": {
+        "description": "Server metrics: per-tool and per-endpoint latency, search stage timings (FTS, vector, fusion), embedding queue and index job depth, SQLite lock waits. Histograms report count, sum, mean and the bucket bounds holding p50/p95.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "prefix": {
+                    "type": "string",
+                    "description": "Only metrics whose name starts with this (e.g. 'pyrite_search')",
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["json", "prometheus"],
+                    "description": "json (default) or Prometheus text exposition",
+                },
+            },
+        },
+    },
 }
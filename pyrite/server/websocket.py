@@ -1,5 +1,26 @@
-"""WebSocket connection manager for multi-tab awareness."""
-
+"""WebSocket fan-out for multi-tab awareness.
+
+Clients narrow what they receive by subscribing to topics — KB names, entry
+types and entry IDs — with ``{"action": "subscribe", "kb": [...],
+"entry_type": [...], "entry_id": [...]}`` (``"unsubscribe"`` removes them).
+A connection with no subscriptions receives everything, as before topics
+existed, and events that name no KB (a full sync, index progress) go to
+every connection.
+
+``publish`` may be called from any thread (sync endpoints run in the
+threadpool, index progress comes from the worker thread).  Events are
+buffered for ``COALESCE_WINDOW`` seconds; repeats of the same change (same
+type, KB and entry, or the same index job) collapse to the latest, and each
+flush sends a connection one message: the event itself, a ``changes`` batch
+when several survived, or a ``resync`` hint when more than ``MAX_BATCH``
+did.  Every connection has its own bounded send queue drained by its own
+task, so a slow browser only delays itself; when its queue overflows the
+backlog is replaced by a single ``resync`` message.
+"""
+
+from __future__ import annotations
+
+import asyncio
 import json
 import logging
 from typing import Any
@@ -8,53 +29,172 @@ from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+COALESCE_WINDOW = 0.05  # seconds
+MAX_BATCH = 200  # events per flush before a client is told to resync instead
+SEND_QUEUE_SIZE = 64  # pending messages per connection
+SEND_TIMEOUT = 10.0  # seconds before a stalled socket is dropped
+
+# Subscription topic -> event field it matches
+TOPIC_FIELDS = {"kb": "kb_name", "entry_type": "entry_type", "entry_id": "entry_id"}
+
+_RESYNC = json.dumps({"type": "resync"})
+
+
+def _coalesce_key(event: dict[str, Any]) -> tuple:
+    if event.get("job_id"):
+        return (event.get("type"), event["job_id"])
+    return (event.get("type"), event.get("kb_name"), event.get("entry_id"))
+
+
+class _Client:
+    """One connection: its topic subscriptions and bounded send queue."""
+
+    def __init__(self, ws: WebSocket, queue_size: int):
+        self.ws = ws
+        self.topics: dict[str, set[str]] = {topic: set() for topic in TOPIC_FIELDS}
+        self.queue: asyncio.Queue[str] = asyncio.Queue(queue_size)
+        self.task: asyncio.Task | None = None
+
+    def wants(self, event: dict[str, Any]) -> bool:
+        if not event.get("kb_name") or not any(self.topics.values()):
+            return True
+        return any(event.get(field) in self.topics[topic] for topic, field in TOPIC_FIELDS.items())
+
+    def offer(self, message: str) -> None:
+        """Queue a message without waiting; on overflow replace the backlog with a resync."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC)
+
 
 class ConnectionManager:
-    """Manages active WebSocket connections and broadcasts events."""
+    """Manages active WebSocket connections and fans events out by topic."""
 
-    def __init__(self):
-        self._connections: set[WebSocket] = set()
+    def __init__(self, window: float = COALESCE_WINDOW, queue_size: int = SEND_QUEUE_SIZE):
+        self.window = window
+        self.queue_size = queue_size
+        self._clients: dict[WebSocket, _Client] = {}
+        self._pending: dict[tuple, dict[str, Any]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
 
     async def connect(self, ws: WebSocket):
         await ws.accept()
-        self._connections.add(ws)
-        logger.debug("WebSocket connected, total: %d", len(self._connections))
+        self._loop = asyncio.get_running_loop()
+        client = _Client(ws, self.queue_size)
+        client.task = asyncio.create_task(self._sender(client))
+        self._clients[ws] = client
+        logger.debug("WebSocket connected, total: %d", len(self._clients))
 
     def disconnect(self, ws: WebSocket):
-        self._connections.discard(ws)
-        logger.debug("WebSocket disconnected, total: %d", len(self._connections))
+        client = self._clients.pop(ws, None)
+        if client and client.task:
+            client.task.cancel()
+        logger.debug("WebSocket disconnected, total: %d", len(self._clients))
+
+    def handle_message(self, ws: WebSocket, text: str) -> None:
+        """Apply a subscribe/unsubscribe message from a client; ignore anything else (pings)."""
+        client = self._clients.get(ws)
+        try:
+            msg = json.loads(text)
+        except ValueError:
+            return
+        if client is None or not isinstance(msg, dict):
+            return
+        action = msg.get("action")
+        if action not in ("subscribe", "unsubscribe"):
+            return
+        for topic, subscribed in client.topics.items():
+            values = msg.get(topic) or []
+            values = {values} if isinstance(values, str) else {str(v) for v in values}
+            if action == "subscribe":
+                subscribed |= values
+            else:
+                subscribed -= values
+        topics = {topic: sorted(values) for topic, values in client.topics.items()}
+        client.offer(json.dumps({"type": "subscribed", "topics": topics}))
+
+    async def _sender(self, client: _Client) -> None:
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(client.ws.send_text(message), SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.debug("WebSocket send failed, dropping connection", exc_info=True)
+            self._clients.pop(client.ws, None)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Queue an event for coalesced delivery.  Safe to call from any thread."""
+        loop = self._loop
+        if loop is None or not self._clients:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._buffer(event)
+            return
+        try:
+            loop.call_soon_threadsafe(self._buffer, event)
+        except RuntimeError:
+            pass  # Loop closed (server shutting down)
+
+    def _buffer(self, event: dict[str, Any]) -> None:
+        key = _coalesce_key(event)
+        self._pending.pop(key, None)  # keep the latest, ordered by last occurrence
+        self._pending[key] = event
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def flush(self) -> None:
+        """Deliver buffered events now: one message per interested connection."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        events = list(self._pending.values())
+        self._pending.clear()
+        if not events:
+            return
+        encoded: dict[tuple[int, ...], str] = {}
+        for client in list(self._clients.values()):
+            mine = [e for e in events if client.wants(e)]
+            if not mine:
+                continue
+            shape = tuple(id(e) for e in mine)
+            if shape not in encoded:
+                if len(mine) == 1:
+                    encoded[shape] = json.dumps(mine[0])
+                elif len(mine) > MAX_BATCH:
+                    encoded[shape] = _RESYNC
+                else:
+                    encoded[shape] = json.dumps({"type": "changes", "events": mine})
+            client.offer(encoded[shape])
 
     async def broadcast(self, event: dict[str, Any]):
-        """Broadcast an event to all connected clients."""
-        if not self._connections:
-            return
+        """Send an event to every interested client now, bypassing coalescing."""
         message = json.dumps(event)
-        dead: list[WebSocket] = []
-        for ws in self._connections:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self._connections.discard(ws)
+        for client in list(self._clients.values()):
+            if client.wants(event):
+                client.offer(message)
 
     @property
     def connection_count(self) -> int:
-        return len(self._connections)
+        return len(self._clients)
 
 
 manager = ConnectionManager()
 
 
 def broadcast_event(event_type: str, **data):
-    """Broadcast a WebSocket event, swallowing errors if no event loop is running.
+    """Publish a WebSocket event for coalesced, topic-filtered delivery.
 
-    Safe to call from sync endpoints and CLI contexts where no event loop exists.
+    Safe to call from sync endpoints, worker threads and CLI contexts; the
+    event is dropped when no client is connected.
     """
-    import asyncio
-
-    try:
-        loop = asyncio.get_running_loop()
-        loop.create_task(manager.broadcast({"type": event_type, **data}))
-    except RuntimeError:
-        pass  # No event loop (CLI context, sync test, etc.)
+    manager.publish({"type": event_type, **data})
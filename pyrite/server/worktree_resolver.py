@@ -2,6 +2,8 @@
 
 Provides WorktreeResolver as a FastAPI dependency that endpoints can use
 to get worktree-aware KBService and DB instances for authenticated users.
+Diff DBs are leased from the app's ``DiffDBPool`` for the lifetime of the
+request; the dependency releases them once the response is sent.
 """
 
 from __future__ import annotations
@@ -15,6 +17,8 @@ from pyrite.services.worktree_service import WorktreeService
 from pyrite.storage.backends.overlay_backend import WorktreeDB
 from pyrite.storage.database import PyriteDB
 
+from .diff_db_pool import DiffDBPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,22 +33,31 @@ class WorktreeResolver:
         self,
         config: PyriteConfig,
         main_db: PyriteDB,
-        diff_db_cache: dict[tuple[int, str], PyriteDB],
+        diff_db_pool: DiffDBPool,
     ):
         self._config = config
         self._main_db = main_db
         self._wt_svc = WorktreeService(config, main_db)
-        self._diff_cache = diff_db_cache
+        self._diff_pool = diff_db_pool
+        self._leased: list[PyriteDB] = []
 
     def _get_diff_db(self, user_id: int, kb_name: str) -> PyriteDB | None:
-        """Get or create a cached diff PyriteDB for a user+KB."""
+        """Lease a pooled diff PyriteDB for a user+KB until ``release``."""
         key = (user_id, kb_name)
-        if key in self._diff_cache:
-            return self._diff_cache[key]
-        diff_db = self._wt_svc.get_user_diff_db(kb_name, user_id)
-        if diff_db is not None:
-            self._diff_cache[key] = diff_db
-        return diff_db
+        path = self._wt_svc.get_user_diff_db_path(kb_name, user_id)
+        if path is None:
+            self._diff_pool.discard(key)
+            return None
+        db = self._diff_pool.acquire(key, path)
+        if db is not None:
+            self._leased.append(db)
+        return db
+
+    def release(self) -> None:
+        """Give back every diff DB leased by this resolver."""
+        leased, self._leased = self._leased, []
+        for db in leased:
+            self._diff_pool.release(db)
 
     def get_read_db(self, kb_name: str, auth_user: dict[str, Any] | None) -> PyriteDB:
         """Get a DB handle for reading, with overlay if user has pending edits.
@@ -119,13 +132,7 @@ class WorktreeResolver:
 
     def invalidate_diff_cache(self, user_id: int, kb_name: str) -> None:
         """Remove a cached diff DB after merge/reset/delete."""
-        key = (user_id, kb_name)
-        cached = self._diff_cache.pop(key, None)
-        if cached:
-            try:
-                cached.close()
-            except Exception:
-                pass
+        self._diff_pool.discard((user_id, kb_name))
 
     @property
     def worktree_service(self) -> WorktreeService:
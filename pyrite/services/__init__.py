@@ -5,12 +5,28 @@ Provides unified business logic extracted from API, CLI, and UI layers.
 Eliminates duplication and ensures consistent behavior across interfaces.
 """
 
-from .git_service import GitService
-from .kb_service import KBService
-from .query_expansion_service import QueryExpansionService
-from .repo_service import RepoService
-from .search_service import SearchMode, SearchService
-from .user_service import UserService
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .git_service import GitService
+    from .kb_service import KBService
+    from .query_expansion_service import QueryExpansionService
+    from .repo_service import RepoService
+    from .search_service import SearchMode, SearchService
+    from .user_service import UserService
+
+# Services are imported on first access so that importing one service module
+# (e.g. from the CLI) does not pull in every other service and its dependencies.
+_EXPORTS = {
+    "GitService": ".git_service",
+    "KBService": ".kb_service",
+    "QueryExpansionService": ".query_expansion_service",
+    "RepoService": ".repo_service",
+    "SearchMode": ".search_service",
+    "SearchService": ".search_service",
+    "UserService": ".user_service",
+}
 
 __all__ = [
     "GitService",
@@ -21,3 +37,12 @@ __all__ = [
     "SearchService",
     "UserService",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
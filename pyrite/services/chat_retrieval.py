@@ -0,0 +1,198 @@
+"""Retrieval for RAG chat: per-conversation cache and budgeted context.
+
+Each chat turn used to run a full hybrid search and fetch every hit's body
+before the first token could stream.  ``ChatRetriever`` keeps a small LRU of
+retrieved passages per conversation, keyed by the normalized query, the KB
+and the index generation (a token that changes whenever committed index data
+changes), so a repeated or rephrased-only-by-case question in a multi-turn
+session skips the search and the entry fetches, and a reindex invalidates
+the cache without any explicit hook.  Caches hang off the search backend
+(weakly), so two indexes in one process never share entries.
+
+``build_context`` then packs ranked passages into a token budget: passages
+are taken in rank order and each gets at most an even share of what is left,
+so a long top hit cannot crowd out the rest and short hits leave room for
+longer ones.  Tokens are estimated at four characters each.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from .kb_service import KBService
+from .search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+MIN_PASSAGE_TOKENS = 32  # stop packing once less than this is left
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different turns share a key."""
+    return " ".join(query.lower().split())
+
+
+def conversation_key(first_message: str, kb_name: str | None) -> str:
+    """Derive a stable conversation id for clients that do not send one."""
+    raw = f"{kb_name or ''}\x00{first_message}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class Passage:
+    """One ranked search hit with the text offered to the model."""
+
+    id: str
+    kb_name: str
+    title: str
+    snippet: str
+    text: str
+
+    def source(self) -> dict[str, str]:
+        return {
+            "id": self.id,
+            "kb_name": self.kb_name,
+            "title": self.title,
+            "snippet": self.snippet[:200],
+        }
+
+
+@dataclass
+class Retrieval:
+    """Result of one retrieval: ranked passages plus how they were obtained."""
+
+    passages: list[Passage]
+    cached: bool
+    search_ms: float
+    fetch_ms: float = 0.0
+    mode: str = ""
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut ``text`` to ``max_chars`` at a paragraph, line or word boundary."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max(max_chars - 2, 0)]  # room for the " …" marker
+    for sep in ("\n\n", "\n", " "):
+        pos = cut.rfind(sep)
+        if pos >= max_chars // 2:
+            return cut[:pos].rstrip() + " …"
+    return cut.rstrip() + " …"
+
+
+def build_context(passages: list[Passage], budget_tokens: int) -> Iterator[str]:
+    """Yield context blocks for ``passages`` in rank order within ``budget_tokens``."""
+    remaining = budget_tokens * CHARS_PER_TOKEN
+    for i, passage in enumerate(passages):
+        header = f"\n---\n[[{passage.id}]] {passage.title}\n"
+        overhead = len(header) + 1
+        share = remaining // (len(passages) - i) - overhead
+        if share < MIN_PASSAGE_TOKENS * CHARS_PER_TOKEN:
+            if remaining - overhead < MIN_PASSAGE_TOKENS * CHARS_PER_TOKEN:
+                return
+            share = remaining - overhead
+        block = f"{header}{_truncate(passage.text, share)}\n"
+        remaining -= len(block)
+        yield block
+
+
+class ChatRetriever:
+    """Process-wide retrieval cache for chat, bounded per conversation and overall."""
+
+    def __init__(self, max_conversations: int = 256, max_queries: int = 16):
+        self.max_conversations = max_conversations
+        self.max_queries = max_queries
+        self._caches: weakref.WeakKeyDictionary[Any, OrderedDict[str, OrderedDict]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._caches.clear()
+
+    def _get(self, backend: Any, conversation: str, key: tuple) -> list[Passage] | None:
+        with self._lock:
+            cache = self._caches.get(backend)
+            queries = cache.get(conversation) if cache is not None else None
+            if queries is None or key not in queries:
+                return None
+            cache.move_to_end(conversation)
+            queries.move_to_end(key)
+            return queries[key]
+
+    def _put(self, backend: Any, conversation: str, key: tuple, passages: list[Passage]) -> None:
+        with self._lock:
+            cache = self._caches.setdefault(backend, OrderedDict())
+            queries = cache.setdefault(conversation, OrderedDict())
+            cache.move_to_end(conversation)
+            # Entries from an older generation can never hit again.
+            for stale in [k for k in queries if k[2] != key[2]]:
+                del queries[stale]
+            queries[key] = passages
+            while len(queries) > self.max_queries:
+                queries.popitem(last=False)
+            while len(cache) > self.max_conversations:
+                cache.popitem(last=False)
+
+    def retrieve(
+        self,
+        conversation: str,
+        query: str,
+        kb_name: str | None,
+        search_svc: SearchService,
+        kb_svc: KBService,
+        limit: int = 5,
+    ) -> Retrieval:
+        """Return ranked passages for ``query``, from cache when the index is unchanged."""
+        start = time.perf_counter()
+        backend = search_svc.db.backend
+        key = (normalize_query(query), kb_name, search_svc.index_generation())
+        passages = self._get(backend, conversation, key)
+        if passages is not None:
+            return Retrieval(passages, True, (time.perf_counter() - start) * 1000)
+
+        mode = "hybrid"
+        try:
+            results = search_svc.search(query=query, kb_name=kb_name, limit=limit, mode="hybrid")
+        except Exception:
+            mode = "keyword"
+            results = search_svc.search(query=query, kb_name=kb_name, limit=limit, mode="keyword")
+        search_ms = (time.perf_counter() - start) * 1000
+
+        passages = []
+        for r in results:
+            full = kb_svc.get_entry(r["id"], kb_name=r.get("kb_name"))
+            passages.append(
+                Passage(
+                    id=r.get("id", ""),
+                    kb_name=r.get("kb_name", ""),
+                    title=r.get("title", ""),
+                    snippet=r.get("snippet") or "",
+                    text=((full or {}).get("body") or "").strip(),
+                )
+            )
+        fetch_ms = (time.perf_counter() - start) * 1000 - search_ms
+        self._put(backend, conversation, key, passages)
+        return Retrieval(passages, False, search_ms, fetch_ms, mode)
+
+
+_RETRIEVER = ChatRetriever()
+
+
+def chat_retriever() -> ChatRetriever:
+    """The shared retriever used by the chat endpoint."""
+    return _RETRIEVER
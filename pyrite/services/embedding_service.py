@@ -15,6 +15,9 @@ from ..storage.database import PyriteDB
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_DIMENSIONS = 384
+
 
 def is_available() -> bool:
     """Check if sentence-transformers is installed."""
@@ -132,36 +135,67 @@ class EmbeddingService:
 
     Uses sentence-transformers for local embedding generation and
     the SearchBackend for vector storage and KNN search.
+
+    On backends with ``supports_embedding_versions`` each KB records the
+    model its vectors came from.  Queries are embedded with that model, so
+    a KB keeps answering searches with its old vectors while
+    ``start_reembed``/``reembed_step`` fill a version for the configured
+    model in the background; the KB switches over once it is complete.
     """
 
-    def __init__(self, db: PyriteDB, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        db: PyriteDB,
+        model_name: str | None = None,
+        dimensions: int | None = None,
+    ):
         self.db = db
-        self.model_name = model_name
+        self.model_name = model_name or DEFAULT_MODEL
+        self._dimensions = dimensions
         self._model = None
+        self._other_models: dict[str, Any] = {}
+        self._version: int | None = None
+
+    def _load_model(self, model_name: str):
+        import logging
+
+        # Suppress noisy output during model loading:
+        # - transformers.disable_progress_bar() silences weight-loading tqdm bars
+        # - Log levels silence the HF load report and auth warnings
+        import transformers.utils.logging as tf_logging
+        from sentence_transformers import SentenceTransformer
+
+        tf_logging.disable_progress_bar()
+        loggers = ["transformers", "huggingface_hub"]
+        old_levels = {name: logging.getLogger(name).level for name in loggers}
+        for name in loggers:
+            logging.getLogger(name).setLevel(logging.ERROR)
+        try:
+            return SentenceTransformer(model_name)
+        finally:
+            for name, level in old_levels.items():
+                logging.getLogger(name).setLevel(level)
+            tf_logging.enable_progress_bar()
+
+    def _get_model(self, model_name: str | None = None):
+        """Lazy-load a sentence-transformers model (the configured one by default)."""
+        if model_name is None or model_name == self.model_name:
+            if self._model is None:
+                self._model = self._load_model(self.model_name)
+            return self._model
+        if model_name not in self._other_models:
+            self._other_models[model_name] = self._load_model(model_name)
+        return self._other_models[model_name]
 
-    def _get_model(self):
-        """Lazy-load the sentence-transformers model."""
-        if self._model is None:
-            import logging
-
-            # Suppress noisy output during model loading:
-            # - transformers.disable_progress_bar() silences weight-loading tqdm bars
-            # - Log levels silence the HF load report and auth warnings
-            import transformers.utils.logging as tf_logging
-            from sentence_transformers import SentenceTransformer
-
-            tf_logging.disable_progress_bar()
-            loggers = ["transformers", "huggingface_hub"]
-            old_levels = {name: logging.getLogger(name).level for name in loggers}
-            for name in loggers:
-                logging.getLogger(name).setLevel(logging.ERROR)
-            try:
-                self._model = SentenceTransformer(self.model_name)
-            finally:
-                for name, level in old_levels.items():
-                    logging.getLogger(name).setLevel(level)
-                tf_logging.enable_progress_bar()
-        return self._model
+    @property
+    def dimensions(self) -> int:
+        """Vector width of the configured model (asks the model when not configured)."""
+        if self._dimensions is None:
+            if self.model_name == DEFAULT_MODEL:
+                self._dimensions = DEFAULT_DIMENSIONS
+            else:
+                self._dimensions = int(self._get_model().get_sentence_embedding_dimension())
+        return self._dimensions
 
     def prewarm(self) -> bool:
         """Pre-load the embedding model to avoid cold-start latency.
@@ -184,14 +218,49 @@ class EmbeddingService:
         """Whether the embedding model is already loaded."""
         return self._model is not None
 
-    def embed_text(self, text: str) -> list[float]:
-        """Generate embedding for a text string."""
-        model = self._get_model()
+    def embed_text(self, text: str, model_name: str | None = None) -> list[float]:
+        """Generate embedding for a text string (with the configured model by default)."""
+        model = self._get_model(model_name)
         embedding = model.encode(text, convert_to_numpy=True)
         return embedding.tolist()
 
+    # -----------------------------------------------------------------
+    # Model versions
+    # -----------------------------------------------------------------
+
+    def _versioned(self) -> bool:
+        return getattr(self.db.backend, "supports_embedding_versions", False)
+
+    def target_version(self) -> int:
+        """Version record for the configured model and dimension."""
+        if self._version is None:
+            model = self.db.backend.register_embedding_model(self.model_name, self.dimensions)
+            self._version = model["version"]
+        return self._version
+
+    def _kb_models(self, kb_name: str) -> list[dict[str, Any]]:
+        """Versions a KB's entries are written to: active, then building."""
+        backend = self.db.backend
+        state = backend.embedding_state(kb_name)
+        if not state["recorded"]:
+            # First vectors for this KB: they come from the configured model.
+            backend.adopt_embedding_version(kb_name, self.target_version())
+            state = backend.embedding_state(kb_name)
+        return [m for m in (state["active"], state["building"]) if m]
+
+    def _store(self, entry_id: str, kb_name: str, text: str, model: dict | None) -> bool:
+        backend = self.db.backend
+        if model is None:
+            return backend.upsert_embedding(entry_id, kb_name, self.embed_text(text))
+        embedding = self.embed_text(text, model["model"])
+        return backend.upsert_embedding(entry_id, kb_name, embedding, version=model["version"])
+
     def embed_entry(self, entry_id: str, kb_name: str) -> bool:
-        """Embed a single entry and store via backend. Returns True on success."""
+        """Embed a single entry and store via backend. Returns True on success.
+
+        During a re-embed the entry is written to both the active and the
+        building version so the cutover does not lose recent edits.
+        """
         backend = self.db.backend
         if not backend.vec_available:
             return False
@@ -204,8 +273,11 @@ class EmbeddingService:
         if not text.strip():
             return False
 
-        embedding = self.embed_text(text)
-        return backend.upsert_embedding(entry_id, kb_name, embedding)
+        models = self._kb_models(kb_name) if self._versioned() else [None]
+        stored = False
+        for model in models:
+            stored = self._store(entry_id, kb_name, text, model) or stored
+        return stored
 
     def embed_all(
         self,
@@ -229,21 +301,36 @@ class EmbeddingService:
             return {"embedded": 0, "skipped": 0, "errors": 0}
 
         stats = {"embedded": 0, "skipped": 0, "errors": 0}
+        versioned = self._versioned()
 
         rows = backend.get_entries_for_embedding(kb_name)
         total = len(rows)
 
-        # Get already-embedded rowids (unless force)
-        embedded_rowids = set()
-        if not force:
-            embedded_rowids = backend.get_embedded_rowids()
+        kb_models: dict[str, list[dict[str, Any] | None]] = {}
+        # Already-embedded rowids per version (unless force)
+        embedded_rowids: dict[int | None, set[int]] = {}
 
         for i, row in enumerate(rows):
             if progress_callback:
                 progress_callback(i, total)
 
             rowid = row.get("rowid")
-            if not force and rowid in embedded_rowids:
+            kb = row["kb_name"]
+            if kb not in kb_models:
+                kb_models[kb] = self._kb_models(kb) if versioned else [None]
+            todo = []
+            for model in kb_models[kb]:
+                version = model["version"] if model else None
+                if version not in embedded_rowids:
+                    if force:
+                        embedded_rowids[version] = set()
+                    elif versioned:
+                        embedded_rowids[version] = backend.get_embedded_rowids(version=version)
+                    else:
+                        embedded_rowids[version] = backend.get_embedded_rowids()
+                if rowid not in embedded_rowids[version]:
+                    todo.append(model)
+            if not todo:
                 stats["skipped"] += 1
                 continue
 
@@ -253,8 +340,8 @@ class EmbeddingService:
                     stats["skipped"] += 1
                     continue
 
-                embedding = self.embed_text(text)
-                backend.upsert_embedding(row["id"], row["kb_name"], embedding)
+                for model in todo:
+                    self._store(row["id"], kb, text, model)
                 stats["embedded"] += 1
             except Exception as e:
                 logger.warning("Failed to embed entry %s: %s", row.get("id"), e)
@@ -265,6 +352,135 @@ class EmbeddingService:
 
         return stats
 
+    def start_reembed(self, kb_name: str) -> bool:
+        """Begin re-embedding a KB with the configured model.
+
+        Returns False when the KB's vectors already come from that model (or
+        the backend keeps a single vector per entry).  Until the rebuild
+        finishes, searches keep using the KB's current vectors.
+        """
+        backend = self.db.backend
+        if not backend.vec_available or not self._versioned():
+            return False
+        return backend.start_embedding_build(kb_name, self.target_version())
+
+    def reembed_step(self, kb_name: str, batch_size: int = 64) -> dict[str, Any]:
+        """Embed up to ``batch_size`` entries missing from a KB's building version.
+
+        Progress lives in the building vec table, so this can be called from a
+        background loop and resumed after a restart.  Once every entry with
+        text has a vector the KB is cut over and its old vectors dropped.
+        """
+        result = {"kb_name": kb_name, "embedded": 0, "errors": 0, "remaining": 0, "done": True}
+        backend = self.db.backend
+        if not backend.vec_available or not self._versioned():
+            return result
+        building = backend.embedding_state(kb_name)["building"]
+        if building is None:
+            return result
+
+        done = backend.get_embedded_rowids(version=building["version"])
+        pending = [
+            row
+            for row in backend.get_entries_for_embedding(kb_name)
+            if row["rowid"] not in done and _entry_text(row).strip()
+        ]
+        for row in pending[:batch_size]:
+            try:
+                if self._store(row["id"], kb_name, _entry_text(row), building):
+                    result["embedded"] += 1
+            except Exception as e:
+                logger.warning("Failed to re-embed entry %s: %s", row["id"], e)
+                result["errors"] += 1
+
+        result["remaining"] = len(pending) - result["embedded"]
+        result["done"] = result["remaining"] == 0
+        if result["done"]:
+            backend.finish_embedding_build(kb_name)
+            logger.info(
+                "KB '%s' now searches %s (%d dimensions)",
+                kb_name,
+                building["model"],
+                building["dimensions"],
+            )
+        return result
+
+    def reembed(
+        self, kb_name: str, batch_size: int = 64, progress_callback: Any = None
+    ) -> dict[str, Any]:
+        """Re-embed a KB with the configured model and cut over when complete."""
+        self.start_reembed(kb_name)
+        totals = {"kb_name": kb_name, "embedded": 0, "errors": 0, "remaining": 0, "done": True}
+        while True:
+            step = self.reembed_step(kb_name, batch_size=batch_size)
+            totals["embedded"] += step["embedded"]
+            totals["errors"] += step["errors"]
+            totals["remaining"] = step["remaining"]
+            totals["done"] = step["done"]
+            if progress_callback:
+                progress_callback(totals["embedded"], totals["embedded"] + step["remaining"])
+            if step["done"] or step["embedded"] == 0:
+                return totals
+
+    def advance_reembeds(self, budget: int) -> int:
+        """Spend up to ``budget`` embeddings on in-progress re-embeds; returns count."""
+        if budget <= 0 or not self._versioned() or not self.db.backend.vec_available:
+            return 0
+        spent = 0
+        for kb in self.db.backend.embedding_builds():
+            step = self.reembed_step(kb, batch_size=budget - spent)
+            spent += step["embedded"]
+            if spent >= budget:
+                break
+        return spent
+
+    def set_quantization(self, quantization: str) -> dict[int, int]:
+        """Keep (or drop) a quantized KNN copy for every version in use.
+
+        Versions already in ``quantization`` are left alone.  Returns vectors
+        quantized per changed version.
+        """
+        backend = self.db.backend
+        if not backend.vec_available or not self._versioned():
+            return {}
+        versions = set(backend.active_embedding_versions().values())
+        versions.add(self.target_version())
+        for kb in backend.embedding_builds():
+            versions.add(backend.embedding_state(kb)["building"]["version"])
+        changed = {}
+        for version in sorted(versions):
+            if backend.embedding_model(version)["quantization"] != quantization:
+                changed[version] = backend.set_embedding_quantization(version, quantization)
+        return changed
+
+    def embedding_status(self, kb_name: str | None = None) -> list[dict[str, Any]]:
+        """Active and building model per KB, flagging KBs not on the configured model."""
+        backend = self.db.backend
+        if not self._versioned():
+            return []
+        kbs = [kb_name] if kb_name else sorted(backend.active_embedding_versions())
+        status = []
+        for kb in kbs:
+            state = backend.embedding_state(kb)
+            active = state["active"]
+            status.append(
+                {
+                    "kb_name": kb,
+                    "model": active["model"],
+                    "dimensions": active["dimensions"],
+                    "quantization": active["quantization"],
+                    "version": active["version"],
+                    "building": state["building"],
+                    "current": (active["model"], active["dimensions"])
+                    == (self.model_name, self.dimensions),
+                }
+            )
+        return status
+
+    # -----------------------------------------------------------------
+    # Search
+    # -----------------------------------------------------------------
+
     def search_similar(
         self,
         query: str,
@@ -288,13 +504,16 @@ class EmbeddingService:
         if not backend.vec_available:
             return []
 
-        embedding = self.embed_text(query)
-        results = backend.search_semantic(
-            embedding=embedding,
-            kb_name=kb_name,
-            limit=limit,
-            max_distance=max_distance,
-        )
+        if self._versioned():
+            results = self._search_versions(query, kb_name, limit, max_distance)
+        else:
+            embedding = self.embed_text(query)
+            results = backend.search_semantic(
+                embedding=embedding,
+                kb_name=kb_name,
+                limit=limit,
+                max_distance=max_distance,
+            )
 
         # Add relevance-aware snippets to results
         for entry in results:
@@ -303,6 +522,34 @@ class EmbeddingService:
 
         return results
 
+    def _search_versions(
+        self, query: str, kb_name: str | None, limit: int, max_distance: float
+    ) -> list[dict[str, Any]]:
+        """Search each active version with a query embedded by its own model."""
+        backend = self.db.backend
+        if kb_name:
+            models = [backend.embedding_state(kb_name)["active"]]
+        else:
+            versions = sorted(set(backend.active_embedding_versions().values()))
+            models = [backend.embedding_model(v) for v in versions]
+        queries: dict[str, list[float]] = {}
+        results: list[dict[str, Any]] = []
+        for model in models:
+            if model["model"] not in queries:
+                queries[model["model"]] = self.embed_text(query, model["model"])
+            results.extend(
+                backend.search_semantic(
+                    embedding=queries[model["model"]],
+                    kb_name=kb_name,
+                    limit=limit,
+                    max_distance=max_distance,
+                    version=model["version"],
+                )
+            )
+        if len(models) > 1:
+            results.sort(key=lambda r: r.get("distance", 0))
+        return results[:limit]
+
     def has_embeddings(self) -> bool:
         """Check if any embeddings exist in the database."""
         return self.db.backend.has_embeddings()
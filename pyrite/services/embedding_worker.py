@@ -12,11 +12,17 @@ Usage:
     worker.enqueue("entry-id", "kb-name")
     processed = worker.process_batch(batch_size=10)
     status = worker.get_status()
+
+Batches not filled by queued entries advance any in-progress KB re-embeds
+(see EmbeddingService.start_reembed), so model upgrades run in the same
+background loop without blocking writes or searches.
 """
 
 import logging
+import time
 from datetime import UTC, datetime
 
+from ..metrics import EMBED_BATCH_SECONDS, acquire_write_lock
 from ..storage.database import PyriteDB
 
 logger = logging.getLogger(__name__)
@@ -25,9 +31,17 @@ logger = logging.getLogger(__name__)
 class EmbeddingWorker:
     """Background embedding worker with SQLite-backed queue."""
 
-    def __init__(self, db: PyriteDB, max_attempts: int = 3):
+    def __init__(
+        self,
+        db: PyriteDB,
+        max_attempts: int = 3,
+        model_name: str | None = None,
+        dimensions: int | None = None,
+    ):
         self.db = db
         self.max_attempts = max_attempts
+        self.model_name = model_name
+        self.dimensions = dimensions
         self._embedding_svc = None
         self._ensure_table()
 
@@ -49,6 +63,7 @@ class EmbeddingWorker:
     def enqueue(self, entry_id: str, kb_name: str) -> None:
         """Add an entry to the embedding queue. Idempotent — skips if already queued."""
         now = datetime.now(UTC).isoformat()
+        acquire_write_lock(self.db._raw_conn, "embed_queue")
         self.db._raw_conn.execute(
             """
             INSERT OR IGNORE INTO embed_queue (entry_id, kb_name, queued_at, status, attempts)
@@ -59,7 +74,10 @@ class EmbeddingWorker:
         self.db._raw_conn.commit()
 
     def process_batch(self, batch_size: int = 10) -> int:
-        """Process up to batch_size pending entries. Returns count of successfully embedded."""
+        """Process up to batch_size pending entries, then re-embed work with what is left.
+
+        Returns count of successfully embedded entries.
+        """
         rows = self.db._raw_conn.execute(
             """
             SELECT entry_id, kb_name, attempts FROM embed_queue
@@ -70,7 +88,8 @@ class EmbeddingWorker:
             (self.max_attempts, batch_size),
         ).fetchall()
 
-        if not rows:
+        rebuilding = len(rows) < batch_size and self._has_reembeds()
+        if not rows and not rebuilding:
             return 0
 
         svc = self._get_embedding_svc()
@@ -78,12 +97,14 @@ class EmbeddingWorker:
             logger.debug("Embedding service not available, skipping batch")
             return 0
 
+        start = time.perf_counter()
         success_count = 0
         for row in rows:
             entry_id, kb_name, attempts = row[0], row[1], row[2]
             try:
                 svc.embed_entry(entry_id, kb_name)
                 # Mark as done — delete from queue
+                acquire_write_lock(self.db._raw_conn, "embed_queue")
                 self.db._raw_conn.execute(
                     "DELETE FROM embed_queue WHERE entry_id = ? AND kb_name = ?",
                     (entry_id, kb_name),
@@ -92,6 +113,7 @@ class EmbeddingWorker:
             except Exception as e:
                 new_attempts = attempts + 1
                 new_status = "failed" if new_attempts >= self.max_attempts else "pending"
+                acquire_write_lock(self.db._raw_conn, "embed_queue")
                 self.db._raw_conn.execute(
                     """
                     UPDATE embed_queue
@@ -109,19 +131,32 @@ class EmbeddingWorker:
                 )
 
         self.db._raw_conn.commit()
+        if rebuilding:
+            success_count += svc.advance_reembeds(batch_size - len(rows))
+        EMBED_BATCH_SECONDS.observe(time.perf_counter() - start)
         return success_count
 
+    def _has_reembeds(self) -> bool:
+        backend = self.db.backend
+        return getattr(backend, "supports_embedding_versions", False) and bool(
+            backend.embedding_builds()
+        )
+
     def get_status(self) -> dict:
-        """Get queue status: counts by status."""
+        """Get queue status: counts by status and KBs being re-embedded."""
         rows = self.db._raw_conn.execute(
             "SELECT status, COUNT(*) FROM embed_queue GROUP BY status"
         ).fetchall()
         counts = {r[0]: r[1] for r in rows}
+        backend = self.db.backend
         return {
             "pending": counts.get("pending", 0),
             "processing": counts.get("processing", 0),
             "failed": counts.get("failed", 0),
             "total": sum(counts.values()),
+            "reembedding": backend.embedding_builds()
+            if getattr(backend, "supports_embedding_versions", False)
+            else [],
         }
 
     def _get_embedding_svc(self):
@@ -132,7 +167,9 @@ class EmbeddingWorker:
             from .embedding_service import EmbeddingService, is_available
 
             if is_available() and self.db.vec_available:
-                self._embedding_svc = EmbeddingService(self.db)
+                self._embedding_svc = EmbeddingService(
+                    self.db, model_name=self.model_name, dimensions=self.dimensions
+                )
                 return self._embedding_svc
         except Exception:
             logger.warning("Embedding service initialization failed in worker", exc_info=True)
@@ -0,0 +1,466 @@
+"""
+Graph Analytics
+
+Centrality, community and path analysis over the knowledge graph.
+
+Algorithms run over the backend's cached ``LinkGraph`` built with
+``include_refs=True``, so links, object refs (``entry_ref``) and edge
+entities (``edge_endpoint``) all contribute edges.  PageRank is vectorized
+with NumPy when it is installed and falls back to pure Python otherwise.
+
+Results are cached per database and KB scope.  When an index sync changes
+the graph, the next request recomputes incrementally: PageRank restarts
+from the previous score vector and Louvain from the previous partition, so
+small edits converge in a few iterations instead of a cold start.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import weakref
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..storage.backends.link_graph import LinkGraph
+
+
+def pagerank(
+    graph: LinkGraph,
+    damping: float = 0.85,
+    tol: float = 1e-6,
+    max_iter: int = 100,
+    initial: list[float] | None = None,
+) -> list[float]:
+    """Compute PageRank over directed edges by power iteration.
+
+    Mass on dangling nodes (no outgoing edges) is spread uniformly.  Parallel
+    edges count as extra weight.  ``initial`` warm-starts the iteration.
+    """
+    n = len(graph)
+    if n == 0:
+        return []
+    try:
+        import numpy as np
+    except ImportError:
+        return _pagerank_python(graph, damping, tol, max_iter, initial)
+
+    offsets = np.frombuffer(graph.out_offsets, dtype=np.int32)
+    out_deg = np.diff(offsets)
+    src = np.repeat(np.arange(n), out_deg)
+    dst = np.frombuffer(graph.out_targets, dtype=np.int32)
+    inv_deg = np.divide(1.0, out_deg, out=np.zeros(n), where=out_deg > 0)
+    dangling = out_deg == 0
+
+    rank = np.full(n, 1.0 / n) if initial is None else np.asarray(initial, dtype=float)
+    rank = rank / rank.sum() if rank.sum() > 0 else np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = np.bincount(dst, weights=(rank * inv_deg)[src], minlength=n)
+        new = damping * (spread + rank[dangling].sum() / n) + (1.0 - damping) / n
+        err = np.abs(new - rank).sum()
+        rank = new
+        if err < n * tol:
+            break
+    return rank.tolist()
+
+
+def _pagerank_python(
+    graph: LinkGraph,
+    damping: float,
+    tol: float,
+    max_iter: int,
+    initial: list[float] | None,
+) -> list[float]:
+    n = len(graph)
+    offsets, targets = graph.out_offsets, graph.out_targets
+    out_deg = [offsets[i + 1] - offsets[i] for i in range(n)]
+    rank = list(initial) if initial is not None else [1.0 / n] * n
+    total = sum(rank)
+    rank = [r / total for r in rank] if total > 0 else [1.0 / n] * n
+    for _ in range(max_iter):
+        dangling_mass = sum(rank[i] for i in range(n) if out_deg[i] == 0)
+        base = (1.0 - damping) / n + damping * dangling_mass / n
+        new = [base] * n
+        for i in range(n):
+            if out_deg[i]:
+                share = damping * rank[i] / out_deg[i]
+                for k in range(offsets[i], offsets[i + 1]):
+                    new[targets[k]] += share
+        err = sum(abs(a - b) for a, b in zip(new, rank, strict=True))
+        rank = new
+        if err < n * tol:
+            break
+    return rank
+
+
+def connected_components(graph: LinkGraph) -> list[int]:
+    """Label weakly connected components; returns a component ID per node."""
+    n = len(graph)
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for u, v, _relation in graph.iter_edges():
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            parent[max(ru, rv)] = min(ru, rv)
+    return _renumber([find(i) for i in range(n)])
+
+
+def louvain_communities(
+    graph: LinkGraph,
+    resolution: float = 1.0,
+    initial: list[int] | None = None,
+    max_levels: int = 10,
+) -> list[int]:
+    """Detect communities by greedy modularity optimisation (Louvain method).
+
+    Edges are treated as undirected; parallel edges add weight and self-links
+    are ignored.  Nodes are visited in index order so results are
+    deterministic.  ``initial`` seeds the first level's partition.
+    """
+    n = len(graph)
+    adj: list[dict[int, float]] = [defaultdict(float) for _ in range(n)]
+    for u, v, _relation in graph.iter_edges():
+        if u != v:
+            adj[u][v] += 1.0
+            adj[v][u] += 1.0
+    membership = list(range(n))
+    comm = list(initial) if initial is not None and len(initial) == n else list(range(n))
+
+    for level in range(max_levels):
+        size = len(adj)
+        degree = [sum(nbrs.values()) for nbrs in adj]
+        m2 = sum(degree)
+        if m2 == 0:
+            break
+        totals: dict[int, float] = defaultdict(float)
+        for i in range(size):
+            totals[comm[i]] += degree[i]
+
+        moved = False
+        improved = True
+        while improved:
+            improved = False
+            for i in range(size):
+                ci, ki = comm[i], degree[i]
+                weights: dict[int, float] = defaultdict(float)
+                for j, w in adj[i].items():
+                    if j != i:
+                        weights[comm[j]] += w
+                totals[ci] -= ki
+                best = ci
+                best_gain = weights.get(ci, 0.0) - resolution * totals[ci] * ki / m2
+                for c, w in weights.items():
+                    gain = w - resolution * totals[c] * ki / m2
+                    if gain > best_gain + 1e-12:
+                        best, best_gain = c, gain
+                totals[best] += ki
+                if best != ci:
+                    comm[i] = best
+                    improved = moved = True
+
+        comm = _renumber(comm)
+        membership = [comm[c] for c in membership]
+        if not moved and level > 0:
+            break
+
+        # Aggregate each community into a single node and repeat.
+        count = max(comm) + 1
+        merged: list[dict[int, float]] = [defaultdict(float) for _ in range(count)]
+        for i in range(size):
+            ci = comm[i]
+            for j, w in adj[i].items():
+                merged[ci][comm[j]] += w
+        if count == size:
+            break
+        adj = merged
+        comm = list(range(count))
+    return membership
+
+
+def k_shortest_paths(
+    graph: LinkGraph,
+    source: int,
+    target: int,
+    k: int = 3,
+    max_length: int = 6,
+) -> list[list[int]]:
+    """Find up to ``k`` loopless shortest paths (Yen's algorithm, unit weights).
+
+    Edges are followed in both directions.  Paths longer than ``max_length``
+    hops are not considered.
+    """
+    first = _bfs_path(graph, source, target, set(), set(), max_length)
+    if first is None:
+        return []
+    paths = [first]
+    candidates: list[tuple[int, list[int]]] = []
+    seen = {tuple(first)}
+    while len(paths) < k:
+        prev = paths[-1]
+        for i in range(len(prev) - 1):
+            root = prev[: i + 1]
+            banned_edges: set[tuple[int, int]] = set()
+            for p in paths:
+                if p[: i + 1] == root and len(p) > i + 1:
+                    banned_edges.add((p[i], p[i + 1]))
+                    banned_edges.add((p[i + 1], p[i]))
+            spur = _bfs_path(graph, prev[i], target, set(root[:-1]), banned_edges, max_length - i)
+            if spur is None:
+                continue
+            candidate = root[:-1] + spur
+            if tuple(candidate) not in seen:
+                seen.add(tuple(candidate))
+                heapq.heappush(candidates, (len(candidate), candidate))
+        if not candidates:
+            break
+        paths.append(heapq.heappop(candidates)[1])
+    return paths
+
+
+def _bfs_path(
+    graph: LinkGraph,
+    source: int,
+    target: int,
+    banned_nodes: set[int],
+    banned_edges: set[tuple[int, int]],
+    max_length: int,
+) -> list[int] | None:
+    if source == target:
+        return [source]
+    prev = {source: -1}
+    depth = {source: 0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if depth[u] >= max_length:
+            continue
+        for v in _undirected_neighbours(graph, u):
+            if v in prev or v in banned_nodes or (u, v) in banned_edges:
+                continue
+            prev[v] = u
+            depth[v] = depth[u] + 1
+            if v == target:
+                path = [v]
+                while prev[path[-1]] != -1:
+                    path.append(prev[path[-1]])
+                return path[::-1]
+            queue.append(v)
+    return None
+
+
+def _undirected_neighbours(graph: LinkGraph, i: int):
+    for k in range(graph.out_offsets[i], graph.out_offsets[i + 1]):
+        yield graph.out_targets[k]
+    for k in range(graph.in_offsets[i], graph.in_offsets[i + 1]):
+        yield graph.in_sources[k]
+
+
+def _renumber(labels: list[int]) -> list[int]:
+    """Map arbitrary labels to 0..n-1 in order of first appearance."""
+    mapping: dict[int, int] = {}
+    return [mapping.setdefault(label, len(mapping)) for label in labels]
+
+
+# =========================================================================
+# Per-KB result cache
+# =========================================================================
+
+
+@dataclass
+class _AnalyticsState:
+    graph: LinkGraph
+    pagerank: list[float] | None = None
+    components: list[int] | None = None
+    communities: list[int] | None = None
+    previous: _AnalyticsState | None = field(default=None, repr=False)
+
+    def carry_over(self, values: list | None, default: Any) -> list | None:
+        """Map a previous per-node result onto this graph's node indices."""
+        prev = self.previous
+        if prev is None or values is None:
+            return None
+        return [
+            values[j] if (j := prev.graph.index_of(*key)) is not None else default
+            for key in self.graph.keys
+        ]
+
+    def release_previous(self) -> None:
+        """Drop the warm-start state once every warm-startable result is fresh."""
+        if self.pagerank is not None and self.communities is not None:
+            self.previous = None
+
+
+_STATES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_STATES_LOCK = threading.Lock()
+
+
+class GraphAnalytics:
+    """Cached graph analytics for one database.
+
+    Instances are cheap; state is shared per database object so every
+    ``GraphService`` over the same ``PyriteDB`` reuses the same results.
+    """
+
+    def __init__(self, db: Any):
+        self.db = db
+
+    def _state(self, kb_name: str | None) -> _AnalyticsState | None:
+        graph = self.db.get_link_graph(kb_name, include_refs=True)
+        if graph is None:
+            return None
+        with _STATES_LOCK:
+            try:
+                states = _STATES.setdefault(self.db, {})
+            except TypeError:
+                states = {}
+            state = states.get(kb_name)
+            if state is None or state.graph is not graph:
+                if state is not None:
+                    state.previous = None
+                state = _AnalyticsState(graph=graph, previous=state)
+                states[kb_name] = state
+        return state
+
+    def _node(self, graph: LinkGraph, i: int) -> dict[str, Any]:
+        entry_id, kb_name = graph.keys[i]
+        return {
+            "id": entry_id,
+            "kb_name": kb_name,
+            "title": graph.titles[i] or entry_id,
+            "entry_type": graph.entry_types[i] or "unknown",
+        }
+
+    @staticmethod
+    def _in_scope(graph: LinkGraph, i: int, kb_name: str | None) -> bool:
+        return bool(graph.exists[i]) and (not kb_name or graph.keys[i][1] == kb_name)
+
+    def pagerank(self, kb_name: str | None = None, limit: int = 20) -> list[dict[str, Any]]:
+        """Top entries by PageRank score."""
+        state = self._state(kb_name)
+        if state is None:
+            return []
+        graph = state.graph
+        if state.pagerank is None:
+            initial = state.carry_over(
+                state.previous.pagerank if state.previous else None, 1.0 / max(len(graph), 1)
+            )
+            state.pagerank = pagerank(graph, initial=initial)
+            state.release_previous()
+        scores = state.pagerank
+        ranked = sorted(
+            (i for i in range(len(graph)) if self._in_scope(graph, i, kb_name)),
+            key=lambda i: scores[i],
+            reverse=True,
+        )
+        return [
+            {
+                **self._node(graph, i),
+                "score": scores[i],
+                "in_degree": graph.in_degree(i),
+                "out_degree": graph.out_degree(i),
+            }
+            for i in ranked[:limit]
+        ]
+
+    def communities(
+        self,
+        kb_name: str | None = None,
+        method: str = "louvain",
+        min_size: int = 2,
+        limit: int = 20,
+        member_limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Communities (``louvain``) or connected components (``connected``), largest first."""
+        if method not in ("louvain", "connected"):
+            raise ValueError(f"Unknown community method: {method!r}")
+        state = self._state(kb_name)
+        if state is None:
+            return []
+        graph = state.graph
+        if method == "connected":
+            if state.components is None:
+                state.components = connected_components(graph)
+            labels = state.components
+        else:
+            if state.communities is None:
+                initial = state.carry_over(
+                    state.previous.communities if state.previous else None, -1
+                )
+                if initial is not None:
+                    # New nodes start in singleton communities.
+                    next_label = max(initial, default=-1) + 1
+                    for i, label in enumerate(initial):
+                        if label == -1:
+                            initial[i] = next_label
+                            next_label += 1
+                state.communities = louvain_communities(graph, initial=initial)
+                state.release_previous()
+            labels = state.communities
+
+        groups: dict[int, list[int]] = defaultdict(list)
+        for i, label in enumerate(labels):
+            if self._in_scope(graph, i, kb_name):
+                groups[label].append(i)
+        ranked = sorted(
+            (members for members in groups.values() if len(members) >= min_size),
+            key=len,
+            reverse=True,
+        )
+        scores = state.pagerank
+        result = []
+        for number, members in enumerate(ranked[:limit]):
+            if scores is not None:
+                members = sorted(members, key=lambda i: scores[i], reverse=True)
+            result.append(
+                {
+                    "community": number,
+                    "size": len(members),
+                    "members": [self._node(graph, i) for i in members[:member_limit]],
+                }
+            )
+        return result
+
+    def shortest_paths(
+        self,
+        source_id: str,
+        source_kb: str,
+        target_id: str,
+        target_kb: str,
+        k: int = 3,
+        max_length: int = 6,
+        kb_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Up to ``k`` shortest paths between two entries, each with per-hop relations."""
+        state = self._state(kb_name)
+        if state is None:
+            return []
+        graph = state.graph
+        source = graph.index_of(source_id, source_kb)
+        target = graph.index_of(target_id, target_kb)
+        if source is None or target is None:
+            return []
+        paths = []
+        for path in k_shortest_paths(graph, source, target, k=k, max_length=max_length):
+            hops = []
+            for u, v in zip(path, path[1:], strict=False):
+                relation = next((r for t, r in graph.out_edges(u) if t == v), None)
+                direction = "out"
+                if relation is None:
+                    relation = next((r for s, r in graph.in_edges(u) if s == v), None)
+                    direction = "in"
+                hops.append({"relation": relation, "direction": direction})
+            paths.append(
+                {
+                    "length": len(path) - 1,
+                    "nodes": [self._node(graph, i) for i in path],
+                    "hops": hops,
+                }
+            )
+        return paths
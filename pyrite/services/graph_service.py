@@ -7,6 +7,7 @@ Graph and link operations for knowledge base entries.
 from typing import Any
 
 from ..storage.database import PyriteDB
+from .graph_analytics import GraphAnalytics
 
 
 class GraphService:
@@ -34,6 +35,63 @@ class GraphService:
             limit=limit,
         )
 
+    def get_related_entries(
+        self, entry_id: str, kb_name: str, limit: int = 5
+    ) -> list[dict[str, Any]]:
+        """Get entries sharing actors/tags with an entry, from the precomputed index."""
+        return self.db.get_related_entries(entry_id, kb_name, limit=limit)
+
+    # =========================================================================
+    # Analytics (links + object refs + edge entities)
+    # =========================================================================
+
+    @property
+    def analytics(self) -> GraphAnalytics:
+        """Cached analytics over this database's graph."""
+        return GraphAnalytics(self.db)
+
+    def get_pagerank(self, kb_name: str | None = None, limit: int = 20) -> list[dict[str, Any]]:
+        """Get the most central entries by PageRank score."""
+        return self.analytics.pagerank(kb_name=kb_name, limit=limit)
+
+    def get_communities(
+        self,
+        kb_name: str | None = None,
+        method: str = "louvain",
+        min_size: int = 2,
+        limit: int = 20,
+        member_limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Get entry clusters: Louvain communities or connected components."""
+        return self.analytics.communities(
+            kb_name=kb_name,
+            method=method,
+            min_size=min_size,
+            limit=limit,
+            member_limit=member_limit,
+        )
+
+    def get_shortest_paths(
+        self,
+        source_id: str,
+        source_kb: str,
+        target_id: str,
+        target_kb: str,
+        k: int = 3,
+        max_length: int = 6,
+        kb_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get up to k shortest paths between two entries."""
+        return self.analytics.shortest_paths(
+            source_id,
+            source_kb,
+            target_id,
+            target_kb,
+            k=k,
+            max_length=max_length,
+            kb_name=kb_name,
+        )
+
     def get_refs_to(self, entry_id: str, kb_name: str) -> list[dict[str, Any]]:
         """Get entries that reference this entry via object-ref fields."""
         return self.db.get_refs_to(entry_id, kb_name)
@@ -13,11 +13,13 @@ Usage:
 
 import logging
 import threading
+import time
 import uuid
 from collections.abc import Callable
 from datetime import UTC, datetime
 
 from ..config import PyriteConfig
+from ..metrics import INDEX_JOB_SECONDS, acquire_write_lock
 from ..storage.database import PyriteDB
 from ..storage.index import IndexManager
 
@@ -156,6 +158,7 @@ class IndexWorker:
         """
         db = PyriteDB(self.db.db_path)
         index_mgr = IndexManager(db, self.config)
+        start, outcome = time.perf_counter(), "failed"
         try:
             self._update_status(db, job_id, "running")
 
@@ -175,6 +178,7 @@ class IndexWorker:
                 (results["added"], results["updated"], results["removed"], now, job_id),
             )
             db._raw_conn.commit()
+            outcome = "completed"
         except Exception as e:
             logger.error("Index sync job %s failed: %s", job_id, e, exc_info=True)
             now = datetime.now(UTC).isoformat()
@@ -191,6 +195,9 @@ class IndexWorker:
             except Exception:
                 logger.debug("Failed to update job status after error", exc_info=True)
         finally:
+            INDEX_JOB_SECONDS.observe(
+                time.perf_counter() - start, operation="sync", outcome=outcome
+            )
             db.close()
 
     def _run_rebuild(self, job_id: str, kb_name: str):
@@ -200,6 +207,7 @@ class IndexWorker:
         """
         db = PyriteDB(self.db.db_path)
         index_mgr = IndexManager(db, self.config)
+        start, outcome = time.perf_counter(), "failed"
         try:
             self._update_status(db, job_id, "running")
 
@@ -218,6 +226,7 @@ class IndexWorker:
                 (count, now, job_id),
             )
             db._raw_conn.commit()
+            outcome = "completed"
         except Exception as e:
             logger.error("Index rebuild job %s failed: %s", job_id, e, exc_info=True)
             now = datetime.now(UTC).isoformat()
@@ -234,11 +243,15 @@ class IndexWorker:
             except Exception:
                 logger.debug("Failed to update job status after error", exc_info=True)
         finally:
+            INDEX_JOB_SECONDS.observe(
+                time.perf_counter() - start, operation="rebuild", outcome=outcome
+            )
             db.close()
 
     @staticmethod
     def _update_status(db: PyriteDB, job_id: str, status: str):
         """Update job status using the given DB connection."""
+        acquire_write_lock(db._raw_conn, "index_job")
         db._raw_conn.execute(
             "UPDATE index_job SET status = ? WHERE job_id = ?",
             (status, job_id),
@@ -247,6 +260,7 @@ class IndexWorker:
 
     def _update_progress(self, db: PyriteDB, job_id: str, current: int, total: int):
         """Update progress columns and optionally call on_progress callback."""
+        acquire_write_lock(db._raw_conn, "index_job")
         db._raw_conn.execute(
             "UPDATE index_job SET progress_current = ?, progress_total = ? WHERE job_id = ?",
             (current, total, job_id),
@@ -73,7 +73,9 @@ class KBService:
 
             if is_available() and self.db.vec_available:
                 self._embedding_svc = EmbeddingService(
-                    self.db, model_name=self.config.settings.embedding_model
+                    self.db,
+                    model_name=self.config.settings.embedding_model,
+                    dimensions=self.config.settings.embedding_dimensions,
                 )
         except Exception:
             logger.warning("Embedding service initialization failed", exc_info=True)
@@ -756,24 +758,36 @@ class KBService:
         """Search entries by tag prefix (includes child tags)."""
         return self.db.search_by_tag_prefix(prefix, kb_name=kb_name, limit=limit)
 
+    def _kb_summary(self, kb_name: str, tag_limit: int) -> dict[str, Any]:
+        """Entry total, per-type counts and top tags for a KB.
+
+        Read from the materialized ``kb_stat`` counters; overlay (worktree)
+        DBs return None there and are counted through the overlay instead.
+        """
+        summary = self.db.get_kb_summary(kb_name, tag_limit=tag_limit)
+        if summary is not None:
+            return summary
+        types = [
+            {"type": t, "count": self.count_entries(kb_name=kb_name, entry_type=t)}
+            for t in self.get_distinct_types(kb_name=kb_name)
+        ]
+        types.sort(key=lambda x: x["count"], reverse=True)
+        return {
+            "total_entries": self.count_entries(kb_name=kb_name),
+            "types": types,
+            "top_tags": self.get_tags(kb_name=kb_name, limit=tag_limit) if tag_limit else [],
+        }
+
     def orient(self, kb_name: str, recent_limit: int = 5) -> dict[str, Any]:
         """One-shot KB orientation summary for agents entering a new KB."""
         kb_config = self.config.get_kb(kb_name)
         if not kb_config:
             raise KBNotFoundError(f"KB '{kb_name}' not found")
 
-        total = self.count_entries(kb_name=kb_name)
-        distinct_types = self.get_distinct_types(kb_name=kb_name)
-
-        # Per-type counts
-        types = []
-        for t in distinct_types:
-            count = self.count_entries(kb_name=kb_name, entry_type=t)
-            types.append({"type": t, "count": count})
-        types.sort(key=lambda x: x["count"], reverse=True)
-
-        # Top tags
-        top_tags = self.get_tags(kb_name=kb_name, limit=10)
+        summary = self._kb_summary(kb_name, tag_limit=10)
+        total = summary["total_entries"]
+        types = summary["types"]
+        top_tags = summary["top_tags"]
 
         # Recent entries (slim)
         recent = self.list_entries(
@@ -832,15 +846,9 @@ class KBService:
             raise KBNotFoundError(f"KB not found: {kb_name}")
 
         description = kb_config.description or ""
-        total = self.count_entries(kb_name=kb_name)
-        distinct_types = self.get_distinct_types(kb_name=kb_name)
-
-        # Per-type counts
-        type_counts: list[tuple[str, int]] = []
-        for t in distinct_types:
-            count = self.count_entries(kb_name=kb_name, entry_type=t)
-            type_counts.append((t, count))
-        type_counts.sort(key=lambda x: x[1], reverse=True)
+        summary = self._kb_summary(kb_name, tag_limit=0)
+        total = summary["total_entries"]
+        type_counts = [(t["type"], t["count"]) for t in summary["types"]]
 
         # Build markdown
         lines: list[str] = [f"# {kb_name}", ""]
@@ -1222,9 +1230,9 @@ class KBService:
         if len(parts) < 3:
             return None
         try:
-            from ..utils.yaml import load_yaml
+            from ..utils.yaml import load_yaml_fast
 
-            return load_yaml(parts[1])
+            return load_yaml_fast(parts[1])
         except Exception:
             return None
 
@@ -9,10 +9,13 @@ from __future__ import annotations
 
 import logging
 import re
+from array import array
+from collections.abc import Iterator
 from typing import Any
 
 from ..config import PyriteConfig
 from ..storage.database import PyriteDB
+from .similarity import cosine_to_score, top_k_neighbors
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +26,31 @@ class LinkDiscoveryService:
     def __init__(self, config: PyriteConfig, db: PyriteDB):
         self.config = config
         self.db = db
+        self._kb_svc = None
+        self._search_svc = None
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @property
+    def kb_service(self):
+        """KBService shared by every lookup this service makes."""
+        if self._kb_svc is None:
+            from .kb_service import KBService
+
+            self._kb_svc = KBService(self.config, self.db)
+        return self._kb_svc
+
+    @property
+    def search_service(self):
+        """SearchService shared by every search this service makes."""
+        if self._search_svc is None:
+            from .search_service import SearchService
+
+            self._search_svc = SearchService(self.db, settings=self.config.settings)
+        return self._search_svc
+
     @staticmethod
     def build_suggest_query(entry: dict) -> str:
         """Build an FTS5 OR query from an entry's title words and tags.
@@ -68,11 +91,7 @@ class LinkDiscoveryService:
         Returns a list of candidate dicts with id, kb_name, title, entry_type,
         score, and snippet.
         """
-        from .kb_service import KBService
-        from .search_service import SearchService
-
-        svc = KBService(self.config, self.db)
-        entry = svc.get_entry(entry_id, kb_name=kb_name)
+        entry = self.kb_service.get_entry(entry_id, kb_name=kb_name)
         if entry is None:
             return []
 
@@ -80,7 +99,7 @@ class LinkDiscoveryService:
         if not query.strip():
             return []
 
-        search_svc = SearchService(self.db, settings=self.config.settings)
+        search_svc = self.search_service
         search_kb = target_kb or kb_name
 
         # Fetch extra results so we can filter out self and existing links
@@ -138,11 +157,7 @@ class LinkDiscoveryService:
         Supports keyword, semantic, and hybrid modes. Falls back to keyword
         if semantic embeddings are not available.
         """
-        from .kb_service import KBService
-        from .search_service import SearchService
-
-        svc = KBService(self.config, self.db)
-        entry = svc.get_entry(entry_id, kb_name=kb_name)
+        entry = self.kb_service.get_entry(entry_id, kb_name=kb_name)
         if entry is None:
             return []
 
@@ -186,9 +201,7 @@ class LinkDiscoveryService:
             except (ImportError, AttributeError):
                 actual_mode = "keyword"
 
-        search_svc = SearchService(self.db, settings=self.config.settings)
-
-        raw_results = search_svc.search(
+        raw_results = self.search_service.search(
             query=query,
             kb_name=target_kb,
             limit=limit + 30,
@@ -248,13 +261,31 @@ class LinkDiscoveryService:
     ) -> list[dict]:
         """Find all potential cross-KB links between two KBs.
 
-        For each entry in source_kb, runs discover_neighbors against target_kb,
-        then deduplicates bidirectional matches and sorts by score.
+        In semantic mode, when both KBs have stored embeddings, neighbours
+        come from one blocked matrix pass over the stored vectors (see
+        ``iter_batch_suggestions``).  Otherwise, including when the KBs' active
+        vectors come from different embedding models, runs discover_neighbors
+        for each entry in source_kb against target_kb.  Either way
+        bidirectional matches are deduplicated and pairs sorted by score.
         """
-        from .kb_service import KBService
-
-        svc = KBService(self.config, self.db)
-        source_entries = svc.list_entries(kb_name=source_kb, limit=10000)
+        if mode == "semantic" and self._same_embedding_model(source_kb, target_kb):
+            source_vectors = self._kb_vectors(source_kb)
+            target_vectors = self._kb_vectors(target_kb) if source_vectors else []
+            if source_vectors and target_vectors:
+                pairs = list(
+                    self._vector_suggestions(
+                        source_kb,
+                        source_vectors,
+                        target_kb,
+                        target_vectors,
+                        limit_per_entry,
+                        exclude_linked,
+                    )
+                )
+                pairs.sort(key=lambda x: x["score"], reverse=True)
+                return pairs
+
+        source_entries = self.kb_service.list_entries(kb_name=source_kb, limit=10000)
 
         all_pairs: list[dict] = []
         seen_pairs: set[tuple[str, ...]] = set()
@@ -292,6 +323,153 @@ class LinkDiscoveryService:
         all_pairs.sort(key=lambda x: x["score"], reverse=True)
         return all_pairs
 
+    def iter_batch_suggestions(
+        self,
+        source_kb: str,
+        target_kb: str,
+        limit_per_entry: int = 3,
+        exclude_linked: bool = True,
+        block_size: int = 512,
+    ) -> Iterator[dict]:
+        """Stream semantic link suggestions between two KBs from stored vectors.
+
+        Loads each KB's embeddings once and yields pairs block by block as
+        the top-k products complete, in source order rather than by score.
+        Yields nothing if either KB has no stored embeddings, or if the two
+        KBs' active vectors come from different embedding models.
+        """
+        if not self._same_embedding_model(source_kb, target_kb):
+            return
+        source_vectors = self._kb_vectors(source_kb)
+        target_vectors = self._kb_vectors(target_kb) if source_vectors else []
+        yield from self._vector_suggestions(
+            source_kb,
+            source_vectors,
+            target_kb,
+            target_vectors,
+            limit_per_entry,
+            exclude_linked,
+            block_size,
+        )
+
+    def _same_embedding_model(self, source_kb: str, target_kb: str) -> bool:
+        """Whether both KBs' active vectors share a (model, dimensions).
+
+        Mid-migration KBs can read different embedding versions; cosine
+        scores across models are meaningless.
+        """
+        backend = getattr(self.db, "backend", None)
+        if backend is None or not getattr(backend, "supports_embedding_versions", False):
+            return True
+        try:
+            source = backend.embedding_state(source_kb)["active"]
+            target = backend.embedding_state(target_kb)["active"]
+        except Exception:
+            logger.debug("Could not read embedding versions", exc_info=True)
+            return False
+        return (source["model"], source["dimensions"]) == (target["model"], target["dimensions"])
+
+    def _kb_vectors(self, kb_name: str) -> list[tuple[str, array]]:
+        backend = getattr(self.db, "backend", None)
+        if backend is None:
+            return []
+        try:
+            return backend.get_kb_embeddings(kb_name)
+        except Exception:
+            logger.debug("Could not load embeddings for %s", kb_name, exc_info=True)
+            return []
+
+    def _vector_suggestions(
+        self,
+        source_kb: str,
+        source_vectors: list[tuple[str, array]],
+        target_kb: str,
+        target_vectors: list[tuple[str, array]],
+        limit_per_entry: int,
+        exclude_linked: bool,
+        block_size: int = 512,
+    ) -> Iterator[dict]:
+        if not source_vectors or not target_vectors:
+            return
+        if len(source_vectors[0][1]) != len(target_vectors[0][1]):
+            return
+        source_ids = [eid for eid, _ in source_vectors]
+        target_ids = [eid for eid, _ in target_vectors]
+        target_index = {eid: j for j, eid in enumerate(target_ids)}
+
+        exclude: dict[int, set[int]] = {}
+        if source_kb == target_kb:
+            for i, eid in enumerate(source_ids):
+                exclude[i] = {target_index[eid]}
+        if exclude_linked:
+            source_index = {eid: i for i, eid in enumerate(source_ids)}
+            for a_id, b_id in self.db.backend.get_linked_pairs(source_kb, target_kb):
+                i, j = source_index.get(a_id), target_index.get(b_id)
+                if i is not None and j is not None:
+                    exclude.setdefault(i, set()).add(j)
+
+        infos: dict[tuple[str, str], dict] = {}
+        seen_pairs: set[tuple[str, ...]] = set()
+        neighbors = top_k_neighbors(
+            [v for _, v in source_vectors],
+            [v for _, v in target_vectors],
+            limit_per_entry,
+            exclude=exclude,
+            block_size=block_size,
+        )
+        pending: list[tuple[int, list[tuple[int, float]]]] = []
+        for item in neighbors:
+            pending.append(item)
+            if len(pending) >= block_size:
+                yield from self._emit_pairs(
+                    pending, source_kb, source_ids, target_kb, target_ids, infos, seen_pairs
+                )
+                pending = []
+        yield from self._emit_pairs(
+            pending, source_kb, source_ids, target_kb, target_ids, infos, seen_pairs
+        )
+
+    def _emit_pairs(
+        self,
+        block: list[tuple[int, list[tuple[int, float]]]],
+        source_kb: str,
+        source_ids: list[str],
+        target_kb: str,
+        target_ids: list[str],
+        infos: dict[tuple[str, str], dict],
+        seen_pairs: set[tuple[str, ...]],
+    ) -> Iterator[dict]:
+        """Fetch titles for one block of neighbour lists and yield its pairs."""
+        keys = {(source_ids[i], source_kb) for i, _ in block}
+        keys.update((target_ids[j], target_kb) for _, hits in block for j, _ in hits)
+        missing = [k for k in keys if k not in infos]
+        for entry in self.db.get_entry_headers(missing):
+            infos[(entry["id"], entry["kb_name"])] = {
+                "title": entry.get("title", ""),
+                "entry_type": entry.get("entry_type", ""),
+                "snippet": (entry.get("summary") or "")[:150],
+            }
+        for i, hits in block:
+            eid = source_ids[i]
+            source = infos.get((eid, source_kb), {})
+            for j, cosine in hits:
+                cid = target_ids[j]
+                pair_key = tuple(sorted([eid, cid]))
+                if pair_key in seen_pairs:
+                    continue
+                seen_pairs.add(pair_key)
+                target = infos.get((cid, target_kb), {})
+                yield {
+                    "source_id": eid,
+                    "source_title": source.get("title", ""),
+                    "source_type": source.get("entry_type", ""),
+                    "target_id": cid,
+                    "target_title": target.get("title", ""),
+                    "target_type": target.get("entry_type", ""),
+                    "score": cosine_to_score(cosine),
+                    "snippet": target.get("snippet", ""),
+                }
+
     # ------------------------------------------------------------------
     # find_orphans — high-importance entries with few cross-KB links
     # ------------------------------------------------------------------
@@ -307,10 +485,7 @@ class LinkDiscoveryService:
         Orphan score = potential_matches - cross_kb_links. High score means
         "should be connected but isn't."
         """
-        from .kb_service import KBService
-
-        svc = KBService(self.config, self.db)
-        entries = svc.list_entries(kb_name=kb_name, limit=10000)
+        entries = self.kb_service.list_entries(kb_name=kb_name, limit=10000)
 
         candidates: list[dict[str, Any]] = []
         for entry in entries:
@@ -10,6 +10,7 @@ import re
 from enum import StrEnum
 from typing import Any
 
+from ..metrics import SEARCH_STAGE_SECONDS, timed
 from ..storage.database import PyriteDB
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ class SearchMode(StrEnum):
     KEYWORD = "keyword"
     SEMANTIC = "semantic"
     HYBRID = "hybrid"
+    SUBSTRING = "substring"
 
 
 class SearchService:
@@ -99,6 +101,10 @@ class SearchService:
     # Search Operations
     # =========================================================================
 
+    def index_generation(self) -> Any:
+        """Token that changes whenever committed index data changes."""
+        return self.db.backend.index_generation()
+
     def search(
         self,
         query: str,
@@ -129,7 +135,8 @@ class SearchService:
             limit: Max results
             offset: Pagination offset
             sanitize: Whether to sanitize query for FTS5 (default True)
-            mode: Search mode - keyword, semantic, or hybrid
+            mode: Search mode - keyword, semantic, hybrid, or substring (matches
+                text anywhere in title/summary/body; honours kb_name only)
             expand: Whether to use AI query expansion for additional terms
 
         Returns:
@@ -149,6 +156,8 @@ class SearchService:
         # Apply query expansion to the FTS5 query (keyword leg only)
         expanded_query = self._expand_query(query) if expand else query
 
+        if mode == SearchMode.SUBSTRING:
+            return self.db.search_substring(query, kb_name=kb_name, limit=limit + offset)[offset:]
         if mode == SearchMode.SEMANTIC:
             # Semantic uses original natural language query, not expanded
             return self._semantic_search(query, kb_name, limit, offset=offset)
@@ -173,19 +182,20 @@ class SearchService:
         if sanitize:
             kw_query = self.sanitize_fts_query(kw_query)
 
-        return self.db.search(
-            query=kw_query,
-            kb_name=kb_name,
-            entry_type=entry_type,
-            tags=tags,
-            date_from=date_from,
-            date_to=date_to,
-            limit=limit,
-            offset=offset,
-            include_archived=include_archived,
-            fips=fips,
-            state=state,
-        )
+        with timed("search.fts", SEARCH_STAGE_SECONDS, stage="fts"):
+            return self.db.search(
+                query=kw_query,
+                kb_name=kb_name,
+                entry_type=entry_type,
+                tags=tags,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit,
+                offset=offset,
+                include_archived=include_archived,
+                fips=fips,
+                state=state,
+            )
 
     def _expand_query(self, query: str) -> str:
         """Expand query with AI-generated terms, returning OR-combined FTS5 query."""
@@ -221,11 +231,24 @@ class SearchService:
 
         # sqlite-vec KNN doesn't support SQL OFFSET, so fetch limit+offset
         # and slice in Python
-        results = svc.search_similar(
-            query, kb_name=kb_name, limit=limit + offset, max_distance=max_distance
-        )
+        with timed("search.vector", SEARCH_STAGE_SECONDS, stage="vector"):
+            results = svc.search_similar(
+                query, kb_name=kb_name, limit=limit + offset, max_distance=max_distance
+            )
         return results[offset:]
 
+    def _query_embedding(self, query: str) -> list[float] | None:
+        """Embed ``query`` for the vector leg, or None when there is nothing to match."""
+        from .embedding_service import EmbeddingService, is_available
+
+        if not is_available() or not self.db.backend.vec_available:
+            return None
+        svc = EmbeddingService(self.db)
+        if not svc.has_embeddings():
+            return None
+        with timed("search.embed", SEARCH_STAGE_SECONDS, stage="embed"):
+            return svc.embed_text(query)
+
     def _hybrid_search(
         self,
         query: str,
@@ -245,25 +268,47 @@ class SearchService:
         Hybrid search using Reciprocal Rank Fusion (RRF).
 
         Combines FTS5 keyword results with vector similarity results.
-        Falls back to keyword-only if no embeddings exist.
+        Falls back to keyword-only if no embeddings exist.  Backends that
+        advertise ``supports_hybrid_search`` run the fusion themselves.
         """
+        fts_query = expanded_query if expanded_query else query
+        kw_query = self.sanitize_fts_query(fts_query) if sanitize else fts_query
+
+        backend = self.db.backend
+        if getattr(backend, "supports_hybrid_search", False):
+            # Backend fuses both legs server-side with the same filters
+            embedding = self._query_embedding(query)
+            with timed("search.hybrid", SEARCH_STAGE_SECONDS, stage="hybrid"):
+                return backend.search_hybrid(
+                    query=kw_query,
+                    embedding=embedding,
+                    kb_name=kb_name,
+                    entry_type=entry_type,
+                    tags=tags,
+                    date_from=date_from,
+                    date_to=date_to,
+                    limit=limit,
+                    offset=offset,
+                    fips=fips,
+                    state=state,
+                )
+
         # Get keyword results — use expanded query for FTS5 leg if available
         # Fetch enough candidates from each leg to cover offset + limit after fusion
         fetch_size = max(limit * 2, offset + limit)
-        fts_query = expanded_query if expanded_query else query
-        kw_query = self.sanitize_fts_query(fts_query) if sanitize else fts_query
-        keyword_results = self.db.search(
-            query=kw_query,
-            kb_name=kb_name,
-            entry_type=entry_type,
-            tags=tags,
-            date_from=date_from,
-            date_to=date_to,
-            limit=fetch_size,
-            offset=0,
-            fips=fips,
-            state=state,
-        )
+        with timed("search.fts", SEARCH_STAGE_SECONDS, stage="fts"):
+            keyword_results = self.db.search(
+                query=kw_query,
+                kb_name=kb_name,
+                entry_type=entry_type,
+                tags=tags,
+                date_from=date_from,
+                date_to=date_to,
+                limit=fetch_size,
+                offset=0,
+                fips=fips,
+                state=state,
+            )
 
         # Try to get semantic results
         semantic_results = self._semantic_search(query, kb_name, limit=fetch_size)
@@ -273,29 +318,30 @@ class SearchService:
             return keyword_results[offset : offset + limit]
 
         # Reciprocal Rank Fusion
-        k = 60  # RRF constant
-        scores: dict[tuple[str, str], float] = {}
-        entries: dict[tuple[str, str], dict[str, Any]] = {}
-
-        for rank, result in enumerate(keyword_results):
-            key = (result["id"], result["kb_name"])
-            scores[key] = scores.get(key, 0) + 1.0 / (k + rank)
-            entries[key] = result
-
-        for rank, result in enumerate(semantic_results):
-            key = (result["id"], result["kb_name"])
-            scores[key] = scores.get(key, 0) + 1.0 / (k + rank)
-            if key not in entries:
+        with timed("search.fusion", SEARCH_STAGE_SECONDS, stage="fusion"):
+            k = 60  # RRF constant
+            scores: dict[tuple[str, str], float] = {}
+            entries: dict[tuple[str, str], dict[str, Any]] = {}
+
+            for rank, result in enumerate(keyword_results):
+                key = (result["id"], result["kb_name"])
+                scores[key] = scores.get(key, 0) + 1.0 / (k + rank)
                 entries[key] = result
 
-        # Sort by RRF score descending
-        sorted_keys = sorted(scores.keys(), key=lambda k: scores[k], reverse=True)
+            for rank, result in enumerate(semantic_results):
+                key = (result["id"], result["kb_name"])
+                scores[key] = scores.get(key, 0) + 1.0 / (k + rank)
+                if key not in entries:
+                    entries[key] = result
+
+            # Sort by RRF score descending
+            sorted_keys = sorted(scores.keys(), key=lambda k: scores[k], reverse=True)
 
-        results = []
-        for key in sorted_keys[offset : offset + limit]:
-            entry = entries[key]
-            entry["rrf_score"] = scores[key]
-            results.append(entry)
+            results = []
+            for key in sorted_keys[offset : offset + limit]:
+                entry = entries[key]
+                entry["rrf_score"] = scores[key]
+                results.append(entry)
 
         return results
 
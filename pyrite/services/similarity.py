@@ -0,0 +1,100 @@
+"""
+Vector Similarity
+
+Top-k nearest-neighbour search over stored embeddings, used for batch link
+suggestion.  Scores are cosine similarities of L2-normalized vectors.  With
+NumPy installed they are computed as blocked matrix products — one
+``block_size × len(corpus)`` score matrix at a time, so memory stays bounded
+however many queries there are — and with a pure-Python loop otherwise,
+which is only practical for small KBs.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from operator import mul
+
+Neighbors = list[tuple[int, float]]
+
+
+def top_k_neighbors(
+    queries: Sequence[array],
+    corpus: Sequence[array],
+    k: int,
+    exclude: Mapping[int, set[int]] | None = None,
+    block_size: int = 1024,
+) -> Iterator[tuple[int, Neighbors]]:
+    """Yield ``(query index, [(corpus index, cosine), ...])`` best first.
+
+    ``exclude`` maps a query index to corpus indices it must not be paired
+    with (self matches, already-linked entries).  Results are yielded in
+    query order as each block completes.
+    """
+    if not queries or not corpus or k <= 0:
+        return
+    exclude = exclude or {}
+    try:
+        import numpy as np
+    except ImportError:
+        yield from _top_k_python(queries, corpus, k, exclude)
+        return
+
+    matrix = _normalized_matrix(np, corpus)
+    k = min(k, len(corpus))
+    for start in range(0, len(queries), block_size):
+        block = _normalized_matrix(np, queries[start : start + block_size])
+        scores = block @ matrix.T
+        for row in range(len(block)):
+            skip = exclude.get(start + row)
+            if skip:
+                scores[row, list(skip)] = -np.inf
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        for row in range(len(block)):
+            yield (
+                start + row,
+                [
+                    (int(top[row, j]), float(top_scores[row, j]))
+                    for j in order[row]
+                    if top_scores[row, j] > -np.inf
+                ],
+            )
+
+
+def _normalized_matrix(np, vectors: Sequence[array]):
+    data = np.frombuffer(b"".join(v.tobytes() for v in vectors), dtype=np.float32)
+    data = data.reshape(len(vectors), -1)
+    norms = np.linalg.norm(data, axis=1, keepdims=True)
+    return data / np.where(norms == 0, 1.0, norms)
+
+
+def _normalized(vector: array) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _top_k_python(
+    queries: Sequence[array],
+    corpus: Sequence[array],
+    k: int,
+    exclude: Mapping[int, set[int]],
+) -> Iterator[tuple[int, Neighbors]]:
+    normalized = [_normalized(c) for c in corpus]
+    for i, query in enumerate(queries):
+        q = _normalized(query)
+        skip = exclude.get(i, ())
+        scored = ((sum(map(mul, q, c)), j) for j, c in enumerate(normalized) if j not in skip)
+        yield i, [(j, score) for score, j in heapq.nlargest(k, scored)]
+
+
+def cosine_to_score(cosine: float) -> float:
+    """Map cosine similarity to the ``1 - distance / 2`` score semantic search reports.
+
+    For unit vectors the L2 distance is ``sqrt(2 - 2·cos)``, so batch and
+    per-entry suggestions rank and display on the same scale.
+    """
+    return round(1.0 - math.sqrt(max(0.0, 2.0 - 2.0 * cosine)) / 2.0, 4)
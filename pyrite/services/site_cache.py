@@ -1,6 +1,28 @@
-"""Site cache service — renders /site pages to static HTML files for fast serving."""
-
+"""Site cache service — renders /site pages to static HTML files for fast serving.
+
+Rendering is incremental.  ``_render_graph.json`` in the cache directory
+records, for every output page, a fingerprint of its render inputs, a
+SHA-256 of the HTML it produced and the entries it depends on (its own
+entry, backlinks, outlinks, related entries and index membership).  A
+render pass only re-renders pages whose fingerprint changed, skips writes
+whose output is byte-identical, and ``invalidate_entry`` uses the recorded
+dependencies to drop every page that shows a changed entry.
+
+Each page is written with precompressed ``.gz`` (and ``.br`` when the
+``brotli`` package is installed) siblings, and ``_manifest.json`` lists every
+page's content hash, modification time and available encodings so the
+server can answer conditional requests without touching the page files.
+"""
+
+import gzip
+import hashlib
+import json
 import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
@@ -44,6 +66,126 @@ _SCHEMA_TYPES = {
     "component": "SoftwareSourceCode",
 }
 
+_GRAPH_FILE = "_render_graph.json"
+_GRAPH_VERSION = 2
+
+# Read by server/static.py to serve ETags and precompressed variants.
+MANIFEST_FILE = "_manifest.json"
+
+# Precompressed sibling suffixes, in server preference order.
+COMPRESSED_SUFFIXES = ("br", "gz")
+
+# Entries fetched per keyset page while walking a KB.
+_ENTRY_BATCH = 500
+
+# Below this many stale entry pages a process pool costs more than it saves.
+_POOL_MIN_JOBS = 200
+
+# Fields of an entry that index pages display.
+_SUMMARY_FIELDS = ("id", "title", "entry_type", "date", "tags", "updated_at")
+
+
+def _fingerprint(*parts: object) -> str:
+    """Stable hash of render inputs."""
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _compress(data: bytes) -> dict[str, bytes]:
+    """Precompressed variants of a page, keyed by sibling suffix."""
+    variants = {}
+    try:
+        import brotli
+
+        variants["br"] = brotli.compress(data, quality=11)
+    except ImportError:
+        pass
+    # mtime=0 keeps the gzip bytes a pure function of the content
+    variants["gz"] = gzip.compress(data, compresslevel=9, mtime=0)
+    return variants
+
+
+def _entry_key(kb_name: str, entry_id: str) -> str:
+    return f"{kb_name}/{entry_id}"
+
+
+def _entry_page(kb_name: str, entry_id: str) -> str:
+    return f"{kb_name}/{sanitize_filename(entry_id)}.html"
+
+
+class _RenderGraph:
+    """Persisted per-page render records, keyed by path relative to the cache dir.
+
+    Each record holds ``key`` (fingerprint of the render inputs), ``hash``
+    (SHA-256 of the written HTML), ``modified`` (Unix time the HTML last
+    changed), ``encodings`` (precompressed siblings written) and ``deps`` —
+    entry keys ``kb/id`` the page displays, or ``kb/*`` for pages listing KB
+    membership.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.pages: dict[str, dict] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == _GRAPH_VERSION:
+            self.pages = data.get("pages") or {}
+
+    def save(self) -> None:
+        """Write the graph and the serving manifest derived from it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            rel: {
+                "etag": rec["hash"][:32],
+                "modified": rec.get("modified", 0),
+                "encodings": rec.get("encodings", []),
+            }
+            for rel, rec in self.pages.items()
+        }
+        _write_json(self.path, {"version": _GRAPH_VERSION, "pages": self.pages})
+        _write_json(self.path.with_name(MANIFEST_FILE), {"version": 1, "pages": manifest})
+
+    def dependents(self, kb_name: str, entry_id: str) -> list[str]:
+        """Pages that display the given entry or list its KB's membership."""
+        keys = {_entry_key(kb_name, entry_id), f"{kb_name}/*"}
+        return [rel for rel, rec in self.pages.items() if keys.intersection(rec.get("deps", ()))]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Write JSON atomically so readers never see a partial file."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@dataclass
+class _RenderPass:
+    """State for one render run."""
+
+    stamp: str
+    force: bool = False
+    seen: set[str] = field(default_factory=set)
+    stats: dict = field(
+        default_factory=lambda: {
+            "kbs": 0,
+            "entries": 0,
+            "errors": 0,
+            "rendered": 0,
+            "written": 0,
+        }
+    )
+    executor: Executor | None = None
+
+
+def _render_entry_job(args: tuple) -> tuple[str | None, str | None]:
+    """Process-pool worker: render one entry page, returning ``(html, error)``."""
+    try:
+        return _entry_page_html(*args), None
+    except Exception as e:
+        return None, str(e)
+
 
 class SiteCacheService:
     """Renders site pages to static HTML files."""
@@ -55,128 +197,215 @@ class SiteCacheService:
         self.db = db
         self.cache_dir = Path(config.settings.index_path).parent / "site-cache"
         self._branding = BrandingService(config.settings.branding_dir).get()
+        self._graph: _RenderGraph | None = None
 
-    def render_all(self) -> dict:
-        """Render all KB index pages and entry pages. Returns stats."""
-        from collections import defaultdict
+    @property
+    def graph(self) -> _RenderGraph:
+        if self._graph is None:
+            self._graph = _RenderGraph(self.cache_dir / _GRAPH_FILE)
+        return self._graph
 
+    def render_all(self, force: bool = False) -> dict:
+        """Bring every KB index and entry page up to date. Returns stats.
+
+        Pages whose render inputs are unchanged since the last run are
+        skipped; ``force`` re-renders everything.  Pages for entries that no
+        longer exist are removed.
+        """
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        run = _RenderPass(stamp=self._stamp(), force=force)
 
         kbs = [
             {"name": kb.name, "description": getattr(kb, "description", ""), "entry_count": 0}
             for kb in self.config.knowledge_bases
         ]
-        stats = {"kbs": 0, "entries": 0, "errors": 0}
-
-        # Load all entries per KB (one query each, not per-entry)
-        kb_entries: dict[str, list] = {}
-        for kb_info in kbs:
-            entries = self.db.list_entries(kb_name=kb_info["name"], limit=10000)
-            kb_entries[kb_info["name"]] = entries
-            kb_info["entry_count"] = len(entries)
-
-        # Render landing page
-        self._render_landing(kbs)
-
-        for kb_info in kbs:
-            kb_name = kb_info["name"]
-            kb_dir = self.cache_dir / kb_name
-            kb_dir.mkdir(parents=True, exist_ok=True)
-
-            entries = kb_entries[kb_name]
-
-            # Render KB index and paginated browse pages
-            self._render_kb_index(kb_info, entries)
-            self._render_paginated_index(kb_name, entries)
-            stats["kbs"] += 1
-
-            # Batch-load all backlinks, outlinks, and sources for this KB (3 queries total, not 3N)
-            backlinks_map = self.db.get_all_backlinks_for_kb(kb_name)
-            outlinks_map = self.db.get_all_outlinks_for_kb(kb_name)
-            sources_map = self.db.get_all_sources_for_kb(kb_name)
-
-            # Pre-compute actor->entry_ids and tag->entry_ids for related events
-            actor_to_entries: dict[str, set[str]] = defaultdict(set)
-            tag_to_entries: dict[str, set[str]] = defaultdict(set)
-            entry_by_id: dict[str, dict] = {}
-            for entry in entries:
-                eid = entry["id"]
-                entry_by_id[eid] = entry
-                # Parse metadata
-                meta = parse_metadata(entry.get("metadata"))
-                actors = meta.get("actors") or meta.get("participants") or []
-                if isinstance(actors, list):
-                    for actor in actors:
-                        if actor:
-                            actor_to_entries[str(actor)].add(eid)
-                for tag in entry.get("tags") or []:
-                    if tag:
-                        tag_to_entries[str(tag)].add(eid)
-
-            # Compute related entries map: entry_id -> [(entry_dict, score), ...]
-            related_map: dict[str, list[tuple[dict, int]]] = {}
-            for entry in entries:
-                eid = entry["id"]
-                meta = parse_metadata(entry.get("metadata"))
-                actors = meta.get("actors") or meta.get("participants") or []
-                if not isinstance(actors, list):
-                    actors = []
-                tags = entry.get("tags") or []
-
-                # IDs to exclude: self, backlinks, outlinks
-                exclude = {eid}
-                for bl in backlinks_map.get(eid, []):
-                    exclude.add(bl["id"])
-                for ol in outlinks_map.get(eid, []):
-                    exclude.add(ol["id"])
-
-                # Score candidates
-                scores: dict[str, int] = defaultdict(int)
-                for actor in actors:
-                    if actor:
-                        for candidate_id in actor_to_entries.get(str(actor), set()):
-                            if candidate_id not in exclude:
-                                scores[candidate_id] += 2
-                for tag in tags:
-                    if tag:
-                        for candidate_id in tag_to_entries.get(str(tag), set()):
-                            if candidate_id not in exclude:
-                                scores[candidate_id] += 1
-
-                if scores:
-                    top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
-                    related_map[eid] = [
-                        (entry_by_id[cid], score) for cid, score in top if cid in entry_by_id
-                    ]
-
-            # Check if KB is read-only (hide edit links on public sites)
-            kb_config = self.config.get_kb(kb_name)
-            is_read_only = kb_config.read_only if kb_config else False
-
-            # Inject pre-loaded sources into entries so _render_entry won't query per-entry
-            for entry in entries:
+        try:
+            for kb_info in kbs:
+                self._render_kb(run, kb_info)
+                run.stats["kbs"] += 1
+        finally:
+            if run.executor is not None:
+                run.executor.shutdown()
+
+        # Landing page last, once entry counts are known
+        landing = [(kb["name"], kb.get("description"), kb["entry_count"]) for kb in kbs]
+        self._publish(
+            run, "index.html", _fingerprint(run.stamp, landing), [], lambda: self._landing_html(kbs)
+        )
+
+        for rel in [rel for rel in self.graph.pages if rel not in run.seen]:
+            self._remove_page(rel)
+        self.graph.save()
+        return run.stats
+
+    def _render_kb(self, run: _RenderPass, kb_info: dict) -> None:
+        """Render one KB's entry pages and indexes, walking entries by keyset."""
+        kb_name = kb_info["name"]
+        (self.cache_dir / kb_name).mkdir(parents=True, exist_ok=True)
+
+        # Batch-load all backlinks, outlinks, and sources for this KB (3 queries total, not 3N)
+        backlinks_map = self.db.get_all_backlinks_for_kb(kb_name)
+        outlinks_map = self.db.get_all_outlinks_for_kb(kb_name)
+        sources_map = self.db.get_all_sources_for_kb(kb_name)
+
+        # Related entries come from the precomputed related_entry index
+        related_map: dict[str, list[tuple[dict, float]]] = {
+            eid: [(rel, rel["score"]) for rel in rows]
+            for eid, rows in self.db.get_all_related_for_kb(kb_name, limit=5).items()
+        }
+
+        # Check if KB is read-only (hide edit links on public sites)
+        kb_config = self.config.get_kb(kb_name)
+        is_read_only = kb_config.read_only if kb_config else False
+
+        # Index pages only need summaries, so entry bodies are dropped per batch
+        summaries: list[dict] = []
+        for batch in self.db.iter_kb_entries(kb_name, batch_size=_ENTRY_BATCH):
+            jobs = []
+            for entry in batch:
                 eid = entry["id"]
+                summaries.append({k: entry.get(k) for k in _SUMMARY_FIELDS})
+                # Inject pre-loaded sources so rendering won't query per-entry
                 if entry.get("sources") is None:
                     entry["sources"] = sources_map.get(eid, [])
+                job = self._entry_job(
+                    run,
+                    kb_name,
+                    entry,
+                    backlinks_map.get(eid, []),
+                    outlinks_map.get(eid, []),
+                    related_map.get(eid, []),
+                    is_read_only,
+                )
+                if job is None:
+                    run.stats["entries"] += 1
+                else:
+                    jobs.append(job)
+            self._run_entry_jobs(run, jobs)
 
-            # Render each entry using pre-loaded data
-            for entry in entries:
-                try:
-                    eid = entry["id"]
-                    self._render_entry(
-                        kb_name,
-                        entry,
-                        backlinks_map.get(eid, []),
-                        outlinks_map.get(eid, []),
-                        read_only=is_read_only,
-                        related=related_map.get(eid, []),
-                    )
-                    stats["entries"] += 1
-                except Exception as e:
-                    logger.warning("Failed to render %s/%s: %s", kb_name, eid, e)
-                    stats["errors"] += 1
-
-        return stats
+        kb_info["entry_count"] = len(summaries)
+        summaries.sort(key=lambda e: e.get("updated_at") or "", reverse=True)
+        self._render_kb_index(run, kb_info, summaries)
+        self._render_paginated_index(run, kb_name, summaries)
+
+    def _entry_job(
+        self,
+        run: _RenderPass,
+        kb_name: str,
+        entry: dict,
+        backlinks: list,
+        outlinks: list,
+        related: list[tuple[dict, float]],
+        read_only: bool,
+    ) -> tuple | None:
+        """Record an entry page in the pass; return its render job if it is stale."""
+        entry_id = entry["id"]
+        rel = _entry_page(kb_name, entry_id)
+        run.seen.add(rel)
+        shown_related = [(r["id"], r.get("title"), r.get("date")) for r, _ in related]
+        key = _fingerprint(run.stamp, read_only, entry, backlinks, outlinks, shown_related)
+        if self._is_fresh(run, rel, key):
+            return None
+        deps = {_entry_key(kb_name, entry_id)}
+        for link in backlinks + outlinks:
+            deps.add(_entry_key(link.get("kb_name", kb_name), link["id"]))
+        deps.update(_entry_key(r.get("kb_name", kb_name), r["id"]) for r, _ in related)
+        args = (kb_name, entry, backlinks, outlinks, read_only, related, self._branding.name)
+        return rel, key, sorted(deps), args
+
+    def _run_entry_jobs(self, run: _RenderPass, jobs: list[tuple]) -> None:
+        """Render stale entry pages, across a process pool for large batches."""
+        if not jobs:
+            return
+        workers = self._worker_count()
+        if workers > 1 and len(jobs) >= _POOL_MIN_JOBS:
+            if run.executor is None:
+                import multiprocessing
+
+                # spawn, not fork: renders run on server threads
+                run.executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            chunksize = max(1, len(jobs) // (workers * 4))
+            results = run.executor.map(_render_entry_job, [j[3] for j in jobs], chunksize=chunksize)
+        else:
+            results = map(_render_entry_job, [j[3] for j in jobs])
+
+        for (rel, key, deps, _args), (html, error) in zip(jobs, results, strict=True):
+            if error is not None:
+                logger.warning("Failed to render %s: %s", rel, error)
+                run.stats["errors"] += 1
+                continue
+            run.stats["entries"] += 1
+            run.stats["rendered"] += 1
+            if self._write_page(rel, html, key, deps):
+                run.stats["written"] += 1
+
+    def _worker_count(self) -> int:
+        workers = getattr(self.config.settings, "site_render_workers", 0)
+        return workers if workers > 0 else (os.cpu_count() or 1)
+
+    def _stamp(self) -> str:
+        """Fingerprint of everything besides entry data that shapes the output."""
+        from .. import __version__
+
+        try:
+            template = (_TEMPLATE_DIR / "base.html").read_bytes()
+        except OSError:
+            template = b""
+        return _fingerprint(__version__, self._branding.name, hashlib.sha256(template).hexdigest())
+
+    def _is_fresh(self, run: _RenderPass, rel: str, key: str) -> bool:
+        if run.force:
+            return False
+        record = self.graph.pages.get(rel)
+        return bool(record and record.get("key") == key and (self.cache_dir / rel).is_file())
+
+    def _write_page(self, rel: str, html: str, key: str, deps: list[str]) -> bool:
+        """Record a rendered page; write it only if its content changed. Returns True if written."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.cache_dir / rel
+        previous = self.graph.pages.get(rel)
+        if previous and previous.get("hash") == digest and path.is_file():
+            self.graph.pages[rel] = {**previous, "key": key, "deps": deps}
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        variants = _compress(data)
+        for suffix in COMPRESSED_SUFFIXES:
+            sibling = path.with_name(f"{path.name}.{suffix}")
+            if suffix in variants:
+                sibling.write_bytes(variants[suffix])
+            else:
+                sibling.unlink(missing_ok=True)
+        self.graph.pages[rel] = {
+            "key": key,
+            "hash": digest,
+            "modified": int(time.time()),
+            "encodings": sorted(variants),
+            "deps": deps,
+        }
+        return True
+
+    def _remove_page(self, rel: str) -> None:
+        """Delete a page, its compressed siblings and its graph record."""
+        path = self.cache_dir / rel
+        path.unlink(missing_ok=True)
+        for suffix in COMPRESSED_SUFFIXES:
+            path.with_name(f"{path.name}.{suffix}").unlink(missing_ok=True)
+        self.graph.pages.pop(rel, None)
+
+    def _publish(
+        self, run: _RenderPass, rel: str, key: str, deps: list[str], render: Callable[[], str]
+    ) -> None:
+        """Render and write a page unless its inputs are unchanged."""
+        run.seen.add(rel)
+        if self._is_fresh(run, rel, key):
+            return
+        run.stats["rendered"] += 1
+        if self._write_page(rel, render(), key, deps):
+            run.stats["written"] += 1
 
     def render_entry_by_id(self, entry_id: str, kb_name: str) -> bool:
         """Render a single entry page. Returns True if successful."""
@@ -185,15 +414,29 @@ class SiteCacheService:
             return False
         backlinks = self.db.get_backlinks(entry_id, kb_name)
         outlinks = self.db.get_outlinks(entry_id, kb_name)
-        self._render_entry(kb_name, entry, backlinks, outlinks)
-        return True
+        related = [(r, r["score"]) for r in self.db.get_related_entries(entry_id, kb_name)]
+        kb_config = self.config.get_kb(kb_name)
+        read_only = kb_config.read_only if kb_config else False
+        run = _RenderPass(stamp=self._stamp())
+        job = self._entry_job(run, kb_name, entry, backlinks, outlinks, related, read_only)
+        if job is not None:
+            self._run_entry_jobs(run, [job])
+            self.graph.save()
+        return run.stats["errors"] == 0
 
     def invalidate_entry(self, entry_id: str, kb_name: str):
-        """Delete cached page for an entry."""
-        path = self.cache_dir / kb_name / f"{entry_id}.html"
-        path.unlink(missing_ok=True)
-        # Also invalidate KB index since entry list changed
-        (self.cache_dir / kb_name / "index.html").unlink(missing_ok=True)
+        """Delete cached pages that show an entry.
+
+        Besides the entry's own page this drops every page recorded as
+        depending on it (backlinks, outlinks, related entries, paginated
+        index pages listing it) and the KB index.
+        """
+        pages = set(self.graph.dependents(kb_name, entry_id))
+        pages.add(_entry_page(kb_name, entry_id))
+        pages.add(f"{kb_name}/index.html")
+        for rel in pages:
+            self._remove_page(rel)
+        self.graph.save()
 
     def invalidate_kb(self, kb_name: str):
         """Delete all cached pages for a KB."""
@@ -202,9 +445,13 @@ class SiteCacheService:
         kb_dir = self.cache_dir / kb_name
         if kb_dir.exists():
             shutil.rmtree(kb_dir)
-        (self.cache_dir / "index.html").unlink(missing_ok=True)
+        self._remove_page("index.html")
+        prefix = f"{kb_name}/"
+        for rel in [rel for rel in self.graph.pages if rel.startswith(prefix)]:
+            del self.graph.pages[rel]
+        self.graph.save()
 
-    def _render_landing(self, kbs: list[dict]):
+    def _landing_html(self, kbs: list[dict]) -> str:
         """Render the /site landing page."""
         cards = []
         for kb in kbs:
@@ -239,19 +486,36 @@ class SiteCacheService:
             canonical='<link rel="canonical" href="/site">',
             body=body,
         )
-        (self.cache_dir / "index.html").write_text(html, encoding="utf-8")
+        return html
 
-    def _render_kb_index(self, kb: dict, entries: list[dict]):
+    def _render_kb_index(self, run: _RenderPass, kb: dict, entries: list[dict]):
         """Render a KB index page. Uses _homepage entry content if available."""
+        kb_name = kb["name"]
+        homepage = self.db.get_entry("_homepage", kb_name)
+        has_about = self.db.get_entry("_about", kb_name) is not None
+        if homepage and homepage.get("body"):
+            listed = len(entries)  # designed homepages only show the count
+        else:
+            listed = [(e["id"], e.get("title"), e.get("entry_type")) for e in entries]
+        key = _fingerprint(run.stamp, kb_name, kb.get("description"), homepage, has_about, listed)
+        self._publish(
+            run,
+            f"{kb_name}/index.html",
+            key,
+            [f"{kb_name}/*"],
+            lambda: self._kb_index_html(kb, entries, homepage, has_about),
+        )
+
+    def _kb_index_html(
+        self, kb: dict, entries: list[dict], homepage: dict | None, has_about: bool
+    ) -> str:
         kb_name = kb["name"]
         desc = kb.get("description", "")
         total = len(entries)
 
-        # Check for a custom homepage entry
-        homepage = self.db.get_entry("_homepage", kb_name)
+        # Use the custom homepage entry if there is one
         if homepage and homepage.get("body"):
             title = homepage.get("title", kb_name)
-            has_about = self.db.get_entry("_about", kb_name) is not None
             body = _render_designed_homepage(homepage, kb_name, total, has_about=has_about)
             page_desc = (
                 homepage.get("summary")
@@ -299,342 +563,344 @@ class SiteCacheService:
             canonical=f'<link rel="canonical" href="/site/{_esc(kb_name)}">',
             body=body,
         )
-        (self.cache_dir / kb_name / "index.html").write_text(html, encoding="utf-8")
+        return html
 
-    def _render_paginated_index(self, kb_name: str, entries: list[dict], page_size: int = 100):
+    def _render_paginated_index(
+        self, run: _RenderPass, kb_name: str, entries: list[dict], page_size: int = 100
+    ):
         """Render paginated HTML index pages for crawlers and AI agents."""
         # Sort by date descending (newest first)
         sorted_entries = sorted(entries, key=lambda e: e.get("date") or "", reverse=True)
         total = len(sorted_entries)
         total_pages = max(1, (total + page_size - 1) // page_size)
 
-        page_dir = self.cache_dir / kb_name / "page"
-        page_dir.mkdir(parents=True, exist_ok=True)
-
         for page_num in range(1, total_pages + 1):
             start = (page_num - 1) * page_size
             page_entries = sorted_entries[start : start + page_size]
+            shown = [(e["id"], e.get("title"), e.get("date"), e.get("tags")) for e in page_entries]
+            self._publish(
+                run,
+                f"{kb_name}/page/{page_num}.html",
+                _fingerprint(run.stamp, page_num, total_pages, total, shown),
+                sorted({_entry_key(kb_name, e["id"]) for e in page_entries}),
+                lambda n=page_num, page=page_entries: self._index_page_html(
+                    kb_name, page, n, total, total_pages
+                ),
+            )
 
-            rows = []
-            for e in page_entries:
-                eid = e["id"]
-                title = _esc(e.get("title", eid))
-                date = _esc(e.get("date") or "")
-                tags = e.get("tags") or []
-                tag_html = " ".join(
-                    f'<a class="tag" href="/site/search?q={_esc(t)}">{_esc(t)}</a>'
-                    for t in tags[:3]
-                )
-                if len(tags) > 3:
-                    tag_html += f' <span class="tag" style="background:var(--surface-overlay);border-color:var(--border);color:var(--ink-muted)">+{len(tags) - 3}</span>'
-                date_span = (
-                    f"<span style=\"font-family:'JetBrains Mono',monospace;font-size:0.8125rem;color:var(--ink-muted);min-width:6.5rem;display:inline-block\">{date}</span>"
-                    if date
-                    else ""
-                )
-                rows.append(
-                    f'<div class="index-entry">'
-                    f"{date_span}"
-                    f'<a href="/site/{_esc(kb_name)}/{_esc(eid)}">{title}</a>'
-                    f'<div class="index-tags">{tag_html}</div>'
-                    f"</div>"
-                )
+    def _index_page_html(
+        self, kb_name: str, page_entries: list[dict], page_num: int, total: int, total_pages: int
+    ) -> str:
+        rows = []
+        for e in page_entries:
+            eid = e["id"]
+            title = _esc(e.get("title", eid))
+            date = _esc(e.get("date") or "")
+            tags = e.get("tags") or []
+            tag_html = " ".join(
+                f'<a class="tag" href="/site/search?q={_esc(t)}">{_esc(t)}</a>' for t in tags[:3]
+            )
+            if len(tags) > 3:
+                tag_html += f' <span class="tag" style="background:var(--surface-overlay);border-color:var(--border);color:var(--ink-muted)">+{len(tags) - 3}</span>'
+            date_span = (
+                f"<span style=\"font-family:'JetBrains Mono',monospace;font-size:0.8125rem;color:var(--ink-muted);min-width:6.5rem;display:inline-block\">{date}</span>"
+                if date
+                else ""
+            )
+            rows.append(
+                f'<div class="index-entry">'
+                f"{date_span}"
+                f'<a href="/site/{_esc(kb_name)}/{_esc(eid)}">{title}</a>'
+                f'<div class="index-tags">{tag_html}</div>'
+                f"</div>"
+            )
 
-            # Pagination nav
-            nav_parts = []
-            if page_num > 1:
-                nav_parts.append(
-                    f'<a href="/site/{_esc(kb_name)}/page/{page_num - 1}">&larr; Newer</a>'
-                )
+        # Pagination nav
+        nav_parts = []
+        if page_num > 1:
             nav_parts.append(
-                f'<span style="color:var(--ink-muted);font-size:0.875rem">Page {page_num} of {total_pages}</span>'
+                f'<a href="/site/{_esc(kb_name)}/page/{page_num - 1}">&larr; Newer</a>'
             )
-            if page_num < total_pages:
-                nav_parts.append(
-                    f'<a href="/site/{_esc(kb_name)}/page/{page_num + 1}">Older &rarr;</a>'
-                )
-            nav_html = f'<nav style="display:flex;justify-content:center;align-items:center;gap:1.5rem;margin:2rem 0">{" ".join(nav_parts)}</nav>'
-
-            body = (
-                f'<div class="breadcrumb"><a href="/site/{_esc(kb_name)}">Home</a><span class="sep">/</span><strong>Browse</strong></div>'
-                f"<h1>All Events</h1>"
-                f'<p style="color:var(--ink-muted);margin-bottom:1.5rem">{total} events &middot; Page {page_num} of {total_pages} &middot; Sorted by date (newest first)</p>'
-                f"{nav_html}"
-                f'<div class="index-list">{"".join(rows)}</div>'
-                f"{nav_html}"
+        nav_parts.append(
+            f'<span style="color:var(--ink-muted);font-size:0.875rem">Page {page_num} of {total_pages}</span>'
+        )
+        if page_num < total_pages:
+            nav_parts.append(
+                f'<a href="/site/{_esc(kb_name)}/page/{page_num + 1}">Older &rarr;</a>'
             )
+        nav_html = f'<nav style="display:flex;justify-content:center;align-items:center;gap:1.5rem;margin:2rem 0">{" ".join(nav_parts)}</nav>'
 
-            html = _render_page(
-                title=f"Browse Events (Page {page_num}) — {_esc(kb_name)} | {self._branding.name}",
-                description=f"Browse {total} events in {kb_name}, page {page_num} of {total_pages}",
-                og_title=f"Browse Events — {_esc(kb_name)}",
-                og_type="website",
-                og_url=f"/site/{_esc(kb_name)}/page/{page_num}",
-                og_image="/static/favicon.svg",
-                twitter_card="summary",
-                extra_head='<meta name="robots" content="index, follow">',
-                canonical=f'<link rel="canonical" href="/site/{_esc(kb_name)}/page/{page_num}">',
-                body=body,
-            )
-            (page_dir / f"{page_num}.html").write_text(html, encoding="utf-8")
+        body = (
+            f'<div class="breadcrumb"><a href="/site/{_esc(kb_name)}">Home</a><span class="sep">/</span><strong>Browse</strong></div>'
+            f"<h1>All Events</h1>"
+            f'<p style="color:var(--ink-muted);margin-bottom:1.5rem">{total} events &middot; Page {page_num} of {total_pages} &middot; Sorted by date (newest first)</p>'
+            f"{nav_html}"
+            f'<div class="index-list">{"".join(rows)}</div>'
+            f"{nav_html}"
+        )
 
-    def _render_entry(
-        self,
-        kb_name: str,
-        entry: dict,
-        backlinks: list,
-        outlinks: list,
-        *,
-        read_only: bool = False,
-        related: list[tuple[dict, int]] | None = None,
-    ):
-        """Render a single entry page."""
-        import json
+        html = _render_page(
+            title=f"Browse Events (Page {page_num}) — {_esc(kb_name)} | {self._branding.name}",
+            description=f"Browse {total} events in {kb_name}, page {page_num} of {total_pages}",
+            og_title=f"Browse Events — {_esc(kb_name)}",
+            og_type="website",
+            og_url=f"/site/{_esc(kb_name)}/page/{page_num}",
+            og_image="/static/favicon.svg",
+            twitter_card="summary",
+            extra_head='<meta name="robots" content="index, follow">',
+            canonical=f'<link rel="canonical" href="/site/{_esc(kb_name)}/page/{page_num}">',
+            body=body,
+        )
+        return html
 
-        entry_id = entry["id"]
-        title = entry.get("title", entry_id)
-        entry_type = entry.get("entry_type", "note")
-        body_md = entry.get("body") or ""
-        summary = entry.get("summary") or ""
-        tags = entry.get("tags") or []
-        date = entry.get("date") or ""
-        status = entry.get("status") or ""
-        location = entry.get("location") or ""
-        description = summary or (
-            body_md[:160].replace("\n", " ") + "..."
-            if len(body_md) > 160
-            else body_md.replace("\n", " ")
+
+def _entry_page_html(
+    kb_name: str,
+    entry: dict,
+    backlinks: list,
+    outlinks: list,
+    read_only: bool,
+    related: list[tuple[dict, float]] | None,
+    brand_name: str,
+) -> str:
+    """Render a single entry page.
+
+    Module-level and free of database access so it can run in a process
+    pool; callers pass the entry with its ``sources`` already loaded.
+    """
+    entry_id = entry["id"]
+    title = entry.get("title", entry_id)
+    entry_type = entry.get("entry_type", "note")
+    body_md = entry.get("body") or ""
+    summary = entry.get("summary") or ""
+    tags = entry.get("tags") or []
+    date = entry.get("date") or ""
+    status = entry.get("status") or ""
+    location = entry.get("location") or ""
+    description = summary or (
+        body_md[:160].replace("\n", " ") + "..."
+        if len(body_md) > 160
+        else body_md.replace("\n", " ")
+    )
+
+    # Parse metadata (may be a JSON string or already a dict)
+    metadata = parse_metadata(entry.get("metadata"))
+
+    sources = entry.get("sources") or []
+
+    # Canonical URL
+    canonical_path = f"/site/{_esc(kb_name)}/{_esc(entry_id)}"
+    canonical = f'<link rel="canonical" href="{canonical_path}">'
+
+    # JSON-LD (enhanced with url, publisher, author)
+    schema_type = _SCHEMA_TYPES.get(entry_type, "Article")
+    jsonld = {
+        "@context": "https://schema.org",
+        "@type": schema_type,
+        "name": title,
+        "description": description,
+        "url": canonical_path,
+        "publisher": {"@type": "Organization", "name": brand_name},
+    }
+    if date:
+        jsonld["datePublished"] = date
+    if tags:
+        jsonld["keywords"] = ", ".join(tags)
+    # Author from created_by or provenance in metadata
+    author_name = entry.get("created_by") or ""
+    if not author_name:
+        prov = metadata.get("provenance") or {}
+        if isinstance(prov, dict):
+            author_name = prov.get("created_by") or ""
+    if author_name:
+        jsonld["author"] = {"@type": "Person", "name": author_name}
+
+    extra_head = f'<script type="application/ld+json">{json.dumps(jsonld)}</script>'
+
+    # Reading time estimate
+    word_count = len(body_md.split())
+    reading_mins = max(1, round(word_count / 230))
+
+    # Render body markdown to HTML (basic)
+    body_html = _md_to_html(body_md, kb_name)
+
+    # Tags (clickable — link to search)
+    tags_html = "".join(
+        f'<a class="tag" href="/site/search?q={_esc(t)}">{_esc(t)}</a>' for t in tags
+    )
+    tags_section = f'<div class="tags">{tags_html}</div>' if tags else ""
+
+    # Status badge (displayed next to type badge in h1)
+    status_html = ""
+    if status:
+        status_lower = status.lower()
+        if status_lower == "confirmed":
+            css_class = "status-confirmed"
+        elif status_lower in ("reported", "alleged", "rumored"):
+            css_class = f"status-{status_lower}"
+        elif status_lower == "disputed":
+            css_class = "status-disputed"
+        elif status_lower == "draft":
+            css_class = "status-draft"
+        else:
+            css_class = "status-draft"
+        status_html = f'<span class="badge-status {css_class}">{_esc(status)}</span>'
+
+    # Actors / Participants
+    actors = metadata.get("actors") or metadata.get("participants") or []
+    actors_html = ""
+    if actors and isinstance(actors, list):
+        actor_links = ", ".join(
+            f'<a href="/site/search?q={_esc(str(a))}">{_esc(str(a))}</a>' for a in actors if a
         )
+        if actor_links:
+            actors_html = (
+                f'<div class="actors"><span class="label">Actors:</span>{actor_links}</div>'
+            )
 
-        # Parse metadata (may be a JSON string or already a dict)
-        metadata = parse_metadata(entry.get("metadata"))
-
-        # Fetch sources — list_entries doesn't include them, so fetch via get_entry
-        sources = entry.get("sources")
-        if sources is None:
-            full_entry = self.db.get_entry(entry_id, kb_name)
-            sources = full_entry.get("sources", []) if full_entry else []
-
-        # Canonical URL
-        canonical_path = f"/site/{_esc(kb_name)}/{_esc(entry_id)}"
-        canonical = f'<link rel="canonical" href="{canonical_path}">'
-
-        # JSON-LD (enhanced with url, publisher, author)
-        schema_type = _SCHEMA_TYPES.get(entry_type, "Article")
-        jsonld = {
-            "@context": "https://schema.org",
-            "@type": schema_type,
-            "name": title,
-            "description": description,
-            "url": canonical_path,
-            "publisher": {"@type": "Organization", "name": self._branding.name},
-        }
-        if date:
-            jsonld["datePublished"] = date
-        if tags:
-            jsonld["keywords"] = ", ".join(tags)
-        # Author from created_by or provenance in metadata
-        author_name = entry.get("created_by") or ""
-        if not author_name:
-            prov = metadata.get("provenance") or {}
-            if isinstance(prov, dict):
-                author_name = prov.get("created_by") or ""
-        if author_name:
-            jsonld["author"] = {"@type": "Person", "name": author_name}
-
-        extra_head = f'<script type="application/ld+json">{json.dumps(jsonld)}</script>'
-
-        # Reading time estimate
-        word_count = len(body_md.split())
-        reading_mins = max(1, round(word_count / 230))
-
-        # Render body markdown to HTML (basic)
-        body_html = _md_to_html(body_md, kb_name)
-
-        # Tags (clickable — link to search)
-        tags_html = "".join(
-            f'<a class="tag" href="/site/search?q={_esc(t)}">{_esc(t)}</a>' for t in tags
+    # Capture lanes
+    capture_lanes = metadata.get("capture_lanes") or []
+    lanes_html = ""
+    if capture_lanes and isinstance(capture_lanes, list):
+        lane_badges = "".join(
+            f'<a class="lane-badge" href="/site/search?q={_esc(str(lane))}">{_esc(str(lane))}</a>'
+            for lane in capture_lanes
+            if lane
         )
-        tags_section = f'<div class="tags">{tags_html}</div>' if tags else ""
-
-        # Status badge (displayed next to type badge in h1)
-        status_html = ""
-        if status:
-            status_lower = status.lower()
-            if status_lower == "confirmed":
-                css_class = "status-confirmed"
-            elif status_lower in ("reported", "alleged", "rumored"):
-                css_class = f"status-{status_lower}"
-            elif status_lower == "disputed":
-                css_class = "status-disputed"
-            elif status_lower == "draft":
-                css_class = "status-draft"
+        if lane_badges:
+            lanes_html = f'<div class="capture-lanes">{lane_badges}</div>'
+
+    # Sources section (rendered before backlinks)
+    sources_html = ""
+    if sources:
+        source_items = []
+        for src in sources:
+            if not isinstance(src, dict):
+                continue
+            src_title = _esc(str(src.get("title") or "Untitled"))
+            src_url = src.get("url") or ""
+            src_outlet = _esc(str(src.get("outlet") or ""))
+            src_date = _esc(str(src.get("date") or ""))
+
+            # Only render href for http/https URLs
+            if (
+                src_url
+                and isinstance(src_url, str)
+                and src_url.lower().startswith(("http://", "https://"))
+            ):
+                title_part = (
+                    f'<a href="{_esc(src_url)}" target="_blank" rel="noopener">{src_title}</a>'
+                )
             else:
-                css_class = "status-draft"
-            status_html = f'<span class="badge-status {css_class}">{_esc(status)}</span>'
-
-        # Actors / Participants
-        actors = metadata.get("actors") or metadata.get("participants") or []
-        actors_html = ""
-        if actors and isinstance(actors, list):
-            actor_links = ", ".join(
-                f'<a href="/site/search?q={_esc(str(a))}">{_esc(str(a))}</a>' for a in actors if a
+                title_part = src_title
+
+            parts = [title_part]
+            if src_outlet:
+                parts.append(f'<span class="outlet">{src_outlet}</span>')
+            if src_date:
+                parts.append(f'<span class="source-date">({src_date})</span>')
+            source_items.append(f"<li>{' &mdash; '.join(parts)}</li>")
+
+        if source_items:
+            sources_html = (
+                f'<div class="sources-section"><h2>Sources</h2>'
+                f"<ol>{''.join(source_items)}</ol></div>"
             )
-            if actor_links:
-                actors_html = (
-                    f'<div class="actors"><span class="label">Actors:</span>{actor_links}</div>'
-                )
 
-        # Capture lanes
-        capture_lanes = metadata.get("capture_lanes") or []
-        lanes_html = ""
-        if capture_lanes and isinstance(capture_lanes, list):
-            lane_badges = "".join(
-                f'<a class="lane-badge" href="/site/search?q={_esc(str(lane))}">{_esc(str(lane))}</a>'
-                for lane in capture_lanes
-                if lane
+    # Related events (entries sharing actors/tags, excluding self/backlinks/outlinks)
+    related_html = ""
+    if related:
+        related_items = []
+        for rel_entry, _score in related:
+            rel_id = rel_entry["id"]
+            rel_title = rel_entry.get("title", rel_id)
+            rel_date = rel_entry.get("date") or ""
+            date_span = f' <span class="date">{_esc(rel_date)}</span>' if rel_date else ""
+            related_items.append(
+                f'<div class="related-item"><a href="/site/{_esc(kb_name)}/{_esc(rel_id)}">{_esc(rel_title)}</a>{date_span}</div>'
+            )
+        if related_items:
+            related_html = (
+                f'<div class="related-section"><h2>Related Events</h2>'
+                f'<div class="related-list">{"".join(related_items)}</div></div>'
             )
-            if lane_badges:
-                lanes_html = f'<div class="capture-lanes">{lane_badges}</div>'
-
-        # Sources section (rendered before backlinks)
-        sources_html = ""
-        if sources:
-            source_items = []
-            for src in sources:
-                if not isinstance(src, dict):
-                    continue
-                src_title = _esc(str(src.get("title") or "Untitled"))
-                src_url = src.get("url") or ""
-                src_outlet = _esc(str(src.get("outlet") or ""))
-                src_date = _esc(str(src.get("date") or ""))
-
-                # Only render href for http/https URLs
-                if (
-                    src_url
-                    and isinstance(src_url, str)
-                    and src_url.lower().startswith(("http://", "https://"))
-                ):
-                    title_part = (
-                        f'<a href="{_esc(src_url)}" target="_blank" rel="noopener">{src_title}</a>'
-                    )
-                else:
-                    title_part = src_title
-
-                parts = [title_part]
-                if src_outlet:
-                    parts.append(f'<span class="outlet">{src_outlet}</span>')
-                if src_date:
-                    parts.append(f'<span class="source-date">({src_date})</span>')
-                source_items.append(f"<li>{' &mdash; '.join(parts)}</li>")
-
-            if source_items:
-                sources_html = (
-                    f'<div class="sources-section"><h2>Sources</h2>'
-                    f"<ol>{''.join(source_items)}</ol></div>"
-                )
-
-        # Related events (entries sharing actors/tags, excluding self/backlinks/outlinks)
-        related_html = ""
-        if related:
-            related_items = []
-            for rel_entry, _score in related:
-                rel_id = rel_entry["id"]
-                rel_title = rel_entry.get("title", rel_id)
-                rel_date = rel_entry.get("date") or ""
-                date_span = f' <span class="date">{_esc(rel_date)}</span>' if rel_date else ""
-                related_items.append(
-                    f'<div class="related-item"><a href="/site/{_esc(kb_name)}/{_esc(rel_id)}">{_esc(rel_title)}</a>{date_span}</div>'
-                )
-            if related_items:
-                related_html = (
-                    f'<div class="related-section"><h2>Related Events</h2>'
-                    f'<div class="related-list">{"".join(related_items)}</div></div>'
-                )
 
-        # Coverage — from the entry's own coverage frontmatter field
-        # Format: coverage: [{title, url, publication}, ...]
-        coverage_html = ""
-        coverage_data = metadata.get("coverage") or []
-        if isinstance(coverage_data, list) and coverage_data:
-            coverage_items = []
-            for cov in coverage_data:
-                if not isinstance(cov, dict):
-                    continue
-                cov_title = _esc(cov.get("title", ""))
-                cov_url = cov.get("url", "")
-                cov_pub = _esc(cov.get("publication", ""))
-                if (
-                    cov_url
-                    and isinstance(cov_url, str)
-                    and cov_url.startswith(("http://", "https://"))
-                ):
-                    pub_span = f' <span class="coverage-pub">— {cov_pub}</span>' if cov_pub else ""
-                    coverage_items.append(
-                        f'<a href="{_esc(cov_url)}" target="_blank" rel="noopener noreferrer">{cov_title or _esc(cov_url)}</a>{pub_span}'
-                    )
-            if coverage_items:
-                coverage_html = (
-                    f'<div class="coverage-section"><h2>Coverage</h2>'
-                    f'<div class="coverage-list">{"".join(coverage_items)}</div></div>'
+    # Coverage — from the entry's own coverage frontmatter field
+    # Format: coverage: [{title, url, publication}, ...]
+    coverage_html = ""
+    coverage_data = metadata.get("coverage") or []
+    if isinstance(coverage_data, list) and coverage_data:
+        coverage_items = []
+        for cov in coverage_data:
+            if not isinstance(cov, dict):
+                continue
+            cov_title = _esc(cov.get("title", ""))
+            cov_url = cov.get("url", "")
+            cov_pub = _esc(cov.get("publication", ""))
+            if cov_url and isinstance(cov_url, str) and cov_url.startswith(("http://", "https://")):
+                pub_span = f' <span class="coverage-pub">— {cov_pub}</span>' if cov_pub else ""
+                coverage_items.append(
+                    f'<a href="{_esc(cov_url)}" target="_blank" rel="noopener noreferrer">{cov_title or _esc(cov_url)}</a>{pub_span}'
                 )
-
-        # Backlinks
-        bl_html = ""
-        if backlinks:
-            links = "".join(
-                f'<a href="/site/{_esc(bl.get("kb_name", kb_name))}/{_esc(bl["id"])}">{_esc(bl.get("title", bl["id"]))}</a> '
-                for bl in backlinks
-            )
-            bl_html = f'<div class="links-section"><h2>Linked from</h2>{links}</div>'
-
-        # Outlinks
-        ol_html = ""
-        if outlinks:
-            links = "".join(
-                f'<a href="/site/{_esc(ol.get("kb_name", kb_name))}/{_esc(ol["id"])}">{_esc(ol.get("title", ol["id"]))}</a> '
-                for ol in outlinks
-            )
-            ol_html = f'<div class="links-section"><h2>Links to</h2>{links}</div>'
-
-        meta_parts = []
-        if date:
-            meta_parts.append(_esc(date))
-        if location:
-            meta_parts.append(f"<span>{_esc(location)}</span>")
-        meta_parts.append(f'<span class="reading-time">{reading_mins} min read</span>')
-        if not read_only:
-            meta_parts.append(
-                f'<a href="/entries/{_esc(entry_id)}?kb={_esc(kb_name)}">Edit on Pyrite</a>'
+        if coverage_items:
+            coverage_html = (
+                f'<div class="coverage-section"><h2>Coverage</h2>'
+                f'<div class="coverage-list">{"".join(coverage_items)}</div></div>'
             )
-        meta_html = f'<div class="meta">{" &middot; ".join(meta_parts)}</div>'
 
-        body = (
-            f'<div class="breadcrumb"><a href="/site/{_esc(kb_name)}">Home</a><span class="sep">/</span>'
-            f"<strong>{_esc(title)}</strong></div>"
-            f"<h1>{_esc(title)}</h1>"
-            f'<div class="entry-badges"><span class="badge">{_esc(_humanize_type(entry_type))}</span>{status_html}</div>'
-            f"{tags_section}{lanes_html}{actors_html}{meta_html}"
-            f"<article>{body_html}</article>"
-            f"{coverage_html}{related_html}{sources_html}{bl_html}{ol_html}"
+    # Backlinks
+    bl_html = ""
+    if backlinks:
+        links = "".join(
+            f'<a href="/site/{_esc(bl.get("kb_name", kb_name))}/{_esc(bl["id"])}">{_esc(bl.get("title", bl["id"]))}</a> '
+            for bl in backlinks
         )
-
-        html = _render_page(
-            title=f"{_esc(title)} — {_esc(kb_name)} | {self._branding.name}",
-            description=_esc(description),
-            og_title=f"{_esc(title)} — {_esc(kb_name)}",
-            og_type="article",
-            og_url=canonical_path,
-            og_image="/static/favicon.svg",
-            twitter_card="summary",
-            extra_head=extra_head,
-            canonical=canonical,
-            body=body,
+        bl_html = f'<div class="links-section"><h2>Linked from</h2>{links}</div>'
+
+    # Outlinks
+    ol_html = ""
+    if outlinks:
+        links = "".join(
+            f'<a href="/site/{_esc(ol.get("kb_name", kb_name))}/{_esc(ol["id"])}">{_esc(ol.get("title", ol["id"]))}</a> '
+            for ol in outlinks
         )
+        ol_html = f'<div class="links-section"><h2>Links to</h2>{links}</div>'
+
+    meta_parts = []
+    if date:
+        meta_parts.append(_esc(date))
+    if location:
+        meta_parts.append(f"<span>{_esc(location)}</span>")
+    meta_parts.append(f'<span class="reading-time">{reading_mins} min read</span>')
+    if not read_only:
+        meta_parts.append(
+            f'<a href="/entries/{_esc(entry_id)}?kb={_esc(kb_name)}">Edit on Pyrite</a>'
+        )
+    meta_html = f'<div class="meta">{" &middot; ".join(meta_parts)}</div>'
+
+    body = (
+        f'<div class="breadcrumb"><a href="/site/{_esc(kb_name)}">Home</a><span class="sep">/</span>'
+        f"<strong>{_esc(title)}</strong></div>"
+        f"<h1>{_esc(title)}</h1>"
+        f'<div class="entry-badges"><span class="badge">{_esc(_humanize_type(entry_type))}</span>{status_html}</div>'
+        f"{tags_section}{lanes_html}{actors_html}{meta_html}"
+        f"<article>{body_html}</article>"
+        f"{coverage_html}{related_html}{sources_html}{bl_html}{ol_html}"
+    )
 
-        kb_dir = self.cache_dir / kb_name
-        kb_dir.mkdir(parents=True, exist_ok=True)
-        (kb_dir / f"{sanitize_filename(entry_id)}.html").write_text(html, encoding="utf-8")
+    html = _render_page(
+        title=f"{_esc(title)} — {_esc(kb_name)} | {brand_name}",
+        description=_esc(description),
+        og_title=f"{_esc(title)} — {_esc(kb_name)}",
+        og_type="article",
+        og_url=canonical_path,
+        og_image="/static/favicon.svg",
+        twitter_card="summary",
+        extra_head=extra_head,
+        canonical=canonical,
+        body=body,
+    )
+    return html
 
 
 def _render_designed_homepage(
@@ -1,19 +1,30 @@
 """URL liveness checking service for QA validation.
 
 Checks HTTP status codes for source URLs across KB entries, with caching
-to avoid rechecking unchanged URLs.
+to avoid rechecking unchanged URLs.  Checks run on a bounded thread pool
+with per-host concurrency and spacing limits, and cached URLs are
+revalidated with ETag/Last-Modified so an unchanged page costs one 304.
 """
 
 import json
 import logging
-from collections import defaultdict
-from dataclasses import dataclass
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Pyrite-QA/1.0 (URL liveness check)"
+# Responses worth retrying: rate limited or a transient server-side failure.
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 60.0
+
 
 @dataclass
 class URLCheckResult:
@@ -25,6 +36,8 @@ class URLCheckResult:
     error: str = ""
     checked_at: str = ""
     redirect_url: str = ""
+    etag: str = ""
+    last_modified: str = ""
 
     def to_dict(self) -> dict[str, Any]:
         d = {"url": self.url, "status_code": self.status_code, "ok": self.ok}
@@ -34,6 +47,10 @@ class URLCheckResult:
             d["redirect_url"] = self.redirect_url
         if self.checked_at:
             d["checked_at"] = self.checked_at
+        if self.etag:
+            d["etag"] = self.etag
+        if self.last_modified:
+            d["last_modified"] = self.last_modified
         return d
 
     @classmethod
@@ -45,6 +62,8 @@ class URLCheckResult:
             error=d.get("error", ""),
             checked_at=d.get("checked_at", ""),
             redirect_url=d.get("redirect_url", ""),
+            etag=d.get("etag", ""),
+            last_modified=d.get("last_modified", ""),
         )
 
 
@@ -56,12 +75,22 @@ class URLChecker:
         db: Any,
         cache_path: Path | None = None,
         timeout: int = 10,
-        max_concurrent: int = 5,
+        max_concurrent: int = 16,
+        per_host: int = 2,
+        host_delay: float = 0.5,
+        retries: int = 2,
+        backoff: float = 1.0,
+        cache_max_age: float | None = 86400.0,
     ):
         self.db = db
         self.cache_path = cache_path
         self.timeout = timeout
         self.max_concurrent = max_concurrent
+        self.per_host = max(1, per_host)
+        self.host_delay = host_delay
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_max_age = cache_max_age
 
     def collect_urls(
         self,
@@ -108,59 +137,152 @@ class URLChecker:
 
         return dict(url_entries)
 
-    def check_url(self, url: str) -> URLCheckResult:
-        """Check a single URL for liveness."""
+    def check_url(self, url: str, cached: URLCheckResult | None = None) -> URLCheckResult:
+        """Check a single URL for liveness.
+
+        With a ``cached`` result carrying an ETag or Last-Modified, the
+        request is conditional and a 304 returns the cached result with a
+        new ``checked_at``.  Rate limiting (429) and 5xx responses are
+        retried ``retries`` times with exponential backoff, honouring a
+        numeric ``Retry-After``.
+        """
+        headers = {"User-Agent": USER_AGENT}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        attempt = 0
+        while True:
+            result, retry_after = self._request(url, headers)
+            if result.status_code == 304 and cached is not None:
+                return replace(cached, checked_at=result.checked_at)
+            retryable = result.status_code in RETRY_STATUS or (
+                result.status_code == 0 and retry_after is not None
+            )
+            if not retryable or attempt >= self.retries:
+                return result
+            delay = self.backoff * (2**attempt)
+            if retry_after:
+                delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+            time.sleep(delay)
+            attempt += 1
+
+    def _request(self, url: str, headers: dict[str, str]) -> tuple[URLCheckResult, float | None]:
+        """One HEAD request; returns the result and a retry delay hint.
+
+        The hint is the ``Retry-After`` seconds (0.0 when absent) for
+        retryable responses and connection errors, None otherwise.
+        """
         import urllib.error
         import urllib.request
 
+        now = datetime.now(UTC).isoformat()
         try:
-            req = urllib.request.Request(url, method="HEAD")
-            req.add_header("User-Agent", "Pyrite-QA/1.0 (URL liveness check)")
+            req = urllib.request.Request(url, method="HEAD", headers=headers)
             with urllib.request.urlopen(req, timeout=self.timeout) as resp:
                 return URLCheckResult(
                     url=url,
                     status_code=resp.status,
                     ok=200 <= resp.status < 400,
-                    checked_at=datetime.now(UTC).isoformat(),
+                    checked_at=now,
                     redirect_url=resp.url if resp.url != url else "",
-                )
+                    etag=resp.headers.get("ETag", ""),
+                    last_modified=resp.headers.get("Last-Modified", ""),
+                ), None
         except urllib.error.HTTPError as e:
+            retry_after = None
+            if e.code in RETRY_STATUS:
+                try:
+                    retry_after = float(e.headers.get("Retry-After", 0))
+                except (TypeError, ValueError):
+                    retry_after = 0.0
             return URLCheckResult(
                 url=url,
                 status_code=e.code,
                 ok=False,
-                checked_at=datetime.now(UTC).isoformat(),
-            )
+                checked_at=now,
+            ), retry_after
         except Exception as e:
             return URLCheckResult(
                 url=url,
                 status_code=0,
                 ok=False,
                 error=str(e)[:200],
-                checked_at=datetime.now(UTC).isoformat(),
-            )
+                checked_at=now,
+            ), 0.0
 
     def check_urls(
         self,
         urls: list[str],
         use_cache: bool = True,
     ) -> list[URLCheckResult]:
-        """Check multiple URLs, using cache when available."""
+        """Check multiple URLs concurrently, using cache when available.
+
+        Cached results younger than ``cache_max_age`` seconds are returned
+        without a request; older ones are revalidated conditionally.  URLs
+        are grouped by host and each host gets at most ``per_host``
+        concurrent requests spaced ``host_delay`` seconds apart, so one slow
+        or strict host occupies only its own lanes of the
+        ``max_concurrent`` worker threads.
+        """
         cached = self.load_cache() if use_cache and self.cache_path else {}
-        results: list[URLCheckResult] = []
+        checked: dict[str, URLCheckResult] = {}
+        by_host: dict[str, deque[str]] = defaultdict(deque)
 
-        for url in urls:
-            if url in cached:
-                results.append(cached[url])
+        for url in dict.fromkeys(urls):
+            hit = cached.get(url)
+            if hit is not None and self._is_fresh(hit):
+                checked[url] = hit
             else:
-                result = self.check_url(url)
-                results.append(result)
-                cached[url] = result
+                by_host[urlsplit(url).netloc.lower()].append(url)
+
+        if by_host:
+            lock = threading.Lock()
+            next_start: dict[str, float] = dict.fromkeys(by_host, 0.0)
+
+            def lane(host: str) -> None:
+                queue = by_host[host]
+                while True:
+                    with lock:
+                        if not queue:
+                            return
+                        url = queue.popleft()
+                        now = time.monotonic()
+                        wait = max(0.0, next_start[host] - now)
+                        next_start[host] = now + wait + self.host_delay
+                    if wait:
+                        time.sleep(wait)
+                    result = self.check_url(url, cached.get(url))
+                    with lock:
+                        checked[url] = result
+
+            # Interleave lanes across hosts so every host starts early.
+            lanes = [
+                host
+                for rank in range(self.per_host)
+                for host, queue in by_host.items()
+                if rank < len(queue)
+            ]
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrent)) as pool:
+                for future in [pool.submit(lane, host) for host in lanes]:
+                    future.result()
 
         if self.cache_path:
+            cached.update(checked)
             self.save_cache(cached)
 
-        return results
+        return [checked[url] for url in urls]
+
+    def _is_fresh(self, result: URLCheckResult) -> bool:
+        if self.cache_max_age is None:
+            return True
+        try:
+            checked_at = datetime.fromisoformat(result.checked_at)
+        except ValueError:
+            return False
+        return (datetime.now(UTC) - checked_at).total_seconds() < self.cache_max_age
 
     def build_report(
         self,
@@ -458,15 +458,23 @@ class WorktreeService:
 
         return dataclasses.replace(kb_config, path=user_kb_path)
 
+    def get_user_diff_db_path(self, kb_name: str, user_id: int) -> Path | None:
+        """Path of the user's diff index, or None if they have no worktree."""
+        row = self._get_worktree_row(kb_name, user_id)
+        if not row:
+            return None
+        return Path(row["diff_db_path"])
+
     def get_user_diff_db(
         self, kb_name: str, user_id: int
     ) -> PyriteDB | None:
         """Get a PyriteDB instance for the user's diff index.
 
         Returns None if the user has no worktree for this KB.
-        The caller should cache this — PyriteDB init is heavyweight.
+        The caller owns the handle; the server shares them through
+        ``DiffDBPool`` instead of opening one per request.
         """
-        row = self._get_worktree_row(kb_name, user_id)
-        if not row:
+        path = self.get_user_diff_db_path(kb_name, user_id)
+        if path is None:
             return None
-        return PyriteDB(Path(row["diff_db_path"]))
+        return PyriteDB(path)
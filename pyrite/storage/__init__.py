@@ -4,23 +4,52 @@ pyrite Storage Layer
 SQLAlchemy ORM for standard tables, raw SQL for FTS5/sqlite-vec virtual tables.
 """
 
-from .database import PyriteDB
-from .document_manager import DocumentManager
-from .index import IndexManager
-from .models import (
-    KB,
-    Base,
-    Entry,
-    EntryTag,
-    EntryVersion,
-    Link,
-    Repo,
-    Source,
-    Tag,
-    User,
-    WorkspaceRepo,
-)
-from .repository import KBRepository
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .database import PyriteDB
+    from .document_manager import DocumentManager
+    from .index import IndexManager
+    from .models import (
+        KB,
+        Base,
+        Entry,
+        EntryTag,
+        EntryVersion,
+        Link,
+        Repo,
+        Source,
+        Tag,
+        User,
+        WorkspaceRepo,
+    )
+    from .repository import KBRepository
+
+# Exports are imported on first access: KBRepository and the file-based
+# helpers must not drag SQLAlchemy in for CLI commands that never open the DB.
+_EXPORTS = {
+    "PyriteDB": ".database",
+    "DocumentManager": ".document_manager",
+    "IndexManager": ".index",
+    "KBRepository": ".repository",
+    **dict.fromkeys(
+        [
+            "KB",
+            "Base",
+            "Entry",
+            "EntryTag",
+            "EntryVersion",
+            "Link",
+            "Repo",
+            "Source",
+            "Tag",
+            "User",
+            "WorkspaceRepo",
+        ],
+        ".models",
+    ),
+}
 
 __all__ = [
     "Base",
@@ -39,3 +68,12 @@ __all__ = [
     "User",
     "WorkspaceRepo",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -14,14 +14,36 @@ from __future__ import annotations
 
 import json
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from typing import Any
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from ..models import Block, EdgeEndpoint, Entry, EntryRef, EntryTag, Link, Source, Tag
+from ..models import (
+    Block,
+    EdgeEndpoint,
+    Entry,
+    EntryRef,
+    EntryTag,
+    EntryTombstone,
+    Link,
+    RelatedDirty,
+    RelatedEntry,
+    RelatedTerm,
+    Setting,
+    Source,
+    Tag,
+)
+from ..virtual_tables import FTS_CONFIG_KEY, FtsConfig
+from .link_graph import LinkGraph
+from .related_index import RelatedScoring, entry_terms, top_related
 from ...utils.json_utils import SafeEncoder as _SafeEncoder
+from ...utils.markdown_blocks import content_hash
 
 
 class BaseBackend(ABC):
@@ -31,6 +53,15 @@ class BaseBackend(ABC):
 
     _SORT_COLUMNS = {"title", "updated_at", "created_at", "entry_type"}
 
+    # Backends that fuse keyword and vector search server-side set this and
+    # implement ``search_hybrid()``; SearchService fuses in Python otherwise.
+    supports_hybrid_search = False
+
+    # Backends that keep one vector table per embedding model version set this
+    # and implement the ``*_embedding_*`` version methods (see SQLiteBackend);
+    # others hold a single vector per entry.
+    supports_embedding_versions = False
+
     # =====================================================================
     # Raw SQL helpers — subclasses must provide these
     # =====================================================================
@@ -71,10 +102,13 @@ class BaseBackend(ABC):
             self._sync_entry_refs(entry_id, kb_name, entry_data)
             self._sync_blocks(entry_id, kb_name, entry_data)
             self._sync_edge_endpoints(entry_id, kb_name, entry_data)
+            self._sync_related_terms(entry_id, kb_name, entry_data)
             self._session.commit()
         except Exception:
             self._session.rollback()
             raise
+        self.invalidate_link_graph()
+        self._drain_related(kb_name)
 
     def _upsert_entry_main(self, entry_id: str, kb_name: str, entry_data: dict[str, Any]) -> None:
         metadata = entry_data.get("metadata", {})
@@ -203,8 +237,25 @@ class BaseBackend(ABC):
             )
 
     def _sync_blocks(self, entry_id: str, kb_name: str, entry_data: dict) -> None:
-        self._session.query(Block).filter_by(entry_id=entry_id, kb_name=kb_name).delete()
+        """Diff the entry's blocks against its stored rows by content hash.
+
+        Rows whose block ID, heading, type and content hash still appear are
+        kept (only a moved block's position is rewritten); the rest are
+        deleted and new blocks inserted, so a frontmatter-only or one-block
+        edit no longer deletes and reinserts every block row.
+        """
+        stored: dict[tuple, list[Block]] = {}
+        for row in self._session.query(Block).filter_by(entry_id=entry_id, kb_name=kb_name):
+            key = (row.block_id, row.heading, row.block_type, content_hash(row.content))
+            stored.setdefault(key, []).append(row)
         for blk in entry_data.get("_blocks", []):
+            digest = blk.get("content_hash") or content_hash(blk["content"])
+            rows = stored.get((blk["block_id"], blk.get("heading"), blk["block_type"], digest))
+            if rows:
+                row = rows.pop()
+                if row.position != blk["position"]:
+                    row.position = blk["position"]
+                continue
             self._session.add(
                 Block(
                     entry_id=entry_id,
@@ -216,6 +267,9 @@ class BaseBackend(ABC):
                     block_type=blk["block_type"],
                 )
             )
+        for rows in stored.values():
+            for row in rows:
+                self._session.delete(row)
 
     def _sync_edge_endpoints(self, entry_id: str, kb_name: str, entry_data: dict) -> None:
         self._session.query(EdgeEndpoint).filter_by(
@@ -234,9 +288,51 @@ class BaseBackend(ABC):
                 )
             )
 
+    def _sync_related_terms(self, entry_id: str, kb_name: str, entry_data: dict) -> None:
+        terms = self._session.query(RelatedTerm).filter_by(entry_id=entry_id, kb_name=kb_name)
+        old = {(t.kind, t.value) for t in terms}
+        new = entry_terms(entry_data)
+        terms.delete()
+        for kind, value in new:
+            self._session.add(
+                RelatedTerm(entry_id=entry_id, kb_name=kb_name, kind=kind, value=value)
+            )
+        self._session.merge(RelatedDirty(entry_id=entry_id, kb_name=kb_name))
+        self._queue_threshold_crossings(kb_name, set(new) - old, old - set(new))
+
+    def _queue_threshold_crossings(
+        self, kb_name: str, added: set[tuple[str, str]], removed: set[tuple[str, str]]
+    ) -> None:
+        """Queue every entry sharing a term that just crossed ``max_term_entries``.
+
+        Scores skip terms used by more than ``max_term_entries`` entries, so
+        when a term enters or leaves that range the scores of all its other
+        entries change too, not just the writer's.
+        """
+        max_df = self.get_related_scoring().max_term_entries
+        if max_df <= 0:
+            return
+        crossings = [(term, max_df + 1) for term in added] + [(term, max_df) for term in removed]
+        for (kind, value), crossed_at in crossings:
+            holders = self._session.query(RelatedTerm.entry_id).filter_by(
+                kb_name=kb_name, kind=kind, value=value
+            )
+            if holders.count() == crossed_at:
+                for (holder,) in holders:
+                    self._session.merge(RelatedDirty(entry_id=holder, kb_name=kb_name))
+
     def delete_entry(self, entry_id: str, kb_name: str) -> bool:
+        terms = self._session.query(RelatedTerm).filter_by(entry_id=entry_id, kb_name=kb_name)
+        removed = {(t.kind, t.value) for t in terms}
+        terms.delete()
         count = self._session.query(Entry).filter_by(id=entry_id, kb_name=kb_name).delete()
+        if count:
+            self._session.merge(RelatedDirty(entry_id=entry_id, kb_name=kb_name))
+            self._queue_threshold_crossings(kb_name, set(), removed)
         self._session.commit()
+        self.invalidate_link_graph()
+        if count:
+            self._drain_related(kb_name)
         return count > 0
 
     def get_entry(self, entry_id: str, kb_name: str) -> dict[str, Any] | None:
@@ -266,6 +362,24 @@ class BaseBackend(ABC):
             results.append(d)
         return results
 
+    def get_entry_headers(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Batch-get id, kb_name, title, entry_type and summary, without bodies or relations."""
+        if not ids:
+            return []
+        from sqlalchemy import tuple_
+
+        rows = (
+            self._session.query(
+                Entry.id, Entry.kb_name, Entry.title, Entry.entry_type, Entry.summary
+            )
+            .filter(tuple_(Entry.id, Entry.kb_name).in_(ids))
+            .all()
+        )
+        return [
+            {"id": r[0], "kb_name": r[1], "title": r[2], "entry_type": r[3], "summary": r[4]}
+            for r in rows
+        ]
+
     @staticmethod
     def _parse_metadata(raw: Any) -> dict:
         """Parse extra_data into a dict, handling JSON strings and edge cases."""
@@ -423,6 +537,35 @@ class BaseBackend(ABC):
             entries.append(e)
         return entries
 
+    def list_entries_after(
+        self,
+        kb_name: str,
+        after_id: str | None = None,
+        limit: int = 500,
+        include_archived: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Keyset page of a KB's entries ordered by ID, starting after ``after_id``.
+
+        Unlike ``list_entries`` with ``offset``, each page is an index range
+        scan on the (id, kb_name) primary key, so walking a whole KB stays
+        linear however large it is.
+        """
+        from sqlalchemy import func as sa_func
+
+        query = self._session.query(Entry).filter(Entry.kb_name == kb_name)
+        if not include_archived:
+            query = query.filter(sa_func.coalesce(Entry.lifecycle, "active") != "archived")
+        if after_id is not None:
+            query = query.filter(Entry.id > after_id)
+        rows = query.order_by(Entry.id).limit(limit).all()
+        tag_map = self._get_tags_for_entries([(e.id, e.kb_name) for e in rows])
+        entries = []
+        for entry in rows:
+            e = self._entry_to_dict(entry)
+            e["tags"] = tag_map.get((entry.id, entry.kb_name), [])
+            entries.append(e)
+        return entries
+
     def count_entries(
         self,
         kb_name: str | None = None,
@@ -452,6 +595,36 @@ class BaseBackend(ABC):
             query = query.filter(Entry.importance >= min_importance)
         return query.scalar() or 0
 
+    def get_entry_keys(self, kb_name: str | None = None) -> list[tuple[str, str]]:
+        """All (entry_id, kb_name) keys, without loading entry rows."""
+        query = self._session.query(Entry.id, Entry.kb_name)
+        if kb_name:
+            query = query.filter(Entry.kb_name == kb_name)
+        return [(r[0], r[1]) for r in query.all()]
+
+    # =====================================================================
+    # Overlay tombstones (used in per-user diff indexes)
+    # =====================================================================
+
+    def add_tombstone(self, entry_id: str, kb_name: str) -> None:
+        self._session.merge(EntryTombstone(entry_id=entry_id, kb_name=kb_name))
+        self._session.commit()
+
+    def remove_tombstone(self, entry_id: str, kb_name: str) -> bool:
+        count = (
+            self._session.query(EntryTombstone)
+            .filter_by(entry_id=entry_id, kb_name=kb_name)
+            .delete()
+        )
+        self._session.commit()
+        return count > 0
+
+    def get_tombstones(self, kb_name: str | None = None) -> set[tuple[str, str]]:
+        query = self._session.query(EntryTombstone.entry_id, EntryTombstone.kb_name)
+        if kb_name:
+            query = query.filter(EntryTombstone.kb_name == kb_name)
+        return {(r[0], r[1]) for r in query.all()}
+
     def get_distinct_types(self, kb_name: str | None = None) -> list[str]:
         query = (
             self._session.query(Entry.entry_type).filter(Entry.entry_type.isnot(None)).distinct()
@@ -490,6 +663,70 @@ class BaseBackend(ABC):
         """Full-text search — FTS5 (SQLite) or tsvector (Postgres)."""
         ...
 
+    # =====================================================================
+    # Full-text search options and substring search
+    # =====================================================================
+
+    _fts_config: FtsConfig | None = None
+
+    # Substring matching operator; case-insensitive for ASCII in SQLite.
+    _SUBSTRING_LIKE = "LIKE"
+
+    def get_fts_config(self) -> FtsConfig:
+        """The FTS ranking/index config stored for this database."""
+        if self._fts_config is None:
+            self._fts_config = FtsConfig.from_json(
+                self._exec_scalar(
+                    "SELECT value FROM setting WHERE key = :key", {"key": FTS_CONFIG_KEY}
+                )
+            )
+        return self._fts_config
+
+    def configure_fts(self, config: FtsConfig) -> bool:
+        """Store a new FTS config, rebuilding the index if its structure changed."""
+        current = self.get_fts_config()
+        if current == config:
+            return False
+        if not current.same_structure(config):
+            self._rebuild_fts(config)
+        setting = self._session.query(Setting).filter_by(key=FTS_CONFIG_KEY).first()
+        if setting is None:
+            setting = Setting(key=FTS_CONFIG_KEY)
+            self._session.add(setting)
+        setting.value = config.to_json()
+        setting.updated_at = datetime.now(UTC).isoformat()
+        self._session.commit()
+        self._fts_config = config
+        return True
+
+    def _rebuild_fts(self, config: FtsConfig) -> None:
+        """Rebuild the keyword index for new prefix/trigram options.
+
+        A no-op for backends whose keyword index has no such options.
+        """
+        return None
+
+    def search_substring(
+        self, text: str, kb_name: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Entries whose title, summary or body contains ``text`` anywhere (LIKE scan)."""
+        escaped = text
+        for char in ("\\", "%", "_"):
+            escaped = escaped.replace(char, "\\" + char)
+        like = self._SUBSTRING_LIKE
+        sql = f"""
+            SELECT e.id, e.kb_name, e.entry_type, e.title, e.summary, e.date
+            FROM entry e
+            WHERE (e.title {like} :pattern ESCAPE '\\' OR e.summary {like} :pattern ESCAPE '\\'
+                   OR e.body {like} :pattern ESCAPE '\\')
+        """
+        params: dict[str, Any] = {"pattern": f"%{escaped}%", "limit": limit}
+        if kb_name:
+            sql += " AND e.kb_name = :kb_name"
+            params["kb_name"] = kb_name
+        sql += " ORDER BY e.title LIMIT :limit"
+        return self._exec(sql, params)
+
     @abstractmethod
     def search_by_tag(
         self, tag: str, kb_name: str | None = None, limit: int = 50
@@ -550,6 +787,23 @@ class BaseBackend(ABC):
     def delete_embedding(self, entry_id: str, kb_name: str) -> None:
         ...
 
+    @abstractmethod
+    def get_embedding(self, entry_id: str, kb_name: str) -> list[float] | None:
+        ...
+
+    def get_kb_embeddings(self, kb_name: str) -> list[tuple[str, array]]:
+        """(entry_id, float32 array) for each embedded entry in ``kb_name``.
+
+        Generic fallback fetching one embedding per entry; backends that can
+        read a KB's vectors in one query override this.
+        """
+        result = []
+        for entry_id, _kb in self.get_entry_keys(kb_name):
+            embedding = self.get_embedding(entry_id, kb_name)
+            if embedding:
+                result.append((entry_id, array("f", embedding)))
+        return result
+
     # =====================================================================
     # Graph queries (links) — shared via _exec helpers
     # =====================================================================
@@ -587,6 +841,19 @@ class BaseBackend(ABC):
             {"entry_id": entry_id, "kb_name": kb_name},
         )
 
+    def get_linked_pairs(self, kb_a: str, kb_b: str) -> set[tuple[str, str]]:
+        rows = self._exec(
+            """
+            SELECT source_id AS a_id, target_id AS b_id FROM link
+            WHERE source_kb = :kb_a AND target_kb = :kb_b
+            UNION
+            SELECT target_id AS a_id, source_id AS b_id FROM link
+            WHERE source_kb = :kb_b AND target_kb = :kb_a
+            """,
+            {"kb_a": kb_a, "kb_b": kb_b},
+        )
+        return {(r["a_id"], r["b_id"]) for r in rows}
+
     def get_all_backlinks_for_kb(self, kb_name: str) -> dict[str, list[dict[str, Any]]]:
         """Get ALL backlinks targeting entries in a KB in one query."""
         rows = self._exec(
@@ -645,6 +912,171 @@ class BaseBackend(ABC):
             result[entry_id].append(d)
         return result
 
+    # Link graphs larger than this are traversed with batched SQL instead of
+    # being loaded into memory.
+    _GRAPH_CACHE_MAX_LINKS = 2_000_000
+
+    # Max entry IDs bound per IN (...) list on the SQL traversal path.
+    _GRAPH_SQL_BATCH = 400
+
+    _link_graphs: dict[tuple[str | None, bool], LinkGraph] | None = None
+
+    def invalidate_link_graph(self) -> None:
+        """Drop all cached link graphs; they are rebuilt lazily on next use."""
+        self._link_graphs = None
+
+    def _graph_data_version(self) -> Any:
+        """Return a token that changes whenever committed link or entry data changes.
+
+        The default is a row-count/max-id fingerprint; backends with a cheaper
+        change counter should override it.
+        """
+        row = self._exec_one(
+            "SELECT (SELECT COUNT(*) FROM link) AS link_count, "
+            "(SELECT MAX(id) FROM link) AS max_link_id, "
+            "(SELECT MAX(indexed_at) FROM entry) AS last_indexed"
+        )
+        return tuple(row.values()) if row else None
+
+    def index_generation(self) -> Any:
+        """Return a token that changes whenever committed index data changes.
+
+        Callers caching anything derived from the index (search results,
+        retrieved chat context) compare it instead of subscribing to writes.
+        """
+        return self._graph_data_version()
+
+    def get_link_graph(
+        self, kb_name: str | None = None, include_refs: bool = False
+    ) -> LinkGraph | None:
+        """Return the cached CSR link graph for a KB (or all KBs), rebuilding if stale.
+
+        A KB-scoped graph holds every edge with at least one endpoint in the
+        KB.  With ``include_refs`` the graph also carries object-ref edges
+        (relation ``ref:<field>``) and edge-entity edges from each edge
+        entry's source endpoint to its target endpoint (relation
+        ``edge:<edge_type>``).
+
+        Returns None when the scope has more than ``_GRAPH_CACHE_MAX_LINKS``
+        edges — callers fall back to SQL.
+        """
+        if self._link_graphs is None:
+            self._link_graphs = {}
+        cache_key = (kb_name, include_refs)
+        version = self._graph_data_version()
+        graph = self._link_graphs.get(cache_key)
+        if graph is not None and graph.version == version:
+            return graph
+
+        params: dict[str, Any] = {}
+        link_where = ref_where = edge_where = ""
+        if kb_name:
+            params["kb_name"] = kb_name
+            link_where = " WHERE source_kb = :kb_name OR target_kb = :kb_name"
+            ref_where = " WHERE r.source_kb = :kb_name OR r.target_kb = :kb_name"
+            edge_where = " AND (s.endpoint_kb = :kb_name OR t.endpoint_kb = :kb_name)"
+        edge_sql = (
+            "SELECT source_id, source_kb, target_id, target_kb, relation, "
+            f"0 AS kind, id AS ord FROM link{link_where}"
+        )
+        if include_refs:
+            edge_sql += f"""
+                UNION ALL
+                SELECT r.source_id, r.source_kb, r.target_id, r.target_kb,
+                       'ref:' || r.field_name, 1, r.id
+                FROM entry_ref r{ref_where}
+                UNION ALL
+                SELECT s.endpoint_id, s.endpoint_kb, t.endpoint_id, t.endpoint_kb,
+                       'edge:' || s.edge_type, 2, s.id
+                FROM edge_endpoint s
+                JOIN edge_endpoint t ON s.edge_entry_id = t.edge_entry_id
+                                    AND s.edge_entry_kb = t.edge_entry_kb
+                WHERE s.role = 'source' AND t.role = 'target'{edge_where}"""
+        edge_total = self._exec_scalar(f"SELECT COUNT(*) FROM ({edge_sql}) AS g", params) or 0
+        if edge_total > self._GRAPH_CACHE_MAX_LINKS:
+            self._link_graphs.pop(cache_key, None)
+            return None
+
+        edge_rows = self._exec(f"{edge_sql} ORDER BY kind, ord", params)
+        entry_sql = "SELECT id, kb_name, title, entry_type FROM entry"
+        if kb_name:
+            entry_sql += " WHERE kb_name = :kb_name"
+        entry_rows = self._exec(entry_sql, params)
+        graph = LinkGraph.build(
+            (
+                (r["source_id"], r["source_kb"], r["target_id"], r["target_kb"], r["relation"])
+                for r in edge_rows
+            ),
+            ((r["id"], r["kb_name"], r["title"], r["entry_type"]) for r in entry_rows),
+            version=version,
+        )
+        self._link_graphs[cache_key] = graph
+        return graph
+
+    @staticmethod
+    def _graph_neighbours_cached(graph: LinkGraph, frontier: list[tuple[str, str]]):
+        """Neighbour lookup for one BFS hop, served from the in-memory graph."""
+
+        def neighbours(key: tuple[str, str]):
+            i = graph.index_of(*key)
+            if i is None:
+                return (), ()
+            keys, titles, types, exists = graph.keys, graph.titles, graph.entry_types, graph.exists
+            out_rows = (
+                (*keys[t], relation, titles[t], types[t]) for t, relation in graph.out_edges(i)
+            )
+            in_rows = (
+                (*keys[s], relation, titles[s], types[s])
+                for s, relation in graph.in_edges(i)
+                if exists[s]
+            )
+            return out_rows, in_rows
+
+        return neighbours
+
+    def _graph_neighbours_sql(self, frontier: list[tuple[str, str]]):
+        """Neighbour lookup for one BFS hop, fetched with one query per ID batch."""
+        wanted = set(frontier)
+        out_map: dict[tuple[str, str], list[tuple]] = defaultdict(list)
+        in_map: dict[tuple[str, str], list[tuple]] = defaultdict(list)
+        ids = sorted({eid for eid, _ in frontier})
+        for start in range(0, len(ids), self._GRAPH_SQL_BATCH):
+            batch = ids[start : start + self._GRAPH_SQL_BATCH]
+            params = {f"id{n}": eid for n, eid in enumerate(batch)}
+            in_list = ", ".join(f":{name}" for name in params)
+            rows = self._exec(
+                f"""SELECT 'out' AS direction, l.id AS link_id,
+                           l.source_id AS anchor_id, l.source_kb AS anchor_kb,
+                           l.target_id AS node_id, l.target_kb AS node_kb,
+                           l.relation, e.title, e.entry_type
+                    FROM link l
+                    LEFT JOIN entry e ON l.target_id = e.id AND l.target_kb = e.kb_name
+                    WHERE l.source_id IN ({in_list})
+                    UNION ALL
+                    SELECT 'in' AS direction, l.id AS link_id,
+                           l.target_id AS anchor_id, l.target_kb AS anchor_kb,
+                           l.source_id AS node_id, l.source_kb AS node_kb,
+                           l.relation, e.title, e.entry_type
+                    FROM link l
+                    JOIN entry e ON l.source_id = e.id AND l.source_kb = e.kb_name
+                    WHERE l.target_id IN ({in_list})
+                    ORDER BY link_id""",
+                params,
+            )
+            for r in rows:
+                anchor = (r["anchor_id"], r["anchor_kb"])
+                if anchor not in wanted:
+                    continue
+                target = out_map if r["direction"] == "out" else in_map
+                target[anchor].append(
+                    (r["node_id"], r["node_kb"], r["relation"], r["title"], r["entry_type"])
+                )
+
+        def neighbours(key: tuple[str, str]):
+            return out_map.get(key, ()), in_map.get(key, ())
+
+        return neighbours
+
     def get_graph_data(
         self,
         center: str | None = None,
@@ -658,13 +1090,25 @@ class BaseBackend(ABC):
         nodes: dict[tuple[str, str], dict[str, Any]] = {}
         edges: list[dict[str, Any]] = []
         edge_set: set[tuple[str, str, str, str]] = set()
+        graph = self.get_link_graph(kb_name)
 
         if center and center_kb:
-            row = self._exec_one(
-                "SELECT id, kb_name, title, entry_type FROM entry "
-                "WHERE id = :center AND kb_name = :center_kb",
-                {"center": center, "center_kb": center_kb},
-            )
+            row = None
+            if graph is not None:
+                ci = graph.index_of(center, center_kb)
+                if ci is not None and graph.exists[ci]:
+                    row = {
+                        "id": center,
+                        "kb_name": center_kb,
+                        "title": graph.titles[ci],
+                        "entry_type": graph.entry_types[ci],
+                    }
+            if row is None:
+                row = self._exec_one(
+                    "SELECT id, kb_name, title, entry_type FROM entry "
+                    "WHERE id = :center AND kb_name = :center_kb",
+                    {"center": center, "center_kb": center_kb},
+                )
             if not row:
                 return {"nodes": [], "edges": []}
             nodes[(row["id"], row["kb_name"])] = row
@@ -673,25 +1117,21 @@ class BaseBackend(ABC):
             for _hop in range(depth):
                 if not frontier or len(nodes) >= limit:
                     break
+                if graph is not None:
+                    neighbours = self._graph_neighbours_cached(graph, frontier)
+                else:
+                    neighbours = self._graph_neighbours_sql(frontier)
                 next_frontier: list[tuple[str, str]] = []
                 for eid, ekb in frontier:
                     if len(nodes) >= limit:
                         break
-                    out_rows = self._exec(
-                        """SELECT l.target_id, l.target_kb, l.relation,
-                                  e.title, e.entry_type
-                           FROM link l
-                           LEFT JOIN entry e ON l.target_id = e.id AND l.target_kb = e.kb_name
-                           WHERE l.source_id = :eid AND l.source_kb = :ekb""",
-                        {"eid": eid, "ekb": ekb},
-                    )
-                    for r in out_rows:
+                    out_rows, in_rows = neighbours((eid, ekb))
+                    for tid, tkb, relation, title, etype in out_rows:
                         if len(nodes) >= limit:
                             break
-                        tid, tkb = r["target_id"], r["target_kb"]
                         if kb_name and tkb != kb_name:
                             continue
-                        if entry_type and r["entry_type"] and r["entry_type"] != entry_type:
+                        if entry_type and etype and etype != entry_type:
                             continue
                         edge_key = (eid, ekb, tid, tkb)
                         if edge_key not in edge_set:
@@ -702,33 +1142,24 @@ class BaseBackend(ABC):
                                     "source_kb": ekb,
                                     "target_id": tid,
                                     "target_kb": tkb,
-                                    "relation": r["relation"],
+                                    "relation": relation,
                                 }
                             )
                         if (tid, tkb) not in nodes:
                             nodes[(tid, tkb)] = {
                                 "id": tid,
                                 "kb_name": tkb,
-                                "title": r["title"] or tid,
-                                "entry_type": r["entry_type"] or "unknown",
+                                "title": title or tid,
+                                "entry_type": etype or "unknown",
                             }
                             next_frontier.append((tid, tkb))
 
-                    in_rows = self._exec(
-                        """SELECT l.source_id, l.source_kb, l.relation,
-                                  e.title, e.entry_type
-                           FROM link l
-                           JOIN entry e ON l.source_id = e.id AND l.source_kb = e.kb_name
-                           WHERE l.target_id = :eid AND l.target_kb = :ekb""",
-                        {"eid": eid, "ekb": ekb},
-                    )
-                    for r in in_rows:
+                    for sid, skb, relation, title, etype in in_rows:
                         if len(nodes) >= limit:
                             break
-                        sid, skb = r["source_id"], r["source_kb"]
                         if kb_name and skb != kb_name:
                             continue
-                        if entry_type and r["entry_type"] != entry_type:
+                        if entry_type and etype != entry_type:
                             continue
                         edge_key = (sid, skb, eid, ekb)
                         if edge_key not in edge_set:
@@ -739,19 +1170,52 @@ class BaseBackend(ABC):
                                     "source_kb": skb,
                                     "target_id": eid,
                                     "target_kb": ekb,
-                                    "relation": r["relation"],
+                                    "relation": relation,
                                 }
                             )
                         if (sid, skb) not in nodes:
                             nodes[(sid, skb)] = {
                                 "id": sid,
                                 "kb_name": skb,
-                                "title": r["title"] or sid,
-                                "entry_type": r["entry_type"] or "unknown",
+                                "title": title or sid,
+                                "entry_type": etype or "unknown",
                             }
                             next_frontier.append((sid, skb))
 
                 frontier = next_frontier
+        elif graph is not None:
+            selected: list[int] = []
+            for i, (eid, ekb) in enumerate(graph.keys):
+                if len(selected) >= limit:
+                    break
+                if not graph.exists[i]:
+                    continue
+                if kb_name and ekb != kb_name:
+                    continue
+                if entry_type and graph.entry_types[i] != entry_type:
+                    continue
+                selected.append(i)
+                nodes[(eid, ekb)] = {
+                    "id": eid,
+                    "kb_name": ekb,
+                    "title": graph.titles[i],
+                    "entry_type": graph.entry_types[i],
+                }
+            chosen = set(selected)
+            for i in selected:
+                sid, skb = graph.keys[i]
+                for t, relation in graph.out_edges(i):
+                    if t in chosen:
+                        tid, tkb = graph.keys[t]
+                        edges.append(
+                            {
+                                "source_id": sid,
+                                "source_kb": skb,
+                                "target_id": tid,
+                                "target_kb": tkb,
+                                "relation": relation,
+                            }
+                        )
         else:
             sql = """
                 SELECT e.id, e.kb_name, e.title, e.entry_type
@@ -770,25 +1234,31 @@ class BaseBackend(ABC):
             params["limit"] = limit
             for r in self._exec(sql, params):
                 nodes[(r["id"], r["kb_name"])] = r
-            if nodes:
-                link_rows = self._exec(
-                    "SELECT source_id, source_kb, target_id, target_kb, relation FROM link"
-                )
-                for r in link_rows:
+            ids = sorted({eid for eid, _ in nodes})
+            for start in range(0, len(ids), self._GRAPH_SQL_BATCH):
+                batch = ids[start : start + self._GRAPH_SQL_BATCH]
+                batch_params = {f"id{n}": eid for n, eid in enumerate(batch)}
+                in_list = ", ".join(f":{name}" for name in batch_params)
+                for r in self._exec(
+                    "SELECT source_id, source_kb, target_id, target_kb, relation "
+                    f"FROM link WHERE source_id IN ({in_list}) ORDER BY id",
+                    batch_params,
+                ):
                     src = (r["source_id"], r["source_kb"])
                     tgt = (r["target_id"], r["target_kb"])
                     if src in nodes and tgt in nodes:
                         edges.append(r)
 
+        link_counts: Counter[tuple[str, str]] = Counter()
+        for e in edges:
+            src = (e["source_id"], e["source_kb"])
+            tgt = (e["target_id"], e["target_kb"])
+            link_counts[src] += 1
+            if tgt != src:
+                link_counts[tgt] += 1
         node_list = []
-        for node in nodes.values():
-            count = 0
-            for e in edges:
-                if (e["source_id"] == node["id"] and e["source_kb"] == node["kb_name"]) or (
-                    e["target_id"] == node["id"] and e["target_kb"] == node["kb_name"]
-                ):
-                    count += 1
-            node["link_count"] = count
+        for key, node in nodes.items():
+            node["link_count"] = link_counts[key]
             node_list.append(node)
         return {"nodes": node_list, "edges": edges}
 
@@ -1038,3 +1508,333 @@ class BaseBackend(ABC):
             """,
             {"id_a": id_a, "id_b": id_b, "kb_name": kb_name},
         )
+
+    # =====================================================================
+    # Related entries index (raw SQL reads, ORM writes)
+    # =====================================================================
+
+    _RELATED_SCORING_KEY = "related_entries.scoring"
+    # Rescore a whole KB in one pass once this share of it is queued.
+    _RELATED_BULK_FRACTION = 0.25
+
+    def get_related_scoring(self) -> RelatedScoring:
+        """The scoring config the stored related_entry rows were computed with."""
+        return RelatedScoring.from_json(
+            self._exec_scalar(
+                "SELECT value FROM setting WHERE key = :key", {"key": self._RELATED_SCORING_KEY}
+            )
+        )
+
+    def configure_related_scoring(self, scoring: RelatedScoring) -> bool:
+        """Store a new scoring config, queueing every entry for rescoring if it changed."""
+        if self.get_related_scoring() == scoring:
+            return False
+        setting = self._session.query(Setting).filter_by(key=self._RELATED_SCORING_KEY).first()
+        if setting is None:
+            setting = Setting(key=self._RELATED_SCORING_KEY)
+            self._session.add(setting)
+        setting.value = scoring.to_json()
+        setting.updated_at = datetime.now(UTC).isoformat()
+        self._queue_all_related()
+        self._session.commit()
+        return True
+
+    def _queue_all_related(self, kb_name: str | None = None) -> None:
+        dirty = self._session.query(RelatedDirty)
+        entries = select(Entry.id, Entry.kb_name)
+        if kb_name:
+            dirty = dirty.filter_by(kb_name=kb_name)
+            entries = entries.where(Entry.kb_name == kb_name)
+        dirty.delete(synchronize_session=False)
+        self._session.execute(
+            insert(RelatedDirty).from_select(["entry_id", "kb_name"], entries)
+        )
+
+    def rebuild_related_entries(self, kb_name: str | None = None) -> int:
+        """Rescore every entry in a KB (or all KBs). Returns entries rescored."""
+        try:
+            self._queue_all_related(kb_name)
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        return self.refresh_related_entries(kb_name)
+
+    _related_deferred = 0
+
+    @contextmanager
+    def deferred_related_refresh(self, kb_name: str | None = None) -> Iterator[None]:
+        """Hold related-entry rescoring for writes in the block; rescore once at the end.
+
+        ``upsert_entry`` and ``delete_entry`` otherwise rescore their KB's
+        queue as they commit; bulk writers (syncs, imports) wrap their loop
+        in this so a KB is rescored once, in bulk when enough of it changed.
+        """
+        self._related_deferred += 1
+        try:
+            yield
+        finally:
+            self._related_deferred -= 1
+        self._drain_related(kb_name)
+
+    def _drain_related(self, kb_name: str | None) -> None:
+        if not self._related_deferred:
+            self.refresh_related_entries(kb_name)
+
+    def refresh_related_entries(self, kb_name: str | None = None) -> int:
+        """Rescore queued entries and the neighbours they affect. Returns entries rescored."""
+        sql = "SELECT entry_id, kb_name FROM related_dirty"
+        params: dict[str, Any] = {}
+        if kb_name:
+            sql += " WHERE kb_name = :kb_name"
+            params["kb_name"] = kb_name
+        rows = self._exec(sql, params)
+        if not rows:
+            return 0
+        queued: dict[str, set[str]] = defaultdict(set)
+        for r in rows:
+            queued[r["kb_name"]].add(r["entry_id"])
+
+        scoring = self.get_related_scoring()
+        rescored = 0
+        try:
+            for kb, entry_ids in queued.items():
+                rescored += self._refresh_related_kb(kb, entry_ids, scoring)
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        return rescored
+
+    def _refresh_related_kb(self, kb_name: str, queued: set[str], scoring: RelatedScoring) -> int:
+        params = {"kb_name": kb_name}
+        entry_count = (
+            self._exec_scalar("SELECT COUNT(*) FROM entry WHERE kb_name = :kb_name", params) or 0
+        )
+        if len(queued) >= entry_count * self._RELATED_BULK_FRACTION:
+            self._session.query(RelatedDirty).filter_by(kb_name=kb_name).delete(
+                synchronize_session=False
+            )
+            related = self._score_related_bulk(kb_name, scoring)
+            self._session.query(RelatedEntry).filter_by(kb_name=kb_name).delete(
+                synchronize_session=False
+            )
+            self._write_related(kb_name, related)
+            return len(related)
+
+        ids = sorted(queued)
+        for batch in self._batches(ids):
+            self._session.query(RelatedDirty).filter(
+                RelatedDirty.kb_name == kb_name, RelatedDirty.entry_id.in_(batch)
+            ).delete(synchronize_session=False)
+
+        # Entries whose lists mention a queued entry may need to drop it.
+        affected = set(queued)
+        for _batch, in_list, batch_params in self._in_batches(ids, params):
+            for r in self._exec(
+                f"""SELECT DISTINCT entry_id FROM related_entry
+                    WHERE kb_name = :kb_name AND related_id IN ({in_list})""",
+                batch_params,
+            ):
+                affected.add(r["entry_id"])
+
+        # Entries a queued entry now scores high enough to enter the top list of.
+        scores_by_entry = {eid: self._score_related(eid, kb_name, scoring) for eid in ids}
+        best: dict[str, float] = {}
+        for scores in scores_by_entry.values():
+            for cid, score in scores.items():
+                if cid not in affected and score > best.get(cid, 0.0):
+                    best[cid] = score
+        floors = self._related_floors(kb_name, sorted(best), scoring.limit)
+        affected.update(cid for cid, score in best.items() if score >= floors.get(cid, 0.0))
+
+        related = {}
+        for eid in affected:
+            scores = scores_by_entry.get(eid)
+            if scores is None:
+                scores = self._score_related(eid, kb_name, scoring)
+            related[eid] = top_related(scores, scoring.limit)
+        for batch in self._batches(sorted(related)):
+            self._session.query(RelatedEntry).filter(
+                RelatedEntry.kb_name == kb_name, RelatedEntry.entry_id.in_(batch)
+            ).delete(synchronize_session=False)
+        self._write_related(kb_name, related)
+        return len(related)
+
+    def _batches(self, ids: list[str]):
+        for start in range(0, len(ids), self._GRAPH_SQL_BATCH):
+            yield ids[start : start + self._GRAPH_SQL_BATCH]
+
+    def _in_batches(self, ids: list[str], params: dict[str, Any]):
+        """Yield ``(batch, in_list, params)`` for ``IN (...)`` queries over ID batches."""
+        for batch in self._batches(ids):
+            batch_params = {f"id{n}": eid for n, eid in enumerate(batch)}
+            in_list = ", ".join(f":{name}" for name in batch_params)
+            yield batch, in_list, {**params, **batch_params}
+
+    def _related_floors(self, kb_name: str, entry_ids: list[str], limit: int) -> dict[str, float]:
+        """Lowest stored score of each full top list (entries with room score 0)."""
+        floors: dict[str, float] = {}
+        for _batch, in_list, params in self._in_batches(entry_ids, {"kb_name": kb_name}):
+            for r in self._exec(
+                f"""SELECT entry_id, COUNT(*) AS n, MIN(score) AS low FROM related_entry
+                    WHERE kb_name = :kb_name AND entry_id IN ({in_list})
+                    GROUP BY entry_id""",
+                params,
+            ):
+                if r["n"] >= limit:
+                    floors[r["entry_id"]] = r["low"]
+        return floors
+
+    def _related_excluded(self, entry_id: str, kb_name: str) -> set[str]:
+        """The entry itself plus everything it links to or is linked from in its KB."""
+        rows = self._exec(
+            """SELECT target_id AS id FROM link
+               WHERE source_id = :entry_id AND source_kb = :kb_name AND target_kb = :kb_name
+               UNION
+               SELECT source_id AS id FROM link
+               WHERE target_id = :entry_id AND target_kb = :kb_name AND source_kb = :kb_name""",
+            {"entry_id": entry_id, "kb_name": kb_name},
+        )
+        excluded = {r["id"] for r in rows}
+        excluded.add(entry_id)
+        return excluded
+
+    def _score_related(
+        self, entry_id: str, kb_name: str, scoring: RelatedScoring
+    ) -> dict[str, float]:
+        """Score every candidate sharing a term with one entry."""
+        params: dict[str, Any] = {"entry_id": entry_id, "kb_name": kb_name}
+        common_filter = ""
+        if scoring.max_term_entries > 0:
+            params["max_df"] = scoring.max_term_entries
+            common_filter = """
+                  AND (SELECT COUNT(*) FROM related_term t3
+                       WHERE t3.kb_name = t1.kb_name AND t3.kind = t1.kind
+                             AND t3.value = t1.value) <= :max_df"""
+        rows = self._exec(
+            f"""SELECT t2.entry_id AS candidate, t1.kind AS kind, COUNT(*) AS shared
+                FROM related_term t1
+                JOIN related_term t2 ON t2.kb_name = t1.kb_name AND t2.kind = t1.kind
+                                     AND t2.value = t1.value
+                WHERE t1.entry_id = :entry_id AND t1.kb_name = :kb_name
+                  AND t2.entry_id != :entry_id{common_filter}
+                GROUP BY t2.entry_id, t1.kind""",
+            params,
+        )
+        excluded = self._related_excluded(entry_id, kb_name)
+        scores: dict[str, float] = defaultdict(float)
+        for r in rows:
+            if r["candidate"] not in excluded:
+                scores[r["candidate"]] += scoring.weight(r["kind"]) * r["shared"]
+        self._blend_related_embeddings(entry_id, kb_name, scoring, scores, excluded)
+        return scores
+
+    def _score_related_bulk(
+        self, kb_name: str, scoring: RelatedScoring
+    ) -> dict[str, list[tuple[str, float]]]:
+        """Score a whole KB in memory from one pass over its terms and links."""
+        params = {"kb_name": kb_name}
+        postings: dict[tuple[str, str], list[str]] = defaultdict(list)
+        terms_of: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for r in self._exec(
+            "SELECT entry_id, kind, value FROM related_term WHERE kb_name = :kb_name", params
+        ):
+            key = (r["kind"], r["value"])
+            postings[key].append(r["entry_id"])
+            terms_of[r["entry_id"]].append(key)
+        if scoring.max_term_entries > 0:
+            postings = {
+                k: v for k, v in postings.items() if len(v) <= scoring.max_term_entries
+            }
+        linked: dict[str, set[str]] = defaultdict(set)
+        for r in self._exec(
+            "SELECT source_id, target_id FROM link "
+            "WHERE source_kb = :kb_name AND target_kb = :kb_name",
+            params,
+        ):
+            linked[r["source_id"]].add(r["target_id"])
+            linked[r["target_id"]].add(r["source_id"])
+
+        related: dict[str, list[tuple[str, float]]] = {}
+        for r in self._exec("SELECT id FROM entry WHERE kb_name = :kb_name", params):
+            eid = r["id"]
+            excluded = linked.get(eid, set()) | {eid}
+            scores: dict[str, float] = defaultdict(float)
+            for key in terms_of.get(eid, ()):
+                posting = postings.get(key)
+                if posting is None:
+                    continue
+                weight = scoring.weight(key[0])
+                for cid in posting:
+                    if cid not in excluded:
+                        scores[cid] += weight
+            self._blend_related_embeddings(eid, kb_name, scoring, scores, excluded)
+            related[eid] = top_related(scores, scoring.limit)
+        return related
+
+    def _blend_related_embeddings(
+        self,
+        entry_id: str,
+        kb_name: str,
+        scoring: RelatedScoring,
+        scores: dict[str, float],
+        excluded: set[str],
+    ) -> None:
+        if scoring.embedding_weight <= 0:
+            return
+        vector = self.get_embedding(entry_id, kb_name)
+        if not vector:
+            return
+        for r in self.search_semantic(vector, kb_name=kb_name, limit=scoring.limit * 2):
+            cid = r.get("id")
+            if cid and cid not in excluded:
+                similarity = max(0.0, 1.0 - float(r.get("distance") or 0.0))
+                scores[cid] += scoring.embedding_weight * similarity
+
+    def _write_related(self, kb_name: str, related: dict[str, list[tuple[str, float]]]) -> None:
+        rows = [
+            {
+                "entry_id": eid,
+                "kb_name": kb_name,
+                "related_id": cid,
+                "score": score,
+                "rank": rank,
+            }
+            for eid, top in related.items()
+            for rank, (cid, score) in enumerate(top)
+        ]
+        if rows:
+            self._session.execute(insert(RelatedEntry), rows)
+
+    def get_related_entries(
+        self, entry_id: str, kb_name: str, limit: int = 5
+    ) -> list[dict[str, Any]]:
+        """Top related entries for an entry, as of the last index refresh."""
+        return self._exec(
+            """SELECT e.id, e.kb_name, e.title, e.entry_type, e.date, r.score
+               FROM related_entry r
+               JOIN entry e ON e.id = r.related_id AND e.kb_name = r.kb_name
+               WHERE r.entry_id = :entry_id AND r.kb_name = :kb_name
+               ORDER BY r.rank
+               LIMIT :limit""",
+            {"entry_id": entry_id, "kb_name": kb_name, "limit": limit},
+        )
+
+    def get_all_related_for_kb(
+        self, kb_name: str, limit: int = 5
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Top related entries for every entry in a KB, keyed by entry ID."""
+        rows = self._exec(
+            """SELECT r.entry_id AS for_id, e.id, e.kb_name, e.title, e.entry_type,
+                      e.date, r.score
+               FROM related_entry r
+               JOIN entry e ON e.id = r.related_id AND e.kb_name = r.kb_name
+               WHERE r.kb_name = :kb_name AND r.rank < :limit
+               ORDER BY r.entry_id, r.rank""",
+            {"kb_name": kb_name, "limit": limit},
+        )
+        result: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for r in rows:
+            result[r.pop("for_id")].append(r)
+        return dict(result)
@@ -0,0 +1,204 @@
+"""
+LinkGraph — compact in-memory adjacency for the ``link`` table.
+
+Entries are interned to dense integer node indices and links are stored in
+compressed sparse row (CSR) form, once per direction, so neighbourhood
+expansion and degree lookups are array slices instead of SQL round-trips.
+
+Backends build one ``LinkGraph`` per KB scope (plus one global graph) on
+first use and keep it until the link data changes — see
+``BaseBackend.get_link_graph``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+NodeKey = tuple[str, str]
+
+
+class LinkGraph:
+    """Immutable CSR adjacency over ``(entry_id, kb_name)`` nodes.
+
+    Node ``i`` has outgoing links ``out_targets[out_offsets[i]:out_offsets[i+1]]``
+    and incoming links ``in_sources[in_offsets[i]:in_offsets[i+1]]``, each
+    paired with an index into ``relations``.  Adjacency preserves the order
+    in which links were supplied to :meth:`build`.
+    """
+
+    __slots__ = (
+        "keys",
+        "titles",
+        "entry_types",
+        "exists",
+        "relations",
+        "out_offsets",
+        "out_targets",
+        "out_relations",
+        "in_offsets",
+        "in_sources",
+        "in_relations",
+        "version",
+        "_index",
+    )
+
+    def __init__(
+        self,
+        keys: list[NodeKey],
+        titles: list[str | None],
+        entry_types: list[str | None],
+        exists: bytearray,
+        relations: list[str],
+        out_offsets: array,
+        out_targets: array,
+        out_relations: array,
+        in_offsets: array,
+        in_sources: array,
+        in_relations: array,
+        version: Any = None,
+    ):
+        self.keys = keys
+        self.titles = titles
+        self.entry_types = entry_types
+        self.exists = exists
+        self.relations = relations
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.out_relations = out_relations
+        self.in_offsets = in_offsets
+        self.in_sources = in_sources
+        self.in_relations = in_relations
+        self.version = version
+        self._index = {k: i for i, k in enumerate(keys)}
+
+    @classmethod
+    def build(
+        cls,
+        links: Iterable[tuple[str, str, str, str, str]],
+        entries: Iterable[tuple[str, str, str | None, str | None]],
+        version: Any = None,
+    ) -> LinkGraph:
+        """Build a graph from link and entry rows.
+
+        Args:
+            links: ``(source_id, source_kb, target_id, target_kb, relation)``
+                tuples, in the order adjacency should be reported.
+            entries: ``(id, kb_name, title, entry_type)`` tuples used to label
+                nodes.  Link endpoints without a matching entry are kept as
+                dangling nodes with ``exists`` cleared.
+            version: Opaque staleness token stored on the graph.
+        """
+        index: dict[NodeKey, int] = {}
+        keys: list[NodeKey] = []
+        rel_index: dict[str, int] = {}
+        relations: list[str] = []
+        src_idx = array("i")
+        tgt_idx = array("i")
+        rel_idx = array("i")
+
+        def intern(key: NodeKey) -> int:
+            i = index.get(key)
+            if i is None:
+                i = len(keys)
+                index[key] = i
+                keys.append(key)
+            return i
+
+        for source_id, source_kb, target_id, target_kb, relation in links:
+            src_idx.append(intern((source_id, source_kb)))
+            tgt_idx.append(intern((target_id, target_kb)))
+            r = rel_index.get(relation)
+            if r is None:
+                r = len(relations)
+                rel_index[relation] = r
+                relations.append(relation)
+            rel_idx.append(r)
+
+        n = len(keys)
+        titles: list[str | None] = [None] * n
+        entry_types: list[str | None] = [None] * n
+        exists = bytearray(n)
+        for entry_id, kb_name, title, entry_type in entries:
+            i = index.get((entry_id, kb_name))
+            if i is not None:
+                titles[i] = title
+                entry_types[i] = entry_type
+                exists[i] = 1
+
+        out_offsets, out_targets, out_relations = cls._csr(n, src_idx, tgt_idx, rel_idx)
+        in_offsets, in_sources, in_relations = cls._csr(n, tgt_idx, src_idx, rel_idx)
+        return cls(
+            keys,
+            titles,
+            entry_types,
+            exists,
+            relations,
+            out_offsets,
+            out_targets,
+            out_relations,
+            in_offsets,
+            in_sources,
+            in_relations,
+            version=version,
+        )
+
+    @staticmethod
+    def _csr(n: int, rows: array, cols: array, vals: array) -> tuple[array, array, array]:
+        """Stable counting sort of ``(row, col, val)`` triples into CSR arrays."""
+        offsets = array("i", bytes(4 * (n + 1)))
+        for r in rows:
+            offsets[r + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        cursor = array("i", offsets[:n])
+        m = len(rows)
+        out_cols = array("i", bytes(4 * m))
+        out_vals = array("i", bytes(4 * m))
+        for k in range(m):
+            r = rows[k]
+            pos = cursor[r]
+            out_cols[pos] = cols[k]
+            out_vals[pos] = vals[k]
+            cursor[r] = pos + 1
+        return offsets, out_cols, out_vals
+
+    # ── lookups ──────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_targets)
+
+    def index_of(self, entry_id: str, kb_name: str) -> int | None:
+        """Return the node index for an entry, or None if it has no links."""
+        return self._index.get((entry_id, kb_name))
+
+    def out_edges(self, i: int) -> Iterator[tuple[int, str]]:
+        """Yield ``(target_index, relation)`` for each outgoing link of node ``i``."""
+        rels = self.relations
+        for k in range(self.out_offsets[i], self.out_offsets[i + 1]):
+            yield self.out_targets[k], rels[self.out_relations[k]]
+
+    def in_edges(self, i: int) -> Iterator[tuple[int, str]]:
+        """Yield ``(source_index, relation)`` for each incoming link of node ``i``."""
+        rels = self.relations
+        for k in range(self.in_offsets[i], self.in_offsets[i + 1]):
+            yield self.in_sources[k], rels[self.in_relations[k]]
+
+    def out_degree(self, i: int) -> int:
+        return self.out_offsets[i + 1] - self.out_offsets[i]
+
+    def in_degree(self, i: int) -> int:
+        return self.in_offsets[i + 1] - self.in_offsets[i]
+
+    def iter_edges(self) -> Iterator[tuple[int, int, str]]:
+        """Yield every link as ``(source_index, target_index, relation)``."""
+        rels = self.relations
+        offsets = self.out_offsets
+        for i in range(len(self.keys)):
+            for k in range(offsets[i], offsets[i + 1]):
+                yield i, self.out_targets[k], rels[self.out_relations[k]]
@@ -6,12 +6,58 @@ Write operations go only to the diff backend.
 
 Used by the worktree collaboration system (ADR-0024) so users see their
 own pending edits overlaid on the shared main index.
+
+Ordered reads are a lazy k-way merge of the two backends' ordered results.
+The diff index is small, so everything it holds (plus its tombstones for
+entries deleted in the worktree) forms a "shadow" set of keys whose main
+rows are skipped; the main backend is asked for at most
+``offset + limit + len(shadow)`` rows instead of the whole result set.
 """
 
 from __future__ import annotations
 
+import heapq
+from array import array
+from collections.abc import Iterable, Iterator
+from functools import cmp_to_key
+from itertools import chain, islice
 from typing import Any
 
+from .base_backend import BaseBackend
+
+EntryKey = tuple[str, str]  # (entry_id, kb_name)
+
+
+def _key(entry: dict[str, Any]) -> EntryKey:
+    return (entry.get("id", ""), entry.get("kb_name", ""))
+
+
+def _order_key(columns: list[tuple[str, bool]]):
+    """Sort key matching SQLite ``ORDER BY`` over ``(column, descending)`` pairs.
+
+    NULLs sort first ascending and last descending, as in SQLite.
+    """
+
+    def compare(a: dict[str, Any], b: dict[str, Any]) -> int:
+        for column, descending in columns:
+            va, vb = a.get(column), b.get(column)
+            if va == vb:
+                continue
+            if va is None:
+                result = -1
+            elif vb is None:
+                result = 1
+            else:
+                result = -1 if va < vb else 1
+            return -result if descending else result
+        return 0
+
+    return cmp_to_key(compare)
+
+
+def _page(rows: Iterable[dict[str, Any]], offset: int, limit: int) -> list[dict[str, Any]]:
+    return list(islice(rows, offset, offset + limit if limit else None))
+
 
 class OverlaySearchBackend:
     """Overlays a user's diff index on top of the shared main index.
@@ -32,15 +78,27 @@ class OverlaySearchBackend:
 
     def upsert_entry(self, entry_data: dict[str, Any]) -> None:
         self._diff.upsert_entry(entry_data)
+        self._diff.remove_tombstone(entry_data["id"], entry_data["kb_name"])
 
     def delete_entry(self, entry_id: str, kb_name: str) -> bool:
-        # Delete from diff if present there
         result = self._diff.delete_entry(entry_id, kb_name)
-        # If the entry exists in main, we'd need a tombstone for full correctness.
-        # For V1, deleting from diff is sufficient — the entry reappears from main
-        # on read, which is acceptable (admin merge handles actual deletion).
+        # Entries that exist in main are hidden by a tombstone in the diff
+        # index until the deletion is merged.
+        if self._main.get_entry(entry_id, kb_name) is not None:
+            self._diff.add_tombstone(entry_id, kb_name)
+            return True
         return result
 
+    # ── shadow set ──────────────────────────────────────────────────
+
+    def _shadowed(self, kb_name: str | None = None) -> set[EntryKey]:
+        """Keys whose main rows the overlay hides: diff entries and tombstones."""
+        return set(self._diff.get_entry_keys(kb_name)) | self._diff.get_tombstones(kb_name)
+
+    @staticmethod
+    def _visible(rows: Iterable[dict[str, Any]], shadowed: set[EntryKey]) -> Iterator[dict]:
+        return (e for e in rows if _key(e) not in shadowed)
+
     # ── entry CRUD reads → merge ────────────────────────────────────
 
     def get_entry(self, entry_id: str, kb_name: str) -> dict[str, Any] | None:
@@ -48,18 +106,22 @@ class OverlaySearchBackend:
         diff_entry = self._diff.get_entry(entry_id, kb_name)
         if diff_entry is not None:
             return diff_entry
+        if (entry_id, kb_name) in self._diff.get_tombstones(kb_name):
+            return None
         return self._main.get_entry(entry_id, kb_name)
 
     def get_entries(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
-        main_entries = self._main.get_entries(ids)
         diff_entries = self._diff.get_entries(ids)
-        # Build lookup by (id, kb_name) — diff wins
-        merged: dict[tuple[str, str], dict[str, Any]] = {}
-        for e in main_entries:
-            merged[(e["id"], e["kb_name"])] = e
-        for e in diff_entries:
-            merged[(e["id"], e["kb_name"])] = e
-        return list(merged.values())
+        found = {_key(e) for e in diff_entries}
+        hidden = found | self._diff.get_tombstones()
+        main_entries = self._main.get_entries([k for k in ids if tuple(k) not in hidden])
+        return main_entries + diff_entries
+
+    def get_entry_headers(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        diff_entries = self._diff.get_entry_headers(ids)
+        hidden = {_key(e) for e in diff_entries} | self._diff.get_tombstones()
+        main_entries = self._main.get_entry_headers([k for k in ids if tuple(k) not in hidden])
+        return main_entries + diff_entries
 
     def list_entries(
         self,
@@ -74,33 +136,46 @@ class OverlaySearchBackend:
         status: str | None = None,
         min_importance: int | None = None,
     ) -> list[dict[str, Any]]:
-        # Get all from main (without limit — we need to merge before paginating)
-        main_results = self._main.list_entries(
-            kb_name=kb_name,
-            entry_type=entry_type,
-            tag=tag,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            limit=10000,  # fetch all for merge
-            offset=0,
-            include_archived=include_archived,
-            status=status,
-            min_importance=min_importance,
+        shadowed = self._shadowed(kb_name)
+        filters = {
+            "kb_name": kb_name,
+            "entry_type": entry_type,
+            "tag": tag,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "offset": 0,
+            "include_archived": include_archived,
+            "status": status,
+            "min_importance": min_importance,
+        }
+        window = offset + limit if limit else 0
+        main = self._main.list_entries(
+            limit=window + len(shadowed) if limit else 10000, **filters
         )
-        diff_results = self._diff.list_entries(
-            kb_name=kb_name,
-            entry_type=entry_type,
-            tag=tag,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            limit=10000,
-            offset=0,
-            include_archived=include_archived,
-            status=status,
-            min_importance=min_importance,
+        diff = self._diff.list_entries(limit=window or 10000, **filters)
+        column = sort_by if sort_by in BaseBackend._SORT_COLUMNS else "updated_at"
+        order = [(column, sort_order.lower() != "asc")]
+        if column != "updated_at":
+            order.append(("updated_at", True))
+        merged = heapq.merge(self._visible(main, shadowed), diff, key=_order_key(order))
+        return _page(merged, offset, limit)
+
+    def list_entries_after(
+        self,
+        kb_name: str,
+        after_id: str | None = None,
+        limit: int = 500,
+        include_archived: bool = False,
+    ) -> list[dict[str, Any]]:
+        # Both sides are ID-ordered pages, so the first ``limit`` IDs of their
+        # union are exactly the next overlay page.
+        shadowed = self._shadowed(kb_name)
+        main = self._main.list_entries_after(
+            kb_name, after_id, limit + len(shadowed), include_archived
         )
-        merged = self._merge_entry_lists(main_results, diff_results, sort_by, sort_order)
-        return merged[offset : offset + limit] if limit else merged
+        diff = self._diff.list_entries_after(kb_name, after_id, limit, include_archived)
+        merged = heapq.merge(self._visible(main, shadowed), diff, key=lambda e: e["id"])
+        return _page(merged, 0, limit)
 
     def count_entries(
         self,
@@ -110,26 +185,51 @@ class OverlaySearchBackend:
         status: str | None = None,
         min_importance: int | None = None,
     ) -> int:
-        main_count = self._main.count_entries(
-            kb_name=kb_name, entry_type=entry_type, tag=tag,
-            status=status, min_importance=min_importance,
-        )
-        diff_entries = self._diff.list_entries(
-            kb_name=kb_name, entry_type=entry_type, tag=tag, limit=10000,
-            status=status, min_importance=min_importance,
-        )
-        # New entries in diff (not in main) add to count
-        # Modified entries in diff don't change count
-        main_ids = set()
-        if diff_entries:
-            main_all = self._main.list_entries(
-                kb_name=kb_name, entry_type=entry_type, tag=tag, limit=10000
-            )
-            main_ids = {(e["id"], e["kb_name"]) for e in main_all}
-        new_in_diff = sum(
-            1 for e in diff_entries if (e["id"], e["kb_name"]) not in main_ids
+        filters = {
+            "kb_name": kb_name,
+            "entry_type": entry_type,
+            "tag": tag,
+            "status": status,
+            "min_importance": min_importance,
+        }
+        main_count = self._main.count_entries(**filters)
+        diff_count = self._diff.count_entries(**filters)
+        shadowed = self._shadowed(kb_name)
+        if not shadowed:
+            return main_count + diff_count
+        # Main rows replaced or deleted in the diff are not visible; fetch
+        # only those (a keyed lookup) to see which of them the count included.
+        hidden = sum(
+            1
+            for e in self._main.get_entries(list(shadowed))
+            if self._matches(e, **filters)
         )
-        return main_count + new_in_diff
+        return main_count - hidden + diff_count
+
+    @staticmethod
+    def _matches(
+        entry: dict[str, Any],
+        kb_name: str | None,
+        entry_type: str | None,
+        tag: str | None,
+        status: str | None,
+        min_importance: int | None,
+    ) -> bool:
+        """Python mirror of the ``count_entries`` filters."""
+        if kb_name and entry["kb_name"] != kb_name:
+            return False
+        if entry_type and entry["entry_type"] != entry_type:
+            return False
+        if tag and tag not in entry.get("tags", []):
+            return False
+        if status and entry.get("status") != status:
+            return False
+        if min_importance is not None:
+            # Like SQL ``importance >= :min``, a NULL importance never matches
+            importance = entry.get("importance")
+            if importance is None or importance < min_importance:
+                return False
+        return True
 
     def get_distinct_types(self, kb_name: str | None = None) -> list[str]:
         main_types = set(self._main.get_distinct_types(kb_name))
@@ -156,43 +256,34 @@ class OverlaySearchBackend:
         fips: str | None = None,
         state: str | None = None,
     ) -> list[dict[str, Any]]:
-        main_results = self._main.search(
-            query,
-            kb_name=kb_name,
-            entry_type=entry_type,
-            tags=tags,
-            date_from=date_from,
-            date_to=date_to,
-            limit=10000,  # fetch all for merge
-            offset=0,
-            include_archived=include_archived,
-            lifecycle=lifecycle,
-            fips=fips,
-            state=state,
-        )
-        diff_results = self._diff.search(
-            query,
-            kb_name=kb_name,
-            entry_type=entry_type,
-            tags=tags,
-            date_from=date_from,
-            date_to=date_to,
-            limit=10000,
-            offset=0,
-            include_archived=include_archived,
-            lifecycle=lifecycle,
-            fips=fips,
-            state=state,
+        filters = {
+            "kb_name": kb_name,
+            "entry_type": entry_type,
+            "tags": tags,
+            "date_from": date_from,
+            "date_to": date_to,
+            "offset": 0,
+            "include_archived": include_archived,
+            "lifecycle": lifecycle,
+            "fips": fips,
+            "state": state,
+        }
+        shadowed = self._shadowed(kb_name)
+        window = offset + limit if limit else 10000
+        main = self._main.search(query, limit=window + len(shadowed), **filters)
+        diff = self._diff.search(query, limit=window, **filters)
+        merged = heapq.merge(
+            self._visible(main, shadowed), diff, key=_order_key([("rank", False)])
         )
-        merged = self._merge_entry_lists(main_results, diff_results)
-        return merged[offset : offset + limit] if limit else merged
+        return _page(merged, offset, limit)
 
     def search_by_tag(
         self, tag: str, kb_name: str | None = None, limit: int = 50
     ) -> list[dict[str, Any]]:
-        main = self._main.search_by_tag(tag, kb_name, limit=10000)
-        diff = self._diff.search_by_tag(tag, kb_name, limit=10000)
-        return self._merge_entry_lists(main, diff)[:limit]
+        shadowed = self._shadowed(kb_name)
+        main = self._main.search_by_tag(tag, kb_name, limit=limit + len(shadowed))
+        diff = self._diff.search_by_tag(tag, kb_name, limit=limit)
+        return self._merge_ordered(main, diff, shadowed, self._BY_DATE_DESC, limit)
 
     def search_by_date_range(
         self,
@@ -201,16 +292,48 @@ class OverlaySearchBackend:
         kb_name: str | None = None,
         limit: int = 100,
     ) -> list[dict[str, Any]]:
-        main = self._main.search_by_date_range(date_from, date_to, kb_name, limit=10000)
-        diff = self._diff.search_by_date_range(date_from, date_to, kb_name, limit=10000)
-        return self._merge_entry_lists(main, diff)[:limit]
+        shadowed = self._shadowed(kb_name)
+        main = self._main.search_by_date_range(
+            date_from, date_to, kb_name, limit=limit + len(shadowed)
+        )
+        diff = self._diff.search_by_date_range(date_from, date_to, kb_name, limit=limit)
+        return self._merge_ordered(main, diff, shadowed, [("date", False)], limit)
 
     def search_by_tag_prefix(
         self, prefix: str, kb_name: str | None = None, limit: int = 50
     ) -> list[dict[str, Any]]:
-        main = self._main.search_by_tag_prefix(prefix, kb_name, limit=10000)
-        diff = self._diff.search_by_tag_prefix(prefix, kb_name, limit=10000)
-        return self._merge_entry_lists(main, diff)[:limit]
+        shadowed = self._shadowed(kb_name)
+        main = self._main.search_by_tag_prefix(prefix, kb_name, limit=limit + len(shadowed))
+        diff = self._diff.search_by_tag_prefix(prefix, kb_name, limit=limit)
+        return self._merge_ordered(main, diff, shadowed, self._BY_DATE_DESC, limit)
+
+    def search_substring(
+        self, text: str, kb_name: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        shadowed = self._shadowed(kb_name)
+        main = self._main.search_substring(text, kb_name, limit=limit + len(shadowed))
+        diff = self._diff.search_substring(text, kb_name, limit=limit)
+        return self._merge_ordered(main, diff, shadowed, [("title", False)], limit)
+
+    def get_fts_config(self) -> Any:
+        return self._main.get_fts_config()
+
+    def configure_fts(self, config: Any) -> bool:
+        # The main index is configured by its own sync; only the diff is ours.
+        return self._diff.configure_fts(config)
+
+    _BY_DATE_DESC = [("date", True), ("title", False)]
+
+    def _merge_ordered(
+        self,
+        main: list[dict[str, Any]],
+        diff: list[dict[str, Any]],
+        shadowed: set[EntryKey],
+        order: list[tuple[str, bool]],
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        merged = heapq.merge(self._visible(main, shadowed), diff, key=_order_key(order))
+        return _page(merged, 0, limit)
 
     # ── edge endpoints → delegate to main ────────────────────────────
 
@@ -228,18 +351,26 @@ class OverlaySearchBackend:
     def get_backlinks(
         self, entry_id: str, kb_name: str, limit: int = 0, offset: int = 0
     ) -> list[dict[str, Any]]:
-        main = self._main.get_backlinks(entry_id, kb_name, limit=10000)
-        diff = self._diff.get_backlinks(entry_id, kb_name, limit=10000)
-        merged = self._merge_entry_lists(main, diff)
-        if limit:
-            return merged[offset : offset + limit]
-        return merged
+        # Backlinks are unordered: main's visible rows, then the diff's.
+        # Main rows whose *source* was edited or deleted in the diff are
+        # hidden, since the diff version decides whether the link still exists.
+        shadowed = self._shadowed()
+        window = offset + limit if limit else 0
+        main = self._main.get_backlinks(
+            entry_id, kb_name, limit=window + len(shadowed) if limit else 0
+        )
+        diff = self._diff.get_backlinks(entry_id, kb_name, limit=window)
+        return _page(chain(self._visible(main, shadowed), diff), offset, limit)
 
     def get_outlinks(self, entry_id: str, kb_name: str) -> list[dict[str, Any]]:
         main = self._main.get_outlinks(entry_id, kb_name)
         diff = self._diff.get_outlinks(entry_id, kb_name)
         return self._merge_entry_lists(main, diff)
 
+    def get_linked_pairs(self, kb_a: str, kb_b: str) -> set[tuple[str, str]]:
+        # A superset is fine: callers use this to exclude pairs from suggestions.
+        return self._main.get_linked_pairs(kb_a, kb_b) | self._diff.get_linked_pairs(kb_a, kb_b)
+
     def get_graph_data(
         self,
         center: str | None = None,
@@ -261,11 +392,46 @@ class OverlaySearchBackend:
             limit=limit,
         )
 
+    def get_link_graph(self, kb_name: str | None = None, include_refs: bool = False) -> Any:
+        # Same as get_graph_data: graph analytics come from main only.
+        return self._main.get_link_graph(kb_name, include_refs)
+
     def get_most_linked(
         self, kb_name: str | None = None, limit: int = 20
     ) -> list[dict[str, Any]]:
         return self._main.get_most_linked(kb_name, limit)
 
+    def index_generation(self) -> Any:
+        return (self._main.index_generation(), self._diff.index_generation())
+
+    # ── related entries → main only ─────────────────────────────────
+
+    def get_related_entries(
+        self, entry_id: str, kb_name: str, limit: int = 5
+    ) -> list[dict[str, Any]]:
+        return self._main.get_related_entries(entry_id, kb_name, limit)
+
+    def get_all_related_for_kb(
+        self, kb_name: str, limit: int = 5
+    ) -> dict[str, list[dict[str, Any]]]:
+        return self._main.get_all_related_for_kb(kb_name, limit)
+
+    def refresh_related_entries(self, kb_name: str | None = None) -> int:
+        return self._main.refresh_related_entries(kb_name)
+
+    def deferred_related_refresh(self, kb_name: str | None = None) -> Any:
+        # Overlay writes land in the diff index
+        return self._diff.deferred_related_refresh(kb_name)
+
+    def rebuild_related_entries(self, kb_name: str | None = None) -> int:
+        return self._main.rebuild_related_entries(kb_name)
+
+    def get_related_scoring(self) -> Any:
+        return self._main.get_related_scoring()
+
+    def configure_related_scoring(self, scoring: Any) -> bool:
+        return self._main.configure_related_scoring(scoring)
+
     def get_orphans(self, kb_name: str | None = None) -> list[dict[str, Any]]:
         return self._main.get_orphans(kb_name)
 
@@ -341,6 +507,17 @@ class OverlaySearchBackend:
     def delete_embedding(self, entry_id: str, kb_name: str) -> None:
         self._diff.delete_embedding(entry_id, kb_name)
 
+    def get_embedding(self, entry_id: str, kb_name: str) -> list[float] | None:
+        return self._diff.get_embedding(entry_id, kb_name) or self._main.get_embedding(
+            entry_id, kb_name
+        )
+
+    def get_kb_embeddings(self, kb_name: str) -> list[tuple[str, array]]:
+        # Entries edited in the diff use only the diff's (re-embedded) vector.
+        shadowed = self._shadowed(kb_name)
+        main = [e for e in self._main.get_kb_embeddings(kb_name) if (e[0], kb_name) not in shadowed]
+        return main + self._diff.get_kb_embeddings(kb_name)
+
     # ── object refs → delegate to main ──────────────────────────────
 
     def get_refs_from(self, entry_id: str, kb_name: str) -> list[dict[str, Any]]:
@@ -456,6 +633,9 @@ class WorktreeDB:
     def get_entries(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
         return self._overlay.get_entries(ids)
 
+    def get_entry_headers(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        return self._overlay.get_entry_headers(ids)
+
     def search(self, query: str, **kwargs) -> list[dict[str, Any]]:
         return self._overlay.search(query, **kwargs)
 
@@ -474,12 +654,20 @@ class WorktreeDB:
     def get_all_tags(self, kb_name: str | None = None) -> list[tuple[str, int]]:
         return self._overlay.get_all_tags(kb_name)
 
+    def get_kb_summary(self, kb_name: str, tag_limit: int = 10) -> None:
+        # Materialized counters describe main only; callers recount through
+        # the overlay so the user's pending edits are included.
+        return None
+
     def upsert_entry(self, entry_data: dict[str, Any]) -> None:
         return self._overlay.upsert_entry(entry_data)
 
     def delete_entry(self, entry_id: str, kb_name: str) -> bool:
         return self._overlay.delete_entry(entry_id, kb_name)
 
+    def deferred_related_refresh(self, kb_name: str | None = None) -> Any:
+        return self._overlay.deferred_related_refresh(kb_name)
+
     def close(self):
         # Only close diff — main is shared
         self._diff.close()
@@ -6,11 +6,13 @@ Inherits shared ORM/SQL logic from BaseBackend.  Only overrides:
 - ``_sync_links`` (delete-all-reinsert)
 - Full-text search (tsvector/tsquery)
 - Embedding operations (pgvector)
+- Hybrid search (``search_hybrid``: RRF over both legs in one statement)
 """
 
 from __future__ import annotations
 
 import logging
+from array import array
 from typing import Any
 
 from sqlalchemy import text
@@ -22,15 +24,29 @@ from ..models import Link
 logger = logging.getLogger(__name__)
 
 
-def ensure_schema(engine) -> None:
+# First-pass KNN expressions for quantized search.  pgvector has no int8
+# type, so ``int8`` maps to its closest compact form, half precision.
+_QUANTIZED_KNN = {
+    "bit": ("binary_quantize({col})::bit({dims})", "<~>", "bit_hamming_ops"),
+    "int8": ("({col})::halfvec({dims})", "<=>", "halfvec_cosine_ops"),
+}
+
+
+def ensure_schema(engine, dimensions: int = 384, quantization: str = "none") -> None:
     """Create pgvector extension, FTS column, embedding column, and indexes.
 
+    ``quantization`` (``bit`` or ``int8``) adds an HNSW expression index on
+    a compact form of ``embedding`` for first-pass KNN; see
+    ``PostgresBackend.search_semantic``.
+
     Idempotent — safe to call on every startup.
     """
     with engine.connect() as conn:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         conn.execute(text("ALTER TABLE entry ADD COLUMN IF NOT EXISTS fts_vector tsvector"))
-        conn.execute(text("ALTER TABLE entry ADD COLUMN IF NOT EXISTS embedding vector(384)"))
+        conn.execute(
+            text(f"ALTER TABLE entry ADD COLUMN IF NOT EXISTS embedding vector({int(dimensions)})")
+        )
         # GIN index for FTS
         conn.execute(
             text("CREATE INDEX IF NOT EXISTS idx_entry_fts ON entry USING gin(fts_vector)")
@@ -43,11 +59,27 @@ def ensure_schema(engine) -> None:
                 "ON entry USING hnsw(embedding vector_cosine_ops)"
             )
         )
-        # Trigger to auto-update fts_vector on INSERT/UPDATE
+        if quantization in _QUANTIZED_KNN:
+            expr, _, ops = _QUANTIZED_KNN[quantization]
+            conn.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS idx_entry_embedding_{quantization} "
+                    f"ON entry USING hnsw(({expr.format(col='embedding', dims=int(dimensions))}) "
+                    f"{ops})"
+                )
+            )
+        # Trigger to auto-update fts_vector on INSERT and on UPDATEs that change
+        # indexed text; status/assignee/embedding updates skip re-tokenizing.
         conn.execute(
             text("""
             CREATE OR REPLACE FUNCTION entry_fts_trigger() RETURNS trigger AS $$
             BEGIN
+                IF TG_OP = 'UPDATE'
+                   AND NEW.title IS NOT DISTINCT FROM OLD.title
+                   AND NEW.summary IS NOT DISTINCT FROM OLD.summary
+                   AND NEW.body IS NOT DISTINCT FROM OLD.body THEN
+                    RETURN NEW;
+                END IF;
                 NEW.fts_vector :=
                     setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
                     setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'B') ||
@@ -57,17 +89,14 @@ def ensure_schema(engine) -> None:
             $$ LANGUAGE plpgsql;
         """)
         )
+        # Recreated so databases with the older unrestricted trigger pick up
+        # the column list.
+        conn.execute(text("DROP TRIGGER IF EXISTS trg_entry_fts ON entry"))
         conn.execute(
             text("""
-            DO $$ BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM pg_trigger WHERE tgname = 'trg_entry_fts'
-                ) THEN
-                    CREATE TRIGGER trg_entry_fts
-                    BEFORE INSERT OR UPDATE ON entry
-                    FOR EACH ROW EXECUTE FUNCTION entry_fts_trigger();
-                END IF;
-            END $$;
+            CREATE TRIGGER trg_entry_fts
+            BEFORE INSERT OR UPDATE OF title, summary, body ON entry
+            FOR EACH ROW EXECUTE FUNCTION entry_fts_trigger()
         """)
         )
         conn.commit()
@@ -76,9 +105,27 @@ def ensure_schema(engine) -> None:
 class PostgresBackend(BaseBackend):
     """SearchBackend implementation for PostgreSQL + tsvector + pgvector."""
 
-    def __init__(self, session: Session, engine=None):
+    # pgvector is installed by ensure_schema()
+    vec_available = True
+    supports_hybrid_search = True
+
+    # LIKE is case-sensitive in PostgreSQL
+    _SUBSTRING_LIKE = "ILIKE"
+
+    # Candidates fetched per requested result when reranking quantized KNN
+    quantized_rerank_factor = 8
+
+    def __init__(
+        self,
+        session: Session,
+        engine=None,
+        dimensions: int = 384,
+        quantization: str = "none",
+    ):
         self._session = session
         self._engine = engine
+        self.dimensions = dimensions
+        self.quantization = quantization
 
     def close(self) -> None:
         """No-op — connection lifecycle owned by caller."""
@@ -170,7 +217,40 @@ class PostgresBackend(BaseBackend):
             WHERE e.fts_vector @@ plainto_tsquery('english', :query)
         """
         params: dict[str, Any] = {"query": query}
+        sql += self._filter_sql(
+            params,
+            kb_name=kb_name,
+            entry_type=entry_type,
+            tags=tags,
+            date_from=date_from,
+            date_to=date_to,
+            include_archived=include_archived,
+            lifecycle=lifecycle,
+            fips=fips,
+            state=state,
+        )
 
+        sql += " ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+        params["limit"] = limit
+        params["offset"] = offset
+
+        return self._exec(sql, params)
+
+    @staticmethod
+    def _filter_sql(
+        params: dict[str, Any],
+        kb_name: str | None = None,
+        entry_type: str | None = None,
+        tags: list[str] | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        include_archived: bool = False,
+        lifecycle: str | None = None,
+        fips: str | None = None,
+        state: str | None = None,
+    ) -> str:
+        """Build the ``AND ...`` filter clauses on alias ``e``, adding to ``params``."""
+        sql = ""
         if lifecycle:
             sql += " AND e.lifecycle = :lifecycle"
             params["lifecycle"] = lifecycle
@@ -211,11 +291,100 @@ class PostgresBackend(BaseBackend):
         if state:
             sql += " AND e.state = :state"
             params["state"] = state
+        return sql
 
-        sql += " ORDER BY rank DESC LIMIT :limit OFFSET :offset"
-        params["limit"] = limit
-        params["offset"] = offset
+    # =====================================================================
+    # Hybrid search (tsvector + pgvector fused with RRF in one statement)
+    # =====================================================================
 
+    def search_hybrid(
+        self,
+        query: str,
+        embedding: list[float] | None = None,
+        kb_name: str | None = None,
+        entry_type: str | None = None,
+        tags: list[str] | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        include_archived: bool = False,
+        lifecycle: str | None = None,
+        fips: str | None = None,
+        state: str | None = None,
+        rrf_k: int = 60,
+        max_distance: float = 1.3,
+    ) -> list[dict[str, Any]]:
+        """Keyword and vector search fused with Reciprocal Rank Fusion in SQL.
+
+        Each leg ranks its own candidates (``offset + limit``, at least
+        ``2 * limit``) under the same filters; entries score
+        ``sum(1 / (rrf_k + rank))`` over the legs they appear in.  Only the
+        final page is joined back to ``entry`` for projected columns and
+        snippets.  Without ``embedding`` the keyword leg alone is ranked.
+        """
+        params: dict[str, Any] = {
+            "query": query,
+            "fetch": max(limit * 2, offset + limit),
+            "rrf_k": rrf_k,
+            "limit": limit,
+            "offset": offset,
+        }
+        filters = self._filter_sql(
+            params,
+            kb_name=kb_name,
+            entry_type=entry_type,
+            tags=tags,
+            date_from=date_from,
+            date_to=date_to,
+            include_archived=include_archived,
+            lifecycle=lifecycle,
+            fips=fips,
+            state=state,
+        )
+        legs = f"""
+            SELECT e.id, e.kb_name,
+                   row_number() OVER (
+                       ORDER BY ts_rank(e.fts_vector, plainto_tsquery('english', :query)) DESC
+                   ) - 1 AS rnk
+            FROM entry e
+            WHERE e.fts_vector @@ plainto_tsquery('english', :query) {filters}
+            ORDER BY rnk LIMIT :fetch
+        """
+        if embedding is not None:
+            params["vec"] = "[" + ",".join(str(v) for v in embedding) + "]"
+            params["max_distance"] = max_distance
+            legs = f"""({legs})
+            UNION ALL
+            (SELECT e.id, e.kb_name,
+                    row_number() OVER (ORDER BY e.embedding <=> CAST(:vec AS vector)) - 1 AS rnk
+             FROM entry e
+             WHERE e.embedding IS NOT NULL
+               AND (e.embedding <=> CAST(:vec AS vector)) <= :max_distance {filters}
+             ORDER BY rnk LIMIT :fetch)
+            """
+        sql = f"""
+            WITH legs AS ({legs}),
+            fused AS (
+                SELECT id, kb_name, SUM(1.0 / (:rrf_k + rnk)) AS rrf_score
+                FROM legs GROUP BY id, kb_name
+                ORDER BY rrf_score DESC, id
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT
+                e.id, e.kb_name, e.entry_type, e.title, e.summary,
+                e.file_path, e.date, e.importance, e.status, e.location,
+                e.lifecycle, e.metadata, e.created_at, e.updated_at, e.indexed_at,
+                e.created_by, e.modified_by,
+                ts_headline('english', coalesce(e.body, ''),
+                    plainto_tsquery('english', :query),
+                    'StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MaxWords=32'
+                ) as snippet,
+                CAST(f.rrf_score AS double precision) AS rrf_score
+            FROM fused f
+            JOIN entry e ON e.id = f.id AND e.kb_name = f.kb_name
+            ORDER BY f.rrf_score DESC, e.id
+        """
         return self._exec(sql, params)
 
     def search_by_tag(
@@ -302,13 +471,46 @@ class PostgresBackend(BaseBackend):
         if kb_name:
             sql += " AND e.kb_name = :kb_name"
             params["kb_name"] = kb_name
-        sql += " ORDER BY e.embedding <=> CAST(:vec2 AS vector) LIMIT :limit"
+        if self.quantization in _QUANTIZED_KNN:
+            # First pass over the compact index, exact cosine rerank of the candidates
+            expr, op, _ = _QUANTIZED_KNN[self.quantization]
+            dims = int(self.dimensions)
+            column = expr.format(col="e.embedding", dims=dims)
+            query = expr.format(col="CAST(:vec2 AS vector)", dims=dims)
+            sql = (
+                f"SELECT * FROM ({sql} ORDER BY {column} {op} {query} LIMIT :candidates) c "
+                "ORDER BY c.distance LIMIT :limit"
+            )
+            params["candidates"] = limit * self.quantized_rerank_factor
+        else:
+            sql += " ORDER BY e.embedding <=> CAST(:vec2 AS vector) LIMIT :limit"
         params["vec2"] = vec_str
         params["limit"] = limit
 
         rows = self._exec(sql, params)
         return [r for r in rows if r.get("distance", 0) <= max_distance]
 
+    def get_embedding(self, entry_id: str, kb_name: str) -> list[float] | None:
+        raw = self._exec_scalar(
+            "SELECT CAST(embedding AS text) FROM entry "
+            "WHERE id = :entry_id AND kb_name = :kb_name AND embedding IS NOT NULL",
+            {"entry_id": entry_id, "kb_name": kb_name},
+        )
+        if not raw:
+            return None
+        return [float(v) for v in raw.strip("[]").split(",") if v]
+
+    def get_kb_embeddings(self, kb_name: str) -> list[tuple[str, array]]:
+        rows = self._exec(
+            "SELECT id, CAST(embedding AS text) AS embedding FROM entry "
+            "WHERE kb_name = :kb_name AND embedding IS NOT NULL",
+            {"kb_name": kb_name},
+        )
+        return [
+            (r["id"], array("f", (float(v) for v in r["embedding"].strip("[]").split(",") if v)))
+            for r in rows
+        ]
+
     def has_embeddings(self) -> bool:
         count = self._exec_scalar("SELECT COUNT(*) FROM entry WHERE embedding IS NOT NULL")
         return (count or 0) > 0
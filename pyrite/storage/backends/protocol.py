@@ -8,6 +8,7 @@ protocol.  App-state tables (kb, user, repo, etc.) stay in PyriteDB/ORM.
 
 from __future__ import annotations
 
+from array import array
 from typing import Any, Protocol, runtime_checkable
 
 
@@ -39,6 +40,10 @@ class SearchBackend(Protocol):
         """Batch-get multiple entries by (entry_id, kb_name) pairs."""
         ...
 
+    def get_entry_headers(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Batch-get id/kb_name/title/entry_type/summary by (entry_id, kb_name) pairs."""
+        ...
+
     def list_entries(
         self,
         kb_name: str | None = None,
@@ -55,6 +60,16 @@ class SearchBackend(Protocol):
         """List entries with pagination and optional filters."""
         ...
 
+    def list_entries_after(
+        self,
+        kb_name: str,
+        after_id: str | None = None,
+        limit: int = 500,
+        include_archived: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Keyset page of a KB's entries ordered by ID, after ``after_id``."""
+        ...
+
     def count_entries(
         self,
         kb_name: str | None = None,
@@ -66,6 +81,10 @@ class SearchBackend(Protocol):
         """Count entries matching filters."""
         ...
 
+    def get_entry_keys(self, kb_name: str | None = None) -> list[tuple[str, str]]:
+        """Get all (entry_id, kb_name) keys."""
+        ...
+
     def get_distinct_types(self, kb_name: str | None = None) -> list[str]:
         """Get distinct entry types."""
         ...
@@ -116,6 +135,20 @@ class SearchBackend(Protocol):
         """Search entries by tag prefix (parent includes children)."""
         ...
 
+    def search_substring(
+        self, text: str, kb_name: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Find entries whose title, summary or body contains ``text``, by title."""
+        ...
+
+    def get_fts_config(self) -> Any:
+        """Get the stored FtsConfig (ranking weights and index options)."""
+        ...
+
+    def configure_fts(self, config: Any) -> bool:
+        """Store an FtsConfig, rebuilding the keyword index if needed. Returns True if changed."""
+        ...
+
     # ── semantic search (embeddings) ─────────────────────────────────
 
     def upsert_embedding(self, entry_id: str, kb_name: str, embedding: list[float]) -> bool:
@@ -152,6 +185,14 @@ class SearchBackend(Protocol):
         """Delete embedding for an entry."""
         ...
 
+    def get_embedding(self, entry_id: str, kb_name: str) -> list[float] | None:
+        """Get the stored embedding for an entry, or None."""
+        ...
+
+    def get_kb_embeddings(self, kb_name: str) -> list[tuple[str, array]]:
+        """Get (entry_id, float32 array) for every embedded entry in a KB."""
+        ...
+
     # ── edge endpoints ──────────────────────────────────────────────
 
     def get_edge_endpoints(self, entry_id: str, kb_name: str) -> list[dict[str, Any]]:
@@ -182,6 +223,10 @@ class SearchBackend(Protocol):
         """Get entries this entry links TO."""
         ...
 
+    def get_linked_pairs(self, kb_a: str, kb_b: str) -> set[tuple[str, str]]:
+        """Get (id in kb_a, id in kb_b) for entries linked in either direction."""
+        ...
+
     def get_all_backlinks_for_kb(self, kb_name: str) -> dict[str, list[dict[str, Any]]]:
         """Get ALL backlinks targeting entries in a KB, keyed by target entry_id.
 
@@ -215,10 +260,48 @@ class SearchBackend(Protocol):
         """Multi-hop BFS graph traversal returning {nodes, edges}."""
         ...
 
+    def get_link_graph(self, kb_name: str | None = None, include_refs: bool = False) -> Any:
+        """Get the cached in-memory LinkGraph for a KB scope, or None if too large."""
+        ...
+
     def get_most_linked(self, kb_name: str | None = None, limit: int = 20) -> list[dict[str, Any]]:
         """Get entries with most incoming links."""
         ...
 
+    # ── related entries index ───────────────────────────────────────
+
+    def get_related_entries(
+        self, entry_id: str, kb_name: str, limit: int = 5
+    ) -> list[dict[str, Any]]:
+        """Get precomputed related entries (shared actors/tags), best first."""
+        ...
+
+    def get_all_related_for_kb(
+        self, kb_name: str, limit: int = 5
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get precomputed related entries for every entry in a KB, keyed by entry_id."""
+        ...
+
+    def refresh_related_entries(self, kb_name: str | None = None) -> int:
+        """Rescore entries queued since the last refresh. Returns entries rescored."""
+        ...
+
+    def deferred_related_refresh(self, kb_name: str | None = None) -> Any:
+        """Context manager holding per-write rescoring until the block ends."""
+        ...
+
+    def rebuild_related_entries(self, kb_name: str | None = None) -> int:
+        """Rescore every entry. Returns entries rescored."""
+        ...
+
+    def get_related_scoring(self) -> Any:
+        """Get the stored RelatedScoring config."""
+        ...
+
+    def configure_related_scoring(self, scoring: Any) -> bool:
+        """Store a RelatedScoring config, queueing a rescore if it changed."""
+        ...
+
     def get_orphans(self, kb_name: str | None = None) -> list[dict[str, Any]]:
         """Get entries with no links (neither direction)."""
         ...
@@ -282,8 +365,26 @@ class SearchBackend(Protocol):
         """Count entries in a folder."""
         ...
 
+    # ── overlay tombstones ───────────────────────────────────────────
+
+    def add_tombstone(self, entry_id: str, kb_name: str) -> None:
+        """Record that a main-index entry is deleted in this (diff) index."""
+        ...
+
+    def remove_tombstone(self, entry_id: str, kb_name: str) -> bool:
+        """Clear a tombstone. Returns True if one existed."""
+        ...
+
+    def get_tombstones(self, kb_name: str | None = None) -> set[tuple[str, str]]:
+        """Get (entry_id, kb_name) keys of tombstoned entries."""
+        ...
+
     # ── global counts ────────────────────────────────────────────────
 
+    def index_generation(self) -> Any:
+        """Token that changes whenever committed index data changes."""
+        ...
+
     def get_global_counts(self) -> dict[str, int]:
         """Get global tag and link counts."""
         ...
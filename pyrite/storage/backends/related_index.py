@@ -0,0 +1,87 @@
+"""
+Related-entries scoring for the persisted ``related_entry`` index.
+
+Entries are related when they share terms — actors (``actors`` or
+``participants`` metadata) and tags — and are not already linked to each
+other.  Each shared term adds its kind's weight; terms used by more than
+``max_term_entries`` entries are ignored, which keeps very common tags from
+making the index quadratic.  Embedding similarity can optionally be blended
+in with ``embedding_weight``.
+
+Backends keep one ``related_term`` row per entry term and queue changed
+entries in ``related_dirty``; ``BaseBackend.refresh_related_entries`` then
+rescores only the queued entries and the neighbours whose top list they can
+enter or leave.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ...utils.metadata import parse_metadata
+
+
+@dataclass(frozen=True)
+class RelatedScoring:
+    """Weights and limits used to score related entries."""
+
+    actor_weight: float = 2.0
+    tag_weight: float = 1.0
+    embedding_weight: float = 0.0
+    limit: int = 10
+    max_term_entries: int = 500
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> RelatedScoring:
+        """Build from ``Settings.related_*`` fields."""
+        return cls(
+            actor_weight=settings.related_actor_weight,
+            tag_weight=settings.related_tag_weight,
+            embedding_weight=settings.related_embedding_weight,
+            limit=settings.related_limit,
+            max_term_entries=settings.related_max_term_entries,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> RelatedScoring:
+        """Parse a stored scoring config, falling back to defaults."""
+        if not raw:
+            return cls()
+        try:
+            data = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return cls()
+        fields = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in fields})
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    def weight(self, kind: str) -> float:
+        return self.actor_weight if kind == "actor" else self.tag_weight
+
+
+def entry_terms(entry_data: dict[str, Any]) -> list[tuple[str, str]]:
+    """Return the distinct ``(kind, value)`` scoring terms of an entry dict."""
+    terms: dict[tuple[str, str], None] = {}
+    meta = parse_metadata(entry_data.get("metadata"))
+    actors = meta.get("actors") or meta.get("participants") or []
+    if isinstance(actors, list):
+        for actor in actors:
+            if actor:
+                terms[("actor", str(actor))] = None
+    for tag in entry_data.get("tags") or []:
+        if tag:
+            terms[("tag", str(tag))] = None
+    return list(terms)
+
+
+def top_related(scores: dict[str, float], limit: int) -> list[tuple[str, float]]:
+    """Highest-scoring candidates first, ties broken by entry ID."""
+    ranked = sorted(
+        ((cid, score) for cid, score in scores.items() if score > 0),
+        key=lambda item: (-item[1], item[0]),
+    )
+    return ranked[:limit]
@@ -4,22 +4,27 @@ SQLiteBackend — SearchBackend implementation backed by SQLite + FTS5 + sqlite-
 Inherits shared ORM/SQL logic from BaseBackend.  Only overrides:
 - ``_exec`` / ``_exec_one`` / ``_exec_scalar`` (raw sqlite3 connection)
 - ``_sync_links`` (diff-based sync)
-- Full-text search (FTS5)
+- Full-text search (FTS5, with configurable bm25 column weights)
 - Embedding operations (sqlite-vec)
 """
 
 from __future__ import annotations
 
 import struct
+from array import array
 from typing import Any
 
 from .base_backend import BaseBackend
+from .. import embedding_versions
 from ..models import Link
+from ..virtual_tables import FtsConfig, create_vec_table, rebuild_fts
 
 
 class SQLiteBackend(BaseBackend):
     """SearchBackend implementation for SQLite + FTS5 + sqlite-vec."""
 
+    supports_embedding_versions = True
+
     def __init__(
         self,
         session,
@@ -29,6 +34,7 @@ class SQLiteBackend(BaseBackend):
         self._session = session
         self._raw_conn = raw_conn
         self.vec_available = vec_available
+        self._vec_state: tuple[int, dict[int, dict[str, Any]], dict[str, int]] | None = None
 
     def close(self) -> None:
         """No-op — connection lifecycle owned by PyriteDB."""
@@ -80,6 +86,26 @@ class SQLiteBackend(BaseBackend):
         sql_out = re.sub(r"(?<!:):([a-zA-Z_]\w*)", _replacer, sql)
         return sql_out, param_list
 
+    def _graph_data_version(self) -> int:
+        """Use ``PRAGMA data_version`` as the link-graph staleness token.
+
+        It changes whenever another connection commits — including the ORM
+        session, which performs all index writes — so the check is O(1).
+        """
+        return self._raw_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def index_generation(self) -> tuple[int, int]:
+        # data_version misses commits made on this very connection, so pair
+        # it with the connection's own change counter.
+        return (self._graph_data_version(), self._raw_conn.total_changes)
+
+    def get_global_counts(self) -> dict[str, int]:
+        # Link total from the trigger-maintained kb_stat counters (see
+        # storage.kb_stats) rather than a scan of the link table.
+        tag_count = self._exec_scalar("SELECT COUNT(*) FROM tag") or 0
+        link_count = self._exec_scalar("SELECT SUM(count) FROM kb_stat WHERE kind = 'links'") or 0
+        return {"total_tags": tag_count, "total_links": link_count}
+
     # =====================================================================
     # _sync_links (diff-based — SQLite-specific)
     # =====================================================================
@@ -139,6 +165,10 @@ class SQLiteBackend(BaseBackend):
     # Full-text search (FTS5)
     # =====================================================================
 
+    def _rebuild_fts(self, config: FtsConfig) -> None:
+        self._session.commit()
+        rebuild_fts(self._raw_conn, config)
+
     def search(
         self,
         query: str,
@@ -154,14 +184,15 @@ class SQLiteBackend(BaseBackend):
         fips: str | None = None,
         state: str | None = None,
     ) -> list[dict[str, Any]]:
-        sql = """
+        weights = ", ".join(map(repr, self.get_fts_config().bm25_weights()))
+        sql = f"""
             SELECT
                 e.id, e.kb_name, e.entry_type, e.title, e.body, e.summary,
                 e.file_path, e.date, e.importance, e.status, e.location,
                 e.lifecycle, e.metadata, e.created_at, e.updated_at, e.indexed_at,
                 e.created_by, e.modified_by,
                 snippet(entry_fts, 4, '<mark>', '</mark>', '...', 32) as snippet,
-                bm25(entry_fts) as rank
+                bm25(entry_fts, {weights}) as rank
             FROM entry_fts
             JOIN entry e ON entry_fts.rowid = e.rowid
             WHERE entry_fts MATCH ?
@@ -208,6 +239,31 @@ class SQLiteBackend(BaseBackend):
         rows = self._raw_conn.execute(sql, params).fetchall()
         return [dict(r) for r in rows]
 
+    def search_substring(
+        self, text: str, kb_name: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Entries whose title, summary or body contains ``text`` anywhere.
+
+        Uses the ``entry_trigram`` index when it exists and ``text`` has at
+        least three characters; otherwise falls back to a LIKE scan.
+        """
+        if not (self.get_fts_config().trigram and len(text) >= 3):
+            return super().search_substring(text, kb_name=kb_name, limit=limit)
+        sql = """
+            SELECT e.id, e.kb_name, e.entry_type, e.title, e.summary, e.date
+            FROM entry_trigram
+            JOIN entry e ON entry_trigram.rowid = e.rowid
+            WHERE entry_trigram MATCH ?
+        """
+        params: list[Any] = ['"' + text.replace('"', '""') + '"']
+        if kb_name:
+            sql += " AND e.kb_name = ?"
+            params.append(kb_name)
+        sql += " ORDER BY e.title LIMIT ?"
+        params.append(limit)
+        rows = self._raw_conn.execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
+
     def search_by_tag(
         self, tag: str, kb_name: str | None = None, limit: int = 50
     ) -> list[dict[str, Any]]:
@@ -263,15 +319,196 @@ class SQLiteBackend(BaseBackend):
 
     # =====================================================================
     # Semantic search (sqlite-vec embeddings)
+    #
+    # Each embedding model version has its own vec table (see
+    # ``embedding_versions``).  ``version=None`` means the KB's active version.
+    # A version with a quantized copy (``<vec_table>_q``) runs its first-pass
+    # KNN there and reranks ``quantized_rerank_factor`` times as many
+    # candidates by exact L2 distance against the float32 vectors.
+    #
+    # Models (with their tables created) and each KB's active version are
+    # cached until this backend changes the registry or another connection
+    # commits, which may be a re-embed in another process cutting a KB over.
     # =====================================================================
 
+    quantized_rerank_factor = 8
+    _QUANTIZE = {"int8": "vec_quantize_int8(?, 'unit')", "bit": "vec_quantize_binary(?)"}
+
     @staticmethod
     def _embedding_to_blob(embedding: list[float]) -> bytes:
         return struct.pack(f"{len(embedding)}f", *embedding)
 
-    def upsert_embedding(self, entry_id: str, kb_name: str, embedding: list[float]) -> bool:
+    def _vec_cache(self) -> tuple[dict[int, dict[str, Any]], dict[str, int]]:
+        """Cached models by version and active versions by KB."""
+        token = self._graph_data_version()
+        if self._vec_state is None or self._vec_state[0] != token:
+            self._vec_state = (token, {}, {})
+        return self._vec_state[1], self._vec_state[2]
+
+    def _invalidate_vec_cache(self) -> None:
+        self._vec_state = None
+
+    def _vec_model(self, version: int) -> dict[str, Any]:
+        """Model row for ``version``, creating its vec table on first use."""
+        models, _ = self._vec_cache()
+        if version in models:
+            return models[version]
+        model = embedding_versions.get_model(self._raw_conn, version)
+        if model is None:
+            raise ValueError(f"Unknown embedding version: {version}")
+        create_vec_table(self._raw_conn, model["vec_table"], model["dimensions"])
+        if model["quantization"] != "none":
+            create_vec_table(
+                self._raw_conn,
+                model["vec_table"] + "_q",
+                model["dimensions"],
+                model["quantization"],
+            )
+        models[version] = model
+        return model
+
+    def _active_version(self, kb_name: str) -> int:
+        _, active = self._vec_cache()
+        if kb_name not in active:
+            active[kb_name] = embedding_versions.kb_state(self._raw_conn, kb_name)["active"][
+                "version"
+            ]
+        return active[kb_name]
+
+    def _embedding_activated(self, kb_name: str) -> None:
+        """Drop cached state after a KB's active version changed; create its tables."""
+        self._invalidate_vec_cache()
+        if self.vec_available:
+            self._vec_model(self._active_version(kb_name))
+
+    def _vec_tables(self, version: int | None = None) -> list[str]:
+        """Existing vec tables (full and quantized) of one or every version."""
+        sql = (
+            "SELECT s.name FROM embedding_model m JOIN sqlite_master s "
+            "ON s.type = 'table' AND s.name IN (m.vec_table, m.vec_table || '_q')"
+        )
+        params: tuple = ()
+        if version is not None:
+            sql += " WHERE m.version = ?"
+            params = (version,)
+        return [r[0] for r in self._raw_conn.execute(sql, params)]
+
+    def _active_tables(self) -> list[str]:
+        """Existing vec tables that some KB's searches read."""
+        versions = set(embedding_versions.active_versions(self._raw_conn).values())
+        versions.add(embedding_versions.LEGACY_VERSION)
+        tables = set(self._vec_tables())
+        return [
+            m["vec_table"]
+            for v in sorted(versions)
+            if (m := embedding_versions.get_model(self._raw_conn, v)) and m["vec_table"] in tables
+        ]
+
+    def register_embedding_model(self, model: str, dimensions: int) -> dict[str, Any]:
+        """Version record for ``(model, dimensions)``, allocated on first use."""
+        return embedding_versions.register_model(self._raw_conn, model, dimensions)
+
+    def embedding_model(self, version: int) -> dict[str, Any] | None:
+        """Model name, dimension and vec table of an embedding version."""
+        return embedding_versions.get_model(self._raw_conn, version)
+
+    def embedding_state(self, kb_name: str) -> dict[str, Any]:
+        """Active and building embedding versions of a KB."""
+        return embedding_versions.kb_state(self._raw_conn, kb_name)
+
+    def active_embedding_versions(self) -> dict[str, int]:
+        """Active embedding version per registered KB."""
+        return embedding_versions.active_versions(self._raw_conn)
+
+    def adopt_embedding_version(self, kb_name: str, version: int) -> None:
+        """Record ``version`` for a KB whose model has not been recorded yet."""
+        embedding_versions.adopt(self._raw_conn, kb_name, version)
+        self._embedding_activated(kb_name)
+
+    def start_embedding_build(self, kb_name: str, version: int) -> bool:
+        """Begin filling ``version`` for a KB while its active version serves reads."""
+        if not self.vec_available:
+            return False
+        self._vec_model(version)
+        return embedding_versions.start_build(self._raw_conn, kb_name, version)
+
+    def embedding_builds(self) -> list[str]:
+        """KBs with a re-embed in progress."""
+        return embedding_versions.building_kbs(self._raw_conn)
+
+    def finish_embedding_build(self, kb_name: str) -> tuple[int, int] | None:
+        """Cut a KB over to its building version and drop its old vectors."""
+        switched = embedding_versions.cut_over(self._raw_conn, kb_name)
+        if switched is not None:
+            self._embedding_activated(kb_name)
+            self._drop_kb_vectors(kb_name, switched[0])
+        return switched
+
+    def cancel_embedding_build(self, kb_name: str) -> int | None:
+        """Abandon a KB's re-embed and drop the vectors written so far."""
+        version = embedding_versions.cancel_build(self._raw_conn, kb_name)
+        if version is not None:
+            self._drop_kb_vectors(kb_name, version)
+        return version
+
+    def _drop_kb_vectors(self, kb_name: str, version: int) -> None:
+        in_use = embedding_versions.version_in_use(self._raw_conn, version)
+        for table in self._vec_tables(version):
+            if in_use:
+                self._raw_conn.execute(
+                    f"DELETE FROM {table} "
+                    "WHERE rowid IN (SELECT rowid FROM entry WHERE kb_name = ?)",
+                    (kb_name,),
+                )
+            else:
+                self._raw_conn.execute(f"DROP TABLE {table}")
+        self._raw_conn.commit()
+        self._invalidate_vec_cache()
+
+    def set_embedding_quantization(self, version: int, quantization: str) -> int:
+        """Keep an ``int8``/``bit`` copy of a version's vectors (or none).
+
+        The copy is rebuilt from the stored float32 vectors, so no
+        re-embedding is needed; returns the number of vectors quantized.
+        """
+        if quantization not in embedding_versions.QUANTIZATIONS:
+            raise ValueError(
+                f"Unknown quantization {quantization!r}; "
+                f"use one of {embedding_versions.QUANTIZATIONS}"
+            )
+        if not self.vec_available:
+            return 0
+        model = self._vec_model(version)
+        quantized = model["vec_table"] + "_q"
+        self._raw_conn.execute(f"DROP TABLE IF EXISTS {quantized}")
+        embedding_versions.set_quantization(self._raw_conn, version, quantization)
+        self._invalidate_vec_cache()
+        if quantization == "none":
+            return 0
+        self._vec_model(version)
+        quantize = self._QUANTIZE[quantization].replace("?", "embedding")
+        cursor = self._raw_conn.execute(
+            f"INSERT INTO {quantized}(rowid, embedding) "
+            f"SELECT rowid, {quantize} FROM {model['vec_table']}"
+        )
+        self._raw_conn.commit()
+        return cursor.rowcount
+
+    def upsert_embedding(
+        self,
+        entry_id: str,
+        kb_name: str,
+        embedding: list[float],
+        version: int | None = None,
+    ) -> bool:
         if not self.vec_available:
             return False
+        model = self._vec_model(version or self._active_version(kb_name))
+        if len(embedding) != model["dimensions"]:
+            raise ValueError(
+                f"Embedding has {len(embedding)} dimensions; {model['model']} "
+                f"(version {model['version']}) stores {model['dimensions']}"
+            )
         row = self._raw_conn.execute(
             "SELECT rowid FROM entry WHERE id = ? AND kb_name = ?",
             (entry_id, kb_name),
@@ -280,10 +517,17 @@ class SQLiteBackend(BaseBackend):
             return False
         rowid = row[0]
         blob = self._embedding_to_blob(embedding)
-        self._raw_conn.execute("DELETE FROM vec_entry WHERE rowid = ?", (rowid,))
+        table = model["vec_table"]
+        self._raw_conn.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
         self._raw_conn.execute(
-            "INSERT INTO vec_entry(rowid, embedding) VALUES (?, ?)", (rowid, blob)
+            f"INSERT INTO {table}(rowid, embedding) VALUES (?, ?)", (rowid, blob)
         )
+        if model["quantization"] != "none":
+            quantize = self._QUANTIZE[model["quantization"]]
+            self._raw_conn.execute(f"DELETE FROM {table}_q WHERE rowid = ?", (rowid,))
+            self._raw_conn.execute(
+                f"INSERT INTO {table}_q(rowid, embedding) VALUES (?, {quantize})", (rowid, blob)
+            )
         self._raw_conn.commit()
         return True
 
@@ -293,56 +537,158 @@ class SQLiteBackend(BaseBackend):
         kb_name: str | None = None,
         limit: int = 20,
         max_distance: float = 1.3,
+        version: int | None = None,
     ) -> list[dict[str, Any]]:
+        """KNN over one version's table, limited to KBs that read that version.
+
+        Without ``kb_name`` or ``version`` every KB is searched in its active
+        version (the legacy table for KBs with no recorded version), merged
+        by distance.  Versions whose dimension differs from ``embedding``
+        cannot be compared and are skipped.
+        """
         if not self.vec_available:
             return []
+        if version is None and not kb_name:
+            versions = sorted(set(embedding_versions.active_versions(self._raw_conn).values()))
+            results = [
+                entry
+                for v in versions
+                if self._vec_model(v)["dimensions"] == len(embedding)
+                for entry in self.search_semantic(
+                    embedding, limit=limit, max_distance=max_distance, version=v
+                )
+            ]
+            if len(versions) > 1:
+                results.sort(key=lambda r: r.get("distance", 0))
+            return results[:limit]
+        if version is None:
+            version = self._active_version(kb_name)
+        readers = {
+            kb
+            for kb, v in embedding_versions.active_versions(self._raw_conn).items()
+            if v == version
+        }
+        if kb_name:
+            if kb_name not in readers:
+                return []
+            readers = {kb_name}
+        if not readers:
+            return []
+        model = self._vec_model(version)
+        table = model["vec_table"]
         blob = self._embedding_to_blob(embedding)
         fetch_limit = limit * 3 if kb_name else limit * 2
-        rows = self._raw_conn.execute(
-            """
-            SELECT v.rowid, v.distance, e.*
-            FROM vec_entry v
-            JOIN entry e ON v.rowid = e.rowid
-            WHERE v.embedding MATCH ? AND k = ?
-            ORDER BY v.distance
-            """,
-            (blob, fetch_limit),
-        ).fetchall()
+        if model["quantization"] == "none":
+            rows = self._raw_conn.execute(
+                f"""
+                SELECT v.rowid, v.distance, e.*
+                FROM {table} v
+                JOIN entry e ON v.rowid = e.rowid
+                WHERE v.embedding MATCH ? AND k = ?
+                ORDER BY v.distance
+                """,
+                (blob, fetch_limit),
+            ).fetchall()
+        else:
+            quantize = self._QUANTIZE[model["quantization"]]
+            rows = self._raw_conn.execute(
+                f"""
+                WITH coarse AS (
+                    SELECT rowid FROM {table}_q WHERE embedding MATCH {quantize} AND k = ?
+                )
+                SELECT c.rowid, vec_distance_l2(v.embedding, ?) AS distance, e.*
+                FROM coarse c
+                JOIN {table} v ON v.rowid = c.rowid
+                JOIN entry e ON e.rowid = c.rowid
+                ORDER BY distance
+                """,
+                (blob, fetch_limit * self.quantized_rerank_factor, blob),
+            ).fetchall()
         results = []
         for row in rows:
             entry = dict(row)
             distance = entry.get("distance", 0)
             if distance > max_distance:
                 continue
-            if kb_name and entry.get("kb_name") != kb_name:
+            if entry.get("kb_name") not in readers:
                 continue
             results.append(entry)
             if len(results) >= limit:
                 break
         return results
 
+    def get_embedding(self, entry_id: str, kb_name: str) -> list[float] | None:
+        if not self.vec_available:
+            return None
+        table = self._vec_model(self._active_version(kb_name))["vec_table"]
+        row = self._raw_conn.execute(
+            f"""
+            SELECT v.embedding FROM {table} v
+            JOIN entry e ON v.rowid = e.rowid
+            WHERE e.id = ? AND e.kb_name = ?
+            """,
+            (entry_id, kb_name),
+        ).fetchone()
+        if not row or row[0] is None:
+            return None
+        blob = row[0]
+        return list(struct.unpack(f"{len(blob) // 4}f", blob))
+
+    def get_kb_embeddings(self, kb_name: str) -> list[tuple[str, array]]:
+        if not self.vec_available:
+            return []
+        table = self._vec_model(self._active_version(kb_name))["vec_table"]
+        rows = self._raw_conn.execute(
+            f"""
+            SELECT e.id, v.embedding FROM {table} v
+            JOIN entry e ON v.rowid = e.rowid
+            WHERE e.kb_name = ?
+            """,
+            (kb_name,),
+        ).fetchall()
+        return [(r[0], array("f", r[1])) for r in rows if r[1]]
+
     def has_embeddings(self) -> bool:
         if not self.vec_available:
             return False
-        row = self._raw_conn.execute("SELECT COUNT(*) FROM vec_entry").fetchone()
-        return row[0] > 0
+        return any(
+            self._raw_conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()
+            for table in self._active_tables()
+        )
 
     def embedding_stats(self) -> dict[str, Any]:
         if not self.vec_available:
             return {"available": False, "count": 0, "total_entries": 0}
-        vec_count = self._raw_conn.execute("SELECT COUNT(*) FROM vec_entry").fetchone()[0]
+        vec_count = 0
+        versions = []
+        for version in sorted(set(embedding_versions.active_versions(self._raw_conn).values())):
+            model = self._vec_model(version)
+            count = self._raw_conn.execute(
+                f"""
+                SELECT COUNT(*) FROM {model["vec_table"]} v
+                JOIN entry e ON v.rowid = e.rowid
+                LEFT JOIN kb_embedding ke ON ke.kb_name = e.kb_name
+                WHERE COALESCE(ke.active_version, ?) = ?
+                """,
+                (embedding_versions.LEGACY_VERSION, version),
+            ).fetchone()[0]
+            vec_count += count
+            versions.append({**model, "count": count})
         entry_count = self._raw_conn.execute("SELECT COUNT(*) FROM entry").fetchone()[0]
         return {
             "available": True,
             "count": vec_count,
             "total_entries": entry_count,
             "coverage": f"{vec_count / entry_count * 100:.1f}%" if entry_count > 0 else "0%",
+            "versions": versions,
         }
 
-    def get_embedded_rowids(self) -> set[int]:
+    def get_embedded_rowids(self, version: int | None = None) -> set[int]:
+        """Rowids with a vector in ``version``'s table (legacy table by default)."""
         if not self.vec_available:
             return set()
-        rows = self._raw_conn.execute("SELECT rowid FROM vec_entry").fetchall()
+        table = self._vec_model(version or embedding_versions.LEGACY_VERSION)["vec_table"]
+        rows = self._raw_conn.execute(f"SELECT rowid FROM {table}").fetchall()
         return {r[0] for r in rows}
 
     def get_entries_for_embedding(self, kb_name: str | None = None) -> list[dict[str, Any]]:
@@ -365,5 +711,6 @@ class SQLiteBackend(BaseBackend):
             (entry_id, kb_name),
         ).fetchone()
         if row:
-            self._raw_conn.execute("DELETE FROM vec_entry WHERE rowid = ?", (row[0],))
+            for table in self._vec_tables():
+                self._raw_conn.execute(f"DELETE FROM {table} WHERE rowid = ?", (row[0],))
             self._raw_conn.commit()
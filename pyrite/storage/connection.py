@@ -2,8 +2,16 @@
 Database connection setup, extensions, migrations, and plugin tables.
 
 Mixin class providing __init__, close, transaction, and schema management.
+
+Schema setup (ORM tables, FTS script, migrations, plugin tables) runs only
+when the stamp kept in ``PRAGMA user_version`` differs from the stamp of the
+running code, or the migration version is behind; opening an up-to-date
+database skips it entirely.
 """
 
+import functools
+import hashlib
+import json
 import logging
 import re
 import sqlite3
@@ -16,8 +24,9 @@ from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session
 
 from .backends.sqlite_backend import SQLiteBackend
+from .migrations import CURRENT_VERSION
 from .models import Base
-from .virtual_tables import create_fts_tables, create_vec_table
+from .virtual_tables import FTS_SCHEMA_SQL, VEC_SCHEMA_SQL, create_fts_tables, create_vec_table
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +36,22 @@ sqlite3.register_adapter(date, lambda d: d.isoformat())
 sqlite3.register_converter("timestamp", lambda b: datetime.fromisoformat(b.decode()))
 
 
+@functools.cache
+def _core_schema_digest() -> str:
+    """Digest of the core schema: ORM tables, FTS script and migration level."""
+    h = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        h.update(table.name.encode())
+        for column in table.columns:
+            h.update(f"|{column.name}:{column.type!r}:{column.nullable}".encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            h.update(f"|idx:{index.name}".encode())
+    h.update(FTS_SCHEMA_SQL.encode())
+    h.update(VEC_SCHEMA_SQL.encode())
+    h.update(str(CURRENT_VERSION).encode())
+    return h.hexdigest()
+
+
 class ConnectionMixin:
     """Database connection, extensions, migrations, and plugin table creation."""
 
@@ -50,9 +75,6 @@ class ConnectionMixin:
             cursor.execute("PRAGMA synchronous = NORMAL")
             cursor.close()
 
-        # Create ORM tables
-        Base.metadata.create_all(self.engine)
-
         # Create session
         self.session = Session(self.engine)
 
@@ -62,14 +84,8 @@ class ConnectionMixin:
         self._raw_conn = self._sa_conn.connection.dbapi_connection
         self._raw_conn.row_factory = sqlite3.Row
 
-        # Load extensions and create virtual tables
         self._load_extensions()
-        create_fts_tables(self._raw_conn)
-        if self.vec_available:
-            create_vec_table(self._raw_conn)
-
-        self._run_migrations()
-        self._create_plugin_tables()
+        self._ensure_schema()
 
         # Instantiate the search backend
         self._backend = SQLiteBackend(
@@ -91,6 +107,53 @@ class ConnectionMixin:
         except (ImportError, Exception):
             logger.info("sqlite-vec extension not available")
 
+    def _schema_stamp(self) -> int:
+        """Positive 31-bit stamp of the schema this process would create."""
+        from ..plugins import get_registry
+
+        h = hashlib.sha256(_core_schema_digest().encode())
+        h.update(b"vec" if self.vec_available else b"novec")
+        h.update(get_registry().entry_point_signature().encode())
+        return int.from_bytes(h.digest()[:4], "big") & 0x7FFFFFFF or 1
+
+    def _schema_is_current(self, stamp: int) -> bool:
+        if self._raw_conn.execute("PRAGMA user_version").fetchone()[0] != stamp:
+            return False
+        try:
+            row = self._raw_conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        except sqlite3.Error:
+            return False
+        return row[0] == CURRENT_VERSION
+
+    def _ensure_schema(self, force: bool = False):
+        """Create tables, virtual tables, migrations and plugin tables if needed.
+
+        Skipped when the database was already set up by code with the same
+        schema stamp.  Plugin tables are still (idempotently) created when
+        plugins are already loaded in this process, since their definitions
+        can change without an entry-point version bump during development.
+        """
+        from ..plugins import get_registry
+
+        stamp = self._schema_stamp()
+        if not force and self._schema_is_current(stamp):
+            if get_registry().loaded:
+                self._create_plugin_tables()
+            return
+
+        # Create ORM tables
+        Base.metadata.create_all(self.engine)
+
+        # Create virtual tables
+        create_fts_tables(self._raw_conn)
+        if self.vec_available:
+            create_vec_table(self._raw_conn)
+
+        self._run_migrations()
+        self._create_plugin_tables()
+        self._raw_conn.execute(f"PRAGMA user_version = {stamp}")
+        self._raw_conn.commit()
+
     def _run_migrations(self):
         """Run any pending database migrations using legacy MigrationManager."""
         from .migrations import MigrationManager
@@ -108,11 +171,89 @@ class ConnectionMixin:
         try:
             from ..plugins import get_registry
 
-            for table_def in get_registry().get_all_db_tables():
+            registry = get_registry()
+            for table_def in registry.get_all_db_tables():
                 self._create_table_from_def(table_def)
+            self._sync_derived_tables(registry.get_all_db_derived_tables())
         except Exception:
             logger.warning("Plugin table creation failed", exc_info=True)
 
+    def _sync_derived_tables(self, definitions: list[dict]) -> None:
+        """Install new or re-versioned derived tables and drop ones no plugin declares.
+
+        ``plugin_derived_table`` records each installed definition's version
+        and the schema objects its script created, so they can be dropped
+        when the definition changes or disappears.
+        """
+        conn = self._raw_conn
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS plugin_derived_table "
+            "(name TEXT PRIMARY KEY, version INTEGER NOT NULL, objects TEXT NOT NULL)"
+        )
+        installed = {
+            row[0]: (row[1], json.loads(row[2]))
+            for row in conn.execute("SELECT name, version, objects FROM plugin_derived_table")
+        }
+        wanted = {d["name"]: d for d in definitions}
+
+        for name, (version, objects) in list(installed.items()):
+            definition = wanted.get(name)
+            if definition is not None and definition.get("version", 1) == version:
+                continue
+            self._drop_schema_objects(objects)
+            conn.execute("DELETE FROM plugin_derived_table WHERE name = ?", (name,))
+            del installed[name]
+        conn.commit()
+
+        for name, definition in wanted.items():
+            if name in installed:
+                continue
+            created: set[tuple[str, str]] = set()
+            try:
+                self._run_schema_script(definition["schema"], created)
+                if definition.get("backfill"):
+                    definition["backfill"](conn)
+                conn.execute(
+                    "INSERT INTO plugin_derived_table (name, version, objects) VALUES (?, ?, ?)",
+                    (name, definition.get("version", 1), json.dumps(sorted(created))),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._drop_schema_objects(created)
+                conn.commit()
+                logger.warning("Derived table %s installation failed", name, exc_info=True)
+
+    # sqlite3 authorizer action codes -> sqlite_master type
+    _CREATE_ACTIONS = {
+        sqlite3.SQLITE_CREATE_TABLE: "table",
+        sqlite3.SQLITE_CREATE_INDEX: "index",
+        sqlite3.SQLITE_CREATE_TRIGGER: "trigger",
+        sqlite3.SQLITE_CREATE_VIEW: "view",
+    }
+
+    def _run_schema_script(self, script: str, created: set[tuple[str, str]]) -> None:
+        """Run a SQL script, adding the (type, name) of each object it creates to ``created``."""
+
+        def authorize(action, arg1, arg2, db_name, source):
+            kind = self._CREATE_ACTIONS.get(action)
+            if kind and arg1 and not arg1.startswith("sqlite_"):
+                created.add((kind, arg1))
+            return sqlite3.SQLITE_OK
+
+        self._raw_conn.set_authorizer(authorize)
+        try:
+            self._raw_conn.executescript(script)
+        finally:
+            self._raw_conn.set_authorizer(None)
+
+    def _drop_schema_objects(self, objects) -> None:
+        """Drop (type, name) schema objects: triggers and views first, tables last."""
+        for kind in ("trigger", "view", "index", "table"):
+            for obj_kind, obj_name in objects:
+                if obj_kind == kind:
+                    self._raw_conn.execute(f'DROP {kind.upper()} IF EXISTS "{obj_name}"')
+
     _VALID_SQL_IDENTIFIER = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
     _VALID_SQL_TYPE = re.compile(r"^[A-Z][A-Z0-9_ ()]*$")
     _VALID_FK_REF = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*\([a-zA-Z_][a-zA-Z0-9_]*\)$")
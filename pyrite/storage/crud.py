@@ -5,6 +5,7 @@ Mixin class for insert, update, delete, and get operations on entries.
 Delegates to the SearchBackend instance at ``self._backend``.
 """
 
+from collections.abc import Iterator
 from typing import Any
 
 
@@ -27,6 +28,10 @@ class CRUDMixin:
         """Batch-get multiple entries by (entry_id, kb_name) pairs."""
         return self._backend.get_entries(ids)
 
+    def get_entry_headers(self, ids: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Batch-get id, kb_name, title, entry_type and summary by (entry_id, kb_name) pairs."""
+        return self._backend.get_entry_headers(ids)
+
     # Allowed sort columns to prevent SQL injection
     _SORT_COLUMNS = {"title", "updated_at", "created_at", "entry_type"}
 
@@ -57,6 +62,32 @@ class CRUDMixin:
             min_importance=min_importance,
         )
 
+    def list_entries_after(
+        self,
+        kb_name: str,
+        after_id: str | None = None,
+        limit: int = 500,
+        include_archived: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Keyset page of a KB's entries ordered by ID, starting after ``after_id``."""
+        return self._backend.list_entries_after(
+            kb_name=kb_name, after_id=after_id, limit=limit, include_archived=include_archived
+        )
+
+    def iter_kb_entries(
+        self, kb_name: str, batch_size: int = 500, include_archived: bool = False
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yield every entry of a KB in ID-ordered batches (keyset pagination)."""
+        after_id = None
+        while True:
+            batch = self.list_entries_after(kb_name, after_id, batch_size, include_archived)
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1]["id"]
+
     def count_entries(
         self,
         kb_name: str | None = None,
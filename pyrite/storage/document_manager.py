@@ -113,7 +113,7 @@ class DocumentManager:
         """
         repo = KBRepository(kb_config)
         file_deleted = repo.delete(entry_id)
-        self._db.delete_entry(entry_id, kb_name)
+        self._index_mgr.remove_entry(entry_id, kb_name)
         return file_deleted
 
     def index_entry(self, entry: Entry, kb_name: str, file_path: Path) -> None:
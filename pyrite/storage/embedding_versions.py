@@ -0,0 +1,250 @@
+"""Versioned embedding models.
+
+Vectors are stored in one sqlite-vec table per embedding model version,
+sized to that model's dimension.  ``embedding_model`` records each
+(model, dimensions) pair and its table; ``kb_embedding`` records, per KB,
+the version its searches read (``active_version``) and, while a re-embed
+is running, the version being filled (``building_version``).  Searches keep
+reading the active table until ``cut_over`` swaps the pointers, so a model
+upgrade never leaves a KB without vectors.
+
+Version 1 is the original ``vec_entry`` table (all-MiniLM-L6-v2, 384
+dimensions).  KBs without a ``kb_embedding`` row read it.
+
+A version may also carry a quantized copy of its vectors (``int8`` or
+``bit``) in ``<vec_table>_q``; KNN then scans the compact copy and reranks
+its candidates against the full-precision table.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime
+from typing import Any
+
+LEGACY_VERSION = 1
+LEGACY_MODEL = "all-MiniLM-L6-v2"
+LEGACY_DIMENSIONS = 384
+LEGACY_TABLE = "vec_entry"
+QUANTIZATIONS = ("none", "int8", "bit")
+
+EMBEDDING_VERSIONS_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS embedding_model (
+    version INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    vec_table TEXT NOT NULL DEFAULT '',
+    quantization TEXT NOT NULL DEFAULT 'none',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (model, dimensions)
+);
+INSERT OR IGNORE INTO embedding_model (version, model, dimensions, vec_table)
+VALUES ({LEGACY_VERSION}, '{LEGACY_MODEL}', {LEGACY_DIMENSIONS}, '{LEGACY_TABLE}');
+
+CREATE TABLE IF NOT EXISTS kb_embedding (
+    kb_name TEXT PRIMARY KEY,
+    active_version INTEGER NOT NULL DEFAULT {LEGACY_VERSION},
+    building_version INTEGER,
+    build_started_at TEXT,
+    activated_at TEXT
+);
+"""
+
+_KB_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS kb_embedding_kb_ad AFTER DELETE ON kb BEGIN
+    DELETE FROM kb_embedding WHERE kb_name = old.name;
+END;
+"""
+
+
+def create_embedding_versions(connection: sqlite3.Connection) -> None:
+    """Create the version registry, pinning existing KBs to the legacy table."""
+    connection.executescript(EMBEDDING_VERSIONS_SCHEMA_SQL)
+    has_kb = connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'kb'"
+    ).fetchone()
+    if has_kb:
+        connection.executescript(_KB_TRIGGER_SQL)
+        # Vectors indexed before versioning were all written by the legacy model.
+        connection.execute(
+            "INSERT OR IGNORE INTO kb_embedding (kb_name, active_version) "
+            f"SELECT name, {LEGACY_VERSION} FROM kb"
+        )
+    connection.commit()
+
+
+_MODEL_COLUMNS = "version, model, dimensions, vec_table, quantization"
+
+
+def _model_dict(row) -> dict[str, Any]:
+    return {
+        "version": row[0],
+        "model": row[1],
+        "dimensions": row[2],
+        "vec_table": row[3],
+        "quantization": row[4],
+    }
+
+
+def get_model(connection: sqlite3.Connection, version: int) -> dict[str, Any] | None:
+    """The model, dimension and vec table of one version."""
+    row = connection.execute(
+        f"SELECT {_MODEL_COLUMNS} FROM embedding_model WHERE version = ?",
+        (version,),
+    ).fetchone()
+    return _model_dict(row) if row else None
+
+
+def register_model(connection: sqlite3.Connection, model: str, dimensions: int) -> dict[str, Any]:
+    """Version for ``(model, dimensions)``, allocating a new one on first use."""
+    connection.execute(
+        "INSERT OR IGNORE INTO embedding_model (model, dimensions) VALUES (?, ?)",
+        (model, dimensions),
+    )
+    connection.execute(
+        "UPDATE embedding_model SET vec_table = 'vec_entry_v' || version WHERE vec_table = ''"
+    )
+    connection.commit()
+    row = connection.execute(
+        f"SELECT {_MODEL_COLUMNS} FROM embedding_model WHERE model = ? AND dimensions = ?",
+        (model, dimensions),
+    ).fetchone()
+    return _model_dict(row)
+
+
+def kb_state(connection: sqlite3.Connection, kb_name: str) -> dict[str, Any]:
+    """Active and building versions of one KB (legacy when never recorded)."""
+    row = connection.execute(
+        "SELECT active_version, building_version, build_started_at, activated_at "
+        "FROM kb_embedding WHERE kb_name = ?",
+        (kb_name,),
+    ).fetchone()
+    if row is None:
+        return {
+            "kb_name": kb_name,
+            "recorded": False,
+            "active": get_model(connection, LEGACY_VERSION),
+            "building": None,
+            "build_started_at": None,
+            "activated_at": None,
+        }
+    return {
+        "kb_name": kb_name,
+        "recorded": True,
+        "active": get_model(connection, row[0]),
+        "building": get_model(connection, row[1]) if row[1] is not None else None,
+        "build_started_at": row[2],
+        "activated_at": row[3],
+    }
+
+
+def active_versions(connection: sqlite3.Connection) -> dict[str, int]:
+    """Active version of every registered KB."""
+    return {
+        r[0]: r[1]
+        for r in connection.execute(
+            f"SELECT k.name, COALESCE(ke.active_version, {LEGACY_VERSION}) "
+            "FROM kb k LEFT JOIN kb_embedding ke ON ke.kb_name = k.name"
+        )
+    }
+
+
+def building_kbs(connection: sqlite3.Connection) -> list[str]:
+    """KBs with a re-embed in progress, oldest first."""
+    return [
+        r[0]
+        for r in connection.execute(
+            "SELECT kb_name FROM kb_embedding WHERE building_version IS NOT NULL "
+            "ORDER BY build_started_at"
+        )
+    ]
+
+
+def adopt(connection: sqlite3.Connection, kb_name: str, version: int) -> None:
+    """Record ``version`` as the active version of a KB that has none yet."""
+    connection.execute(
+        "INSERT OR IGNORE INTO kb_embedding (kb_name, active_version, activated_at) "
+        "VALUES (?, ?, ?)",
+        (kb_name, version, datetime.now(UTC).isoformat()),
+    )
+    connection.commit()
+
+
+def start_build(connection: sqlite3.Connection, kb_name: str, version: int) -> bool:
+    """Start filling ``version`` for a KB; False when it is already active."""
+    state = kb_state(connection, kb_name)
+    if state["active"]["version"] == version:
+        return False
+    if state["building"] and state["building"]["version"] == version:
+        return True
+    connection.execute(
+        f"""
+        INSERT INTO kb_embedding (kb_name, active_version, building_version, build_started_at)
+        VALUES (?, {LEGACY_VERSION}, ?, ?)
+        ON CONFLICT (kb_name) DO UPDATE SET
+            building_version = excluded.building_version,
+            build_started_at = excluded.build_started_at
+        """,
+        (kb_name, version, datetime.now(UTC).isoformat()),
+    )
+    connection.commit()
+    return True
+
+
+def cut_over(connection: sqlite3.Connection, kb_name: str) -> tuple[int, int] | None:
+    """Make the building version active; returns ``(old, new)`` or None."""
+    row = connection.execute(
+        "SELECT active_version, building_version FROM kb_embedding "
+        "WHERE kb_name = ? AND building_version IS NOT NULL",
+        (kb_name,),
+    ).fetchone()
+    if row is None:
+        return None
+    connection.execute(
+        """
+        UPDATE kb_embedding
+        SET active_version = building_version, building_version = NULL,
+            build_started_at = NULL, activated_at = ?
+        WHERE kb_name = ?
+        """,
+        (datetime.now(UTC).isoformat(), kb_name),
+    )
+    connection.commit()
+    return row[0], row[1]
+
+
+def cancel_build(connection: sqlite3.Connection, kb_name: str) -> int | None:
+    """Abandon a KB's re-embed; returns the version that was building."""
+    row = connection.execute(
+        "SELECT building_version FROM kb_embedding WHERE kb_name = ?", (kb_name,)
+    ).fetchone()
+    if row is None or row[0] is None:
+        return None
+    connection.execute(
+        "UPDATE kb_embedding SET building_version = NULL, build_started_at = NULL "
+        "WHERE kb_name = ?",
+        (kb_name,),
+    )
+    connection.commit()
+    return row[0]
+
+
+def version_in_use(connection: sqlite3.Connection, version: int) -> bool:
+    """Whether any KB reads or is filling ``version``."""
+    if version == LEGACY_VERSION:
+        return True
+    row = connection.execute(
+        "SELECT 1 FROM kb_embedding WHERE active_version = ? OR building_version = ? LIMIT 1",
+        (version, version),
+    ).fetchone()
+    return row is not None
+
+
+def set_quantization(connection: sqlite3.Connection, version: int, quantization: str) -> None:
+    """Record the quantized copy kept for ``version`` (``none`` for none)."""
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization {quantization!r}; use one of {QUANTIZATIONS}")
+    connection.execute(
+        "UPDATE embedding_model SET quantization = ? WHERE version = ?", (quantization, version)
+    )
+    connection.commit()
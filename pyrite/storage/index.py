@@ -5,6 +5,7 @@ Handles indexing entries from file-based KBs into the SQLite FTS database.
 Supports incremental updates based on file modification times.
 """
 
+import functools
 import logging
 import re
 from collections.abc import Callable
@@ -22,8 +23,10 @@ from ..models.protocols import (
     Statusable,
     Temporal,
 )
+from .backends.related_index import RelatedScoring
 from .database import PyriteDB
 from .repository import KBRepository
+from .virtual_tables import FtsConfig
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +104,17 @@ def _parse_indexed_at(indexed_at: str) -> datetime:
     return dt
 
 
+def _deferred_related(method: Callable) -> Callable:
+    """Rescore related entries once after a bulk write instead of per entry."""
+
+    @functools.wraps(method)
+    def wrapper(self: "IndexManager", *args: Any, **kwargs: Any) -> Any:
+        with self.db.deferred_related_refresh():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class IndexManager:
     """
     Manages the SQLite FTS index for all KBs.
@@ -115,6 +129,16 @@ class IndexManager:
         self.db = db
         self.config = config or load_config()
 
+    def _configure_index(self) -> None:
+        """Push the configured related-entries scoring and FTS options before a sync.
+
+        Configs without ``settings`` keep whatever the index already has.
+        """
+        settings = getattr(self.config, "settings", None)
+        if settings is not None:
+            self.db.configure_related_scoring(RelatedScoring.from_settings(settings))
+            self.db.configure_fts(FtsConfig.from_settings(settings))
+
     def _entry_to_dict(self, entry: Entry, kb_name: str, file_path: Path) -> dict[str, Any]:
         """Convert an Entry to a dict for database storage."""
         data = {
@@ -420,6 +444,7 @@ class IndexManager:
 
         return data
 
+    @_deferred_related
     def index_kb(
         self, kb_name: str, progress_callback: Callable[[int, int], None] | None = None
     ) -> int:
@@ -438,6 +463,7 @@ class IndexManager:
             raise ValueError(f"KB '{kb_name}' not found in config")
 
         repo = KBRepository(kb_config)
+        self._configure_index()
 
         # Register KB in database
         self.db.register_kb(
@@ -520,25 +546,21 @@ class IndexManager:
 
     def get_index_stats(self) -> dict[str, Any]:
         """Get statistics about the index."""
+        summary = self.db.get_stats_summary()
         stats = {
             "kbs": {},
             "total_entries": 0,
-            "total_tags": 0,
-            "total_links": 0,
+            "total_tags": self.db.get_global_counts()["total_tags"],
+            "total_links": summary["total_links"],
         }
 
         for kb in self.config.knowledge_bases:
-            kb_stats = self.db.get_kb_stats(kb.name)
+            kb_stats = summary["kbs"].get(kb.name)
             if kb_stats:
                 stats["kbs"][kb.name] = kb_stats
-                stats["total_entries"] += kb_stats.get("actual_count", 0)
-
-        # Get global counts
-        global_counts = self.db.get_global_counts()
-        stats["total_tags"] = global_counts["total_tags"]
-        stats["total_links"] = global_counts["total_links"]
+                stats["total_entries"] += kb_stats["actual_count"]
 
-        stats["type_counts"] = self.db.get_type_counts()
+        stats["type_counts"] = summary["type_counts"]
 
         return stats
 
@@ -739,6 +761,7 @@ class IndexManager:
 
         return health
 
+    @_deferred_related
     def sync_incremental(
         self,
         kb_name: str | None = None,
@@ -760,6 +783,8 @@ class IndexManager:
 
         kbs = [self.config.get_kb(kb_name)] if kb_name else self.config.knowledge_bases
         kbs = [kb for kb in kbs if kb and kb.path.exists()]
+        if kbs:
+            self._configure_index()
 
         # Count total files across all KBs for progress (cheap: just path listing)
         total_files = 0
@@ -847,6 +872,7 @@ class IndexManager:
 
         return results
 
+    @_deferred_related
     def sync_kb(self, kb_config: KBConfig) -> dict[str, int]:
         """Sync a single KB given its config. Used by KBRegistryService for DB-only KBs."""
         results = {"added": 0, "updated": 0, "removed": 0}
@@ -855,6 +881,7 @@ class IndexManager:
             return results
 
         repo = KBRepository(kb_config)
+        self._configure_index()
 
         self.db.register_kb(
             name=kb_config.name,
@@ -890,6 +917,7 @@ class IndexManager:
         self.db.update_kb_indexed(kb_config.name, len(seen_ids))
         return results
 
+    @_deferred_related
     def index_with_attribution(
         self,
         kb_name: str,
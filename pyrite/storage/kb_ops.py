@@ -9,6 +9,7 @@ from typing import Any
 
 from sqlalchemy import text
 
+from . import kb_stats
 from .models import KB
 
 
@@ -66,11 +67,11 @@ class KBOpsMixin:
         """Get statistics for a KB."""
         row = self.session.execute(
             text("""
-                SELECT k.*, COUNT(e.id) as actual_count
+                SELECT k.*, COALESCE(s.count, 0) as actual_count
                 FROM kb k
-                LEFT JOIN entry e ON k.name = e.kb_name
+                LEFT JOIN kb_stat s
+                    ON s.kb_name = k.name AND s.kind = 'entries' AND s.key = ''
                 WHERE k.name = :name
-                GROUP BY k.name
             """),
             {"name": name},
         ).fetchone()
@@ -81,19 +82,36 @@ class KBOpsMixin:
     def get_type_counts(self, kb_name: str | None = None) -> list[dict[str, Any]]:
         """Get entry counts grouped by entry_type."""
         if kb_name:
-            rows = self.session.execute(
-                text(
-                    "SELECT entry_type, COUNT(*) as count FROM entry WHERE kb_name = :kb GROUP BY entry_type ORDER BY count DESC"
-                ),
-                {"kb": kb_name},
-            ).fetchall()
-        else:
-            rows = self.session.execute(
-                text(
-                    "SELECT entry_type, COUNT(*) as count FROM entry GROUP BY entry_type ORDER BY count DESC"
-                ),
-            ).fetchall()
-        return [dict(r._mapping) for r in rows]
+            return [
+                {"entry_type": t["type"], "count": t["count"]}
+                for t in self.get_kb_summary(kb_name, tag_limit=0)["types"]
+            ]
+        return kb_stats.global_summary(self._raw_conn)["type_counts"]
+
+    def get_kb_summary(self, kb_name: str, tag_limit: int = 10) -> dict[str, Any] | None:
+        """Entry total, type counts, top tags and link total from ``kb_stat``."""
+        return kb_stats.kb_summary(self._raw_conn, kb_name, tag_limit)
+
+    def get_stats_summary(self) -> dict[str, Any]:
+        """Per-KB entry totals, type counts and link total across all KBs.
+
+        ``kbs`` maps each registered KB to its row plus ``actual_count``, the
+        same shape ``get_kb_stats`` returns for one KB.
+        """
+        summary = kb_stats.global_summary(self._raw_conn)
+        summary["kbs"] = {
+            row["name"]: {**dict(row), "actual_count": summary["entries"].get(row["name"], 0)}
+            for row in self._raw_conn.execute("SELECT * FROM kb")
+        }
+        return summary
+
+    def check_kb_stats(self, kb_name: str | None = None) -> list[dict[str, Any]]:
+        """Materialized counters that disagree with the indexed rows."""
+        return kb_stats.check_kb_stats(self._raw_conn, kb_name)
+
+    def rebuild_kb_stats(self, kb_name: str | None = None) -> int:
+        """Recompute materialized counters; returns rows written."""
+        return kb_stats.rebuild_kb_stats(self._raw_conn, kb_name)
 
     def link_kb_to_repo(self, kb_name: str, repo_id: int, repo_subpath: str) -> None:
         """Associate a KB with a repo."""
@@ -0,0 +1,211 @@
+"""Materialized per-KB statistics.
+
+``kb_stat`` holds one counter row per (KB, kind, key): the entry total
+(``entries``), entries per type (``type``), entries per tag (``tag``) and
+outgoing links (``links``).  Triggers on ``entry``, ``entry_tag`` and
+``link`` keep the counters current as the upsert and delete paths write
+those tables, so orientation and stats reads are index lookups instead of
+``COUNT``/``GROUP BY`` scans.
+
+Counters can drift if rows are changed with triggers disabled or a tag row
+vanishes before its ``entry_tag`` rows; ``check_kb_stats`` compares them
+with a fresh aggregate and ``rebuild_kb_stats`` recomputes them.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+STAT_KINDS = ("entries", "type", "tag", "links")
+
+
+def _bump(kb: str, kind: str, key: str, delta: int) -> str:
+    """Trigger statement adding ``delta`` to one counter (creating it at 0)."""
+    return f"""
+    INSERT INTO kb_stat (kb_name, kind, key, count) VALUES ({kb}, '{kind}', {key}, {delta})
+    ON CONFLICT (kb_name, kind, key) DO UPDATE SET count = count + ({delta});"""
+
+
+def _bump_tag(kb: str, tag_id: str, delta: int) -> str:
+    return f"""
+    INSERT INTO kb_stat (kb_name, kind, key, count)
+    SELECT {kb}, 'tag', t.name, {delta} FROM tag t WHERE t.id = {tag_id}
+    ON CONFLICT (kb_name, kind, key) DO UPDATE SET count = count + ({delta});"""
+
+
+KB_STATS_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS kb_stat (
+    kb_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kb_name, kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_kb_stat_count ON kb_stat(kb_name, kind, count);
+CREATE INDEX IF NOT EXISTS idx_entry_kb_updated ON entry(kb_name, updated_at);
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_entry_ai AFTER INSERT ON entry BEGIN
+    {_bump("new.kb_name", "entries", "''", 1)}
+    {_bump("new.kb_name", "type", "new.entry_type", 1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_entry_ad AFTER DELETE ON entry BEGIN
+    {_bump("old.kb_name", "entries", "''", -1)}
+    {_bump("old.kb_name", "type", "old.entry_type", -1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_entry_au
+AFTER UPDATE OF kb_name, entry_type ON entry
+WHEN old.kb_name IS NOT new.kb_name OR old.entry_type IS NOT new.entry_type
+BEGIN
+    {_bump("old.kb_name", "entries", "''", -1)}
+    {_bump("old.kb_name", "type", "old.entry_type", -1)}
+    {_bump("new.kb_name", "entries", "''", 1)}
+    {_bump("new.kb_name", "type", "new.entry_type", 1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_tag_ai AFTER INSERT ON entry_tag BEGIN
+    {_bump_tag("new.kb_name", "new.tag_id", 1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_tag_ad AFTER DELETE ON entry_tag BEGIN
+    {_bump_tag("old.kb_name", "old.tag_id", -1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_link_ai AFTER INSERT ON link BEGIN
+    {_bump("new.source_kb", "links", "''", 1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_link_ad AFTER DELETE ON link BEGIN
+    {_bump("old.source_kb", "links", "''", -1)}
+END;
+
+CREATE TRIGGER IF NOT EXISTS kb_stat_kb_ad AFTER DELETE ON kb BEGIN
+    DELETE FROM kb_stat WHERE kb_name = old.name;
+END;
+"""
+
+# Fresh aggregates, one SELECT per kind, each yielding (kb_name, key, count).
+_AGGREGATES = {
+    "entries": "SELECT kb_name, '', COUNT(*) FROM entry {where} GROUP BY kb_name",
+    "type": "SELECT kb_name, entry_type, COUNT(*) FROM entry {where} GROUP BY kb_name, entry_type",
+    "tag": """SELECT et.kb_name, t.name, COUNT(*) FROM entry_tag et
+              JOIN tag t ON t.id = et.tag_id {where} GROUP BY et.kb_name, t.name""",
+    "links": "SELECT source_kb, '', COUNT(*) FROM link {where} GROUP BY source_kb",
+}
+_KB_COLUMN = {"entries": "kb_name", "type": "kb_name", "tag": "et.kb_name", "links": "source_kb"}
+
+
+def create_kb_stats(connection: sqlite3.Connection) -> None:
+    """Create ``kb_stat`` and its maintenance triggers."""
+    connection.executescript(KB_STATS_SCHEMA_SQL)
+
+
+def _fresh_counts(
+    connection: sqlite3.Connection, kb_name: str | None
+) -> dict[tuple[str, str, str], int]:
+    counts = {}
+    for kind, sql in _AGGREGATES.items():
+        where = f"WHERE {_KB_COLUMN[kind]} = ?" if kb_name else ""
+        rows = connection.execute(sql.format(where=where), (kb_name,) if kb_name else ())
+        for kb, key, count in rows:
+            counts[(kb, kind, key)] = count
+    return counts
+
+
+def _stored_counts(
+    connection: sqlite3.Connection, kb_name: str | None
+) -> dict[tuple[str, str, str], int]:
+    sql = "SELECT kb_name, kind, key, count FROM kb_stat WHERE count != 0"
+    params: tuple = ()
+    if kb_name:
+        sql += " AND kb_name = ?"
+        params = (kb_name,)
+    return {(r[0], r[1], r[2]): r[3] for r in connection.execute(sql, params)}
+
+
+def rebuild_kb_stats(connection: sqlite3.Connection, kb_name: str | None = None) -> int:
+    """Recompute the counters for one KB (or all); returns rows written."""
+    if kb_name:
+        connection.execute("DELETE FROM kb_stat WHERE kb_name = ?", (kb_name,))
+    else:
+        connection.execute("DELETE FROM kb_stat")
+    counts = _fresh_counts(connection, kb_name)
+    connection.executemany(
+        "INSERT INTO kb_stat (kb_name, kind, key, count) VALUES (?, ?, ?, ?)",
+        [(kb, kind, key, count) for (kb, kind, key), count in counts.items()],
+    )
+    connection.commit()
+    return len(counts)
+
+
+def check_kb_stats(
+    connection: sqlite3.Connection, kb_name: str | None = None
+) -> list[dict[str, Any]]:
+    """Counters that differ from a fresh aggregate (empty when consistent)."""
+    fresh = _fresh_counts(connection, kb_name)
+    stored = _stored_counts(connection, kb_name)
+    return [
+        {
+            "kb_name": key[0],
+            "kind": key[1],
+            "key": key[2],
+            "stored": stored.get(key, 0),
+            "actual": fresh.get(key, 0),
+        }
+        for key in sorted(fresh.keys() | stored.keys())
+        if stored.get(key, 0) != fresh.get(key, 0)
+    ]
+
+
+def kb_summary(connection: sqlite3.Connection, kb_name: str, tag_limit: int = 10) -> dict[str, Any]:
+    """Entry total, per-type counts, top tags and link total for one KB."""
+    total = links = 0
+    types = []
+    for kind, key, count in connection.execute(
+        "SELECT kind, key, count FROM kb_stat "
+        "WHERE kb_name = ? AND kind IN ('entries', 'type', 'links') AND count > 0",
+        (kb_name,),
+    ):
+        if kind == "entries":
+            total = count
+        elif kind == "links":
+            links = count
+        else:
+            types.append({"type": key, "count": count})
+    types.sort(key=lambda t: (-t["count"], t["type"]))
+    top_tags = [
+        {"name": r[0], "count": r[1]}
+        for r in connection.execute(
+            "SELECT key, count FROM kb_stat WHERE kb_name = ? AND kind = 'tag' AND count > 0 "
+            "ORDER BY count DESC, key LIMIT ?",
+            (kb_name, tag_limit),
+        )
+    ]
+    return {"total_entries": total, "types": types, "top_tags": top_tags, "total_links": links}
+
+
+def global_summary(connection: sqlite3.Connection) -> dict[str, Any]:
+    """Entry totals per KB, type counts across KBs and the link total."""
+    per_kb: dict[str, int] = {}
+    type_counts: dict[str, int] = {}
+    links = 0
+    for kb, kind, key, count in connection.execute(
+        "SELECT kb_name, kind, key, count FROM kb_stat "
+        "WHERE kind IN ('entries', 'type', 'links') AND count > 0"
+    ):
+        if kind == "entries":
+            per_kb[kb] = count
+        elif kind == "links":
+            links += count
+        else:
+            type_counts[key] = type_counts.get(key, 0) + count
+    return {
+        "entries": per_kb,
+        "type_counts": [
+            {"entry_type": t, "count": c}
+            for t, c in sorted(type_counts.items(), key=lambda x: -x[1])
+        ],
+        "total_links": links,
+    }
@@ -16,7 +16,7 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 # Current schema version
-CURRENT_VERSION = 20
+CURRENT_VERSION = 27
 
 
 @dataclass
@@ -429,6 +429,88 @@ MIGRATIONS: list[Migration] = [
         -- SQLite < 3.35 does not support DROP COLUMN; columns remain but are unused.
         """,
     ),
+    Migration(
+        version=21,
+        description="Add related_entry index with related_term and related_dirty tables",
+        # Tables are created and seeded from existing entries in _apply_v21().
+        up="",
+        down="""
+        DROP TABLE IF EXISTS related_dirty;
+        DROP TABLE IF EXISTS related_entry;
+        DROP TABLE IF EXISTS related_term;
+        """,
+    ),
+    Migration(
+        version=22,
+        description="Rebuild entry_fts with prefix indexes",
+        # entry_fts is recreated and reindexed from entry in _apply_v22().
+        up="",
+        down="""
+        -- entry_fts keeps its prefix indexes; they are harmless to older code.
+        """,
+    ),
+    Migration(
+        version=23,
+        description="Only re-tokenize FTS rows when indexed text columns change",
+        # Update triggers are dropped and recreated in _apply_v23().
+        up="",
+        down="""
+        -- The restricted update triggers stay; they index the same content.
+        """,
+    ),
+    Migration(
+        version=24,
+        description="Add entry_tombstone table for worktree overlay deletions",
+        up="""
+        CREATE TABLE IF NOT EXISTS entry_tombstone (
+            entry_id TEXT NOT NULL,
+            kb_name TEXT NOT NULL,
+            deleted_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (entry_id, kb_name)
+        );
+        """,
+        down="""
+        DROP TABLE IF EXISTS entry_tombstone;
+        """,
+    ),
+    Migration(
+        version=25,
+        description="Add trigger-maintained kb_stat counters for orientation and stats",
+        # Table and triggers are created and seeded in _apply_v25().
+        up="",
+        down="""
+        DROP TRIGGER IF EXISTS kb_stat_entry_ai;
+        DROP TRIGGER IF EXISTS kb_stat_entry_ad;
+        DROP TRIGGER IF EXISTS kb_stat_entry_au;
+        DROP TRIGGER IF EXISTS kb_stat_tag_ai;
+        DROP TRIGGER IF EXISTS kb_stat_tag_ad;
+        DROP TRIGGER IF EXISTS kb_stat_link_ai;
+        DROP TRIGGER IF EXISTS kb_stat_link_ad;
+        DROP TRIGGER IF EXISTS kb_stat_kb_ad;
+        DROP INDEX IF EXISTS idx_entry_kb_updated;
+        DROP TABLE IF EXISTS kb_stat;
+        """,
+    ),
+    Migration(
+        version=26,
+        description="Add embedding model versions and per-KB active/building versions",
+        # Tables are created and existing KBs pinned to vec_entry in _apply_v26().
+        up="",
+        down="""
+        DROP TRIGGER IF EXISTS kb_embedding_kb_ad;
+        DROP TABLE IF EXISTS kb_embedding;
+        DROP TABLE IF EXISTS embedding_model;
+        """,
+    ),
+    Migration(
+        version=27,
+        description="Add quantization mode to embedding model versions",
+        # Column added conditionally in _apply_v27(); new registries already have it.
+        up="",
+        down="""
+        -- SQLite < 3.35 does not support DROP COLUMN; quantization stays but is unused.
+        """,
+    ),
 ]
 
 
@@ -658,6 +740,122 @@ class MigrationManager:
         self.conn.execute("CREATE INDEX IF NOT EXISTS idx_entry_state ON entry(state)")
         self.conn.commit()
 
+    def _apply_v21(self) -> None:
+        """Create the related-entries tables and queue existing entries for scoring."""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS related_term (
+                entry_id TEXT NOT NULL,
+                kb_name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (entry_id, kb_name, kind, value),
+                FOREIGN KEY (entry_id, kb_name) REFERENCES entry(id, kb_name) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS idx_related_term_value ON related_term(kb_name, kind, value);
+            CREATE TABLE IF NOT EXISTS related_entry (
+                entry_id TEXT NOT NULL,
+                kb_name TEXT NOT NULL,
+                related_id TEXT NOT NULL,
+                score REAL NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (entry_id, kb_name, related_id),
+                FOREIGN KEY (entry_id, kb_name) REFERENCES entry(id, kb_name) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS idx_related_entry_related ON related_entry(kb_name, related_id);
+            CREATE TABLE IF NOT EXISTS related_dirty (
+                entry_id TEXT NOT NULL,
+                kb_name TEXT NOT NULL,
+                PRIMARY KEY (entry_id, kb_name)
+            );
+        """)
+        table_exists = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='entry'"
+        ).fetchone()
+        if not table_exists:
+            return
+        # Existing entries only get terms on their next upsert, so seed them here.
+        self.conn.execute("""
+            INSERT OR IGNORE INTO related_term (entry_id, kb_name, kind, value)
+            SELECT et.entry_id, et.kb_name, 'tag', t.name
+            FROM entry_tag et JOIN tag t ON t.id = et.tag_id
+        """)
+        self.conn.execute("""
+            INSERT OR IGNORE INTO related_term (entry_id, kb_name, kind, value)
+            SELECT e.id, e.kb_name, 'actor', CAST(a.value AS TEXT)
+            FROM entry e, json_each(
+                CASE
+                    WHEN NOT json_valid(e.metadata) THEN '[]'
+                    WHEN json_array_length(e.metadata, '$.actors') > 0
+                        THEN json_extract(e.metadata, '$.actors')
+                    WHEN json_type(e.metadata, '$.participants') = 'array'
+                        THEN json_extract(e.metadata, '$.participants')
+                    ELSE '[]'
+                END
+            ) a
+            WHERE a.value IS NOT NULL AND a.value != ''
+        """)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO related_dirty (entry_id, kb_name) SELECT id, kb_name FROM entry"
+        )
+        self.conn.commit()
+
+    def _apply_v22(self) -> None:
+        """Rebuild entry_fts in place so existing indexes get prefix indexes."""
+        from .virtual_tables import FTS_CONFIG_KEY, FtsConfig, rebuild_fts
+
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='entry_fts'"
+        ).fetchone()
+        if not row or "prefix=" in row[0]:
+            return
+        config = FtsConfig()
+        if self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='setting'"
+        ).fetchone():
+            stored = self.conn.execute(
+                "SELECT value FROM setting WHERE key = ?", (FTS_CONFIG_KEY,)
+            ).fetchone()
+            config = FtsConfig.from_json(stored[0] if stored else None)
+        rebuild_fts(self.conn, config)
+
+    def _apply_v23(self) -> None:
+        """Recreate the FTS update triggers restricted to indexed text columns."""
+        from .virtual_tables import refresh_fts_update_triggers
+
+        refresh_fts_update_triggers(self.conn)
+
+    def _apply_v25(self) -> None:
+        """Create kb_stat with its triggers and seed it from existing rows."""
+        from .kb_stats import create_kb_stats, rebuild_kb_stats
+
+        tables = {
+            row[0]
+            for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name IN ('kb', 'entry', 'tag', 'entry_tag', 'link')"
+            )
+        }
+        if len(tables) < 5:
+            # Partial schemas (tests, very old files); the triggers need them all.
+            return
+        create_kb_stats(self.conn)
+        rebuild_kb_stats(self.conn)
+
+    def _apply_v26(self) -> None:
+        """Create the embedding version registry."""
+        from .embedding_versions import create_embedding_versions
+
+        create_embedding_versions(self.conn)
+
+    def _apply_v27(self) -> None:
+        """Add embedding_model.quantization to registries created before it existed."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(embedding_model)")}
+        if columns and "quantization" not in columns:
+            self.conn.execute(
+                "ALTER TABLE embedding_model ADD COLUMN quantization TEXT NOT NULL DEFAULT 'none'"
+            )
+            self.conn.commit()
+
     def rollback(self, target_version: int = 0) -> list[Migration]:
         """
         Rollback migrations down to target_version.
@@ -7,6 +7,7 @@ are handled separately in virtual_tables.py since they have no ORM equivalent.
 
 from sqlalchemy import (
     Column,
+    Float,
     ForeignKey,
     ForeignKeyConstraint,
     Index,
@@ -437,6 +438,61 @@ class Block(Base):
     )
 
 
+# =========================================================================
+# Related entries index
+# =========================================================================
+
+
+class RelatedTerm(Base):
+    """Scoring terms (tags, actors) an entry shares with related entries."""
+
+    __tablename__ = "related_term"
+
+    entry_id = Column(String, nullable=False, primary_key=True)
+    kb_name = Column(String, nullable=False, primary_key=True)
+    kind = Column(String, nullable=False, primary_key=True)  # 'tag' or 'actor'
+    value = Column(String, nullable=False, primary_key=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["entry_id", "kb_name"],
+            ["entry.id", "entry.kb_name"],
+            ondelete="CASCADE",
+        ),
+        Index("idx_related_term_value", "kb_name", "kind", "value"),
+    )
+
+
+class RelatedEntry(Base):
+    """Precomputed top related entries for an entry, highest score first."""
+
+    __tablename__ = "related_entry"
+
+    entry_id = Column(String, nullable=False, primary_key=True)
+    kb_name = Column(String, nullable=False, primary_key=True)
+    related_id = Column(String, nullable=False, primary_key=True)
+    score = Column(Float, nullable=False)
+    rank = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["entry_id", "kb_name"],
+            ["entry.id", "entry.kb_name"],
+            ondelete="CASCADE",
+        ),
+        Index("idx_related_entry_related", "kb_name", "related_id"),
+    )
+
+
+class RelatedDirty(Base):
+    """Entries whose related_entry rows (and their neighbours') need recomputing."""
+
+    __tablename__ = "related_dirty"
+
+    entry_id = Column(String, nullable=False, primary_key=True)
+    kb_name = Column(String, nullable=False, primary_key=True)
+
+
 # =========================================================================
 # Settings
 # =========================================================================
@@ -469,6 +525,25 @@ class Review(Base):
     entry = relationship("Entry", back_populates="reviews")
 
 
+# =========================================================================
+# Overlay tombstones
+# =========================================================================
+
+
+class EntryTombstone(Base):
+    """Main-index entry a worktree has deleted; kept in the user's diff index.
+
+    The overlay hides tombstoned entries from main until the deletion is
+    merged and the main index drops them.
+    """
+
+    __tablename__ = "entry_tombstone"
+
+    entry_id = Column(String, nullable=False, primary_key=True)
+    kb_name = Column(String, nullable=False, primary_key=True)
+    deleted_at = Column(String, server_default="CURRENT_TIMESTAMP")
+
+
 # =========================================================================
 # Settings
 # =========================================================================
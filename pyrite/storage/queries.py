@@ -50,6 +50,20 @@ class QueryMixin:
             state=state,
         )
 
+    def search_substring(
+        self, text: str, kb_name: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Find entries containing ``text`` as a substring (trigram index when enabled)."""
+        return self._backend.search_substring(text, kb_name=kb_name, limit=limit)
+
+    def get_fts_config(self) -> Any:
+        """Get the stored FTS ranking/index options."""
+        return self._backend.get_fts_config()
+
+    def configure_fts(self, config: Any) -> bool:
+        """Store FTS ranking/index options; rebuilds entry_fts if prefix or trigram changed."""
+        return self._backend.configure_fts(config)
+
     def search_by_tag(
         self, tag: str, kb_name: str | None = None, limit: int = 50
     ) -> list[dict[str, Any]]:
@@ -133,6 +147,42 @@ class QueryMixin:
             limit=limit,
         )
 
+    def get_link_graph(self, kb_name: str | None = None, include_refs: bool = False) -> Any:
+        """Get the cached CSR link graph for a KB (or all KBs), or None if too large."""
+        return self._backend.get_link_graph(kb_name=kb_name, include_refs=include_refs)
+
+    # =========================================================================
+    # Related entries index
+    # =========================================================================
+
+    def get_related_entries(
+        self, entry_id: str, kb_name: str, limit: int = 5
+    ) -> list[dict[str, Any]]:
+        """Get precomputed related entries (shared actors/tags), best first."""
+        return self._backend.get_related_entries(entry_id, kb_name, limit=limit)
+
+    def get_all_related_for_kb(
+        self, kb_name: str, limit: int = 5
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get precomputed related entries for every entry in a KB, keyed by entry_id."""
+        return self._backend.get_all_related_for_kb(kb_name, limit=limit)
+
+    def refresh_related_entries(self, kb_name: str | None = None) -> int:
+        """Rescore entries queued since the last refresh."""
+        return self._backend.refresh_related_entries(kb_name)
+
+    def deferred_related_refresh(self, kb_name: str | None = None):
+        """Context manager: rescore related entries once after a block of writes."""
+        return self._backend.deferred_related_refresh(kb_name)
+
+    def rebuild_related_entries(self, kb_name: str | None = None) -> int:
+        """Rescore every entry in a KB (or all KBs)."""
+        return self._backend.rebuild_related_entries(kb_name)
+
+    def configure_related_scoring(self, scoring: Any) -> bool:
+        """Store the related-entries scoring config; rescoring is queued if it changed."""
+        return self._backend.configure_related_scoring(scoring)
+
     # =========================================================================
     # Edge endpoint queries
     # =========================================================================
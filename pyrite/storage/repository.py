@@ -51,7 +51,7 @@ class KBRepository:
         try:
             # Read frontmatter to determine type
             text = file_path.read_text(encoding="utf-8")
-            from pyrite.utils.yaml import load_yaml
+            from pyrite.utils.yaml import load_yaml_fast
 
             if text.startswith("---\n") or text.startswith("---\r\n"):
                 # Find the closing `---` delimiter at the start of a line.
@@ -69,7 +69,7 @@ class KBRepository:
                         break
                     search_start = hit + 1
                 if end > 0:
-                    fm = load_yaml(text[3:end])
+                    fm = load_yaml_fast(text[3:end])
                     if fm and isinstance(fm, dict):
                         body = text[end + 3 :].strip()
                         # Defensive: strip duplicated frontmatter fields from body start
@@ -223,7 +223,8 @@ class KBRepository:
         # Fallback: scan frontmatter IDs (handles filename != entry ID)
         # This is slower but catches entries like ADRs where the file is
         # "0025-release-workflow.md" but the ID is "adr-0025"
-        from pyrite.utils.yaml import load_yaml
+        from pyrite.utils.yaml import load_yaml_fast
+
         for md_file in self.path.rglob("*.md"):
             if any(part.startswith(".") or part.startswith("_") for part in md_file.relative_to(self.path).parts):
                 continue
@@ -232,7 +233,7 @@ class KBRepository:
                 if text.startswith("---"):
                     end = text.find("---", 3)
                     if end > 0:
-                        fm = load_yaml(text[3:end])
+                        fm = load_yaml_fast(text[3:end])
                         if isinstance(fm, dict) and fm.get("id") == entry_id:
                             return md_file
             except Exception:
@@ -6,7 +6,100 @@ In a future Postgres migration, this module gets a counterpart using
 tsvector + pgvector.
 """
 
-FTS_SCHEMA_SQL = """
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# ``setting`` key holding the deployment's FtsConfig as JSON.
+FTS_CONFIG_KEY = "fts.config"
+
+FTS_COLUMNS = ("id", "kb_name", "entry_type", "title", "body", "summary", "location")
+
+
+@dataclass(frozen=True)
+class FtsConfig:
+    """Ranking weights and index options for ``entry_fts``.
+
+    The weights are passed to ``bm25()`` per column at query time, so a title
+    hit outranks the same term deep in a long body.  ``prefix`` lists the
+    prefix lengths FTS5 keeps dedicated indexes for (``term*`` queries of
+    those lengths skip the full term scan), and ``trigram`` adds the
+    ``entry_trigram`` companion index for substring matching.  Changing
+    ``prefix`` or ``trigram`` requires rebuilding the index (``rebuild_fts``).
+    """
+
+    title_weight: float = 10.0
+    summary_weight: float = 5.0
+    body_weight: float = 1.0
+    location_weight: float = 1.0
+    prefix: tuple[int, ...] = (2, 3)
+    trigram: bool = False
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> FtsConfig:
+        """Build from ``Settings.fts_*`` fields."""
+        return cls(
+            title_weight=settings.fts_title_weight,
+            summary_weight=settings.fts_summary_weight,
+            body_weight=settings.fts_body_weight,
+            location_weight=settings.fts_location_weight,
+            prefix=tuple(settings.fts_prefix_lengths),
+            trigram=settings.fts_trigram,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> FtsConfig:
+        """Parse a stored config, falling back to defaults."""
+        if not raw:
+            return cls()
+        try:
+            data = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return cls()
+        fields = cls.__dataclass_fields__
+        data = {k: v for k, v in data.items() if k in fields}
+        if "prefix" in data:
+            data["prefix"] = tuple(data["prefix"])
+        return cls(**data)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    def bm25_weights(self) -> tuple[float, ...]:
+        """Weights in ``FTS_COLUMNS`` order; id, kb_name and entry_type keep 1.0."""
+        return (
+            1.0,
+            1.0,
+            1.0,
+            float(self.title_weight),
+            float(self.body_weight),
+            float(self.summary_weight),
+            float(self.location_weight),
+        )
+
+    def same_structure(self, other: FtsConfig) -> bool:
+        """Whether both configs build the same index (weights aside)."""
+        return tuple(self.prefix) == tuple(other.prefix) and self.trigram == other.trigram
+
+
+TRIGRAM_COLUMNS = ("title", "summary", "body")
+
+
+def _changed(columns: tuple[str, ...]) -> str:
+    """Trigger WHEN clause: true if any of ``columns`` differs between old and new.
+
+    The update triggers only re-tokenize a row when indexed text actually
+    changes, so status/assignee/indexed_at updates skip the FTS work.
+    """
+    return " OR ".join(f"old.{c} IS NOT new.{c}" for c in columns)
+
+
+def fts_schema_sql(prefix: tuple[int, ...] = FtsConfig.prefix) -> str:
+    """DDL for ``entry_fts`` and its sync triggers with the given prefix indexes."""
+    prefix_opt = f"    prefix='{' '.join(str(int(n)) for n in prefix)}',\n" if prefix else ""
+    return f"""
 -- Full-text search index
 CREATE VIRTUAL TABLE IF NOT EXISTS entry_fts USING fts5(
     id,
@@ -18,7 +111,7 @@ CREATE VIRTUAL TABLE IF NOT EXISTS entry_fts USING fts5(
     location,
     content='entry',
     content_rowid='rowid',
-    tokenize='porter unicode61'
+{prefix_opt}    tokenize='porter unicode61'
 );
 
 -- FTS triggers for automatic sync
@@ -34,7 +127,10 @@ CREATE TRIGGER IF NOT EXISTS entry_ad AFTER DELETE ON entry BEGIN
            COALESCE(old.body, ''), COALESCE(old.summary, ''), COALESCE(old.location, ''));
 END;
 
-CREATE TRIGGER IF NOT EXISTS entry_au AFTER UPDATE ON entry BEGIN
+CREATE TRIGGER IF NOT EXISTS entry_au
+AFTER UPDATE OF {", ".join(FTS_COLUMNS)} ON entry
+WHEN {_changed(FTS_COLUMNS)}
+BEGIN
     INSERT INTO entry_fts(entry_fts, rowid, id, kb_name, entry_type, title, body, summary, location)
     VALUES('delete', old.rowid, old.id, old.kb_name, old.entry_type, old.title,
            COALESCE(old.body, ''), COALESCE(old.summary, ''), COALESCE(old.location, ''));
@@ -44,7 +140,56 @@ CREATE TRIGGER IF NOT EXISTS entry_au AFTER UPDATE ON entry BEGIN
 END;
 """
 
-VEC_SCHEMA_SQL = "CREATE VIRTUAL TABLE IF NOT EXISTS vec_entry USING vec0(embedding float[384])"
+
+FTS_SCHEMA_SQL = fts_schema_sql()
+
+# Substring companion index: trigram tokens over the text columns.
+TRIGRAM_SCHEMA_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS entry_trigram USING fts5(
+    title,
+    summary,
+    body,
+    content='entry',
+    content_rowid='rowid',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS entry_trigram_ai AFTER INSERT ON entry BEGIN
+    INSERT INTO entry_trigram(rowid, title, summary, body)
+    VALUES (new.rowid, new.title, COALESCE(new.summary, ''), COALESCE(new.body, ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS entry_trigram_ad AFTER DELETE ON entry BEGIN
+    INSERT INTO entry_trigram(entry_trigram, rowid, title, summary, body)
+    VALUES ('delete', old.rowid, old.title, COALESCE(old.summary, ''), COALESCE(old.body, ''));
+END;
+
+CREATE TRIGGER IF NOT EXISTS entry_trigram_au
+AFTER UPDATE OF {", ".join(TRIGRAM_COLUMNS)} ON entry
+WHEN {_changed(TRIGRAM_COLUMNS)}
+BEGIN
+    INSERT INTO entry_trigram(entry_trigram, rowid, title, summary, body)
+    VALUES ('delete', old.rowid, old.title, COALESCE(old.summary, ''), COALESCE(old.body, ''));
+    INSERT INTO entry_trigram(rowid, title, summary, body)
+    VALUES (new.rowid, new.title, COALESCE(new.summary, ''), COALESCE(new.body, ''));
+END;
+"""
+
+
+VEC_ELEMENT_TYPES = ("float", "int8", "bit")
+
+
+def vec_schema_sql(table: str = "vec_entry", dimensions: int = 384, element: str = "float") -> str:
+    """DDL for a sqlite-vec table of ``dimensions``-wide float32, int8 or bit vectors."""
+    if element not in VEC_ELEMENT_TYPES:
+        raise ValueError(f"Unknown vector element type: {element!r}")
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} "
+        f"USING vec0(embedding {element}[{int(dimensions)}])"
+    )
+
+
+VEC_SCHEMA_SQL = vec_schema_sql()
 
 
 def create_fts_tables(connection) -> None:
@@ -53,11 +198,58 @@ def create_fts_tables(connection) -> None:
     connection.commit()
 
 
-def create_vec_table(connection) -> None:
-    """Create sqlite-vec virtual table on a raw sqlite3 connection."""
+def create_vec_table(
+    connection, table: str = "vec_entry", dimensions: int = 384, element: str = "float"
+) -> None:
+    """Create a sqlite-vec virtual table on a raw sqlite3 connection."""
     existing = connection.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='vec_entry'"
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,)
     ).fetchone()
     if not existing:
-        connection.execute(VEC_SCHEMA_SQL)
+        connection.execute(vec_schema_sql(table, dimensions, element))
         connection.commit()
+
+
+def refresh_fts_update_triggers(connection) -> None:
+    """Replace the FTS update triggers with the current definitions.
+
+    ``CREATE TRIGGER IF NOT EXISTS`` leaves triggers from older schemas in
+    place, so trigger changes need an explicit drop and recreate.
+    """
+    tables = {
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('entry_fts', 'entry_trigram')"
+        )
+    }
+    if "entry_fts" in tables:
+        connection.execute("DROP TRIGGER IF EXISTS entry_au")
+        connection.executescript(FTS_SCHEMA_SQL)
+    if "entry_trigram" in tables:
+        connection.execute("DROP TRIGGER IF EXISTS entry_trigram_au")
+        connection.executescript(TRIGRAM_SCHEMA_SQL)
+    connection.commit()
+
+
+def rebuild_fts(connection, config: FtsConfig) -> None:
+    """Recreate ``entry_fts`` (and ``entry_trigram``) for ``config`` and reindex in place.
+
+    Both are external-content tables over ``entry``, so the rebuild re-reads
+    the entry rows without touching them.
+    """
+    connection.executescript("""
+        DROP TRIGGER IF EXISTS entry_ai;
+        DROP TRIGGER IF EXISTS entry_ad;
+        DROP TRIGGER IF EXISTS entry_au;
+        DROP TABLE IF EXISTS entry_fts;
+        DROP TRIGGER IF EXISTS entry_trigram_ai;
+        DROP TRIGGER IF EXISTS entry_trigram_ad;
+        DROP TRIGGER IF EXISTS entry_trigram_au;
+        DROP TABLE IF EXISTS entry_trigram;
+    """)
+    connection.executescript(fts_schema_sql(config.prefix))
+    connection.execute("INSERT INTO entry_fts(entry_fts) VALUES ('rebuild')")
+    if config.trigram:
+        connection.executescript(TRIGRAM_SCHEMA_SQL)
+        connection.execute("INSERT INTO entry_trigram(entry_trigram) VALUES ('rebuild')")
+    connection.commit()
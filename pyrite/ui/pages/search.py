@@ -26,7 +26,7 @@ with st.form("search_form"):
     with col3:
         search_mode = st.radio(
             "Mode",
-            ["keyword", "semantic", "hybrid"],
+            ["keyword", "semantic", "hybrid", "substring"],
             index=0,
             horizontal=True,
         )
@@ -4,6 +4,14 @@ Markdown Block Extraction
 Parses markdown text into discrete blocks (headings, paragraphs, lists, code)
 for block-level referencing. Each block gets an auto-generated ID from a SHA-256
 hash of its content, unless an explicit ^block-id marker is present.
+
+Extraction is a single forward scan: every line is classified once by one
+combined regex (blank, fence, heading, list item, ^marker or text) and the
+scanner groups runs of classified lines into blocks without re-matching.
+Each block also carries a ``content_hash`` (the same SHA-256 that yields
+auto-generated IDs, so each block is hashed once), which lets the index
+diff an entry's blocks against the stored rows and leave unchanged blocks
+untouched.
 """
 
 import hashlib
@@ -12,10 +20,20 @@ import re
 # Matches explicit block ID markers like ^block-id at end of a block
 _BLOCK_ID_RE = re.compile(r"\s*\^([a-zA-Z0-9_-]+)\s*$")
 
+# One match per line; the first alternative that applies decides the kind.
+_LINE_RE = re.compile(
+    r"(?P<fence>\s*```)"
+    r"|(?P<heading>#{1,6})\s+(?P<title>.*)"
+    r"|(?P<list>\s*[-*+]|\s*\d+\.)\s+"
+    r"|\s*\^(?P<marker>[a-zA-Z0-9_-]+)\s*$"
+)
+
+_BLANK, _FENCE, _HEADING, _LIST, _MARKER, _TEXT = range(6)
+
 
-def _make_block_id(content: str) -> str:
-    """Generate a block ID from SHA-256 of content (first 8 hex chars)."""
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:8]
+def content_hash(content: str) -> str:
+    """SHA-256 of block content (first 16 hex chars); block IDs use its first 8."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
 
 def _extract_explicit_id(text: str) -> tuple[str, str | None]:
@@ -23,25 +41,38 @@ def _extract_explicit_id(text: str) -> tuple[str, str | None]:
 
     Returns (cleaned_text, block_id_or_None).
     """
-    lines = text.rstrip().split("\n")
-    if lines:
-        match = _BLOCK_ID_RE.match(lines[-1])
-        if match:
-            block_id = match.group(1)
-            cleaned = "\n".join(lines[:-1]).rstrip()
-            if not cleaned:
-                # The marker was the only content after the block content
-                # Check if there's content before the marker on the same line
-                cleaned = text.rstrip()
-                # Try inline: "some text ^block-id"
-                inline_match = re.match(r"^(.*?)\s+\^([a-zA-Z0-9_-]+)\s*$", cleaned)
-                if inline_match:
-                    return inline_match.group(1), inline_match.group(2)
-                return cleaned, None
-            return cleaned, block_id
+    head, _, last = text.rstrip().rpartition("\n")
+    match = _BLOCK_ID_RE.match(last)
+    if match:
+        cleaned = head.rstrip()
+        if not cleaned:
+            # The marker was the only content after the block content
+            # Check if there's content before the marker on the same line
+            cleaned = text.rstrip()
+            # Try inline: "some text ^block-id"
+            inline_match = re.match(r"^(.*?)\s+\^([a-zA-Z0-9_-]+)\s*$", cleaned)
+            if inline_match:
+                return inline_match.group(1), inline_match.group(2)
+            return cleaned, None
+        return cleaned, match.group(1)
     return text, None
 
 
+def _classify(line: str) -> tuple[int, re.Match | None]:
+    if not line.strip():
+        return _BLANK, None
+    m = _LINE_RE.match(line)
+    if m is None:
+        return _TEXT, None
+    if m.group("fence") is not None:
+        return _FENCE, m
+    if m.group("heading") is not None:
+        return _HEADING, m
+    if m.group("list") is not None:
+        return _LIST, m
+    return _MARKER, m
+
+
 def extract_blocks(markdown_text: str) -> list[dict[str, str | int | None]]:
     """Extract blocks from markdown text.
 
@@ -52,60 +83,50 @@ def extract_blocks(markdown_text: str) -> list[dict[str, str | int | None]]:
         - content: the block text
         - position: 0-based index of block in document
         - block_type: one of heading, paragraph, list, code
+        - content_hash: ``content_hash`` of the content
     """
     if not markdown_text or not markdown_text.strip():
         return []
 
     lines = markdown_text.split("\n")
+    kinds = [_classify(line) for line in lines]
+    n = len(lines)
     blocks: list[dict[str, str | int | None]] = []
     current_heading: str | None = None
-    position = 0
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    def marker_at(idx: int) -> str | None:
+        """The ^block-id on line ``idx`` when that line is a standalone marker."""
+        if idx < n and kinds[idx][0] == _MARKER:
+            return kinds[idx][1].group("marker")
+        return None
 
-        # Skip blank lines
-        if not line.strip():
+    i = 0
+    while i < n:
+        kind, match = kinds[i]
+        if kind == _BLANK:
             i += 1
             continue
 
-        # Fenced code block
-        if line.strip().startswith("```"):
-            code_lines = [line]
+        start = i
+        if kind == _FENCE:
+            # Fenced code block, up to and including the closing fence
             i += 1
-            while i < len(lines):
-                code_lines.append(lines[i])
-                if lines[i].strip().startswith("```") and len(code_lines) > 1:
-                    i += 1
-                    break
+            while i < n:
                 i += 1
-            content = "\n".join(code_lines)
-            content, explicit_id = _check_next_line_marker(lines, i, content)
+                if kinds[i - 1][0] == _FENCE:
+                    break
+            block_type = "code"
+            content = "\n".join(lines[start:i])
+            explicit_id = marker_at(i)
             if explicit_id:
-                # Skip the marker line
                 i += 1
-            block_id = explicit_id or _make_block_id(content)
-            blocks.append(
-                {
-                    "block_id": block_id,
-                    "heading": current_heading,
-                    "content": content,
-                    "position": position,
-                    "block_type": "code",
-                }
-            )
-            position += 1
-            continue
 
-        # Heading
-        heading_match = re.match(r"^(#{1,6})\s+(.*)", line)
-        if heading_match:
+        elif kind == _HEADING:
+            block_type = "heading"
+            line = lines[i]
             content = line
-            content, explicit_id = _check_next_line_marker(lines, i + 1, content)
-            skip_extra = 1 if explicit_id else 0
-            block_id = explicit_id or _make_block_id(content)
-            current_heading = heading_match.group(2).strip()
+            explicit_id = marker_at(i + 1)
+            current_heading = match.group("title").strip()
             # Check for inline ^block-id
             inline_match = _BLOCK_ID_RE.search(current_heading)
             if inline_match:
@@ -113,107 +134,48 @@ def extract_blocks(markdown_text: str) -> list[dict[str, str | int | None]]:
                 if not explicit_id:
                     explicit_id = inline_match.group(1)
                     content = line[: line.rfind("^")].rstrip()
-                    block_id = explicit_id
-            blocks.append(
-                {
-                    "block_id": block_id,
-                    "heading": current_heading,
-                    "content": content,
-                    "position": position,
-                    "block_type": "heading",
-                }
-            )
-            position += 1
-            i += 1 + skip_extra
-            continue
+            i += 2 if marker_at(i + 1) else 1
 
-        # List (bulleted or numbered)
-        if re.match(r"^(\s*[-*+]|\s*\d+\.)\s+", line):
-            list_lines = [line]
+        elif kind == _LIST:
+            # List items, indented continuations and blank lines between items
+            block_type = "list"
             i += 1
-            while i < len(lines):
-                cur = lines[i]
-                # Continue list: list item or indented continuation or blank line between items
-                if re.match(r"^(\s*[-*+]|\s*\d+\.)\s+", cur):
-                    list_lines.append(cur)
-                    i += 1
-                elif (
-                    cur.strip() == ""
-                    and i + 1 < len(lines)
-                    and re.match(r"^(\s*[-*+]|\s*\d+\.)\s+", lines[i + 1])
+            while i < n:
+                cur_kind = kinds[i][0]
+                if (
+                    cur_kind == _LIST
+                    or (cur_kind == _BLANK and i + 1 < n and kinds[i + 1][0] == _LIST)
+                    or lines[i].startswith(("  ", "\t"))
                 ):
-                    list_lines.append(cur)
-                    i += 1
-                elif cur.startswith("  ") or cur.startswith("\t"):
-                    # Indented continuation
-                    list_lines.append(cur)
                     i += 1
                 else:
                     break
-            content = "\n".join(list_lines).rstrip()
-            content, explicit_id = _check_next_line_marker(lines, i, content)
+            content = "\n".join(lines[start:i]).rstrip()
+            explicit_id = marker_at(i)
             if explicit_id:
                 i += 1
-            # Also check last line of content for inline marker
-            if not explicit_id:
+            else:
                 content, explicit_id = _extract_explicit_id(content)
-            block_id = explicit_id or _make_block_id(content)
-            blocks.append(
-                {
-                    "block_id": block_id,
-                    "heading": current_heading,
-                    "content": content,
-                    "position": position,
-                    "block_type": "list",
-                }
-            )
-            position += 1
-            continue
 
-        # Paragraph (default): collect contiguous non-blank, non-special lines
-        para_lines = [line]
-        i += 1
-        while i < len(lines):
-            cur = lines[i]
-            if not cur.strip():
-                break
-            if cur.strip().startswith("```"):
-                break
-            if re.match(r"^#{1,6}\s+", cur):
-                break
-            if re.match(r"^(\s*[-*+]|\s*\d+\.)\s+", cur):
-                break
-            para_lines.append(cur)
+        else:
+            # Paragraph: contiguous text lines; a trailing ^marker line names it
+            block_type = "paragraph"
             i += 1
-        content = "\n".join(para_lines).rstrip()
-        content, explicit_id = _extract_explicit_id(content)
-        if not explicit_id:
-            content_stripped = content
-            content_stripped, explicit_id = _check_next_line_marker(lines, i, content_stripped)
-            if explicit_id:
-                content = content_stripped
+            while i < n and kinds[i][0] in (_TEXT, _MARKER):
                 i += 1
-        block_id = explicit_id or _make_block_id(content)
+            content = "\n".join(lines[start:i]).rstrip()
+            content, explicit_id = _extract_explicit_id(content)
+
+        digest = content_hash(content)
         blocks.append(
             {
-                "block_id": block_id,
+                "block_id": explicit_id or digest[:8],
                 "heading": current_heading,
                 "content": content,
-                "position": position,
-                "block_type": "paragraph",
+                "position": len(blocks),
+                "block_type": block_type,
+                "content_hash": digest,
             }
         )
-        position += 1
 
     return blocks
-
-
-def _check_next_line_marker(
-    lines: list[str], next_idx: int, content: str
-) -> tuple[str, str | None]:
-    """Check if the line at next_idx is a standalone ^block-id marker."""
-    if next_idx < len(lines):
-        match = _BLOCK_ID_RE.match(lines[next_idx])
-        if match and not lines[next_idx].strip().startswith("#"):
-            return content, match.group(1)
-    return content, None
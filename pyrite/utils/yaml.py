@@ -2,14 +2,88 @@
 
 Preserves comments, quoting style, and key ordering — producing minimal
 git diffs when only a single field changes.
+
+Read-only callers (indexing, ``find_file`` scans, QA, export) use
+``load_yaml_fast`` instead: a PyYAML safe loader on the libyaml C bindings
+when available, with YAML 1.2 scalar resolution so values match what the
+round-trip loader produces, but as plain dicts, lists and scalars.
 """
 
+import re
 from io import StringIO
 from pathlib import Path
 from typing import Any
 
+import yaml as pyyaml
 from ruamel.yaml import YAML
 
+_BaseSafeLoader = getattr(pyyaml, "CSafeLoader", pyyaml.SafeLoader)
+
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+_INT_TAG = "tag:yaml.org,2002:int"
+_FLOAT_TAG = "tag:yaml.org,2002:float"
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+class _FastLoader(_BaseSafeLoader):
+    """Safe loader resolving plain scalars like ruamel's YAML 1.2 loader.
+
+    PyYAML implements YAML 1.1, where ``yes``/``on`` are booleans, ``010`` is
+    octal and ``1:30`` is sexagesimal.  Those resolvers are replaced so the
+    fast path and ``load_yaml`` agree on frontmatter values.  Duplicate keys
+    are rejected, as they are by ruamel.
+    """
+
+    def construct_mapping(self, node: Any, deep: bool = False) -> dict[Any, Any]:
+        seen: set[tuple[str, str]] = set()
+        for key_node, _ in node.value:
+            if isinstance(key_node, pyyaml.ScalarNode) and key_node.tag != _MERGE_TAG:
+                key = (key_node.tag, key_node.value)
+                if key in seen:
+                    raise pyyaml.constructor.ConstructorError(
+                        "while constructing a mapping",
+                        node.start_mark,
+                        f"found duplicate key {key_node.value!r}",
+                        key_node.start_mark,
+                    )
+                seen.add(key)
+        return super().construct_mapping(node, deep=deep)
+
+
+_FastLoader.yaml_implicit_resolvers = {
+    first: [(tag, rx) for tag, rx in resolvers if tag not in (_BOOL_TAG, _INT_TAG, _FLOAT_TAG)]
+    for first, resolvers in _BaseSafeLoader.yaml_implicit_resolvers.items()
+}
+_FastLoader.add_implicit_resolver(
+    _BOOL_TAG, re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF")
+)
+_FastLoader.add_implicit_resolver(
+    _INT_TAG,
+    re.compile(r"^[-+]?(?:0b[01_]+|0o[0-7_]+|0x[0-9a-fA-F_]+|[0-9][0-9_]*)$"),
+    list("-+0123456789"),
+)
+_FastLoader.add_implicit_resolver(
+    _FLOAT_TAG,
+    re.compile(
+        r"^(?:[-+]?(?:[0-9][0-9_]*(?:\.[0-9_]*)?|\.[0-9_]+)(?:[eE][-+]?[0-9]+)?"
+        r"|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN))$"
+    ),
+    list("-+0123456789."),
+)
+
+
+def _construct_int(loader: Any, node: Any) -> int:
+    value = loader.construct_scalar(node).replace("_", "")
+    sign = -1 if value.startswith("-") else 1
+    digits = value.lstrip("+-")
+    for prefix, base in (("0b", 2), ("0o", 8), ("0x", 16)):
+        if digits.startswith(prefix):
+            return sign * int(digits[2:], base)
+    return sign * int(digits, 10)
+
+
+_FastLoader.add_constructor(_INT_TAG, _construct_int)
+
 
 def _get_yaml() -> YAML:
     """Get a configured YAML instance for round-trip processing."""
@@ -32,6 +106,17 @@ def load_yaml(text: str) -> dict[str, Any]:
     return result if result is not None else {}
 
 
+def load_yaml_fast(text: str) -> dict[str, Any]:
+    """Load YAML from a string for read-only use.
+
+    Several times faster than ``load_yaml``; returns plain Python objects
+    that cannot be round-tripped through ``dump_yaml`` with comments intact.
+    Returns an empty dict for blank / ``None`` input.
+    """
+    result = pyyaml.load(text, Loader=_FastLoader)  # noqa: S506 - safe loader subclass
+    return result if result is not None else {}
+
+
 def dump_yaml(data: Any) -> str:
     """Dump a mapping to a YAML string, preserving style.
 
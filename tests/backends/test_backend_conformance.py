@@ -122,6 +122,19 @@ class TestEntryLifecycle:
         assert result[0]["id"] == "e1"
         assert result[0]["file_path"] == "notes/e1.md"
 
+    def test_get_entry_headers(self, backend):
+        backend.upsert_entry(_make_entry("e1", tags=["alpha"]))
+        backend.upsert_entry(_make_entry("e2"))
+        assert backend.get_entry_headers([("e1", "test"), ("missing", "test")]) == [
+            {
+                "id": "e1",
+                "kb_name": "test",
+                "title": "Title e1",
+                "entry_type": "note",
+                "summary": "Summary of e1",
+            }
+        ]
+
     def test_entry_metadata(self, backend):
         backend.upsert_entry(_make_entry("e1", metadata={"custom_field": "value"}))
         entry = backend.get_entry("e1", "test")
@@ -273,6 +286,61 @@ class TestFullTextSearch:
         assert len(results) == 2
 
 
+class TestSubstringSearch:
+    def test_search_substring(self, backend):
+        backend.upsert_entry(_make_entry("e2", title="Unrelated", body="mid-word QUANTUMness"))
+        backend.upsert_entry(_make_entry("e1", title="Quantum computing"))
+        backend.upsert_entry(_make_entry("e3", title="Classical music"))
+        assert [r["id"] for r in backend.search_substring("quantum")] == ["e1", "e2"]
+        assert backend.search_substring("100%") == []
+
+    def test_fts_config_round_trip(self, backend):
+        from pyrite.storage.virtual_tables import FtsConfig
+
+        config = FtsConfig(title_weight=3.0)
+        assert backend.configure_fts(config) is True
+        assert backend.configure_fts(config) is False
+        assert backend.get_fts_config() == config
+
+
+class TestHybridSearch:
+    """Server-side RRF fusion, for backends that advertise ``supports_hybrid_search``."""
+
+    @pytest.fixture(autouse=True)
+    def _require_support(self, backend):
+        if not backend.supports_hybrid_search:
+            pytest.skip("backend fuses hybrid results in SearchService")
+
+    def test_keyword_only_without_embedding(self, backend):
+        backend.upsert_entry(_make_entry("e1", title="quantum computing", tags=["science"]))
+        backend.upsert_entry(_make_entry("e2", title="quantum music", tags=["music"]))
+        results = backend.search_hybrid("quantum", tags=["science"])
+        assert [r["id"] for r in results] == ["e1"]
+        assert "body" not in results[0]
+        assert results[0]["rrf_score"] > 0
+
+    def test_fuses_both_legs_with_filters(self, backend):
+        backend.upsert_entry(_make_entry("kw", title="quantum computing"))
+        backend.upsert_entry(_make_entry("both", title="quantum physics"))
+        backend.upsert_entry(_make_entry("vec", title="unrelated"))
+        backend.upsert_entry(_make_entry("other", entry_type="event", title="quantum event"))
+        near = [1.0] + [0.0] * 383
+        for entry_id in ("both", "vec", "other"):
+            backend.upsert_embedding(entry_id, "test", near)
+        results = backend.search_hybrid("quantum", embedding=near, entry_type="note")
+        ids = [r["id"] for r in results]
+        assert ids[0] == "both"
+        assert set(ids) == {"kw", "both", "vec"}
+
+    def test_pagination(self, backend):
+        for i in range(6):
+            backend.upsert_entry(_make_entry(f"e{i}", title=f"quantum topic {i}"))
+        page1 = backend.search_hybrid("quantum", limit=3, offset=0)
+        page2 = backend.search_hybrid("quantum", limit=3, offset=3)
+        assert len(page1) == len(page2) == 3
+        assert {r["id"] for r in page1}.isdisjoint(r["id"] for r in page2)
+
+
 # =========================================================================
 # Graph (links)
 # =========================================================================
@@ -425,3 +425,56 @@ class TestAIChat:
             if line.startswith("data: "):
                 events.append(json.loads(line[6:]))
         assert any(e["type"] == "done" for e in events)
+
+
+class TestAIChatRetrieval:
+    """Per-conversation retrieval cache and budgeted, streamed context."""
+
+    @staticmethod
+    def _chat(ai_env, content, **extra):
+        resp = ai_env["client"].post(
+            "/api/ai/chat",
+            json={"messages": [{"role": "user", "content": content}], "kb": "test-events", **extra},
+        )
+        return [json.loads(line[6:]) for line in resp.text.split("\n") if line.startswith("data: ")]
+
+    def test_retrieval_events_precede_tokens(self, ai_env):
+        _inject_llm(ai_env["app"], MockLLMService(stream_tokens=["A"]))
+        types = [e["type"] for e in self._chat(ai_env, "immigration policy")]
+        assert types.index("retrieval") < types.index("sources") < types.index("context")
+        assert types.index("context") < types.index("token")
+
+    def test_repeat_query_served_from_cache_until_reindex(self, ai_env):
+        _inject_llm(ai_env["app"], MockLLMService(stream_tokens=["A"]))
+        conv = {"conversation_id": "conv-cache"}
+        first = self._chat(ai_env, "Immigration policy", **conv)[0]
+        again = self._chat(ai_env, "  immigration   POLICY ", **conv)[0]
+        assert first["type"] == "retrieval" and not first["cached"]
+        assert again["cached"]
+        assert (
+            self._chat(ai_env, "immigration policy", conversation_id="other")[0]["cached"] is False
+        )
+
+        ai_env["db"].upsert_entry(
+            {
+                "id": "new-note",
+                "kb_name": "test-events",
+                "title": "Immigration brief",
+                "entry_type": "note",
+                "body": "More on immigration policy.",
+            }
+        )
+        assert self._chat(ai_env, "immigration policy", **conv)[0]["cached"] is False
+
+    def test_context_respects_token_budget(self):
+        from pyrite.services.chat_retrieval import Passage, build_context, estimate_tokens
+
+        passages = [
+            Passage(id=f"e{i}", kb_name="kb", title=f"T{i}", snippet="", text="word " * 2000)
+            for i in range(3)
+        ]
+        blocks = list(build_context(passages, budget_tokens=600))
+        assert len(blocks) == 3
+        assert estimate_tokens("".join(blocks)) <= 600
+        short = [Passage(id="s", kb_name="kb", title="S", snippet="", text="brief")]
+        assert list(build_context(short + passages, 600))[0].endswith("brief\n")
@@ -149,6 +149,15 @@ class TestMarkdownBlockExtraction:
         assert blocks[0]["block_type"] == "paragraph"
         assert "Line one\nLine two\nLine three" == blocks[0]["content"]
 
+    def test_content_hash_stable_and_matches_auto_id(self):
+        """Each block carries a content hash; auto IDs are its prefix."""
+        md = "# Title\n\nSome text.\n^named"
+        first, second = extract_blocks(md)
+        assert first["content_hash"] == extract_blocks("# Title")[0]["content_hash"]
+        assert first["block_id"] == first["content_hash"][:8]
+        assert second["block_id"] == "named"
+        assert len(second["content_hash"]) == 16
+
 
 # =========================================================================
 # Migration Tests
@@ -381,3 +390,29 @@ class TestBlockCRUD:
             "SELECT COUNT(*) FROM block WHERE entry_id = 'b4' AND kb_name = 'test'"
         ).fetchone()
         assert rows[0] == 0
+
+    def test_re_upsert_diffs_blocks_by_hash(self, db):
+        """Unchanged blocks keep their rows; only moved positions are rewritten."""
+        body_v1 = "# Intro\n\nKept paragraph.\n\nOld paragraph."
+        body_v2 = "New lead.\n\n# Intro\n\nKept paragraph."
+        db.upsert_entry(_make_entry("b5", body=body_v1, _blocks=extract_blocks(body_v1)))
+
+        def rows():
+            return {
+                r[1]: (r[0], r[2])
+                for r in db._raw_conn.execute(
+                    "SELECT id, content, position FROM block WHERE entry_id = 'b5'"
+                )
+            }
+
+        before = rows()
+        db.upsert_entry(
+            _make_entry("b5", body=body_v1, title="Retitled", _blocks=extract_blocks(body_v1))
+        )
+        assert rows() == before
+
+        db.upsert_entry(_make_entry("b5", body=body_v2, _blocks=extract_blocks(body_v2)))
+        after = rows()
+        assert set(after) == {"New lead.", "# Intro", "Kept paragraph."}
+        assert after["# Intro"] == (before["# Intro"][0], 1)
+        assert after["Kept paragraph."] == (before["Kept paragraph."][0], 2)
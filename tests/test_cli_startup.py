@@ -0,0 +1,79 @@
+"""Tests for CLI cold-start: lazy command loading and skipped schema setup."""
+
+import subprocess
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+from pyrite.storage import connection
+from pyrite.storage.database import PyriteDB
+
+
+def _modules_after_import(module: str) -> set[str]:
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+
+class TestLazyCommands:
+    @pytest.mark.parametrize("module", ["pyrite.cli", "pyrite.read_cli"])
+    def test_import_does_not_load_storage(self, module):
+        loaded = _modules_after_import(module)
+        assert "sqlalchemy" not in loaded
+        assert "pyrite.cli.kb_commands" not in loaded
+
+    def test_help_lists_lazy_and_plugin_commands(self):
+        from pyrite.cli import app
+
+        result = CliRunner().invoke(app, ["--help"])
+        assert result.exit_code == 0
+        for name in ("search", "kb", "list-entries", "backlinks", "task", "init"):
+            assert name in result.output
+
+    def test_repo_includes_legacy_commands(self):
+        from pyrite.cli import app
+
+        result = CliRunner().invoke(app, ["repo", "--help"])
+        assert result.exit_code == 0
+        assert "subscribe" in result.output
+        assert "remove" in result.output
+
+    def test_unknown_command(self):
+        from pyrite.cli import app
+
+        result = CliRunner().invoke(app, ["no-such-command"])
+        assert result.exit_code != 0
+
+
+class TestSchemaSetupSkipped:
+    def test_reopen_skips_setup(self, tmp_path, monkeypatch):
+        PyriteDB(tmp_path / "index.db").close()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("schema setup should be skipped")
+
+        monkeypatch.setattr(connection, "create_fts_tables", fail)
+        db = PyriteDB(tmp_path / "index.db")
+        assert db.execute_sql("SELECT COUNT(*) AS n FROM entry")[0]["n"] == 0
+        db.close()
+
+    @pytest.mark.parametrize(
+        "tamper",
+        ["PRAGMA user_version = 0", "DELETE FROM schema_version WHERE version > 3"],
+    )
+    def test_stale_stamp_reruns_setup(self, tmp_path, monkeypatch, tamper):
+        db = PyriteDB(tmp_path / "index.db")
+        db._raw_conn.execute(tamper)
+        db._raw_conn.commit()
+        db.close()
+
+        calls = []
+        original = connection.create_fts_tables
+        monkeypatch.setattr(
+            connection, "create_fts_tables", lambda conn: calls.append(1) or original(conn)
+        )
+        db = PyriteDB(tmp_path / "index.db")
+        assert calls == [1]
+        assert db._raw_conn.execute("PRAGMA user_version").fetchone()[0] == db._schema_stamp()
+        db.close()
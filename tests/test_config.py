@@ -15,8 +15,10 @@ from pyrite.config import (
     Settings,
     Subscription,
     auto_discover_kbs,
+    config_snapshot,
     load_config,
     save_config,
+    subscribe_config_changes,
 )
 
 
@@ -163,6 +165,118 @@ class TestConfigPersistence:
             assert loaded.get_kb("test") is not None
 
 
+class TestConfigSnapshot:
+    """Tests for the stat-validated config cache and snapshots."""
+
+    @pytest.fixture
+    def saved(self, tmp_path):
+        kb_path = tmp_path / "notes"
+        kb_path.mkdir()
+        (kb_path / "kb.yaml").write_text("types:\n  note:\n    description: A note\n")
+        cfg = PyriteConfig()
+        cfg.add_kb(KBConfig(name="notes", path=kb_path))
+        save_config(cfg)
+        return kb_path
+
+    @staticmethod
+    def _rewrite(path, text):
+        import os
+
+        path.write_text(text)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    def test_unchanged_files_not_reparsed(self, saved, monkeypatch):
+        from pyrite import config as config_module
+
+        load_config()
+        calls = []
+        original = config_module.load_yaml_file
+        monkeypatch.setattr(
+            config_module, "load_yaml_file", lambda p: calls.append(p) or original(p)
+        )
+        config = load_config()
+        assert calls == []
+        assert config.get_kb("notes").types == {"note": {"description": "A note"}}
+
+        self._rewrite(saved / "kb.yaml", "types:\n  memo: {}\n")
+        assert "memo" in load_config().get_kb("notes").types
+        assert calls == [saved / "kb.yaml"]
+
+    def test_load_config_returns_independent_copies(self, saved):
+        first = load_config()
+        first.get_kb("notes").types["extra"] = {}
+        first.settings.cors_origins.append("http://evil")
+        second = load_config()
+        assert "extra" not in second.get_kb("notes").types
+        assert "http://evil" not in second.settings.cors_origins
+
+    def test_snapshot_is_a_private_copy(self, saved):
+        snapshot = config_snapshot()
+        snapshot.get_kb("notes").types["extra"] = {}
+        snapshot.settings.port = 1
+        fresh = config_snapshot()
+        assert fresh is not snapshot
+        assert "extra" not in fresh.get_kb("notes").types
+        assert fresh.settings.port != 1
+
+    def test_snapshot_rebuilt_and_announced_on_change(self, saved):
+        snapshot = config_snapshot()
+        events = []
+        unsubscribe = subscribe_config_changes(events.append)
+        try:
+            self._rewrite(saved / "kb.yaml", "types:\n  memo: {}\n")
+            fresh = config_snapshot()
+        finally:
+            unsubscribe()
+        assert fresh is not snapshot
+        assert "memo" in fresh.get_kb("notes").kb_schema.types
+        assert "note" in snapshot.get_kb("notes").types  # old snapshot untouched
+        assert len(events) == 1
+        assert events[0].changed_kbs == {"notes"}
+        assert events[0].config_changed is False
+
+    def test_save_config_announces_change(self, saved):
+        config_snapshot()
+        events = []
+        unsubscribe = subscribe_config_changes(events.append)
+        try:
+            cfg = load_config()
+            cfg.settings.port = 9100
+            save_config(cfg)
+        finally:
+            unsubscribe()
+        assert len(events) == 1
+        assert events[0].config_changed is True
+        assert events[0].changed_kbs == frozenset()
+        assert events[0].config.settings.port == 9100
+
+    def test_env_change_rebuilds_snapshot(self, saved, monkeypatch):
+        snapshot = config_snapshot()
+        monkeypatch.setenv("PYRITE_PORT", "9999")
+        fresh = config_snapshot()
+        assert fresh is not snapshot
+        assert fresh.settings.port == 9999
+
+    def test_plugin_context_schema_refreshed(self, saved):
+        from pyrite.plugins.context import PluginContext
+        from pyrite.plugins.registry import PluginRegistry
+
+        server_config = load_config()
+        kb = server_config.get_kb("notes")
+        assert "note" in kb.kb_schema.types
+        registry = PluginRegistry()
+        registry._discovered = True
+        registry.set_context(PluginContext(config=server_config, db=None))
+        try:
+            config_snapshot()
+            self._rewrite(saved / "kb.yaml", "types:\n  memo: {}\n")
+            config_snapshot()
+        finally:
+            registry._config_subscription()
+        assert "memo" in kb.kb_schema.types
+
+
 class TestAutoDiscovery:
     """Tests for KB auto-discovery."""
 
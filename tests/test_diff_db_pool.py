@@ -0,0 +1,164 @@
+"""Tests for the bounded worktree diff-DB pool."""
+
+import pytest
+
+from pyrite.server.diff_db_pool import DiffDBPool
+from pyrite.storage.database import PyriteDB
+
+
+class FakeDB:
+    def __init__(self, path):
+        self.path = path
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _use(pool, key, path):
+    """Acquire and release, as one finished request would."""
+    db = pool.acquire(key, path)
+    if db is not None:
+        pool.release(db)
+    return db
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"diff-{i}.db"
+        path.write_bytes(b"")
+        paths.append(path)
+    return paths
+
+
+class TestDiffDBPool:
+    def test_hit_reuses_handle(self, files):
+        pool = DiffDBPool(opener=FakeDB)
+        first = _use(pool, (1, "kb"), files[0])
+        assert _use(pool, (1, "kb"), files[0]) is first
+        stats = pool.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["open_handles"] == 1
+
+    def test_lru_bound_closes_least_recent(self, files):
+        pool = DiffDBPool(max_size=2, opener=FakeDB)
+        a = _use(pool, (1, "kb"), files[0])
+        b = _use(pool, (2, "kb"), files[1])
+        _use(pool, (1, "kb"), files[0])  # a is now most recent
+        _use(pool, (3, "kb"), files[2])
+        assert b.closed and not a.closed
+        assert (2, "kb") not in pool and len(pool) == 2
+        assert pool.stats()["evictions"] == 1
+
+    def test_idle_eviction(self, files):
+        clock = Clock()
+        pool = DiffDBPool(idle_seconds=60, opener=FakeDB, clock=clock)
+        a = _use(pool, (1, "kb"), files[0])
+        clock.now = 30
+        b = _use(pool, (2, "kb"), files[1])
+        clock.now = 70
+        assert pool.evict_idle() == 1
+        assert a.closed and not b.closed
+        # Idle handles are also swept on lookup
+        clock.now = 200
+        _use(pool, (3, "kb"), files[2])
+        assert b.closed and len(pool) == 1
+
+    def test_replaced_or_missing_file_reopens(self, files):
+        pool = DiffDBPool(opener=FakeDB)
+        first = _use(pool, (1, "kb"), files[0])
+        files[0].unlink()
+        assert _use(pool, (1, "kb"), files[0]) is None
+        assert first.closed and len(pool) == 0
+        files[0].write_bytes(b"")
+        second = _use(pool, (1, "kb"), files[0])
+        assert second is not first and not second.closed
+
+    def test_discard_and_close_all(self, files):
+        pool = DiffDBPool(opener=FakeDB)
+        a = _use(pool, (1, "kb"), files[0])
+        b = _use(pool, (2, "kb"), files[1])
+        pool.discard((1, "kb"))
+        assert a.closed and len(pool) == 1
+        pool.close_all()
+        assert b.closed and len(pool) == 0
+
+    def test_real_diff_db_opens_and_closes(self, tmp_path):
+        path = tmp_path / ".pyrite" / "diff-index.db"
+        PyriteDB(path).close()
+        pool = DiffDBPool()
+        with pool.lease((1, "kb"), path) as db:
+            assert isinstance(db, PyriteDB)
+            assert db.get_schema_version() > 0
+        pool.close_all()
+
+    def test_leased_handle_outlives_eviction(self, files):
+        pool = DiffDBPool(max_size=1, opener=FakeDB)
+        with pool.lease((1, "kb"), files[0]) as a:
+            b = pool.acquire((2, "kb"), files[1])  # evicts a from the pool
+            pool.release(b)
+            assert (1, "kb") not in pool and not a.closed
+            assert pool.stats()["retired_handles"] == 1
+        assert a.closed and pool.stats()["retired_handles"] == 0
+        assert not b.closed
+
+    def test_discard_and_close_all_wait_for_leases(self, files):
+        pool = DiffDBPool(opener=FakeDB)
+        a = pool.acquire((1, "kb"), files[0])
+        assert pool.acquire((1, "kb"), files[0]) is a  # second lease
+        pool.discard((1, "kb"))
+        pool.release(a)
+        assert not a.closed
+        pool.release(a)
+        assert a.closed
+        b = pool.acquire((2, "kb"), files[1])
+        pool.close_all()
+        assert not b.closed and len(pool) == 0
+        pool.release(b)
+        assert b.closed
+
+
+class TestAppPool:
+    def test_fallback_pool_uses_settings_and_shutdown_closes(self, tmp_path, monkeypatch):
+        from fastapi import Depends
+        from fastapi.testclient import TestClient
+
+        from pyrite.config import PyriteConfig, Settings
+        from pyrite.server.api import create_app, get_worktree_resolver
+        from pyrite.services.worktree_service import WorktreeService
+
+        config = PyriteConfig(
+            settings=Settings(
+                index_path=tmp_path / "index.db",
+                worktree_diff_db_pool_size=3,
+                worktree_diff_db_idle_seconds=5.0,
+            )
+        )
+        app = create_app(config)
+        path = tmp_path / "diff.db"
+        PyriteDB(path).close()
+        del app.state.pyrite_diff_db_pool
+        monkeypatch.setattr(WorktreeService, "get_user_diff_db_path", lambda *_: path)
+
+        @app.get("/_pool")
+        def _pool(resolver=Depends(get_worktree_resolver)):
+            db = resolver._get_diff_db(1, "kb")
+            return {"leased": resolver._diff_pool.stats()["leased_handles"], "db": db is not None}
+
+        with TestClient(app) as client:
+            assert client.get("/_pool").json() == {"leased": 1, "db": True}
+            pool = app.state.pyrite_diff_db_pool
+            assert (pool.max_size, pool.idle_seconds) == (3, 5.0)
+            assert pool.stats()["leased_handles"] == 0
+            assert len(pool) == 1
+        assert len(pool) == 0
@@ -0,0 +1,261 @@
+"""Tests for versioned embedding models and background re-embedding.
+
+sqlite-vec is optional, so vec tables are stood in for by plain tables with
+the same ``rowid``/``embedding`` columns; everything except KNN ``MATCH``
+behaves as it does against vec0.
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from pyrite.services.embedding_service import EmbeddingService
+from pyrite.services.embedding_worker import EmbeddingWorker
+from pyrite.storage import embedding_versions
+from pyrite.storage.database import PyriteDB
+
+
+def _plain_vec_table(connection, table="vec_entry", dimensions=384, element="float"):
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS {table} (rowid INTEGER PRIMARY KEY, embedding BLOB)"
+    )
+
+
+class _Vector(list):
+    def tolist(self):
+        return list(self)
+
+
+class _FakeModel:
+    def __init__(self, dimensions, fill):
+        self.dimensions = dimensions
+        self.fill = fill
+
+    def encode(self, text, convert_to_numpy=True):
+        return _Vector([self.fill] * self.dimensions)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimensions
+
+
+_MODELS = {"all-MiniLM-L6-v2": _FakeModel(384, 0.5), "bge-base": _FakeModel(768, 0.25)}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = PyriteDB(tmp_path / "index.db")
+    db.register_kb("test", "generic", str(tmp_path / "kb"))
+    db.register_kb("other", "generic", str(tmp_path / "other"))
+    for i in range(5):
+        db.upsert_entry(
+            {"id": f"e{i}", "kb_name": "test", "entry_type": "note", "title": f"Entry {i}"}
+        )
+    db.upsert_entry({"id": "o1", "kb_name": "other", "entry_type": "note", "title": "Other"})
+    db.backend.vec_available = True
+    # Python stand-ins for the sqlite-vec quantizers
+    db._raw_conn.create_function("vec_quantize_binary", 1, lambda blob: b"b" + blob[:4])
+    db._raw_conn.create_function("vec_quantize_int8", 2, lambda blob, mode: b"i" + blob[:4])
+    with patch("pyrite.storage.backends.sqlite_backend.create_vec_table", _plain_vec_table):
+        yield db
+    db.close()
+
+
+def _service(db, model="all-MiniLM-L6-v2"):
+    svc = EmbeddingService(db, model_name=model)
+    svc._load_model = lambda name: _MODELS[name]
+    return svc
+
+
+def _widths(db, kb_name):
+    return {len(vec) for _, vec in db.backend.get_kb_embeddings(kb_name)}
+
+
+class TestRegistry:
+    def test_migration_pins_existing_kbs_to_legacy(self, tmp_path):
+        db = PyriteDB(tmp_path / "index.db")
+        db.register_kb("test", "generic", str(tmp_path / "kb"))
+        state = db.backend.embedding_state("test")
+        assert state["active"]["vec_table"] == "vec_entry"
+        assert state["active"]["dimensions"] == 384
+        assert not state["recorded"]
+
+        model = db.backend.register_embedding_model("bge-base", 768)
+        assert model["vec_table"] == f"vec_entry_v{model['version']}"
+        assert db.backend.register_embedding_model("bge-base", 768) == model
+        db.close()
+
+    def test_build_lifecycle(self, tmp_path):
+        db = PyriteDB(tmp_path / "index.db")
+        db.register_kb("test", "generic", str(tmp_path / "kb"))
+        conn = db._raw_conn
+        v2 = embedding_versions.register_model(conn, "bge-base", 768)["version"]
+
+        assert not embedding_versions.start_build(conn, "test", embedding_versions.LEGACY_VERSION)
+        assert embedding_versions.start_build(conn, "test", v2)
+        assert embedding_versions.building_kbs(conn) == ["test"]
+        assert embedding_versions.version_in_use(conn, v2)
+        assert embedding_versions.cut_over(conn, "test") == (1, v2)
+        assert embedding_versions.kb_state(conn, "test")["active"]["model"] == "bge-base"
+        assert embedding_versions.cut_over(conn, "test") is None
+
+        db.unregister_kb("test")
+        assert not embedding_versions.version_in_use(conn, v2)
+        db.close()
+
+
+class TestReembed:
+    def test_new_kb_adopts_configured_model(self, db):
+        db.register_kb("fresh", "generic", "/tmp/fresh")
+        db.upsert_entry({"id": "f1", "kb_name": "fresh", "entry_type": "note", "title": "F"})
+        svc = _service(db, "bge-base")
+        assert svc.embed_entry("f1", "fresh")
+        assert db.backend.embedding_state("fresh")["active"]["model"] == "bge-base"
+        assert _widths(db, "fresh") == {768}
+
+    def test_old_vectors_serve_until_cutover(self, db):
+        assert _service(db).embed_all()["embedded"] == 6
+        assert _widths(db, "test") == {384}
+
+        svc = _service(db, "bge-base")
+        assert [s["current"] for s in svc.embedding_status("test")] == [False]
+        assert svc.start_reembed("test")
+        step = svc.reembed_step("test", batch_size=2)
+        assert (step["embedded"], step["remaining"], step["done"]) == (2, 3, False)
+        # Reads still use the legacy vectors mid-build
+        assert _widths(db, "test") == {384}
+
+        # Edits during the build are written to both versions
+        db.upsert_entry({"id": "e9", "kb_name": "test", "entry_type": "note", "title": "New"})
+        assert svc.embed_entry("e9", "test")
+
+        result = svc.reembed("test")
+        assert result["done"] and result["embedded"] == 3
+        assert _widths(db, "test") == {768}
+        assert len(db.backend.get_kb_embeddings("test")) == 6
+        assert svc.embedding_status("test")[0]["current"]
+        # The legacy table keeps other KBs' vectors, minus the switched KB's
+        assert db.backend.get_embedded_rowids() == {
+            db._raw_conn.execute("SELECT rowid FROM entry WHERE id = 'o1'").fetchone()[0]
+        }
+        assert not svc.start_reembed("test")
+
+    def test_search_embeds_query_per_active_model(self, db):
+        _service(db).embed_all()
+        svc = _service(db, "bge-base")
+        svc.reembed("test")
+        calls = []
+
+        def fake_search(embedding, kb_name=None, limit=20, max_distance=1.3, version=None):
+            calls.append((len(embedding), version))
+            return [{"id": f"hit{version}", "distance": 0.1 * version, "body": ""}]
+
+        with patch.object(db.backend, "search_semantic", side_effect=fake_search):
+            results = svc.search_similar("query")
+            assert sorted(calls) == [(384, 1), (768, svc.target_version())]
+            assert [r["id"] for r in results] == ["hit1", f"hit{svc.target_version()}"]
+
+            calls.clear()
+            svc.search_similar("query", kb_name="test")
+            assert calls == [(768, svc.target_version())]
+
+    def test_search_without_kb_covers_every_active_version(self, db):
+        _service(db).embed_all()
+        svc = _service(db, "bge-base")
+        svc.reembed("test")
+        search = type(db.backend).search_semantic
+        calls = []
+
+        def per_version(embedding, kb_name=None, limit=20, max_distance=1.3, version=None):
+            if version is None:
+                return search(db.backend, embedding, kb_name, limit, max_distance)
+            calls.append(version)
+            return [{"id": f"hit{version}", "distance": 0.1}]
+
+        with patch.object(db.backend, "search_semantic", side_effect=per_version):
+            # "other" was never re-embedded and still reads the legacy table
+            assert db.backend.search_semantic([0.5] * 384) == [{"id": "hit1", "distance": 0.1}]
+            assert calls == [1]
+            calls.clear()
+            db.backend.search_semantic([0.5] * 768)
+            assert calls == [svc.target_version()]
+
+    def test_dimension_mismatch_rejected(self, db):
+        svc = _service(db, "bge-base")
+        svc._dimensions = 512
+        svc.start_reembed("test")
+        result = svc.reembed_step("test")
+        assert result["errors"] == 5 and not result["done"]
+        assert db.backend.embedding_state("test")["active"]["model"] == "all-MiniLM-L6-v2"
+
+    def test_worker_advances_reembed(self, db):
+        _service(db).embed_all()
+        worker = EmbeddingWorker(db, model_name="bge-base")
+        worker._embedding_svc = _service(db, "bge-base")
+        worker._embedding_svc.start_reembed("test")
+        assert worker.get_status()["reembedding"] == ["test"]
+        assert worker.process_batch(batch_size=3) == 3
+        assert worker.process_batch(batch_size=3) == 2
+        assert worker.get_status()["reembedding"] == []
+        assert _widths(db, "test") == {768}
+
+
+class TestQuantization:
+    def _rows(self, db, table):
+        return dict(db._raw_conn.execute(f"SELECT rowid, embedding FROM {table}").fetchall())
+
+    def test_quantized_copy_follows_writes(self, db):
+        svc = _service(db)
+        svc.embed_all()
+        assert svc.set_quantization("bit") == {1: 6}
+        assert svc.set_quantization("bit") == {}
+        assert db.backend.embedding_model(1)["quantization"] == "bit"
+        assert all(v.startswith(b"b") for v in self._rows(db, "vec_entry_q").values())
+
+        db.upsert_entry({"id": "e9", "kb_name": "test", "entry_type": "note", "title": "New"})
+        svc.embed_entry("e9", "test")
+        assert len(self._rows(db, "vec_entry_q")) == 7
+        db.backend.delete_embedding("e9", "test")
+        assert len(self._rows(db, "vec_entry_q")) == 6
+
+        assert svc.set_quantization("int8") == {1: 6}
+        assert all(v.startswith(b"i") for v in self._rows(db, "vec_entry_q").values())
+        assert svc.set_quantization("none") == {1: 0}
+        assert "vec_entry_q" not in db.backend._vec_tables()
+
+    def test_unknown_mode_rejected(self, db):
+        with pytest.raises(ValueError, match="Unknown quantization"):
+            db.backend.set_embedding_quantization(1, "int4")
+
+    def test_cutover_drops_quantized_copy(self, db):
+        _service(db).embed_all()
+        svc = _service(db, "bge-base")
+        svc.start_reembed("test")
+        svc.set_quantization("bit")
+        svc.reembed("test")
+        table = db.backend.embedding_model(svc.target_version())["vec_table"]
+        assert len(self._rows(db, f"{table}_q")) == 5
+        # The legacy copy lost the switched KB's rows along with the full vectors
+        assert len(self._rows(db, "vec_entry_q")) == 1
+
+
+class TestVecCache:
+    def test_reads_reuse_tables_and_active_version(self, db):
+        _service(db).embed_all()
+        with patch("pyrite.storage.backends.sqlite_backend.create_vec_table") as ddl:
+            db.backend.get_kb_embeddings("test")
+            db.backend.get_kb_embeddings("test")
+        ddl.assert_not_called()
+
+    def test_cutover_from_another_connection_is_seen(self, db, tmp_path):
+        _service(db).embed_all()
+        assert _widths(db, "test") == {384}
+        version = db.backend.register_embedding_model("bge-base", 768)["version"]
+        other = sqlite3.connect(tmp_path / "index.db")
+        other.execute(
+            "UPDATE kb_embedding SET active_version = ? WHERE kb_name = 'test'", (version,)
+        )
+        other.commit()
+        other.close()
+        assert db.backend.embedding_state("test")["active"]["version"] == version
+        assert _widths(db, "test") == set()
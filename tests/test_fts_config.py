@@ -0,0 +1,184 @@
+"""Tests for configurable FTS5 ranking, prefix indexes and the trigram index."""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pyrite.config import PyriteConfig, Settings
+from pyrite.storage.database import PyriteDB
+from pyrite.storage.migrations import MigrationManager
+from pyrite.storage.virtual_tables import FtsConfig
+
+
+def _entry(entry_id, title, body="", summary=""):
+    return {
+        "id": entry_id,
+        "kb_name": "test",
+        "entry_type": "note",
+        "title": title,
+        "body": body,
+        "summary": summary,
+        "tags": [],
+        "sources": [],
+        "links": [],
+        "metadata": {},
+    }
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = PyriteDB(Path(tmpdir) / "fts.db")
+        db.register_kb("test", "generic", "/tmp/test", "")
+        yield db
+        db.close()
+
+
+def _fts_sql(db):
+    return db._raw_conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'entry_fts'"
+    ).fetchone()[0]
+
+
+def _ids(results):
+    return [r["id"] for r in results]
+
+
+class TestFtsConfig:
+    def test_json_round_trip(self):
+        config = FtsConfig(title_weight=3.0, prefix=(2,), trigram=True)
+        assert FtsConfig.from_json(config.to_json()) == config
+        assert FtsConfig.from_json("{broken") == FtsConfig()
+
+    def test_from_settings(self):
+        settings = Settings(fts_body_weight=0.5, fts_prefix_lengths=[3], fts_trigram=True)
+        config = FtsConfig.from_settings(settings)
+        assert (config.body_weight, config.prefix, config.trigram) == (0.5, (3,), True)
+        assert config.bm25_weights() == (1.0, 1.0, 1.0, 10.0, 0.5, 5.0, 1.0)
+
+    def test_settings_round_trip(self):
+        config = PyriteConfig()
+        config.settings.fts_title_weight = 4.0
+        config.settings.fts_prefix_lengths = [2, 4]
+        loaded = PyriteConfig.from_dict(config.to_dict())
+        assert loaded.settings.fts_title_weight == 4.0
+        assert loaded.settings.fts_prefix_lengths == [2, 4]
+
+
+class TestRanking:
+    def test_title_hit_outranks_long_body_hit(self, db):
+        body = "quantum appears once amid a long body " + "filler words " * 2000
+        db.upsert_entry(_entry("body-hit", "Lab notebook", body=body + " quantum"))
+        db.upsert_entry(_entry("title-hit", "Quantum error correction", body="filler " * 200))
+        assert _ids(db.search("quantum"))[0] == "title-hit"
+
+    def test_weights_applied_at_query_time(self, db):
+        db.upsert_entry(_entry("in-title", "quantum", body="other words here"))
+        db.upsert_entry(_entry("in-summary", "other", summary="quantum"))
+        assert _ids(db.search("quantum")) == ["in-title", "in-summary"]
+        db.configure_fts(FtsConfig(title_weight=1.0, summary_weight=50.0))
+        assert _ids(db.search("quantum")) == ["in-summary", "in-title"]
+
+
+class TestIndexOptions:
+    def test_default_prefix_indexes(self, db):
+        assert "prefix='2 3'" in _fts_sql(db)
+        db.upsert_entry(_entry("e1", "Quantum computing"))
+        assert _ids(db.search("qu*")) == ["e1"]
+
+    def test_structure_change_rebuilds_in_place(self, db):
+        db.upsert_entry(_entry("e1", "Quantum computing"))
+        assert db.configure_fts(FtsConfig(prefix=(2, 3, 4))) is True
+        assert "prefix='2 3 4'" in _fts_sql(db)
+        assert _ids(db.search("quantum")) == ["e1"]
+        assert db.configure_fts(FtsConfig(prefix=(2, 3, 4))) is False
+
+    def test_trigram_substring_search(self, db):
+        db.upsert_entry(_entry("e1", "Reindexing pipeline", body="uses sqlite triggers"))
+        db.upsert_entry(_entry("e2", "Other"))
+        # LIKE fallback before the trigram index exists
+        assert _ids(db.search_substring("index")) == ["e1"]
+        db.configure_fts(FtsConfig(trigram=True))
+        assert _ids(db.search_substring("ite trig")) == ["e1"]
+        db.upsert_entry(_entry("e2", "Other", body="triggered"))
+        assert _ids(db.search_substring("trigger")) == ["e2", "e1"]
+        assert _ids(db.search_substring("50%")) == []
+
+
+class TestPrefixMigration:
+    def test_v22_rebuilds_old_fts_table(self):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(
+            """
+            CREATE TABLE entry (id TEXT, kb_name TEXT, entry_type TEXT, title TEXT,
+                                body TEXT, summary TEXT, location TEXT);
+            INSERT INTO entry VALUES ('e1', 'k', 'note', 'Quantum', '', '', '');
+            CREATE VIRTUAL TABLE entry_fts USING fts5(
+                id, kb_name, entry_type, title, body, summary, location,
+                content='entry', content_rowid='rowid', tokenize='porter unicode61'
+            );
+            """
+        )
+        mgr = MigrationManager(conn)
+        conn.execute("INSERT INTO schema_version VALUES (21, 'seed', '2025-01-01T00:00:00')")
+        mgr.migrate()
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'entry_fts'").fetchone()[0]
+        assert "prefix='2 3'" in sql
+        assert conn.execute(
+            "SELECT rowid FROM entry_fts WHERE entry_fts MATCH 'qu*'"
+        ).fetchall() == [(1,)]
+
+
+class TestUpdateTriggers:
+    def _changes(self, conn, sql, params=()):
+        before = conn.total_changes
+        conn.execute(sql, params)
+        conn.commit()
+        return conn.total_changes - before
+
+    def test_status_update_skips_fts(self, db):
+        db.upsert_entry(_entry("e1", "Quantum computing", body="long body " * 1000))
+        conn = db._raw_conn
+        # total_changes counts trigger writes: 1 means entry_fts was not touched
+        assert (
+            self._changes(conn, "UPDATE entry SET status = 'done', assignee = 'a' WHERE id = 'e1'")
+            == 1
+        )
+        assert _ids(db.search("quantum")) == ["e1"]
+
+    def test_text_update_reindexes(self, db):
+        db.upsert_entry(_entry("e1", "Quantum computing"))
+        db.configure_fts(FtsConfig(trigram=True))
+        conn = db._raw_conn
+        assert self._changes(conn, "UPDATE entry SET title = 'Photonic chips' WHERE id = 'e1'") > 1
+        assert _ids(db.search("quantum")) == []
+        assert _ids(db.search("photonic")) == ["e1"]
+        assert _ids(db.search_substring("tonic")) == ["e1"]
+        # Same value written back: column listed in UPDATE OF but unchanged
+        assert self._changes(conn, "UPDATE entry SET title = title WHERE id = 'e1'") == 1
+
+    def test_v23_replaces_unconditional_trigger(self):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(
+            """
+            CREATE TABLE entry (id TEXT, kb_name TEXT, entry_type TEXT, title TEXT,
+                                body TEXT, summary TEXT, location TEXT, status TEXT);
+            CREATE VIRTUAL TABLE entry_fts USING fts5(
+                id, kb_name, entry_type, title, body, summary, location,
+                content='entry', content_rowid='rowid', prefix='2 3'
+            );
+            CREATE TRIGGER entry_au AFTER UPDATE ON entry BEGIN
+                INSERT INTO entry_fts(entry_fts, rowid, id, kb_name, entry_type, title,
+                                      body, summary, location)
+                VALUES('delete', old.rowid, old.id, old.kb_name, old.entry_type, old.title,
+                       old.body, old.summary, old.location);
+            END;
+            """
+        )
+        mgr = MigrationManager(conn)
+        conn.execute("INSERT INTO schema_version VALUES (22, 'seed', '2025-01-01T00:00:00')")
+        mgr.migrate()
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'entry_au'").fetchone()[0]
+        assert "AFTER UPDATE OF" in sql and "WHEN" in sql
@@ -0,0 +1,228 @@
+"""Tests for graph analytics: PageRank, communities and k-shortest paths."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pyrite.services import graph_analytics
+from pyrite.services.graph_analytics import (
+    GraphAnalytics,
+    connected_components,
+    k_shortest_paths,
+    louvain_communities,
+    pagerank,
+)
+from pyrite.services.graph_service import GraphService
+from pyrite.storage.backends.link_graph import LinkGraph
+from pyrite.storage.database import PyriteDB
+
+
+def _graph(edges):
+    return LinkGraph.build([(s, "k", t, "k", "related_to") for s, t in edges], [])
+
+
+def _entry(entry_id, links=None, **extra):
+    return {
+        "id": entry_id,
+        "kb_name": "test",
+        "entry_type": "note",
+        "title": f"Title {entry_id}",
+        "body": "",
+        "tags": [],
+        "sources": [],
+        "links": links or [],
+        "metadata": {},
+        **extra,
+    }
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = PyriteDB(Path(tmpdir) / "graph.db")
+        db.register_kb("test", "generic", "/tmp/test", "")
+        yield db
+        db.close()
+
+
+def _two_triangles(db):
+    """Two link triangles (a-b-c, x-y-z) bridged by an ownership edge entity c->x."""
+    db.upsert_entry(_entry("a", links=[{"target": "b"}, {"target": "c"}]))
+    db.upsert_entry(_entry("b", links=[{"target": "c"}]))
+    db.upsert_entry(_entry("c", links=[{"target": "a"}]))
+    db.upsert_entry(_entry("x", links=[{"target": "y"}, {"target": "z"}]))
+    db.upsert_entry(_entry("y", links=[{"target": "z"}]))
+    db.upsert_entry(_entry("z", _refs=[{"target_id": "x", "field_name": "parent"}]))
+    db.upsert_entry(
+        _entry(
+            "own-1",
+            _edge_endpoints=[
+                {
+                    "role": "source",
+                    "field_name": "owner",
+                    "endpoint_id": "c",
+                    "edge_type": "ownership",
+                },
+                {
+                    "role": "target",
+                    "field_name": "asset",
+                    "endpoint_id": "x",
+                    "edge_type": "ownership",
+                },
+            ],
+        )
+    )
+
+
+class TestAlgorithms:
+    def test_pagerank_sums_to_one(self):
+        graph = _graph([("a", "b"), ("b", "c"), ("c", "a"), ("d", "c")])
+        scores = pagerank(graph)
+        assert sum(scores) == pytest.approx(1.0)
+        c = graph.index_of("c", "k")
+        assert scores[c] == max(scores)
+
+    def test_pagerank_python_matches(self):
+        graph = _graph([("a", "b"), ("b", "c"), ("c", "a"), ("d", "c"), ("c", "e")])
+        fallback = graph_analytics._pagerank_python(graph, 0.85, 1e-6, 100, None)
+        assert pagerank(graph) == pytest.approx(fallback, abs=1e-5)
+
+    def test_pagerank_empty(self):
+        assert pagerank(LinkGraph.build([], [])) == []
+
+    def test_connected_components(self):
+        graph = _graph([("a", "b"), ("c", "d"), ("d", "e")])
+        labels = connected_components(graph)
+        idx = {k: graph.index_of(k, "k") for k in "abcde"}
+        assert labels[idx["a"]] == labels[idx["b"]]
+        assert labels[idx["c"]] == labels[idx["d"]] == labels[idx["e"]]
+        assert labels[idx["a"]] != labels[idx["c"]]
+
+    def test_louvain_splits_bridged_cliques(self):
+        edges = [("a", "b"), ("b", "c"), ("c", "a"), ("x", "y"), ("y", "z"), ("z", "x")]
+        graph = _graph(edges + [("c", "x")])
+        labels = louvain_communities(graph)
+        idx = {k: graph.index_of(k, "k") for k in "abcxyz"}
+        assert labels[idx["a"]] == labels[idx["b"]] == labels[idx["c"]]
+        assert labels[idx["x"]] == labels[idx["y"]] == labels[idx["z"]]
+        assert labels[idx["a"]] != labels[idx["x"]]
+
+    def test_k_shortest_paths(self):
+        graph = _graph([("a", "b"), ("b", "d"), ("a", "c"), ("c", "e"), ("e", "d")])
+        a, d = graph.index_of("a", "k"), graph.index_of("d", "k")
+        paths = k_shortest_paths(graph, a, d, k=3)
+        names = [[graph.keys[i][0] for i in p] for p in paths]
+        assert names == [["a", "b", "d"], ["a", "c", "e", "d"]]
+
+    def test_k_shortest_paths_max_length(self):
+        graph = _graph([("a", "b"), ("b", "c"), ("c", "d")])
+        a, d = graph.index_of("a", "k"), graph.index_of("d", "k")
+        assert k_shortest_paths(graph, a, d, max_length=2) == []
+
+
+class TestGraphAnalytics:
+    def test_include_refs_graph(self, db):
+        _two_triangles(db)
+        graph = db.get_link_graph("test", include_refs=True)
+        relations = {r for _, _, r in graph.iter_edges()}
+        assert {"related_to", "ref:parent", "edge:ownership"} <= relations
+        assert "ref:parent" not in {r for _, _, r in db.get_link_graph("test").iter_edges()}
+
+    def test_pagerank(self, db):
+        _two_triangles(db)
+        ranked = GraphService(db).get_pagerank(kb_name="test", limit=3)
+        assert len(ranked) == 3
+        assert ranked[0]["score"] >= ranked[1]["score"] >= ranked[2]["score"]
+        assert {"id", "kb_name", "title", "entry_type", "in_degree", "out_degree"} <= set(ranked[0])
+
+    def test_communities(self, db):
+        _two_triangles(db)
+        svc = GraphService(db)
+        louvain = svc.get_communities(kb_name="test")
+        groups = sorted(sorted(m["id"] for m in c["members"]) for c in louvain)
+        assert groups == [["a", "b", "c"], ["x", "y", "z"]]
+        connected = svc.get_communities(kb_name="test", method="connected")
+        assert len(connected) == 1
+        assert connected[0]["size"] == 6
+
+    def test_unknown_method(self, db):
+        with pytest.raises(ValueError):
+            GraphService(db).get_communities(method="spectral")
+
+    def test_shortest_paths_through_edge_entity(self, db):
+        _two_triangles(db)
+        paths = GraphService(db).get_shortest_paths("a", "test", "y", "test", k=2)
+        assert [n["id"] for n in paths[0]["nodes"]] == ["a", "c", "x", "y"]
+        assert paths[0]["hops"][1] == {"relation": "edge:ownership", "direction": "out"}
+        assert GraphService(db).get_shortest_paths("a", "test", "nope", "test") == []
+
+    def test_results_cached_until_graph_changes(self, db, monkeypatch):
+        _two_triangles(db)
+        analytics = GraphAnalytics(db)
+        analytics.pagerank(kb_name="test")
+        calls = []
+        original = graph_analytics.pagerank
+
+        def counting(graph, **kwargs):
+            calls.append(kwargs.get("initial"))
+            return original(graph, **kwargs)
+
+        monkeypatch.setattr(graph_analytics, "pagerank", counting)
+        GraphAnalytics(db).pagerank(kb_name="test")
+        assert calls == []
+
+        db.upsert_entry(_entry("w", links=[{"target": "a"}]))
+        ranked = GraphAnalytics(db).pagerank(kb_name="test", limit=10)
+        assert len(calls) == 1
+        assert calls[0] is not None  # warm start from previous scores
+        assert "w" in {r["id"] for r in ranked}
+
+
+class TestGraphAnalyticsWiring:
+    def test_rest_endpoints(self, db):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from pyrite.config import PyriteConfig, Settings
+        from pyrite.server.api import create_app, get_config, get_db
+
+        _two_triangles(db)
+        config = PyriteConfig(knowledge_bases=[], settings=Settings(index_path=db.db_path))
+        app = create_app(config)
+        app.dependency_overrides[get_config] = lambda: config
+        app.dependency_overrides[get_db] = lambda: db
+        client = TestClient(app)
+
+        resp = client.get("/api/graph/pagerank?kb=test&limit=2")
+        assert resp.status_code == 200
+        assert len(resp.json()["entries"]) == 2
+
+        resp = client.get("/api/graph/communities?kb=test")
+        assert resp.status_code == 200
+        assert len(resp.json()["communities"]) == 2
+
+        resp = client.get("/api/graph/communities?method=bogus")
+        assert resp.status_code == 400
+
+        resp = client.get("/api/graph/paths?source=a&source_kb=test&target=z")
+        assert resp.status_code == 200
+        assert resp.json()["paths"][0]["length"] == 3
+
+    def test_mcp_tool(self, db):
+        from pyrite.server.mcp_server import PyriteMCPServer
+
+        _two_triangles(db)
+        server = PyriteMCPServer.__new__(PyriteMCPServer)
+        server.graph_svc = GraphService(db)
+
+        result = server._kb_graph_analytics({"analysis": "pagerank", "kb_name": "test"})
+        assert result["count"] == 6
+        result = server._kb_graph_analytics({"analysis": "communities", "kb_name": "test"})
+        assert result["count"] == 2
+        result = server._kb_graph_analytics(
+            {"analysis": "paths", "source_id": "a", "source_kb": "test", "target_id": "z"}
+        )
+        assert result["paths"]
+        assert "error" in server._kb_graph_analytics({"analysis": "paths"})
+        assert "error" in server._kb_graph_analytics({"analysis": "other"})
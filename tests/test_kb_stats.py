@@ -0,0 +1,139 @@
+"""Tests for the materialized per-KB statistics (kb_stat)."""
+
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from pyrite.cli import app
+from pyrite.config import KBConfig, PyriteConfig, Settings
+from pyrite.services.kb_service import KBService
+from pyrite.storage.database import PyriteDB
+from pyrite.storage.index import IndexManager
+
+
+def _entry(entry_id, entry_type="note", tags=(), links=(), kb_name="test"):
+    return {
+        "id": entry_id,
+        "kb_name": kb_name,
+        "entry_type": entry_type,
+        "title": entry_id.title(),
+        "body": "",
+        "tags": list(tags),
+        "sources": [],
+        "links": [{"target": t, "relation": "related_to"} for t in links],
+        "metadata": {},
+        "updated_at": f"2026-01-01T00:00:0{entry_id[-1]}",
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = PyriteDB(tmp_path / "index.db")
+    db.register_kb("test", "generic", str(tmp_path / "kb"), "")
+    db.register_kb("other", "generic", str(tmp_path / "other"), "")
+    yield db
+    db.close()
+
+
+class TestIncrementalCounters:
+    def test_upsert_and_delete_maintain_counts(self, db):
+        db.upsert_entry(_entry("e1", "note", tags=["a", "b"], links=["e2"]))
+        db.upsert_entry(_entry("e2", "task", tags=["a"]))
+        db.upsert_entry(_entry("e3", "task", kb_name="other"))
+        summary = db.get_kb_summary("test")
+        assert summary["total_entries"] == 2
+        assert summary["types"] == [{"type": "note", "count": 1}, {"type": "task", "count": 1}]
+        assert summary["top_tags"] == [{"name": "a", "count": 2}, {"name": "b", "count": 1}]
+        assert summary["total_links"] == 1
+
+        # Re-typing and re-tagging an entry moves its counts
+        db.upsert_entry(_entry("e1", "task", tags=["b"]))
+        summary = db.get_kb_summary("test")
+        assert summary["types"] == [{"type": "task", "count": 2}]
+        assert summary["top_tags"] == [{"name": "a", "count": 1}, {"name": "b", "count": 1}]
+        assert summary["total_links"] == 0
+
+        db.delete_entry("e2", "test")
+        summary = db.get_kb_summary("test")
+        assert summary["total_entries"] == 1
+        assert summary["top_tags"] == [{"name": "b", "count": 1}]
+        assert db.get_kb_stats("other")["actual_count"] == 1
+        assert db.check_kb_stats() == []
+
+    def test_unregister_kb_drops_counters(self, db):
+        db.upsert_entry(_entry("e1", kb_name="other"))
+        db.unregister_kb("other")
+        assert (
+            db._raw_conn.execute("SELECT COUNT(*) FROM kb_stat WHERE kb_name = 'other'").fetchone()[
+                0
+            ]
+            == 0
+        )
+
+    def test_check_and_rebuild(self, db):
+        db.upsert_entry(_entry("e1", tags=["a"]))
+        db._raw_conn.execute("UPDATE kb_stat SET count = 7 WHERE kind = 'tag'")
+        db._raw_conn.commit()
+        assert db.check_kb_stats("test") == [
+            {"kb_name": "test", "kind": "tag", "key": "a", "stored": 7, "actual": 1}
+        ]
+        assert db.rebuild_kb_stats("test") > 0
+        assert db.check_kb_stats() == []
+
+
+class TestOrientation:
+    def test_orient_reads_counters(self, db, tmp_path):
+        config = PyriteConfig(
+            knowledge_bases=[KBConfig(name="test", path=tmp_path / "kb", kb_type="generic")],
+            settings=Settings(index_path=tmp_path / "index.db"),
+        )
+        db.upsert_entry(_entry("e1", "note", tags=["a"]))
+        db.upsert_entry(_entry("e2", "task", tags=["a"]))
+        svc = KBService(config, db)
+        with patch.object(svc, "count_entries", side_effect=AssertionError("counted")):
+            result = svc.orient("test")
+        assert result["total_entries"] == 2
+        assert {t["type"] for t in result["types"]} == {"note", "task"}
+        assert result["top_tags"] == [{"name": "a", "count": 2}]
+        assert [r["id"] for r in result["recent"]] == ["e2", "e1"]
+
+    def test_index_stats_read_summary_once(self, db, tmp_path):
+        config = PyriteConfig(
+            knowledge_bases=[
+                KBConfig(name="test", path=tmp_path / "kb", kb_type="generic"),
+                KBConfig(name="other", path=tmp_path / "other", kb_type="generic"),
+            ],
+            settings=Settings(index_path=tmp_path / "index.db"),
+        )
+        db.upsert_entry(_entry("e1", "note", links=["e2"]))
+        db.upsert_entry(_entry("e2", "task"))
+        db.upsert_entry(_entry("e3", "task", kb_name="other"))
+        index_mgr = IndexManager(db, config)
+        with patch.object(db, "get_kb_stats", side_effect=AssertionError("per-KB query")):
+            stats = index_mgr.get_index_stats()
+        assert stats["total_entries"] == 3
+        assert stats["kbs"]["test"]["actual_count"] == 2
+        assert stats["kbs"]["other"]["kb_type"] == "generic"
+        assert stats["total_links"] == 1
+        assert stats["type_counts"] == [
+            {"entry_type": "task", "count": 2},
+            {"entry_type": "note", "count": 1},
+        ]
+
+
+@pytest.mark.cli
+def test_check_stats_command(db, tmp_path):
+    config = PyriteConfig(knowledge_bases=[], settings=Settings(index_path=db.db_path))
+    db.upsert_entry(_entry("e1"))
+    db._raw_conn.execute("UPDATE kb_stat SET count = 5 WHERE kind = 'entries'")
+    db._raw_conn.commit()
+    runner = CliRunner()
+    with patch("pyrite.cli.context.load_config", return_value=config):
+        result = runner.invoke(app, ["index", "check-stats"])
+        assert result.exit_code == 1, result.output
+        assert "1 counter(s) out of date" in result.output
+        result = runner.invoke(app, ["index", "check-stats", "--rebuild"])
+        assert result.exit_code == 0, result.output
+        result = runner.invoke(app, ["index", "check-stats"])
+    assert result.exit_code == 0 and "consistent" in result.output
@@ -2,7 +2,9 @@
 
 import json
 import tempfile
+from array import array
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from typer.testing import CliRunner
@@ -11,6 +13,8 @@ from pyrite.cli import app
 from pyrite.cli.link_commands import _batch_suggest
 from pyrite.config import KBConfig, KBType, PyriteConfig, Settings
 from pyrite.services.kb_service import KBService
+from pyrite.services.link_discovery_service import LinkDiscoveryService
+from pyrite.services.similarity import top_k_neighbors
 from pyrite.storage.database import PyriteDB
 
 runner = CliRunner()
@@ -147,6 +151,100 @@ class TestBatchSuggest:
         assert len(results) <= 3  # 3 source entries × 1 per entry
 
 
+def _vec(*values):
+    return array("f", values)
+
+
+# Stored vectors: trust ~ psychological-safety, feedback ~ system-dynamics
+VECTORS = {
+    "kb-a": [
+        ("trust-concept", _vec(1.0, 0.1, 0.0)),
+        ("feedback-loops", _vec(0.0, 1.0, 0.1)),
+        ("cooking-tips", _vec(0.0, 0.0, 1.0)),
+    ],
+    "kb-b": [
+        ("psychological-safety", _vec(0.9, 0.2, 0.0)),
+        ("system-dynamics", _vec(0.1, 0.9, 0.0)),
+        ("gardening-guide", _vec(0.0, 0.3, 0.8)),
+    ],
+}
+
+
+class TestTopKNeighbors:
+    def test_best_first_with_exclusions(self):
+        queries = [_vec(1, 0), _vec(0, 1)]
+        corpus = [_vec(1, 0), _vec(0.7, 0.7), _vec(0, 2)]
+        result = dict(top_k_neighbors(queries, corpus, 2, exclude={1: {2}}, block_size=1))
+        assert [j for j, _ in result[0]] == [0, 1]
+        assert result[0][0][1] == pytest.approx(1.0)
+        assert [j for j, _ in result[1]] == [1, 0]
+
+    def test_k_larger_than_corpus(self):
+        result = list(top_k_neighbors([_vec(1, 0)], [_vec(1, 0)], 5, exclude={0: {0}}))
+        assert result == [(0, [])]
+
+
+class TestBatchSuggestVectors:
+    def _service(self, batch_env):
+        return LinkDiscoveryService(batch_env["config"], batch_env["db"])
+
+    def test_semantic_mode_uses_stored_vectors(self, batch_env):
+        svc = self._service(batch_env)
+        backend = batch_env["db"].backend
+        with (
+            patch.object(backend, "get_kb_embeddings", side_effect=VECTORS.get),
+            patch.object(svc, "discover_neighbors", side_effect=AssertionError("per-entry")),
+        ):
+            pairs = svc.batch_suggest("kb-a", "kb-b", limit_per_entry=1, mode="semantic")
+        assert [(p["source_id"], p["target_id"]) for p in pairs[:2]] == [
+            ("trust-concept", "psychological-safety"),
+            ("feedback-loops", "system-dynamics"),
+        ]
+        assert pairs[0]["target_title"] == "Psychological Safety"
+        assert pairs[0]["score"] > pairs[-1]["score"]
+
+    def test_excludes_linked_pairs_and_streams(self, batch_env):
+        svc = self._service(batch_env)
+        batch_env["svc"].add_link(
+            "trust-concept", "kb-a", "psychological-safety", "related_to", target_kb="kb-b"
+        )
+        backend = batch_env["db"].backend
+        assert backend.get_linked_pairs("kb-a", "kb-b") == {
+            ("trust-concept", "psychological-safety")
+        }
+        with patch.object(backend, "get_kb_embeddings", side_effect=VECTORS.get):
+            stream = svc.iter_batch_suggestions("kb-a", "kb-b", limit_per_entry=1)
+            first = next(stream)
+            rest = list(stream)
+        assert (first["source_id"], first["target_id"]) == (
+            "trust-concept",
+            "system-dynamics",
+        )
+        assert ("trust-concept", "psychological-safety") not in {
+            (p["source_id"], p["target_id"]) for p in rest
+        }
+
+    def test_falls_back_without_embeddings(self, batch_env):
+        svc = self._service(batch_env)
+        # No stored vectors: per-entry discovery, which falls back to keyword
+        with patch.object(svc, "discover_neighbors", return_value=[]) as discover:
+            assert svc.batch_suggest("kb-a", "kb-b", mode="semantic") == []
+        assert discover.call_count == 3
+
+    def test_mismatched_models_skip_vectors(self, batch_env):
+        svc = self._service(batch_env)
+        backend = batch_env["db"].backend
+        other = backend.register_embedding_model("other-model", 3)
+        backend.adopt_embedding_version("kb-b", other["version"])
+        with (
+            patch.object(backend, "get_kb_embeddings", side_effect=VECTORS.get),
+            patch.object(svc, "discover_neighbors", return_value=[]) as discover,
+        ):
+            assert list(svc.iter_batch_suggestions("kb-a", "kb-b")) == []
+            assert svc.batch_suggest("kb-a", "kb-b", mode="semantic") == []
+        assert discover.call_count == 3
+
+
 class TestBatchSuggestCLI:
     def test_cli_json_output(self, batch_env, monkeypatch):
         monkeypatch.setattr(
@@ -165,3 +263,38 @@ class TestBatchSuggestCLI:
         assert "source_kb" in data
         assert data["source_kb"] == "kb-a"
         assert data["target_kb"] == "kb-b"
+
+    def test_cli_stream_prints_json_lines(self, batch_env, monkeypatch):
+        monkeypatch.setattr(
+            "pyrite.cli.link_commands.get_config_and_db",
+            lambda: (batch_env["config"], batch_env["db"]),
+        )
+        batch_env["db"].close = lambda: None
+        backend = batch_env["db"].backend
+
+        with patch.object(backend, "get_kb_embeddings", side_effect=VECTORS.get):
+            result = runner.invoke(
+                app,
+                [
+                    "links",
+                    "batch-suggest",
+                    "--source-kb",
+                    "kb-a",
+                    "--target-kb",
+                    "kb-b",
+                    "--mode",
+                    "semantic",
+                    "-n",
+                    "1",
+                    "--stream",
+                ],
+            )
+        assert result.exit_code == 0, result.output
+        pairs = [json.loads(line) for line in result.output.splitlines()]
+        # Source order, as the blocks complete
+        assert [p["source_id"] for p in pairs] == [
+            "trust-concept",
+            "feedback-loops",
+            "cooking-tips",
+        ]
+        assert pairs[0]["target_id"] == "psychological-safety"
@@ -0,0 +1,141 @@
+"""Tests for the cached CSR link graph and get_graph_data traversal."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pyrite.storage.backends.link_graph import LinkGraph
+from pyrite.storage.database import PyriteDB
+
+
+def _entry(entry_id, kb_name="test", entry_type="note", links=None):
+    return {
+        "id": entry_id,
+        "kb_name": kb_name,
+        "entry_type": entry_type,
+        "title": f"Title {entry_id}",
+        "body": "",
+        "tags": [],
+        "sources": [],
+        "links": links or [],
+        "metadata": {},
+    }
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = PyriteDB(Path(tmpdir) / "graph.db")
+        db.register_kb("test", "generic", "/tmp/test", "")
+        db.register_kb("other", "generic", "/tmp/other", "")
+        yield db
+        db.close()
+
+
+def _normalize(graph):
+    nodes = sorted(
+        (n["id"], n["kb_name"], n["title"], n["entry_type"], n["link_count"])
+        for n in graph["nodes"]
+    )
+    edges = sorted(
+        (e["source_id"], e["source_kb"], e["target_id"], e["target_kb"], e["relation"])
+        for e in graph["edges"]
+    )
+    return nodes, edges
+
+
+class TestLinkGraph:
+    def test_build_csr(self):
+        graph = LinkGraph.build(
+            [
+                ("a", "k", "b", "k", "related_to"),
+                ("a", "k", "c", "k", "cites"),
+                ("b", "k", "c", "k", "related_to"),
+            ],
+            [("a", "k", "A", "note"), ("b", "k", "B", "note")],
+        )
+        a, b, c = (graph.index_of(x, "k") for x in "abc")
+        assert len(graph) == 3
+        assert graph.edge_count == 3
+        assert list(graph.out_edges(a)) == [(b, "related_to"), (c, "cites")]
+        assert list(graph.in_edges(c)) == [(a, "cites"), (b, "related_to")]
+        assert graph.out_degree(a) == 2
+        assert graph.in_degree(a) == 0
+        assert graph.exists[c] == 0
+        assert graph.titles[a] == "A"
+
+    def test_unknown_node(self):
+        graph = LinkGraph.build([], [])
+        assert graph.index_of("missing", "k") is None
+        assert list(graph.iter_edges()) == []
+
+
+class TestGraphData:
+    def _setup(self, db):
+        db.upsert_entry(_entry("a", links=[{"target": "b"}, {"target": "ghost"}]))
+        db.upsert_entry(_entry("b", links=[{"target": "c"}]))
+        db.upsert_entry(_entry("c", entry_type="person", links=[{"target": "a"}]))
+        db.upsert_entry(_entry("d", links=[{"target": "c"}]))
+        db.upsert_entry(_entry("x", kb_name="other", links=[{"target": "a", "kb": "test"}]))
+        db.upsert_entry(_entry("lonely"))
+
+    def test_link_counts(self, db):
+        self._setup(db)
+        graph = db.get_graph_data(center="a", center_kb="test", depth=1)
+        counts = {n["id"]: n["link_count"] for n in graph["nodes"]}
+        assert counts["a"] == 4
+        assert counts["ghost"] == 1
+        ghost = next(n for n in graph["nodes"] if n["id"] == "ghost")
+        assert ghost["entry_type"] == "unknown"
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"center": "a", "center_kb": "test", "depth": 1},
+            {"center": "a", "center_kb": "test", "depth": 3},
+            {"center": "a", "center_kb": "test", "kb_name": "test"},
+            {"center": "b", "center_kb": "test", "entry_type": "note"},
+            {"center": "a", "center_kb": "test", "limit": 3},
+            {},
+            {"kb_name": "test"},
+            {"entry_type": "person"},
+        ],
+    )
+    def test_sql_fallback_matches_cached(self, db, monkeypatch, kwargs):
+        self._setup(db)
+        cached = db.get_graph_data(**kwargs)
+        monkeypatch.setattr(db.backend, "_GRAPH_CACHE_MAX_LINKS", 0)
+        fallback = db.get_graph_data(**kwargs)
+        assert _normalize(cached) == _normalize(fallback)
+
+    def test_graph_cached_between_calls(self, db):
+        self._setup(db)
+        db.get_graph_data(kb_name="test")
+        first = db.backend._link_graphs[("test", False)]
+        db.get_graph_data(center="a", center_kb="test")
+        assert db.backend._link_graphs[("test", False)] is first
+
+    def test_upsert_invalidates(self, db):
+        self._setup(db)
+        before = db.get_graph_data(center="lonely", center_kb="test")
+        assert len(before["nodes"]) == 1
+        db.upsert_entry(_entry("lonely", links=[{"target": "d"}]))
+        after = db.get_graph_data(center="lonely", center_kb="test")
+        assert {n["id"] for n in after["nodes"]} >= {"lonely", "d", "c"}
+
+    def test_external_write_invalidates(self, db):
+        """Writes through another connection are picked up via data_version."""
+        self._setup(db)
+        db.get_graph_data(kb_name="test")
+        other = PyriteDB(db.db_path)
+        try:
+            other.delete_entry("b", "test")
+        finally:
+            other.close()
+        graph = db.get_graph_data(kb_name="test")
+        assert "b" not in {n["id"] for n in graph["nodes"]}
+
+    def test_missing_center(self, db):
+        self._setup(db)
+        assert db.get_graph_data(center="nope", center_kb="test") == {"nodes": [], "edges": []}
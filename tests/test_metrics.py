@@ -0,0 +1,149 @@
+"""Tests for the metrics registry, span tracing and their API/MCP surfaces."""
+
+import json
+
+import pytest
+
+from pyrite import metrics
+from pyrite.config import KBConfig, PyriteConfig, Settings
+from pyrite.metrics import MetricsRegistry, configure_tracing, span, timed
+
+
+@pytest.fixture
+def config(tmp_path):
+    kb_path = tmp_path / "kb"
+    kb_path.mkdir()
+    (kb_path / "alpha.md").write_text(
+        "---\nid: alpha\ntitle: Alpha\ntype: note\n---\n\nQuantum notes.\n"
+    )
+    return PyriteConfig(
+        knowledge_bases=[KBConfig(name="test", path=kb_path, kb_type="generic")],
+        settings=Settings(index_path=tmp_path / "index.db"),
+    )
+
+
+@pytest.fixture
+def tracing(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    configure_tracing(path)
+    yield path
+    configure_tracing(None)
+
+
+def _spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestRegistry:
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("t_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+        hist.observe(0.05, stage="fts")
+        hist.observe(0.5, stage="fts")
+        hist.observe(5.0, stage="fts")
+        text = registry.render()
+        assert "# TYPE t_seconds histogram" in text
+        assert 't_seconds_bucket{stage="fts",le="0.1"} 1' in text
+        assert 't_seconds_bucket{stage="fts",le="1"} 2' in text
+        assert 't_seconds_bucket{stage="fts",le="+Inf"} 3' in text
+        assert 't_seconds_count{stage="fts"} 3' in text
+
+        series = registry.snapshot()["t_seconds"]["series"][0]
+        assert series["count"] == 3 and series["p50_le"] == 1.0 and series["p95_le"] is None
+
+    def test_labels_validated_and_escaped(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("t_total", "Test.", ("route",))
+        with pytest.raises(ValueError, match="takes labels"):
+            counter.inc(path="/x")
+        counter.inc(route='a"b')
+        assert 't_total{route="a\\"b"} 1' in registry.render()
+        assert registry.counter("t_total", "Test.", ("route",)) is counter
+        with pytest.raises(ValueError, match="another shape"):
+            registry.gauge("t_total", "Test.")
+
+    def test_queue_depths_collected(self, tmp_path):
+        from pyrite.services.embedding_worker import EmbeddingWorker
+        from pyrite.storage.database import PyriteDB
+
+        db = PyriteDB(tmp_path / "q.db")
+        try:
+            EmbeddingWorker(db).enqueue("e1", "test")
+            metrics.collect_queue_depths(db._raw_conn)
+            assert 'pyrite_embed_queue_depth{status="pending"} 1' in metrics.REGISTRY.render()
+            lock_waits = metrics.REGISTRY.snapshot("pyrite_sqlite_lock_wait")
+            sources = [
+                s["labels"]["source"]
+                for s in lock_waits["pyrite_sqlite_lock_wait_seconds"]["series"]
+            ]
+            assert "embed_queue" in sources
+        finally:
+            db.close()
+
+
+class TestTracing:
+    def test_nested_spans_share_trace(self, tracing):
+        with span("outer", kb="test"):
+            with timed("inner", metrics.SEARCH_STAGE_SECONDS, stage="fts"):
+                pass
+        inner, outer = _spans(tracing)
+        assert inner["parent_id"] == outer["span_id"]
+        assert inner["trace_id"] == outer["trace_id"]
+        assert inner["attrs"] == {"stage": "fts"}
+
+    def test_error_recorded_and_off_by_default(self, tracing):
+        with pytest.raises(KeyError), span("boom"):
+            raise KeyError("x")
+        assert _spans(tracing)[0]["error"] == "KeyError"
+        configure_tracing(None)
+        with span("quiet"):
+            pass
+        assert len(_spans(tracing)) == 1
+
+
+class TestSurfaces:
+    def test_metrics_endpoint_labels_route_template(self, config):
+        fastapi = pytest.importorskip("fastapi")  # noqa: F841
+        from fastapi.testclient import TestClient
+
+        from pyrite.server.api import create_app
+
+        client = TestClient(create_app(config=config))
+        assert client.get("/api/entries/does-not-exist").status_code == 404
+        # An ID equal to a prefix segment must not be templated into the prefix
+        assert client.get("/api/entries/api").status_code == 404
+        text = client.get("/metrics").text
+        assert 'route="/api/entries/{entry_id}"' in text
+        assert "does-not-exist" not in text
+        assert 'route="/{entry_id}' not in text
+        assert "pyrite_http_request_duration_seconds_bucket" in text
+
+    def test_metrics_endpoint_requires_admin(self, config):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from pyrite.server.api import create_app
+
+        config.settings.api_key = "secret"
+        client = TestClient(create_app(config=config))
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"X-API-Key": "secret"}).status_code == 200
+
+    def test_mcp_tool_timings_and_admin_tool(self, config):
+        from pyrite.server.mcp_server import PyriteMCPServer
+
+        server = PyriteMCPServer(config, tier="admin")
+        try:
+            server.index_mgr.index_kb("test")
+            server._dispatch_tool("kb_search", {"query": "quantum"})
+            result = server._dispatch_tool("kb_metrics", {"prefix": "pyrite_"})
+            tools = result["metrics"]["pyrite_mcp_tool_duration_seconds"]["series"]
+            assert {"tool": "kb_search", "outcome": "ok"} in [s["labels"] for s in tools]
+            stages = result["metrics"]["pyrite_search_stage_duration_seconds"]["series"]
+            assert {"stage": "fts"} in [s["labels"] for s in stages]
+
+            text = server._dispatch_tool("kb_metrics", {"format": "prometheus"})["text"]
+            assert "# TYPE pyrite_mcp_tool_duration_seconds histogram" in text
+            assert "kb_metrics" not in PyriteMCPServer(config, tier="write").tools
+        finally:
+            server.close()
@@ -7,6 +7,7 @@ import pytest
 
 from pyrite.storage.backends.overlay_backend import OverlaySearchBackend, WorktreeDB
 from pyrite.storage.database import PyriteDB
+from pyrite.storage.virtual_tables import FtsConfig
 
 
 def _make_db(path: Path) -> PyriteDB:
@@ -167,6 +168,21 @@ class TestOverlayCountEntries:
             main_db.close()
             diff_db.close()
 
+    def test_min_importance_skips_null_importance(self, tmp_path):
+        main_db = _make_db(tmp_path / "main.db")
+        diff_db = _make_db(tmp_path / "diff.db")
+        try:
+            _insert_entry(main_db, "e1", "test", "Unrated", importance=None)
+            _insert_entry(main_db, "e2", "test", "Rated", importance=3)
+            _insert_entry(diff_db, "e1", "test", "Now rated", importance=4)
+
+            overlay = OverlaySearchBackend(main_db._backend, diff_db._backend)
+            # The shadowed main row has NULL importance, so main never counted it
+            assert overlay.count_entries(kb_name="test", min_importance=0) == 2
+        finally:
+            main_db.close()
+            diff_db.close()
+
 
 class TestOverlaySearch:
     def test_search_merges_results(self, tmp_path):
@@ -305,3 +321,129 @@ class TestWorktreeDB:
         finally:
             main_db.close()
             diff_db.close()
+
+
+class _LimitSpy:
+    """Wraps a backend and records the ``limit`` of each call."""
+
+    def __init__(self, backend):
+        self._backend = backend
+        self.limits = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            if "limit" in kwargs:
+                self.limits.append((name, kwargs["limit"]))
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class TestOverlayStreamingMerge:
+    def test_list_pages_in_sort_order(self, tmp_path):
+        main_db = _make_db(tmp_path / "main.db")
+        diff_db = _make_db(tmp_path / "diff.db")
+        try:
+            for i in range(10):
+                _insert_entry(main_db, f"m{i}", "test", f"Main {i}", updated_at=f"2026-01-{i + 10}")
+            _insert_entry(diff_db, "m3", "test", "Edited 3", updated_at="2026-02-01")
+            _insert_entry(diff_db, "new", "test", "New", updated_at="2026-01-15T12:00")
+
+            main = _LimitSpy(main_db._backend)
+            overlay = OverlaySearchBackend(main, diff_db._backend)
+            ids = [e["id"] for e in overlay.list_entries(kb_name="test", limit=4, offset=1)]
+            assert ids == ["m9", "m8", "m7", "m6"]
+            ids = [e["id"] for e in overlay.list_entries(kb_name="test", limit=4, offset=5)]
+            assert ids == ["new", "m5", "m4", "m2"]
+            # Main asked for offset + limit + |shadow| rows, not everything
+            assert main.limits[-1] == ("list_entries", 5 + 4 + 2)
+
+            by_title = overlay.list_entries(kb_name="test", sort_by="title", sort_order="asc")
+            assert [e["title"] for e in by_title][:3] == ["Edited 3", "Main 0", "Main 1"]
+        finally:
+            main_db.close()
+            diff_db.close()
+
+    def test_search_and_keyset_skip_shadowed(self, tmp_path):
+        main_db = _make_db(tmp_path / "main.db")
+        diff_db = _make_db(tmp_path / "diff.db")
+        try:
+            _insert_entry(main_db, "a", "test", "Alpha research")
+            _insert_entry(main_db, "b", "test", "Beta research")
+            _insert_entry(diff_db, "b", "test", "Beta rewritten")  # no longer matches
+            overlay = OverlaySearchBackend(main_db._backend, diff_db._backend)
+            assert [e["id"] for e in overlay.search("research", kb_name="test")] == ["a"]
+            page = overlay.list_entries_after("test", None, limit=5)
+            assert [(e["id"], e["title"]) for e in page] == [
+                ("a", "Alpha research"),
+                ("b", "Beta rewritten"),
+            ]
+        finally:
+            main_db.close()
+            diff_db.close()
+
+    def test_substring_search_skips_shadowed(self, tmp_path):
+        main_db = _make_db(tmp_path / "main.db")
+        diff_db = _make_db(tmp_path / "diff.db")
+        try:
+            _insert_entry(main_db, "a", "test", "Alpha", body="the bloodhound gang")
+            _insert_entry(main_db, "b", "test", "Beta", body="a hound at rest")
+            _insert_entry(diff_db, "b", "test", "Beta", body="rewritten")
+            _insert_entry(diff_db, "c", "test", "Gamma", body="foxhound")
+            overlay = OverlaySearchBackend(main_db._backend, diff_db._backend)
+            hits = overlay.search_substring("hound", kb_name="test")
+            assert [e["id"] for e in hits] == ["a", "c"]
+        finally:
+            main_db.close()
+            diff_db.close()
+
+
+class TestOverlayFtsConfig:
+    def test_reads_main_writes_diff(self, tmp_path):
+        main_db = _make_db(tmp_path / "main.db")
+        diff_db = _make_db(tmp_path / "diff.db")
+        try:
+            overlay = OverlaySearchBackend(main_db._backend, diff_db._backend)
+            assert overlay.get_fts_config() == main_db._backend.get_fts_config()
+            assert overlay.configure_fts(FtsConfig(trigram=True)) is True
+            assert diff_db._backend.get_fts_config().trigram is True
+            assert main_db._backend.get_fts_config().trigram is False
+        finally:
+            main_db.close()
+            diff_db.close()
+
+
+class TestOverlayTombstones:
+    def test_delete_hides_main_entry_until_rewritten(self, tmp_path):
+        main_db = _make_db(tmp_path / "main.db")
+        diff_db = _make_db(tmp_path / "diff.db")
+        try:
+            _insert_entry(main_db, "e1", "test", "Doomed research", tags=["x"])
+            _insert_entry(main_db, "e2", "test", "Kept research", tags=["x"])
+            _ensure_kb(diff_db, "test")
+            overlay = OverlaySearchBackend(main_db._backend, diff_db._backend)
+
+            assert overlay.delete_entry("e1", "test") is True
+            assert main_db._backend.get_entry("e1", "test") is not None
+            assert overlay.get_entry("e1", "test") is None
+            assert [e["id"] for e in overlay.get_entries([("e1", "test"), ("e2", "test")])] == [
+                "e2"
+            ]
+            assert [e["id"] for e in overlay.list_entries(kb_name="test")] == ["e2"]
+            assert [e["id"] for e in overlay.search("research")] == ["e2"]
+            assert [e["id"] for e in overlay.search_by_tag("x")] == ["e2"]
+            assert overlay.count_entries(kb_name="test") == 1
+            assert overlay.count_entries(kb_name="test", tag="x") == 1
+
+            _insert_entry(diff_db, "e1", "test", "Restored")
+            overlay.upsert_entry(diff_db._backend.get_entry("e1", "test") | {"tags": []})
+            assert overlay.get_entry("e1", "test")["title"] == "Restored"
+            assert diff_db._backend.get_tombstones() == set()
+            assert overlay.count_entries(kb_name="test") == 2
+        finally:
+            main_db.close()
+            diff_db.close()
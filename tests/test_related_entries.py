@@ -0,0 +1,211 @@
+"""Tests for the persisted related_entry index."""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pyrite.services.graph_service import GraphService
+from pyrite.storage.backends.related_index import RelatedScoring, entry_terms, top_related
+from pyrite.storage.database import PyriteDB
+from pyrite.storage.migrations import MigrationManager
+
+
+def _entry(entry_id, tags=(), actors=(), links=(), kb_name="test"):
+    return {
+        "id": entry_id,
+        "kb_name": kb_name,
+        "entry_type": "event",
+        "title": f"Title {entry_id}",
+        "body": "",
+        "date": "2025-01-01",
+        "tags": list(tags),
+        "sources": [],
+        "links": [{"target": t} for t in links],
+        "metadata": {"actors": list(actors)} if actors else {},
+    }
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = PyriteDB(Path(tmpdir) / "related.db")
+        db.register_kb("test", "generic", "/tmp/test", "")
+        yield db
+        db.close()
+
+
+def _ids(db, entry_id):
+    return [r["id"] for r in db.get_related_entries(entry_id, "test", limit=10)]
+
+
+def _stored(db):
+    rows = db.backend._exec(
+        "SELECT entry_id, related_id, score, rank FROM related_entry ORDER BY entry_id, rank"
+    )
+    return [(r["entry_id"], r["related_id"], r["score"], r["rank"]) for r in rows]
+
+
+def _populate(db):
+    db.upsert_entry(_entry("a", tags=["x", "y"], actors=["Alice"]))
+    db.upsert_entry(_entry("b", tags=["x"], actors=["Alice"]))
+    db.upsert_entry(_entry("c", tags=["x", "y"]))
+    db.upsert_entry(_entry("d", tags=["z"], links=["a"]))
+    db.upsert_entry(_entry("e", tags=["z", "x"]))
+    for i in range(20):
+        db.upsert_entry(_entry(f"filler{i}", tags=[f"solo{i}"]))
+    db.refresh_related_entries()
+
+
+class TestScoringHelpers:
+    def test_entry_terms(self):
+        terms = entry_terms({"tags": ["t", "t", ""], "metadata": '{"participants": ["P", null]}'})
+        assert terms == [("actor", "P"), ("tag", "t")]
+
+    def test_actors_win_over_participants(self):
+        terms = entry_terms({"metadata": {"actors": ["A"], "participants": ["P"]}})
+        assert terms == [("actor", "A")]
+
+    def test_top_related_ties_by_id(self):
+        assert top_related({"b": 1.0, "a": 1.0, "c": 2.0, "z": 0.0}, 5) == [
+            ("c", 2.0),
+            ("a", 1.0),
+            ("b", 1.0),
+        ]
+
+    def test_scoring_json_round_trip(self):
+        scoring = RelatedScoring(tag_weight=0.5, limit=3)
+        assert RelatedScoring.from_json(scoring.to_json()) == scoring
+        assert RelatedScoring.from_json("not json") == RelatedScoring()
+
+
+class TestRelatedIndex:
+    def test_scores_and_order(self, db):
+        _populate(db)
+        related = db.get_related_entries("a", "test")
+        assert [r["id"] for r in related] == ["b", "c", "e"]
+        assert [r["score"] for r in related] == [3.0, 2.0, 1.0]
+        assert related[0]["title"] == "Title b"
+
+    def test_links_excluded_both_ways(self, db):
+        _populate(db)
+        assert "d" not in _ids(db, "a")
+        assert "a" not in _ids(db, "d")
+
+    def test_writes_refresh(self, db):
+        _populate(db)
+        db.upsert_entry(_entry("f", tags=["x", "y"], actors=["Alice"]))
+        assert "f" in _ids(db, "a")
+        db.delete_entry("f", "test")
+        assert "f" not in _ids(db, "a")
+        assert db.backend._exec_scalar("SELECT COUNT(*) FROM related_dirty") == 0
+
+    def test_deferred_refresh(self, db):
+        _populate(db)
+        with db.deferred_related_refresh("test"):
+            db.upsert_entry(_entry("f", tags=["x", "y"], actors=["Alice"]))
+            assert "f" not in _ids(db, "a")
+            assert db.backend._exec_scalar("SELECT COUNT(*) FROM related_dirty") == 1
+        assert "f" in _ids(db, "a")
+
+    def test_incremental_matches_rebuild(self, db):
+        _populate(db)
+        with db.deferred_related_refresh("test"):
+            db.upsert_entry(_entry("b", tags=["y"], actors=["Bob"]))
+            db.upsert_entry(_entry("f", tags=["y", "z"], actors=["Alice"]))
+            db.delete_entry("c", "test")
+            db.upsert_entry(_entry("e", tags=["z", "x"], links=["b"]))
+            assert db.refresh_related_entries("test") < 25  # not a full rebuild
+        incremental = _stored(db)
+        db.rebuild_related_entries("test")
+        assert _stored(db) == incremental
+        assert "c" not in {r[1] for r in incremental}
+
+    def test_common_terms_capped(self, db):
+        _populate(db)
+        db.configure_related_scoring(RelatedScoring(max_term_entries=3))
+        db.refresh_related_entries()
+        # "x" is on four entries, so only the actor and "y" still count for a.
+        assert _ids(db, "a") == ["b", "c"]
+
+    def test_term_crossing_cap_requeues_holders(self, db):
+        db.configure_related_scoring(RelatedScoring(max_term_entries=3))
+        for i in range(20):  # keep single-entry refreshes incremental
+            db.upsert_entry(_entry(f"filler{i}", tags=[f"solo{i}"]))
+        for entry_id in ("a", "b", "c"):
+            db.upsert_entry(_entry(entry_id, tags=["x"]))
+        assert _ids(db, "a") == ["b", "c"]
+        db.upsert_entry(_entry("d", tags=["x"]))
+        assert _ids(db, "a") == []
+        db.delete_entry("d", "test")
+        assert _ids(db, "a") == ["b", "c"]
+        incremental = _stored(db)
+        db.rebuild_related_entries("test")
+        assert _stored(db) == incremental
+
+    def test_scoring_change_requeues(self, db):
+        _populate(db)
+        assert db.configure_related_scoring(RelatedScoring(actor_weight=0.0)) is True
+        assert db.configure_related_scoring(RelatedScoring(actor_weight=0.0)) is False
+        db.refresh_related_entries()
+        related = db.get_related_entries("a", "test")
+        assert [(r["id"], r["score"]) for r in related] == [("c", 2.0), ("b", 1.0), ("e", 1.0)]
+
+    def test_limit_stored(self, db):
+        for i in range(5):
+            db.upsert_entry(_entry(f"n{i}", tags=["shared"]))
+        db.configure_related_scoring(RelatedScoring(limit=2))
+        db.refresh_related_entries()
+        assert all(rank < 2 for _, _, _, rank in _stored(db))
+
+    def test_all_related_for_kb(self, db):
+        _populate(db)
+        related = db.get_all_related_for_kb("test", limit=2)
+        assert [r["id"] for r in related["a"]] == ["b", "c"]
+        assert "filler0" not in related
+
+    def test_graph_service(self, db):
+        _populate(db)
+        assert [r["id"] for r in GraphService(db).get_related_entries("b", "test")] == [
+            "a",
+            "c",
+            "e",
+        ]
+
+
+class TestRelatedMigration:
+    def test_v21_seeds_existing_entries(self):
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(
+            """
+            CREATE TABLE entry (id TEXT, kb_name TEXT, metadata TEXT,
+                                PRIMARY KEY (id, kb_name));
+            CREATE TABLE tag (id INTEGER PRIMARY KEY, name TEXT);
+            CREATE TABLE entry_tag (entry_id TEXT, kb_name TEXT, tag_id INTEGER);
+            INSERT INTO entry VALUES ('a', 'k', '{"actors": ["Alice"]}'),
+                                     ('b', 'k', '{"participants": ["Bob"]}'),
+                                     ('c', 'k', 'not json');
+            INSERT INTO tag VALUES (1, 'x');
+            INSERT INTO entry_tag VALUES ('c', 'k', 1);
+            """
+        )
+        mgr = MigrationManager(conn)
+        conn.execute("INSERT INTO schema_version VALUES (20, 'seed', '2025-01-01T00:00:00')")
+        mgr.migrate()
+        terms = conn.execute(
+            "SELECT entry_id, kind, value FROM related_term ORDER BY entry_id"
+        ).fetchall()
+        assert terms == [("a", "actor", "Alice"), ("b", "actor", "Bob"), ("c", "tag", "x")]
+        assert conn.execute("SELECT COUNT(*) FROM related_dirty").fetchone()[0] == 3
+
+
+def test_mcp_tool(db):
+    from pyrite.server.mcp_server import PyriteMCPServer
+
+    _populate(db)
+    server = PyriteMCPServer.__new__(PyriteMCPServer)
+    server.graph_svc = GraphService(db)
+    result = server._kb_related({"entry_id": "a", "kb_name": "test", "limit": 2})
+    assert result["count"] == 2
+    assert [r["id"] for r in result["related"]] == ["b", "c"]
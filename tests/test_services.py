@@ -118,6 +118,7 @@ class TestSearchService:
         assert SearchMode.KEYWORD.value == "keyword"
         assert SearchMode.SEMANTIC.value == "semantic"
         assert SearchMode.HYBRID.value == "hybrid"
+        assert SearchMode.SUBSTRING.value == "substring"
 
     def test_search_mode_from_string(self):
         """SearchMode can be created from string."""
@@ -151,12 +152,46 @@ class TestSearchService:
         results = service.search("test", mode=SearchMode.SEMANTIC)
         assert isinstance(results, list)
 
+    def test_search_substring_mode(self, test_db, test_config):
+        """Substring mode matches text inside words that FTS tokens miss."""
+        test_db.register_kb("test-research", "research", "/tmp/research", "")
+        for entry_id, title in [("q1", "Quantumness"), ("q2", "Subquantum"), ("c", "Classical")]:
+            test_db.upsert_entry(
+                {"id": entry_id, "kb_name": "test-research", "entry_type": "note", "title": title}
+            )
+        service = SearchService(test_db)
+        results = service.search("quantum", mode="substring")
+        assert [r["id"] for r in results] == ["q1", "q2"]
+        assert [r["id"] for r in service.search("quantum", mode="substring", offset=1)] == ["q2"]
+
     def test_search_invalid_mode_falls_back(self, test_db, test_config):
         """Invalid mode string falls back to keyword."""
         service = SearchService(test_db)
         results = service.search("test", mode="invalid_mode")
         assert isinstance(results, list)
 
+    def test_hybrid_search_uses_backend_fusion(self, test_db, test_config):
+        """Backends that fuse server-side get the whole hybrid query with its filters."""
+        from unittest.mock import MagicMock, patch
+
+        service = SearchService(test_db)
+        fused = [{"id": "e1", "kb_name": "test", "rrf_score": 0.03}]
+        search_hybrid = MagicMock(return_value=fused)
+        with (
+            patch.object(test_db.backend, "supports_hybrid_search", True, create=True),
+            patch.object(test_db.backend, "search_hybrid", search_hybrid, create=True),
+            patch.object(test_db, "search") as keyword_search,
+        ):
+            results = service.search(
+                "alex-jones", mode=SearchMode.HYBRID, entry_type="event", limit=5, offset=5
+            )
+        assert results == fused
+        keyword_search.assert_not_called()
+        kwargs = search_hybrid.call_args.kwargs
+        assert kwargs["query"] == '"alex-jones"'
+        assert kwargs["embedding"] is None  # no embeddings stored
+        assert (kwargs["entry_type"], kwargs["limit"], kwargs["offset"]) == ("event", 5, 5)
+
     def test_hybrid_search_offset_returns_correct_page(self, test_db, test_config):
         """Hybrid search with offset returns the correct page of fused results."""
         from unittest.mock import patch
@@ -1228,3 +1228,185 @@ class TestSiteCacheBranding:
         cache_env["svc"].render_all()
         html = (cache_env["cache_dir"] / "index.html").read_text()
         assert "Pyrite Knowledge Base" in html
+
+
+def _note(entry_id, body="", links=(), title=None):
+    return {
+        "id": entry_id,
+        "kb_name": "test-kb",
+        "entry_type": "note",
+        "title": title or entry_id.title(),
+        "body": body,
+        "summary": "",
+        "tags": [],
+        "sources": [],
+        "links": [{"target": t, "relation": "related_to"} for t in links],
+        "metadata": {},
+    }
+
+
+class TestIncrementalRender:
+    def test_second_run_renders_nothing(self, cache_env):
+        first = cache_env["svc"].render_all()
+        assert first["rendered"] == first["written"] > 0
+        second = cache_env["svc"].render_all()
+        assert second["entries"] == 2
+        assert second["rendered"] == 0
+        assert second["written"] == 0
+
+    def test_fresh_service_reuses_graph(self, cache_env):
+        cache_env["svc"].render_all()
+        svc = SiteCacheService(cache_env["svc"].config, cache_env["db"])
+        assert svc.render_all()["rendered"] == 0
+
+    def test_title_change_rerenders_backlink_page(self, cache_env):
+        svc, db = cache_env["svc"], cache_env["db"]
+        svc.render_all()
+        target = cache_env["cache_dir"] / "test-kb" / "wikilink.html"
+        db.upsert_entry(
+            _note("hello-world", "This is a test entry with a [[wikilink]].", ["wikilink"], "Hi")
+        )
+        stats = svc.render_all()
+        # hello-world itself, the page that shows it as a backlink, and the indexes
+        assert stats["rendered"] == 4
+        assert ">Hi</a>" in target.read_text()
+
+    def test_identical_output_not_rewritten(self, cache_env):
+        svc = cache_env["svc"]
+        svc.render_all()
+        page = cache_env["cache_dir"] / "test-kb" / "wikilink.html"
+        page_mtime = page.stat().st_mtime_ns
+        stats = svc.render_all(force=True)
+        assert stats["rendered"] > 0
+        assert stats["written"] == 0
+        assert page.stat().st_mtime_ns == page_mtime
+
+    def test_deleted_entry_page_removed(self, cache_env):
+        svc = cache_env["svc"]
+        svc.render_all()
+        cache_env["db"].delete_entry("wikilink", "test-kb")
+        svc.render_all()
+        assert not (cache_env["cache_dir"] / "test-kb" / "wikilink.html").exists()
+        assert "test-kb/wikilink.html" not in svc.graph.pages
+
+    def test_invalidate_entry_drops_dependent_pages(self, cache_env):
+        svc = cache_env["svc"]
+        svc.render_all()
+        kb_dir = cache_env["cache_dir"] / "test-kb"
+        svc.invalidate_entry("wikilink", "test-kb")
+        assert not (kb_dir / "wikilink.html").exists()
+        assert not (kb_dir / "hello-world.html").exists()  # shows wikilink as an outlink
+        assert not (kb_dir / "page" / "1.html").exists()
+        assert (cache_env["cache_dir"] / "index.html").exists()
+        stats = svc.render_all()
+        assert stats["rendered"] == 4
+        assert (kb_dir / "hello-world.html").exists()
+
+    def test_kb_walked_in_keyset_batches(self, cache_env, monkeypatch):
+        from pyrite.services import site_cache
+
+        for i in range(5):
+            cache_env["db"].upsert_entry(_note(f"extra-{i}"))
+        monkeypatch.setattr(site_cache, "_ENTRY_BATCH", 2)
+        stats = cache_env["svc"].render_all()
+        assert stats["entries"] == 7
+        html = (cache_env["cache_dir"] / "test-kb" / "index.html").read_text()
+        assert "7 entries" in html
+
+    def test_process_pool_render(self, cache_env, monkeypatch):
+        from pyrite.services import site_cache
+
+        cache_env["svc"].config.settings.site_render_workers = 2
+        monkeypatch.setattr(site_cache, "_POOL_MIN_JOBS", 1)
+        stats = cache_env["svc"].render_all()
+        assert stats["errors"] == 0
+        assert stats["entries"] == 2
+        html = (cache_env["cache_dir"] / "test-kb" / "hello-world.html").read_text()
+        assert "Wikilink Target" in html
+
+
+class TestListEntriesAfter:
+    def test_keyset_pages(self, cache_env):
+        db = cache_env["db"]
+        for i in range(3):
+            db.upsert_entry(_note(f"extra-{i}"))
+        first = db.list_entries_after("test-kb", limit=2)
+        assert [e["id"] for e in first] == ["extra-0", "extra-1"]
+        rest = db.list_entries_after("test-kb", after_id="extra-1", limit=10)
+        assert [e["id"] for e in rest] == ["extra-2", "hello-world", "wikilink"]
+        assert sorted(rest[1]["tags"]) == ["demo", "test"]
+        batches = list(db.iter_kb_entries("test-kb", batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+
+class TestPrecompressedServing:
+    @pytest.fixture
+    def client(self, cache_env, monkeypatch):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from pyrite.server.static import mount_site_routes
+
+        cache_env["svc"].render_all()
+        monkeypatch.setenv("PYRITE_DATA_DIR", str(cache_env["cache_dir"].parent))
+        app = FastAPI()
+        mount_site_routes(app)
+        return TestClient(app)
+
+    def test_siblings_and_manifest_written(self, cache_env):
+        import gzip
+        import json
+
+        cache_env["svc"].render_all()
+        page = cache_env["cache_dir"] / "test-kb" / "hello-world.html"
+        gz = page.with_name("hello-world.html.gz")
+        assert gzip.decompress(gz.read_bytes()) == page.read_bytes()
+        manifest = json.loads((cache_env["cache_dir"] / "_manifest.json").read_text())
+        record = manifest["pages"]["test-kb/hello-world.html"]
+        assert "gz" in record["encodings"]
+        assert record["modified"] > 0
+
+    def test_removed_page_drops_siblings(self, cache_env):
+        cache_env["svc"].render_all()
+        cache_env["svc"].invalidate_entry("hello-world", "test-kb")
+        assert not (cache_env["cache_dir"] / "test-kb" / "hello-world.html.gz").exists()
+
+    def test_gzip_negotiated(self, client):
+        resp = client.get("/site/test-kb/hello-world", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert "Hello World" in resp.text  # httpx decodes the body
+
+    def test_identity_when_not_accepted(self, client):
+        resp = client.get("/site/test-kb/hello-world", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.headers["etag"].startswith('"')
+
+    def test_conditional_get_returns_304(self, client, cache_env):
+        first = client.get("/site/test-kb", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["etag"]
+        # The manifest alone answers revalidation, even if the page is gone
+        (cache_env["cache_dir"] / "test-kb" / "index.html").unlink()
+        resp = client.get("/site/test-kb", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        resp = client.get(
+            "/site/test-kb", headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+        assert resp.status_code == 304
+
+    def test_stale_etag_gets_body(self, client):
+        resp = client.get("/site", headers={"If-None-Match": '"deadbeef"'})
+        assert resp.status_code == 200
+        assert "Knowledge Bases" in resp.text
+
+
+def test_pick_encoding():
+    from pyrite.server.static import _pick_encoding
+
+    assert _pick_encoding("gzip, br", ["br", "gz"]) == "br"
+    assert _pick_encoding("br;q=0.5, gzip", ["br", "gz"]) == "gz"
+    assert _pick_encoding("*", ["gz"]) == "gz"
+    assert _pick_encoding("gzip;q=0", ["gz"]) is None
+    assert _pick_encoding("", ["br", "gz"]) is None
@@ -764,6 +764,74 @@ class TestDDLDefaultValidation:
             db._create_table_from_def(table_def)
 
 
+class TestDerivedTables:
+    """Trigger-maintained plugin tables are installed, versioned and removed with the schema."""
+
+    @pytest.fixture
+    def db(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = PyriteDB(Path(tmpdir) / "test.db")
+            db.register_kb("test", "generic", tmpdir, "")
+            yield db
+            db.close()
+
+    @staticmethod
+    def _definition(version=1):
+        schema = """
+            CREATE TABLE title_count (kb_name TEXT PRIMARY KEY, n INTEGER NOT NULL);
+            CREATE TRIGGER title_count_ai AFTER INSERT ON entry BEGIN
+                INSERT OR REPLACE INTO title_count
+                SELECT new.kb_name, COUNT(*) FROM entry WHERE kb_name = new.kb_name;
+            END;
+        """
+
+        def backfill(conn):
+            conn.execute(
+                "INSERT INTO title_count SELECT kb_name, COUNT(*) FROM entry GROUP BY kb_name"
+            )
+
+        return {"name": "title_count", "version": version, "schema": schema, "backfill": backfill}
+
+    @staticmethod
+    def _objects(db):
+        rows = db._raw_conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'title_count%'")
+        return {r[0] for r in rows}
+
+    def _entry(self, db, entry_id):
+        db.upsert_entry(
+            {"id": entry_id, "kb_name": "test", "entry_type": "note", "title": entry_id}
+        )
+
+    def test_install_backfills_then_triggers_maintain(self, db):
+        self._entry(db, "a")
+        db._sync_derived_tables([self._definition()])
+        assert self._objects(db) == {"title_count", "title_count_ai"}
+        self._entry(db, "b")
+        assert db._raw_conn.execute("SELECT n FROM title_count").fetchone()[0] == 2
+
+        db._sync_derived_tables([self._definition()])  # already installed: untouched
+        assert db._raw_conn.execute("SELECT n FROM title_count").fetchone()[0] == 2
+
+    def test_version_bump_reinstalls(self, db):
+        db._sync_derived_tables([self._definition()])
+        self._entry(db, "a")
+        db._raw_conn.execute("UPDATE title_count SET n = 99")
+        db._sync_derived_tables([self._definition(version=2)])
+        assert db._raw_conn.execute("SELECT n FROM title_count").fetchone()[0] == 1
+
+    def test_removed_definition_dropped(self, db):
+        db._sync_derived_tables([self._definition()])
+        db._sync_derived_tables([])
+        assert self._objects(db) == set()
+        self._entry(db, "a")  # writes no longer touch the dropped table
+
+    def test_failed_install_leaves_nothing(self, db):
+        broken = dict(self._definition(), schema="CREATE TABLE title_count_x (a); CREATE NONSENSE;")
+        db._sync_derived_tables([broken])
+        assert self._objects(db) == set()
+        assert db._raw_conn.execute("SELECT COUNT(*) FROM plugin_derived_table").fetchone()[0] == 0
+
+
 class TestIndexedAtOnInsert:
     """Regression: `upsert_entry` INSERT path must write a real timestamp
     into `indexed_at`, never the literal string 'CURRENT_TIMESTAMP'.
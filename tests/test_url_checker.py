@@ -1,6 +1,9 @@
 """Tests for URL liveness checking service."""
 
 import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -143,3 +146,112 @@ class TestURLChecker:
         loaded = checker.load_cache()
         assert "https://example.com/good" in loaded
         assert loaded["https://example.com/good"].ok
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """HEAD-only stub: /slow sleeps, /etag revalidates, /flaky fails once."""
+
+    def do_HEAD(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("If-None-Match")))
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.2)
+                self._reply(200)
+            elif self.path == "/etag":
+                if self.headers.get("If-None-Match") == '"v1"':
+                    self._reply(304)
+                else:
+                    self._reply(200, ETag='"v1"')
+            elif self.path == "/flaky" and hits == 1:
+                self._reply(503, **{"Retry-After": "0"})
+            elif self.path == "/missing":
+                self._reply(404)
+            else:
+                self._reply(200)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, status, **headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.requests, server.hits = [], {}
+    server.in_flight = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestConcurrentChecks:
+    """End-to-end checks against a local stub HTTP server."""
+
+    def _base(self, server, host="127.0.0.1"):
+        return f"http://{host}:{server.server_address[1]}"
+
+    def test_parallel_with_per_host_limit(self, setup, stub_server):
+        base = self._base(stub_server)
+        urls = [f"{base}/slow/{i}" for i in range(6)]
+        checker = URLChecker(setup["db"], max_concurrent=8, per_host=3, host_delay=0)
+        start = time.monotonic()
+        results = checker.check_urls(urls, use_cache=False)
+        elapsed = time.monotonic() - start
+        assert [r.url for r in results] == urls and all(r.ok for r in results)
+        assert stub_server.peak <= 3
+        # Serial would take 6 * 0.2s; three lanes take about 0.4s
+        assert elapsed < 1.0
+
+    def test_slow_host_does_not_block_others(self, setup, stub_server):
+        slow = [f"{self._base(stub_server)}/slow/{i}" for i in range(4)]
+        fast = [f"{self._base(stub_server, 'localhost')}/fast/{i}" for i in range(4)]
+        checker = URLChecker(setup["db"], max_concurrent=3, per_host=1, host_delay=0)
+        results = checker.check_urls(slow + fast, use_cache=False)
+        assert all(r.ok for r in results)
+        paths = [path for path, _ in stub_server.requests]
+        # The slow host holds one lane; the fast host finishes meanwhile
+        assert paths.index("/fast/3") < paths.index("/slow/1")
+
+    def test_retries_transient_failures(self, setup, stub_server):
+        base = self._base(stub_server)
+        checker = URLChecker(setup["db"], backoff=0.01, host_delay=0)
+        results = checker.check_urls([f"{base}/flaky", f"{base}/missing"], use_cache=False)
+        assert [(r.status_code, r.ok) for r in results] == [(200, True), (404, False)]
+        assert stub_server.hits == {"/flaky": 2, "/missing": 1}
+
+    def test_conditional_revalidation(self, setup, stub_server):
+        url = f"{self._base(stub_server)}/etag"
+        cache_path = setup["tmp_path"] / "url_cache.json"
+        checker = URLChecker(setup["db"], cache_path=cache_path, host_delay=0)
+        [first] = checker.check_urls([url])
+        assert first.ok and first.etag == '"v1"'
+        assert json.loads(cache_path.read_text())[url]["etag"] == '"v1"'
+
+        # Fresh cache entries cost nothing
+        checker.check_urls([url])
+        assert len(stub_server.requests) == 1
+
+        # Stale ones are revalidated: one conditional request answered 304
+        checker.cache_max_age = 0
+        [second] = checker.check_urls([url])
+        assert stub_server.requests[-1] == ("/etag", '"v1"')
+        assert (second.status_code, second.ok, second.etag) == (200, True, '"v1"')
+        assert second.checked_at >= first.checked_at
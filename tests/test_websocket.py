@@ -0,0 +1,66 @@
+"""Tests for WebSocket topic subscriptions, coalescing and per-connection queues."""
+
+import asyncio
+import json
+
+import pytest
+
+from pyrite.server.websocket import _RESYNC, _Client, broadcast_event, manager
+
+
+@pytest.fixture
+def ws_client(rest_api_env):
+    with rest_api_env["client"].websocket_connect("/ws") as ws:
+        yield ws
+
+
+class TestTopicFanOut:
+    def test_subscription_filters_and_coalesces_burst(self, ws_client):
+        ws_client.send_text(json.dumps({"action": "subscribe", "kb": ["a"]}))
+        assert ws_client.receive_json()["topics"]["kb"] == ["a"]
+
+        for _ in range(50):
+            broadcast_event("entry_updated", entry_id="e1", kb_name="a")
+        broadcast_event("entry_updated", entry_id="x", kb_name="b")
+        broadcast_event("entry_created", entry_id="e2", kb_name="a")
+
+        message = ws_client.receive_json()
+        assert message["type"] == "changes"
+        assert [(e["type"], e["entry_id"]) for e in message["events"]] == [
+            ("entry_updated", "e1"),
+            ("entry_created", "e2"),
+        ]
+
+    def test_unsubscribed_client_gets_plain_events_from_sync_endpoint(
+        self, rest_api_env, ws_client
+    ):
+        resp = rest_api_env["client"].post(
+            "/api/entries",
+            json={"kb": "test-events", "title": "WS note", "body": "Body", "entry_type": "note"},
+        )
+        assert resp.status_code == 200
+        event = ws_client.receive_json()
+        assert event["type"] == "entry_created"
+        assert event["entry_id"] == resp.json()["id"]
+        assert event["entry_type"]
+
+    def test_entry_topic_and_unsubscribe(self, ws_client):
+        ws_client.send_text(json.dumps({"action": "subscribe", "entry_id": ["e1", "e2"]}))
+        ws_client.receive_json()
+        ws_client.send_text(json.dumps({"action": "unsubscribe", "entry_id": "e1"}))
+        assert ws_client.receive_json()["topics"]["entry_id"] == ["e2"]
+
+        broadcast_event("entry_updated", entry_id="e1", kb_name="a")
+        broadcast_event("entry_deleted", entry_id="e2", kb_name="a")
+        assert ws_client.receive_json()["entry_id"] == "e2"
+
+
+def test_overflowing_queue_collapses_to_resync():
+    async def run():
+        client = _Client(ws=None, queue_size=3)
+        for i in range(5):
+            client.offer(f"m{i}")
+        return [client.queue.get_nowait() for _ in range(client.queue.qsize())]
+
+    assert asyncio.run(run()) == [_RESYNC, "m4"]
+    assert manager.connection_count == 0
@@ -1,6 +1,11 @@
 """Tests for pyrite.utils.yaml round-trip YAML utilities."""
 
-from pyrite.utils.yaml import dump_yaml, dump_yaml_file, load_yaml, load_yaml_file
+import datetime
+
+import pytest
+import yaml
+
+from pyrite.utils.yaml import dump_yaml, dump_yaml_file, load_yaml, load_yaml_fast, load_yaml_file
 
 
 class TestLoadYaml:
@@ -37,6 +42,46 @@ class TestLoadYaml:
         assert list(result.items()) == [("a", 1), ("b", 2)]
 
 
+class TestLoadYamlFast:
+    def test_matches_round_trip_scalars(self):
+        text = (
+            "a: yes\nb: on\nc: 010\nd: 1:30\ne: 1e3\nf: 2025-01-01\ng: 0o17\n"
+            "h: 0x1F\ni: TRUE\nj: NO\nk: 1_000\nl: ~\nm: -2.5\nn: [1, two]"
+        )
+        fast = load_yaml_fast(text)
+        assert fast == load_yaml(text)
+        assert fast["a"] == "yes"
+        assert fast["c"] == 10
+        assert fast["f"] == datetime.date(2025, 1, 1)
+        assert type(fast) is dict
+
+    def test_load_empty(self):
+        assert load_yaml_fast("") == {}
+        assert load_yaml_fast("  \n") == {}
+
+    def test_preserves_order_and_merge_keys(self):
+        result = load_yaml_fast("z: 1\na: &b {x: 1, y: 2}\nm:\n  <<: *b\n  x: 3")
+        assert list(result) == ["z", "a", "m"]
+        assert result["m"] == {"x": 3, "y": 2}
+
+    def test_duplicate_keys_rejected(self):
+        with pytest.raises(yaml.YAMLError):
+            load_yaml_fast("a: 1\na: 2")
+
+    def test_repository_reads_use_fast_path(self, tmp_path):
+        from pyrite.config import KBConfig
+        from pyrite.storage.repository import KBRepository
+
+        (tmp_path / "renamed.md").write_text(
+            "---\nid: adr-0001\ntype: note\ntitle: Decision\nstatus: on\n---\n\nBody\n"
+        )
+        repo = KBRepository(KBConfig(name="t", path=tmp_path, kb_type="generic"))
+        assert repo.find_file("adr-0001") == tmp_path / "renamed.md"
+        entry = repo.load("adr-0001")
+        assert entry.title == "Decision"
+        assert entry.body == "Body"
+
+
 class TestDumpYaml:
     def test_dump_simple(self):
         data = {"title": "Hello", "tags": ["a", "b"]}
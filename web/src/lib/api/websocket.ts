@@ -2,13 +2,23 @@
  * WebSocket client for multi-tab awareness.
  *
  * Auto-connects on init, auto-reconnects with exponential backoff.
- * Dispatches custom events for entry changes.
+ * Dispatches custom events for entry changes. The server coalesces bursts
+ * into `changes` batches, which are unpacked here, and sends `resync` when
+ * a client fell too far behind to replay individual changes.
  */
 
 export interface WSEvent {
-	type: 'entry_created' | 'entry_updated' | 'entry_deleted' | 'kb_synced';
+	type: 'entry_created' | 'entry_updated' | 'entry_deleted' | 'kb_synced' | 'resync';
 	entry_id: string;
 	kb_name: string;
+	entry_type?: string;
+}
+
+/** Topics to receive; an empty subscription receives everything */
+export interface WSTopics {
+	kb?: string[];
+	entry_type?: string[];
+	entry_id?: string[];
 }
 
 type WSEventHandler = (event: WSEvent) => void;
@@ -22,6 +32,7 @@ class WebSocketClient {
 	private shouldConnect = false;
 	private _connected = false;
 	private statusListeners: Set<(connected: boolean) => void> = new Set();
+	private topics: WSTopics = {};
 
 	constructor() {
 		const protocol = typeof window !== 'undefined' && window.location.protocol === 'https:' ? 'wss:' : 'ws:';
@@ -59,12 +70,16 @@ class WebSocketClient {
 			this.ws.onopen = () => {
 				this.reconnectDelay = 1000;
 				this.setConnected(true);
+				this.sendTopics('subscribe', this.topics);
 			};
 
 			this.ws.onmessage = (event) => {
 				try {
-					const data: WSEvent = JSON.parse(event.data);
-					this.handlers.forEach((handler) => handler(data));
+					const data = JSON.parse(event.data);
+					const events: WSEvent[] = data.type === 'changes' ? data.events : [data];
+					for (const ev of events) {
+						this.handlers.forEach((handler) => handler(ev));
+					}
 				} catch {
 					// Ignore malformed messages
 				}
@@ -94,6 +109,29 @@ class WebSocketClient {
 		this.setConnected(false);
 	}
 
+	/** Receive only events for these topics (kept across reconnects) */
+	subscribe(topics: WSTopics) {
+		for (const key of ['kb', 'entry_type', 'entry_id'] as const) {
+			const merged = new Set([...(this.topics[key] ?? []), ...(topics[key] ?? [])]);
+			if (merged.size) this.topics[key] = [...merged];
+		}
+		this.sendTopics('subscribe', topics);
+	}
+
+	unsubscribe(topics: WSTopics) {
+		for (const key of ['kb', 'entry_type', 'entry_id'] as const) {
+			const removed = new Set(topics[key] ?? []);
+			this.topics[key] = (this.topics[key] ?? []).filter((t) => !removed.has(t));
+		}
+		this.sendTopics('unsubscribe', topics);
+	}
+
+	private sendTopics(action: 'subscribe' | 'unsubscribe', topics: WSTopics) {
+		if (this.ws?.readyState !== WebSocket.OPEN) return;
+		if (!Object.values(topics).some((values) => values?.length)) return;
+		this.ws.send(JSON.stringify({ action, ...topics }));
+	}
+
 	onEvent(handler: WSEventHandler): () => void {
 		this.handlers.add(handler);
 		return () => this.handlers.delete(handler);
@@ -15,6 +15,8 @@ class AIChatStore {
 	sources = $state<ChatSourceEntry[]>([]);
 	entryContext = $state<EntryContext | null>(null);
 	private abortController: AbortController | null = null;
+	/** Scopes the server's retrieval cache to this conversation */
+	private conversationId: string | null = null;
 
 	async send(content: string, kb?: string) {
 		this.error = null;
@@ -28,8 +30,10 @@ class AIChatStore {
 
 		try {
 			this.abortController = new AbortController();
+			this.conversationId ??= crypto.randomUUID();
 			const body: Record<string, unknown> = {
-				messages: this.messages.slice(0, -1) // exclude the empty assistant msg
+				messages: this.messages.slice(0, -1), // exclude the empty assistant msg
+				conversation_id: this.conversationId
 			};
 			if (kb) body.kb = kb;
 			if (this.entryContext) {
@@ -106,6 +110,7 @@ class AIChatStore {
 		this.sources = [];
 		this.error = null;
 		this.entryContext = null;
+		this.conversationId = null;
 	}
 }
 